@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пакетный режим WordPress Automation
+- Ключевые слова из файла или из таблицы keywords (SQLite)
+- Исследование, генерация и оценка в пуле потоков с ограниченной параллельностью
+- Публикация отдельной стадией под лимитом запросов к WordPress
+- Чекпоинты в БД: прерванный пакет продолжается с места остановки
+- Недоступность WordPress не теряет статьи: они ждут в спуле публикации (stage = spooled)
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from wordPress_automation_final import WordPressAutomationFinal
+from enhanced_wordpress_automation import EnhancedWordPressAutomation
+
+# Режимы: класс автоматизации и метод вывода результатов
+AUTOMATION_MODES = {
+    'final': (WordPressAutomationFinal, 'display_final_results'),
+    'enhanced': (EnhancedWordPressAutomation, 'display_enhanced_results')
+}
+
+PRIORITY_ORDER = "CASE priority WHEN 'urgent' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END"
+
+
+def load_keywords_from_file(path):
+    """Чтение ключевых слов из файла (одно на строку, # — комментарий)"""
+    keywords = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            keyword = line.strip()
+            if keyword and not keyword.startswith('#') and keyword not in keywords:
+                keywords.append(keyword)
+    return keywords
+
+
+def load_keywords_from_db(db_path, limit=None):
+    """Чтение ключевых слов со статусом pending из таблицы keywords"""
+    conn = sqlite3.connect(db_path)
+    try:
+        query = f"SELECT keyword FROM keywords WHERE status = 'pending' ORDER BY {PRIORITY_ORDER}, id"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return [row[0] for row in conn.execute(query).fetchall()]
+    finally:
+        conn.close()
+
+
+class BatchAutomationRunner:
+    """Пакетная обработка ключевых слов с чекпоинтами"""
+
+    def __init__(self, mode='final', workers=4, publish_rps=None, batch_id=None):
+        automation_class, display_method = AUTOMATION_MODES[mode]
+
+        self.automation_class = automation_class
+        self.workers = max(1, workers)
+        self.batch_id = batch_id or datetime.now().strftime('batch_%Y%m%d_%H%M%S')
+
+        # Основной экземпляр: стадия публикации и чекпоинты (главный поток)
+        self.automation = automation_class()
+        self.display_results = getattr(self.automation, display_method)
+        if publish_rps:
+            self.automation.wp_rate_limiter.set_rate(publish_rps)
+
+        # Экземпляры для потоков пула (у каждого свое соединение с SQLite)
+        self._local = threading.local()
+        self._worker_automations = []
+        self._worker_lock = threading.Lock()
+
+        self.initialize_checkpoints()
+
+    def initialize_checkpoints(self):
+        """Создание таблицы чекпоинтов пакетной обработки"""
+        cursor = self.automation.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS batch_progress (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch_id TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                stage TEXT DEFAULT 'pending',
+                prepared_data TEXT,
+                article_id INTEGER,
+                wp_post_id INTEGER,
+                error_message TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (batch_id, keyword)
+            )
+        ''')
+        self.automation.conn.commit()
+
+    def register_keywords(self, keywords):
+        """Регистрация ключевых слов пакета (повторный запуск не сбрасывает прогресс)"""
+        cursor = self.automation.conn.cursor()
+        cursor.executemany('''
+            INSERT OR IGNORE INTO batch_progress (batch_id, keyword) VALUES (?, ?)
+        ''', [(self.batch_id, keyword) for keyword in keywords])
+        self.automation.conn.commit()
+
+    def load_progress(self):
+        """Текущее состояние пакета: keyword -> (stage, prepared_data)"""
+        cursor = self.automation.conn.cursor()
+        cursor.execute('''
+            SELECT keyword, stage, prepared_data FROM batch_progress WHERE batch_id = ?
+        ''', (self.batch_id,))
+        return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+    def checkpoint(self, keyword, stage, prepared=None, result=None, error=None):
+        """Фиксация стадии обработки ключевого слова"""
+        result = result or {}
+        cursor = self.automation.conn.cursor()
+        cursor.execute('''
+            UPDATE batch_progress
+            SET stage = ?,
+                prepared_data = COALESCE(?, prepared_data),
+                article_id = COALESCE(?, article_id),
+                wp_post_id = COALESCE(?, wp_post_id),
+                error_message = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE batch_id = ? AND keyword = ?
+        ''', (
+            stage,
+            json.dumps(prepared, ensure_ascii=False) if prepared else None,
+            result.get('article_id'),
+            result.get('wp_id'),
+            error,
+            self.batch_id,
+            keyword
+        ))
+        self.automation.conn.commit()
+
+    def _get_worker_automation(self):
+        """Экземпляр автоматизации текущего потока пула"""
+        automation = getattr(self._local, 'automation', None)
+        if automation is None:
+            automation = self.automation_class()
+            self._local.automation = automation
+            with self._worker_lock:
+                self._worker_automations.append(automation)
+        return automation
+
+    def _prepare(self, keyword):
+        """Задача пула: исследование, генерация и оценка без публикации"""
+        return self._get_worker_automation().prepare_article(keyword)
+
+    def _publish(self, prepared, results):
+        """Стадия публикации (главный поток, под лимитом запросов к WordPress)"""
+        keyword = prepared['keyword']
+        try:
+            result = self.automation.publish_prepared_article(prepared)
+        except Exception as e:
+            print(f"   ❌ Ошибка публикации '{keyword}': {str(e)}")
+            self.checkpoint(keyword, 'prepared', error=str(e))
+            results.append(self._error_result(keyword))
+            return
+
+        if result['status'] == 'success':
+            self.checkpoint(keyword, 'published', result=result)
+        elif result['status'] == 'over_budget':
+            # Публиковать нечего: при повторном запуске статья генерируется заново
+            self.checkpoint(keyword, 'error', error='HTML size budget exceeded')
+        elif result['status'] == 'lint_error':
+            self.checkpoint(keyword, 'error', error=f"HTML structure errors: {result.get('lint_errors')}")
+        elif result['status'] == 'seo_gate':
+            self.checkpoint(keyword, 'error', error=f"Offline SEO score {result.get('seo_gate_score')} below threshold")
+        elif result['status'] == 'calculation_error':
+            self.checkpoint(keyword, 'error', error='Commission example does not match the calculator')
+        elif result['status'] == 'duplicate':
+            self.checkpoint(keyword, 'error', error=f"Near-duplicate of article {result.get('duplicate_of')}")
+        elif result['status'] == 'spooled':
+            # Публикует фоновый разбор спула; запись в БД — в record_spooled
+            self.checkpoint(keyword, 'spooled', error='WordPress unavailable, article saved to publish spool')
+        else:
+            # Статья уже подготовлена: при повторном запуске публикуем без регенерации
+            self.checkpoint(keyword, 'prepared', error='WordPress publish failed')
+        results.append(result)
+        self._checkpoint_spooled(self.automation.record_spooled())
+
+    def _checkpoint_spooled(self, recorded_entries):
+        """Чекпоинты статей, опубликованных из спула"""
+        for recorded in recorded_entries:
+            self.checkpoint(recorded['keyword'], 'published', result=recorded)
+
+    def _error_result(self, keyword):
+        return {
+            'keyword': keyword,
+            'article_id': None,
+            'wp_id': None,
+            'wp_url': None,
+            'status': 'error',
+            'word_count': 0,
+            'quality_score': 0,
+            'seo_score': 0,
+            'content_rating': 0
+        }
+
+    def run(self, keywords):
+        """Запуск (или продолжение) пакетной обработки"""
+        print(f"🚀 Пакетный запуск {self.automation_class.__name__}")
+        print(f"📦 Пакет: {self.batch_id} | Ключевых слов: {len(keywords)} | Потоков: {self.workers}")
+        print(f"⏱️ Лимит публикации: {self.automation.wp_rate_limiter.rate:.2f} req/s")
+        print("=" * 60)
+
+        self.register_keywords(keywords)
+        progress = self.load_progress()
+
+        results = []
+        ready = []
+        to_prepare = []
+
+        for keyword in keywords:
+            stage, prepared_data = progress.get(keyword, ('pending', None))
+            if stage == 'published':
+                print(f"   ⏭️ Уже опубликовано: {keyword}")
+            elif stage == 'spooled':
+                print(f"   ⏳ В спуле публикации: {keyword}")
+            elif stage == 'prepared' and prepared_data:
+                ready.append(json.loads(prepared_data))
+            else:
+                to_prepare.append(keyword)
+
+        print(f"📋 К генерации: {len(to_prepare)} | К публикации из чекпоинта: {len(ready)}")
+
+        self._checkpoint_spooled(self.automation.start_spool())
+        # Метки всех ключевых слов пакета создаются одним проходом до публикации
+        self.automation.taxonomy.prepare(to_prepare + [prepared['keyword'] for prepared in ready])
+
+        try:
+            # Подготовленные в прошлом запуске статьи публикуем сразу
+            for prepared in ready:
+                self._publish(prepared, results)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(self._prepare, keyword): keyword for keyword in to_prepare}
+
+                for future in as_completed(futures):
+                    keyword = futures[future]
+                    try:
+                        prepared = future.result()
+                    except Exception as e:
+                        print(f"   ❌ Критическая ошибка при обработке '{keyword}': {str(e)}")
+                        self.checkpoint(keyword, 'error', error=str(e))
+                        results.append(self._error_result(keyword))
+                        continue
+
+                    self.checkpoint(keyword, 'prepared', prepared=prepared)
+                    self._publish(prepared, results)
+        finally:
+            self._checkpoint_spooled(self.automation.stop_spool())
+            self.close()
+
+        self.display_results(results)
+        return results
+
+    def close(self):
+        """Закрытие соединений потоков пула"""
+        with self._worker_lock:
+            for automation in self._worker_automations:
+                if automation.conn:
+                    automation.conn.close()
+            self._worker_automations = []
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Пакетный режим WordPress Automation')
+    parser.add_argument('--mode', default='final', choices=sorted(AUTOMATION_MODES), help='Версия автоматизации')
+    parser.add_argument('--keywords-file', help='Файл с ключевыми словами (одно на строку)')
+    parser.add_argument('--keywords-db', help='SQLite БД с таблицей keywords (берутся status = pending)')
+    parser.add_argument('--limit', type=int, help='Максимум ключевых слов из БД')
+    parser.add_argument('--workers', type=int, default=4, help='Потоков генерации')
+    parser.add_argument('--publish-rps', type=float, help='Лимит запросов публикации в секунду')
+    parser.add_argument('--batch-id', help='Идентификатор пакета (для продолжения прерванного)')
+
+    args = parser.parse_args()
+
+    if args.keywords_file:
+        keywords = load_keywords_from_file(args.keywords_file)
+    elif args.keywords_db:
+        keywords = load_keywords_from_db(args.keywords_db, args.limit)
+    else:
+        parser.error('Укажите --keywords-file или --keywords-db')
+
+    runner = BatchAutomationRunner(
+        mode=args.mode,
+        workers=args.workers,
+        publish_rps=args.publish_rps,
+        batch_id=args.batch_id
+    )
+    runner.run(keywords)
+
+    if runner.automation.conn:
+        runner.automation.conn.close()
+        print("\n🔒 Соединение с базой данных закрыто")
+
+if __name__ == "__main__":
+    main()
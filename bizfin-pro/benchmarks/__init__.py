@@ -0,0 +1 @@
+# Scoring Benchmarks
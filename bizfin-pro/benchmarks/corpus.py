@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Корпус для бенчмарков оценки и разбора HTML
+
+- Синтетические страницы конкурентов и статьи заданного размера: генерация
+  детерминирована (random.Random(seed)), одинаковые параметры дают байт в байт
+  одинаковый HTML, поэтому замеры и оценки сравнимы между запусками
+- Сохраненные страницы (fixtures/): HTML и описание в fixtures/index.json
+- Сохранение новой реальной страницы в fixtures (capture_fixture)
+"""
+
+import json
+import os
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FIXTURES_INDEX = os.path.join(FIXTURES_DIR, 'index.json')
+
+DEFAULT_KEYWORD = 'банковская гарантия на исполнение контракта'
+DEFAULT_SEED = 20240601
+
+# Размер документа: (разделов, слов в разделе)
+CORPUS_SIZES = {
+    'small': (4, 80),
+    'medium': (8, 180),
+    'large': (16, 400),
+}
+
+_SUBJECTS = [
+    'Банк', 'Заказчик', 'Принципал', 'Бенефициар', 'Гарант', 'Поставщик', 'Подрядчик',
+    'Участник закупки', 'Кредитный комитет', 'Электронная площадка', 'Финансовый отдел компании'
+]
+_VERBS = [
+    'проверяет', 'рассчитывает', 'учитывает', 'запрашивает', 'оформляет', 'согласует',
+    'предоставляет', 'анализирует', 'снижает', 'требует', 'фиксирует', 'направляет'
+]
+_OBJECTS = [
+    'бухгалтерскую отчетность за последний год', 'опыт исполнения аналогичных контрактов',
+    'сумму обеспечения по контракту', 'текст гарантии по типовой форме', 'срок действия гарантии',
+    'выписку из реестра банковских гарантий', 'финансовое положение принципала',
+    'комиссию за выдачу гарантии', 'пакет учредительных документов', 'условия возврата аванса',
+    'риски неисполнения обязательств', 'требования документации о закупке'
+]
+_TAILS = [
+    'до подачи заявки', 'в течение {days} рабочих дней', 'при сумме от {amount} руб.',
+    'по ставке от {rate}% годовых', 'согласно {law}', 'на срок до {months} месяцев',
+    'с учетом требований {law}', 'без залога и поручительства', 'в личном кабинете площадки',
+    'для {share}% участников закупок'
+]
+_LAWS = ['44-ФЗ', '223-ФЗ', 'ГК РФ ст. 368', 'ГК РФ ст. 378', 'Постановление Правительства РФ № 1005']
+_SECTION_TITLES = [
+    'Что такое {keyword}', 'Виды банковских гарантий', 'Требования к принципалу', 'Стоимость и комиссия',
+    'Необходимые документы', 'Сроки оформления', 'Проверка гарантии в реестре', 'Частые ошибки',
+    'Как выбрать банк', 'Возврат аванса', 'Гарантия для участия в тендере', 'Риски и ответственность',
+    'Пошаговый процесс оформления', 'Изменения законодательства', 'Практические примеры расчета',
+    'Гарантийные обязательства'
+]
+_QUESTIONS = [
+    'Сколько стоит {keyword}?', 'Какие документы нужны для оформления?', 'Можно ли получить гарантию без залога?',
+    'Как проверить гарантию в реестре?', 'Что делать при отказе банка?', 'Как быстро выдают гарантию?',
+    'Можно ли продлить срок гарантии?', 'Кто платит комиссию банку?'
+]
+_NOISE_LINKS = ['Главная', 'Услуги', 'Тарифы', 'Калькулятор', 'Банки-партнеры', 'Отзывы', 'Контакты', 'Блог']
+_CTAS = ['Оставить заявку', 'Рассчитать стоимость', 'Получить расчёт', 'Оформить гарантию']
+
+
+@dataclass
+class CorpusPage:
+    """Страница корпуса: синтетическая или сохраненная"""
+    name: str
+    kind: str  # competitor, article
+    keyword: str
+    url: str
+    html: str
+    source: str = 'synthetic'
+
+    @property
+    def html_bytes(self) -> bytes:
+        return self.html.encode('utf-8')
+
+
+@dataclass
+class Corpus:
+    """Набор страниц для одного прогона бенчмарков"""
+    keyword: str
+    size: str
+    seed: int
+    pages: List[CorpusPage] = field(default_factory=list)
+
+    @property
+    def competitors(self) -> List[CorpusPage]:
+        return [page for page in self.pages if page.kind == 'competitor']
+
+    @property
+    def articles(self) -> List[CorpusPage]:
+        return [page for page in self.pages if page.kind == 'article']
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'keyword': self.keyword,
+            'size': self.size,
+            'seed': self.seed,
+            'competitors': len(self.competitors),
+            'articles': len(self.articles),
+            'bytes': sum(len(page.html_bytes) for page in self.pages)
+        }
+
+
+class _TextFactory:
+    """Предложения и блоки HTML из словаря предметной области"""
+
+    def __init__(self, rng: random.Random, keyword: str):
+        self.rng = rng
+        self.keyword = keyword
+
+    def sentence(self) -> str:
+        rng = self.rng
+        tail = rng.choice(_TAILS).format(
+            days=rng.randint(1, 10),
+            amount=f"{rng.choice([100, 250, 500, 1000, 5000]) * 1000:,}".replace(',', ' '),
+            rate=f"{rng.uniform(1.5, 5.0):.1f}".replace('.', ','),
+            months=rng.choice([3, 6, 12, 24, 36]),
+            law=rng.choice(_LAWS),
+            share=rng.randint(10, 90)
+        )
+        if rng.random() < 0.2:
+            return f"{self.keyword.capitalize()} {rng.choice(_VERBS).replace('ет', 'ется', 1)} {tail}."
+        return f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {tail}."
+
+    def paragraph(self, words: int) -> str:
+        sentences = []
+        while sum(len(s.split()) for s in sentences) < words:
+            sentences.append(self.sentence())
+        return f"<p>{' '.join(sentences)}</p>"
+
+    def items(self, tag: str, count: int) -> str:
+        return f"<{tag}>" + ''.join(
+            f"<li>{self.rng.choice(_OBJECTS).capitalize()} {self.rng.choice(_TAILS).split('{')[0].strip()}</li>"
+            for _ in range(count)
+        ) + f"</{tag}>"
+
+    def tariff_table(self, rows: int, css_class: str = '') -> str:
+        class_attr = f' class="{css_class}"' if css_class else ''
+        body = ''.join(
+            f"<tr><td>до {amount:,} руб.</td><td>{rate:.1f}%</td><td>от {fee:,} руб.</td></tr>".replace(',', ' ')
+            for amount, rate, fee in (
+                (self.rng.choice([1, 5, 10, 50, 100]) * 1_000_000,
+                 self.rng.uniform(1.5, 5.0),
+                 self.rng.choice([1, 3, 5, 10]) * 1000)
+                for _ in range(rows)
+            )
+        )
+        return (f"<table{class_attr}><thead><tr><th>Сумма гарантии</th><th>Ставка</th><th>Минимальная комиссия</th></tr>"
+                f"</thead><tbody>{body}</tbody></table>")
+
+    def section_body(self, words: int, heading_level: int) -> str:
+        """Абзацы раздела с подзаголовком, списком или таблицей"""
+        parts = []
+        paragraphs = max(1, words // 60)
+        for index in range(paragraphs):
+            parts.append(self.paragraph(min(60, words)))
+            roll = self.rng.random()
+            if index == 0 and roll < 0.35:
+                parts.append(self.items('ul', self.rng.randint(3, 6)))
+            elif index == 0 and roll < 0.55:
+                parts.append(self.tariff_table(self.rng.randint(3, 6), 'wp-block-table'))
+            elif index == 1 and roll < 0.5:
+                title = self.rng.choice(_SECTION_TITLES).format(keyword=self.keyword)
+                parts.append(f"<h{heading_level + 1}>{title}: подробности</h{heading_level + 1}>")
+                parts.append(self.items('ol', self.rng.randint(3, 5)))
+        return '\n'.join(parts)
+
+
+def _section_titles(rng: random.Random, keyword: str, count: int) -> List[str]:
+    titles = [title.format(keyword=keyword) for title in rng.sample(_SECTION_TITLES, min(count, len(_SECTION_TITLES)))]
+    while len(titles) < count:
+        titles.append(f"{rng.choice(_SECTION_TITLES).format(keyword=keyword)} ({len(titles) + 1})")
+    return titles
+
+
+def generate_competitor_page(seed: int, keyword: str = DEFAULT_KEYWORD, size: str = 'medium') -> str:
+    """
+    Синтетическая страница конкурента: полный документ с навигацией, подвалом,
+    schema.org, таблицей тарифов, калькулятором, FAQ в details и CTA
+
+    Args:
+        seed: Зерно генератора (одинаковое зерно — одинаковая страница)
+        keyword: Ключевая фраза
+        size: Размер (small, medium, large)
+
+    Returns:
+        HTML документа
+    """
+    rng = random.Random(seed)
+    text = _TextFactory(rng, keyword)
+    sections, words = CORPUS_SIZES[size]
+    published = date(2024, 1, 1) + timedelta(days=rng.randint(0, 500))
+    questions = [q.format(keyword=keyword) for q in rng.sample(_QUESTIONS, 4)]
+
+    faq_schema = {
+        '@context': 'https://schema.org',
+        '@type': 'FAQPage',
+        'mainEntity': [
+            {'@type': 'Question', 'name': q, 'acceptedAnswer': {'@type': 'Answer', 'text': text.sentence()}}
+            for q in questions
+        ]
+    }
+    organization = {'@context': 'https://schema.org', '@type': 'Organization', 'name': f'Гарант-{seed % 97}'}
+
+    parts = [
+        '<!DOCTYPE html><html lang="ru"><head><meta charset="utf-8">',
+        f'<title>{keyword.capitalize()} — тарифы и условия {published.year}</title>',
+        f'<meta name="description" content="{text.sentence()}">',
+        f'<meta name="author" content="Эксперт {seed % 13}">',
+        f'<script type="application/ld+json">{json.dumps(organization, ensure_ascii=False)}</script>',
+        f'<script type="application/ld+json">{json.dumps(faq_schema, ensure_ascii=False)}</script>',
+        '<style>.menu{display:flex}.cookie{position:fixed}</style></head><body>',
+        '<header><nav class="menu">' + ''.join(f'<a href="/{i}">{link}</a>' for i, link in enumerate(_NOISE_LINKS)) +
+        '</nav></header>',
+        '<div class="breadcrumbs"><a href="/">Главная</a> / <a href="/uslugi">Услуги</a></div>',
+        '<div class="cookie">Мы используем cookie. <a href="/privacy">Подробнее</a></div>',
+        '<main><article>',
+        f'<h1>{keyword.capitalize()}: условия, стоимость и документы</h1>',
+        f'<p class="meta"><span class="author">Эксперт {seed % 13}</span> · '
+        f'<time datetime="{published.isoformat()}">{published.strftime("%d.%m.%Y")}</time></p>',
+        text.paragraph(words // 2),
+    ]
+    for index, title in enumerate(_section_titles(rng, keyword, sections)):
+        parts.append(f'<h2>{title}</h2>')
+        parts.append(text.section_body(words, 2))
+        if index == 1:
+            parts.append(
+                '<form id="calc"><label for="amount">Сумма гарантии</label><input id="amount" name="amount">'
+                '<label for="term">Срок, дней</label><input id="term" name="term">'
+                '<select name="rate"><option>44-ФЗ</option><option>223-ФЗ</option></select></form>'
+            )
+        if index % 3 == 2:
+            parts.append(f'<p><a class="btn" href="/zayavka">{rng.choice(_CTAS)}</a></p>')
+
+    parts.append('<h2>Часто задаваемые вопросы</h2>')
+    for question, entity in zip(questions, faq_schema['mainEntity']):
+        parts.append(f"<details><summary>{question}</summary><p>{entity['acceptedAnswer']['text']}</p></details>")
+    parts.append(f'<p><a class="btn" href="/zayavka">{_CTAS[0]}</a></p>')
+    parts.append('</article></main>')
+    parts.append('<aside class="sidebar">' + text.items('ul', 5) + '</aside>')
+    parts.append('<div class="subscribe">Подпишитесь на рассылку</div>')
+    parts.append('<footer class="foot">' + ' '.join(f'<a href="/f{i}">{link}</a>' for i, link in enumerate(_NOISE_LINKS)) +
+                 '<p>© 2024</p></footer></body></html>')
+    return '\n'.join(parts)
+
+
+def generate_article(seed: int, keyword: str = DEFAULT_KEYWORD, size: str = 'medium') -> str:
+    """
+    Синтетическая статья в разметке генераторов (фрагмент без <html>/<body>):
+    H1, введение, разделы H2 с блоками H3, списки, таблицы, FAQ и заключение
+
+    Args:
+        seed: Зерно генератора
+        keyword: Ключевая фраза
+        size: Размер (small, medium, large)
+
+    Returns:
+        HTML статьи
+    """
+    rng = random.Random(seed)
+    text = _TextFactory(rng, keyword)
+    sections, words = CORPUS_SIZES[size]
+
+    lead = text.sentence()
+    parts = [
+        f'<h1 class="entry-title">{keyword.capitalize()}: полное руководство</h1>',
+        f'<p><strong>{keyword.capitalize()}</strong> — {lead[0].lower()}{lead[1:]}</p>',
+        text.paragraph(words // 2),
+        '<!-- wp:more -->',
+    ]
+    for title in _section_titles(rng, keyword, sections):
+        parts.append(f'<h2 class="section-title">{title}</h2>')
+        parts.append(text.section_body(words, 2))
+
+    parts.append('<h2 class="section-title">Часто задаваемые вопросы</h2>')
+    for question in rng.sample(_QUESTIONS, 5):
+        parts.append(f'<h3>{question.format(keyword=keyword)}</h3>')
+        parts.append(text.paragraph(30))
+    parts.append('<h2 class="section-title">Заключение</h2>')
+    parts.append(text.paragraph(words // 2))
+    return '\n'.join(parts)
+
+
+def build_corpus(size: str = 'medium', pages: int = 10, seed: int = DEFAULT_SEED,
+                 keyword: str = DEFAULT_KEYWORD, include_fixtures: bool = True) -> Corpus:
+    """
+    Корпус для прогона: pages страниц конкурентов и pages статей плюс сохраненные страницы
+
+    Args:
+        size: Размер синтетических документов (small, medium, large)
+        pages: Документов каждого вида
+        seed: Зерно генератора корпуса
+        keyword: Ключевая фраза синтетических документов
+        include_fixtures: Добавить сохраненные страницы из fixtures/
+
+    Returns:
+        Корпус
+    """
+    if size not in CORPUS_SIZES:
+        raise ValueError(f"Неизвестный размер корпуса: {size} (доступны: {', '.join(CORPUS_SIZES)})")
+
+    corpus = Corpus(keyword=keyword, size=size, seed=seed)
+    for index in range(pages):
+        corpus.pages.append(CorpusPage(
+            name=f'synthetic-competitor-{index}', kind='competitor', keyword=keyword,
+            url=f'https://competitor-{index}.example.ru/bankovskaya-garantiya',
+            html=generate_competitor_page(seed + index, keyword, size)
+        ))
+        corpus.pages.append(CorpusPage(
+            name=f'synthetic-article-{index}', kind='article', keyword=keyword,
+            url=f'https://bizfin-pro.ru/synthetic-{index}/',
+            html=generate_article(seed + 10_000 + index, keyword, size)
+        ))
+    if include_fixtures:
+        corpus.pages.extend(load_fixtures())
+    return corpus
+
+
+def _read_index() -> List[Dict[str, Any]]:
+    if not os.path.exists(FIXTURES_INDEX):
+        return []
+    with open(FIXTURES_INDEX, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_fixtures(kind: Optional[str] = None) -> List[CorpusPage]:
+    """
+    Сохраненные страницы из fixtures/index.json
+
+    Args:
+        kind: Только страницы этого вида (competitor, article)
+
+    Returns:
+        Страницы в порядке индекса
+    """
+    pages = []
+    for entry in _read_index():
+        if kind and entry['kind'] != kind:
+            continue
+        with open(os.path.join(FIXTURES_DIR, entry['file']), encoding='utf-8') as f:
+            html = f.read()
+        pages.append(CorpusPage(
+            name=entry['name'], kind=entry['kind'], keyword=entry.get('keyword', DEFAULT_KEYWORD),
+            url=entry.get('url', ''), html=html, source=entry.get('source', 'fixture')
+        ))
+    return pages
+
+
+def capture_fixture(url: str, keyword: str = DEFAULT_KEYWORD, kind: str = 'competitor',
+                    name: Optional[str] = None, timeout: int = 15) -> Tuple[str, int]:
+    """
+    Сохранение реальной страницы в fixtures/ и запись в индекс
+
+    Args:
+        url: Адрес страницы
+        keyword: Ключевая фраза, по которой страница попала в выдачу
+        kind: Вид страницы (competitor, article)
+        name: Имя фикстуры (по умолчанию из домена и пути)
+        timeout: Таймаут запроса, секунд
+
+    Returns:
+        Имя фикстуры и размер HTML в байтах
+    """
+    import requests
+
+    from modules.research.bizfinpro_researcher import UA
+
+    response = requests.get(url, headers={'User-Agent': UA}, timeout=timeout)
+    response.raise_for_status()
+    response.encoding = response.encoding if response.encoding and response.encoding.lower() != 'iso-8859-1' \
+        else response.apparent_encoding
+
+    name = name or re.sub(r'[^a-z0-9]+', '-', re.sub(r'^https?://(www\.)?', '', url.lower())).strip('-')[:60]
+    filename = f'{name}.html'
+    with open(os.path.join(FIXTURES_DIR, filename), 'w', encoding='utf-8') as f:
+        f.write(response.text)
+
+    index = [entry for entry in _read_index() if entry['name'] != name]
+    index.append({
+        'name': name, 'file': filename, 'kind': kind, 'keyword': keyword, 'url': url,
+        'source': 'captured', 'captured': date.today().isoformat()
+    })
+    with open(FIXTURES_INDEX, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return name, len(response.content)
+
+
+# Экспорт
+__all__ = [
+    'CorpusPage', 'Corpus', 'CORPUS_SIZES', 'DEFAULT_KEYWORD', 'DEFAULT_SEED', 'FIXTURES_DIR',
+    'generate_competitor_page', 'generate_article', 'build_corpus', 'load_fixtures', 'capture_fixture'
+]
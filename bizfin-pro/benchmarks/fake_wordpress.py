@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Локальная замена WordPress REST API для нагрузочных тестов публикации
+
+Реализует то, чем пользуются публикаторы пайплайна:
+
+- /wp/v2/posts: список (status, slug, include, search, modified_after,
+  orderby, per_page/page, _fields, заголовки X-WP-Total/X-WP-TotalPages),
+  создание, чтение, обновление и удаление записи
+- /wp/v2/media: поиск и загрузка файла (тело запроса — содержимое файла)
+- /wp/v2/categories и /wp/v2/tags: поиск и создание терминов (term_exists)
+- /wp/v2/users: список пользователей (автор записей по умолчанию — ID 1)
+- /batch/v1: до 25 подзапросов в одном запросе (ответ 207)
+- постоянные ссылки /?p=<id> (GET и HEAD) для проверки после публикации
+
+Нагрузка хостинга моделируется профилем FaultProfile: задержка ответа
+с разбросом, отдельная задержка записи (в пакете — на каждый подзапрос),
+ограниченное число PHP-воркеров (лишние запросы ждут в очереди),
+доля ответов 5xx и 429, серверный лимит запросов в секунду. Часть
+ошибок записи может возвращаться уже после сохранения — так проверяется,
+что повтор не создает дубликат.
+
+Данные хранятся в памяти процесса; сервер работает в фоновых потоках
+и подходит как для нагрузочного теста, так и для ручного запуска
+скриптов публикации (WP_SITE_URL=http://127.0.0.1:<порт>).
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_SEED = 20240601
+
+# Максимум подзапросов batch/v1 и записей на страницу списка (как в WordPress)
+MAX_BATCH_REQUESTS = 25
+MAX_PER_PAGE = 100
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+_ROUTE_RE = re.compile(r'^/wp/v2/(posts|media|categories|tags|users)(?:/(\d+))?/?$')
+_SLUG_SUFFIX_RE = re.compile(r'-\d+$')
+
+
+@dataclass
+class FaultProfile:
+    """Задержки и ошибки, которые сервер вносит в ответы"""
+    latency_ms: float = 0.0          # базовая задержка любого ответа
+    jitter_ms: float = 0.0           # случайная добавка к задержке (0..jitter_ms)
+    write_latency_ms: float = 0.0    # дополнительная задержка записи (в пакете — на каждый подзапрос)
+    server_workers: int = 0          # PHP-воркеров: лишние запросы ждут свободного (0 — без ограничения)
+    error_rate: float = 0.0          # доля ответов 500/503 (в пакете — и доля подзапросов)
+    post_write_errors: float = 0.0   # доля ошибок записи, возвращаемых уже после сохранения
+    throttle_rate: float = 0.0       # доля ответов 429
+    max_rps: float = 0.0             # серверный лимит запросов в секунду, сверх него — 429 (0 — без лимита)
+    retry_after: int = 1             # Retry-After ответов 429, секунды
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _ApiError(Exception):
+    """Ответ REST API с ошибкой"""
+
+    def __init__(self, status: int, code: str, message: str, data: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': code, 'message': message, 'data': {'status': status, **(data or {})}}
+
+
+def _now() -> Tuple[str, str]:
+    """Текущее время в формате WordPress: локальное и GMT"""
+    local = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+    gmt = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    return local, gmt
+
+
+def _slugify(text: str) -> str:
+    slug = re.sub(r'[^\w-]+', '-', str(text).lower(), flags=re.UNICODE).strip('-')
+    return slug or 'term'
+
+
+def _plain(value: Any) -> str:
+    if isinstance(value, dict):
+        value = value.get('raw', value.get('rendered', ''))
+    return '' if value is None else str(value)
+
+
+def _first(query: Dict[str, List[str]], name: str, default: Optional[str] = None) -> Optional[str]:
+    values = query.get(name)
+    return values[0] if values else default
+
+
+class FakeWordPress:
+    """WordPress REST API в памяти процесса с управляемыми задержками и ошибками"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, profile: Optional[FaultProfile] = None,
+                 seed: int = DEFAULT_SEED):
+        """
+        Инициализация сервера
+
+        Args:
+            host: Адрес прослушивания
+            port: Порт (0 — свободный)
+            profile: Задержки и ошибки (по умолчанию без них)
+            seed: Зерно генератора ошибок и задержек (повторяемые прогоны)
+        """
+        self.host = host
+        self.port = port
+        self.profile = profile or FaultProfile()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._workers: Optional[threading.BoundedSemaphore] = None
+        self._window_started = 0.0
+        self._window_count = 0
+        self.reset()
+
+    # --- Жизненный цикл ---
+
+    def start(self) -> 'FakeWordPress':
+        """Запуск в фоновом потоке"""
+        handler = type('FakeWordPressHandler', (_Handler,), {'wordpress': self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        # Очередь соединений как у веб-сервера перед PHP-FPM
+        self._server.request_queue_size = 256
+        self.port = self._server.server_address[1]
+        if self.profile.server_workers > 0:
+            self._workers = threading.BoundedSemaphore(self.profile.server_workers)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-wordpress', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Остановка сервера"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeWordPress':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def site_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.site_url}/wp-json/wp/v2"
+
+    def reset(self):
+        """Очистка данных и счетчиков"""
+        with self._lock:
+            self.posts: Dict[int, Dict[str, Any]] = {}
+            self.media: Dict[int, Dict[str, Any]] = {}
+            self.terms: Dict[str, Dict[int, Dict[str, Any]]] = {'categories': {}, 'tags': {}}
+            self.users: Dict[int, Dict[str, Any]] = {1: {'id': 1, 'name': 'Admin', 'slug': 'admin'}}
+            self._next_id = 1
+            self.requests: Counter = Counter()
+            self.statuses: Counter = Counter()
+            self.faults: Counter = Counter()
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики запросов, ответов и внесенных ошибок"""
+        with self._lock:
+            return {
+                'requests': sum(self.requests.values()),
+                'routes': dict(self.requests),
+                'statuses': {str(code): count for code, count in sorted(self.statuses.items())},
+                'faults': dict(self.faults),
+                'posts': len(self.posts),
+                'media': len(self.media),
+                'duplicates': self.duplicate_posts()
+            }
+
+    def duplicate_posts(self) -> int:
+        """Записи со slug, к которому WordPress добавил суффикс (повторное создание той же статьи)"""
+        slugs = {post['slug'] for post in self.posts.values()}
+        return sum(1 for slug in slugs if _SLUG_SUFFIX_RE.search(slug) and _SLUG_SUFFIX_RE.sub('', slug) in slugs)
+
+    # --- Нагрузка и ошибки ---
+
+    def _chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+    def _sleep(self, method: str, writes: int = 0):
+        """Задержка ответа по профилю"""
+        profile = self.profile
+        delay = profile.latency_ms
+        if profile.jitter_ms:
+            with self._lock:
+                delay += self._rng.uniform(0, profile.jitter_ms)
+        if method in WRITE_METHODS:
+            delay += profile.write_latency_ms * max(1, writes)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _throttled(self) -> bool:
+        """Превышен серверный лимит запросов в секунду (окно в одну секунду)"""
+        if self.profile.max_rps <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._window_started >= 1.0:
+                self._window_started = now
+                self._window_count = 0
+            self._window_count += 1
+            return self._window_count > self.profile.max_rps
+
+    def _injected_error(self) -> _ApiError:
+        with self._lock:
+            status = self._rng.choice((500, 503))
+            self.faults[f"error_{status}"] += 1
+        return _ApiError(status, 'internal_server_error' if status == 500 else 'service_unavailable',
+                         'Injected server error')
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], headers: Dict[str, str],
+               body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Обработка запроса с задержками и ошибками профиля
+
+        Returns:
+            HTTP-код, тело ответа (JSON-совместимое или bytes) и заголовки
+        """
+        route = path.split('/wp-json', 1)[-1] if '/wp-json' in path else path
+        route_key = _ROUTE_RE.sub(lambda m: f"/wp/v2/{m.group(1)}" + ('/<id>' if m.group(2) else ''), route)
+        with self._lock:
+            self.requests[f"{method} {route_key}"] += 1
+
+        if self._workers is not None:
+            self._workers.acquire()
+        try:
+            status, payload, extra = self._handle(method, path, route, query, headers, body)
+        finally:
+            if self._workers is not None:
+                self._workers.release()
+        with self._lock:
+            self.statuses[status] += 1
+        return status, payload, extra
+
+    def _handle(self, method: str, path: str, route: str, query: Dict[str, List[str]], headers: Dict[str, str],
+                body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        if self._throttled() or self._chance(self.profile.throttle_rate):
+            with self._lock:
+                self.faults['throttled_429'] += 1
+            return 429, {'code': 'rest_too_many_requests', 'message': 'Too many requests',
+                         'data': {'status': 429}}, {'Retry-After': str(self.profile.retry_after)}
+
+        if '/wp-json' not in path:
+            self._sleep('GET')
+            return self._permalink(method, query)
+
+        try:
+            if route.rstrip('/') == '/batch/v1':
+                if method != 'POST':
+                    raise _ApiError(404, 'rest_no_route', 'No route was found matching the URL and request method.')
+                requests_list = self._json(body).get('requests') or []
+                self._require_auth(headers)
+                self._sleep(method, writes=len(requests_list))
+                return 207, self._batch(requests_list), {}
+
+            writes = method in WRITE_METHODS
+            self._sleep(method)
+            error = self._chance(self.profile.error_rate)
+            if error and not (writes and self._chance(self.profile.post_write_errors)):
+                raise self._injected_error()
+            status, payload, extra = self.dispatch(method, route, query, headers, body)
+            if error:
+                # Запись сохранена, но клиент получает ошибку
+                with self._lock:
+                    self.faults['lost_write_responses'] += 1
+                raise self._injected_error()
+            return status, payload, extra
+        except _ApiError as e:
+            return e.status, e.body, {}
+
+    # --- Маршруты ---
+
+    @staticmethod
+    def _json(body: bytes) -> Dict[str, Any]:
+        if not body:
+            return {}
+        try:
+            data = json.loads(body.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError):
+            raise _ApiError(400, 'rest_invalid_json', 'Invalid JSON body passed.')
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _require_auth(headers: Dict[str, str]):
+        if not headers.get('authorization'):
+            raise _ApiError(401, 'rest_cannot_create', 'Sorry, you are not allowed to do that.')
+
+    def dispatch(self, method: str, route: str, query: Dict[str, List[str]], headers: Dict[str, str],
+                 body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        """Маршрут /wp/v2/... без задержек и ошибок профиля (используется и подзапросами batch/v1)"""
+        match = _ROUTE_RE.match(route)
+        if not match:
+            raise _ApiError(404, 'rest_no_route', 'No route was found matching the URL and request method.')
+        collection, item_id = match.group(1), match.group(2)
+        if method in WRITE_METHODS or _first(query, 'context') == 'edit':
+            self._require_auth(headers)
+
+        if method == 'GET':
+            if item_id:
+                return 200, self._fields(self._get(collection, int(item_id)), query), {}
+            return self._list(collection, query)
+        if collection == 'media' and method == 'POST' and not item_id:
+            return 201, self._upload(query, headers, body), {}
+        data = self._json(body)
+        if method == 'POST' and not item_id:
+            return 201, self._create(collection, data), {}
+        if method in ('POST', 'PUT', 'PATCH'):
+            return 200, self._update(collection, int(item_id), data), {}
+        if method == 'DELETE':
+            return 200, self._delete(collection, int(item_id), _first(query, 'force') in ('1', 'true')), {}
+        raise _ApiError(404, 'rest_no_route', 'No route was found matching the URL and request method.')
+
+    def _store(self, collection: str) -> Dict[int, Dict[str, Any]]:
+        if collection == 'posts':
+            return self.posts
+        if collection == 'media':
+            return self.media
+        if collection == 'users':
+            return self.users
+        return self.terms[collection]
+
+    def _get(self, collection: str, item_id: int) -> Dict[str, Any]:
+        with self._lock:
+            item = self._store(collection).get(item_id)
+        if item is None:
+            raise _ApiError(404, f"rest_{collection.rstrip('s')}_invalid_id", 'Invalid ID.')
+        return item
+
+    @staticmethod
+    def _fields(item: Dict[str, Any], query: Dict[str, List[str]]) -> Dict[str, Any]:
+        fields = _first(query, '_fields')
+        if not fields:
+            return item
+        names = [name.split('.')[0] for name in fields.split(',')]
+        return {name: item[name] for name in names if name in item}
+
+    def _list(self, collection: str, query: Dict[str, List[str]]) -> Tuple[int, Any, Dict[str, str]]:
+        per_page = int(_first(query, 'per_page', '10'))
+        page = int(_first(query, 'page', '1'))
+        if not 1 <= per_page <= MAX_PER_PAGE:
+            raise _ApiError(400, 'rest_invalid_param', 'Invalid parameter(s): per_page')
+
+        with self._lock:
+            items = list(self._store(collection).values())
+        if collection == 'posts':
+            statuses = (_first(query, 'status', 'publish') or 'publish').split(',')
+            if 'any' not in statuses:
+                items = [item for item in items if item['status'] in statuses]
+            else:
+                items = [item for item in items if item['status'] != 'trash']
+        include = _first(query, 'include')
+        if include:
+            ids = {int(value) for value in include.split(',') if value.strip().isdigit()}
+            items = [item for item in items if item['id'] in ids]
+        slug = _first(query, 'slug')
+        if slug:
+            slugs = set(slug.split(','))
+            items = [item for item in items if item.get('slug') in slugs]
+        search = (_first(query, 'search') or '').lower()
+        if search:
+            items = [item for item in items if search in self._search_text(item)]
+        modified_after = _first(query, 'modified_after')
+        if modified_after and collection in ('posts', 'media'):
+            items = [item for item in items if item['modified'] > modified_after[:19]]
+
+        orderby = _first(query, 'orderby', 'date' if collection in ('posts', 'media') else 'name')
+        key = {'modified': lambda item: (item.get('modified'), item['id']),
+               'id': lambda item: item['id'],
+               'include': lambda item: item['id'],
+               'name': lambda item: (item.get('name', ''), item['id']),
+               'slug': lambda item: (item.get('slug', ''), item['id'])}.get(
+            orderby, lambda item: (item.get('date', ''), item['id']))
+        default_order = 'asc' if collection in ('categories', 'tags', 'users') else 'desc'
+        items.sort(key=key, reverse=_first(query, 'order', default_order) == 'desc')
+
+        total = len(items)
+        total_pages = max(1, math.ceil(total / per_page))
+        if page > total_pages and total:
+            raise _ApiError(400, 'rest_post_invalid_page_number',
+                            'The page number requested is larger than the number of pages available.')
+        page_items = [self._fields(item, query) for item in items[(page - 1) * per_page:page * per_page]]
+        return 200, page_items, {'X-WP-Total': str(total), 'X-WP-TotalPages': str(total_pages)}
+
+    @staticmethod
+    def _search_text(item: Dict[str, Any]) -> str:
+        return ' '.join(_plain(item.get(field)) for field in ('title', 'content', 'name', 'slug', 'source_url')).lower()
+
+    def _allocate_id(self) -> int:
+        item_id = self._next_id
+        self._next_id += 1
+        return item_id
+
+    def _unique_slug(self, collection: str, slug: str, exclude: Optional[int] = None) -> str:
+        """Slug как в WordPress: при совпадении добавляется -2, -3, ..."""
+        taken = {item.get('slug') for item_id, item in self._store(collection).items() if item_id != exclude}
+        if slug not in taken:
+            return slug
+        suffix = 2
+        while f"{slug}-{suffix}" in taken:
+            suffix += 1
+        return f"{slug}-{suffix}"
+
+    def _create(self, collection: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if collection in ('categories', 'tags'):
+            return self._create_term(collection, data)
+        if collection == 'users':
+            raise _ApiError(403, 'rest_cannot_create_user', 'Sorry, you are not allowed to create new users.')
+        if collection == 'media':
+            raise _ApiError(400, 'rest_upload_no_data', 'No data supplied.')
+        title = _plain(data.get('title'))
+        content = _plain(data.get('content'))
+        if not title and not content:
+            raise _ApiError(400, 'empty_content', 'Content, title, and excerpt are empty.')
+        local, gmt = _now()
+        with self._lock:
+            post_id = self._allocate_id()
+            slug = self._unique_slug('posts', _slugify(data.get('slug') or title))
+            post = {
+                'id': post_id, 'date': local, 'date_gmt': gmt, 'modified': local, 'modified_gmt': gmt,
+                'slug': slug, 'status': data.get('status', 'draft'), 'type': 'post',
+                'link': f"{self.site_url}/?p={post_id}",
+                'title': {'raw': title, 'rendered': title},
+                'content': {'raw': content, 'rendered': content, 'protected': False},
+                'excerpt': {'raw': _plain(data.get('excerpt')), 'rendered': _plain(data.get('excerpt'))},
+                'author': 1, 'featured_media': int(data.get('featured_media') or 0),
+                'categories': list(data.get('categories') or []), 'tags': list(data.get('tags') or []),
+                'meta': dict(data.get('meta') or {})
+            }
+            self.posts[post_id] = post
+        return post
+
+    def _update(self, collection: str, item_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        item = self._get(collection, item_id)
+        local, gmt = _now()
+        with self._lock:
+            for key, value in data.items():
+                if key in ('id', 'link', 'type'):
+                    continue
+                if key == 'meta' and isinstance(value, dict):
+                    item.setdefault('meta', {}).update(value)
+                elif key in ('title', 'content', 'excerpt') and collection == 'posts':
+                    text = _plain(value)
+                    item[key] = {**item.get(key, {}), 'raw': text, 'rendered': text}
+                elif key == 'slug':
+                    item['slug'] = self._unique_slug(collection, _slugify(value), exclude=item_id)
+                else:
+                    item[key] = value
+            if collection in ('posts', 'media'):
+                item['modified'], item['modified_gmt'] = local, gmt
+        return item
+
+    def _delete(self, collection: str, item_id: int, force: bool) -> Dict[str, Any]:
+        item = self._get(collection, item_id)
+        with self._lock:
+            if collection == 'posts' and not force:
+                item['status'] = 'trash'
+                return item
+            del self._store(collection)[item_id]
+        return {'deleted': True, 'previous': item}
+
+    def _create_term(self, collection: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        name = str(data.get('name') or '').strip()
+        if not name:
+            raise _ApiError(400, 'rest_missing_callback_param', 'Missing parameter(s): name')
+        slug = _slugify(data.get('slug') or name)
+        with self._lock:
+            terms = self.terms[collection]
+            for term in terms.values():
+                if term['slug'] == slug or term['name'].lower() == name.lower():
+                    raise _ApiError(400, 'term_exists', 'A term with the name provided already exists.',
+                                    {'term_id': term['id']})
+            term_id = self._allocate_id()
+            taxonomy = 'category' if collection == 'categories' else 'post_tag'
+            term = {'id': term_id, 'count': 0, 'description': data.get('description', ''),
+                    'link': f"{self.site_url}/{taxonomy}/{slug}/", 'name': name, 'slug': slug,
+                    'taxonomy': taxonomy, 'meta': []}
+            if collection == 'categories':
+                term['parent'] = int(data.get('parent') or 0)
+            terms[term_id] = term
+        return term
+
+    def _upload(self, query: Dict[str, List[str]], headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+        disposition = headers.get('content-disposition', '')
+        match = re.search(r'filename="?([^";]+)"?', disposition)
+        if not body or not match:
+            raise _ApiError(400, 'rest_upload_no_data', 'No data supplied.')
+        filename = match.group(1)
+        local, gmt = _now()
+        with self._lock:
+            media_id = self._allocate_id()
+            stem = filename.rsplit('.', 1)[0]
+            item = {
+                'id': media_id, 'date': local, 'date_gmt': gmt, 'modified': local, 'modified_gmt': gmt,
+                'slug': self._unique_slug('media', _slugify(stem)), 'status': 'inherit', 'type': 'attachment',
+                'link': f"{self.site_url}/?attachment_id={media_id}",
+                'title': {'raw': stem, 'rendered': stem},
+                'alt_text': _first(query, 'alt_text', ''),
+                'media_type': 'image' if headers.get('content-type', '').startswith('image/') else 'file',
+                'mime_type': headers.get('content-type', 'application/octet-stream'),
+                'source_url': f"{self.site_url}/wp-content/uploads/{local[:4]}/{local[5:7]}/{filename}",
+                'media_details': {'filesize': len(body)}
+            }
+            self.media[media_id] = item
+        return item
+
+    def _batch(self, requests_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if len(requests_list) > MAX_BATCH_REQUESTS:
+            raise _ApiError(400, 'rest_invalid_param', 'Invalid parameter(s): requests',
+                            {'params': {'requests': f"requests must contain at most {MAX_BATCH_REQUESTS} items."}})
+        responses = []
+        for sub in requests_list:
+            method = str(sub.get('method', 'POST')).upper()
+            parsed = urlparse(sub.get('path', ''))
+            try:
+                error = self._chance(self.profile.error_rate)
+                if error and not self._chance(self.profile.post_write_errors):
+                    raise self._injected_error()
+                status, payload, _ = self.dispatch(method, parsed.path, parse_qs(parsed.query),
+                                                   {'authorization': 'batch'},
+                                                   json.dumps(sub.get('body') or {}).encode('utf-8'))
+                if error:
+                    with self._lock:
+                        self.faults['lost_write_responses'] += 1
+                    raise self._injected_error()
+            except _ApiError as e:
+                status, payload = e.status, e.body
+            responses.append({'body': payload, 'status': status, 'headers': {}})
+        return {'responses': responses}
+
+    def _permalink(self, method: str, query: Dict[str, List[str]]) -> Tuple[int, Any, Dict[str, str]]:
+        """Страница записи /?p=<id>: 200 для опубликованной, иначе 404"""
+        post_id = _first(query, 'p', '')
+        with self._lock:
+            post = self.posts.get(int(post_id)) if post_id.isdigit() else None
+        if post is None or post['status'] != 'publish':
+            return 404, b'<html><body>Not Found</body></html>', {'Content-Type': 'text/html; charset=UTF-8'}
+        page = f"<html><head><title>{post['title']['rendered']}</title></head><body>{post['content']['rendered']}</body></html>"
+        return 200, page.encode('utf-8'), {'Content-Type': 'text/html; charset=UTF-8'}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP-обработчик: разбор запроса и отправка ответа FakeWordPress"""
+    protocol_version = 'HTTP/1.1'
+    wordpress: FakeWordPress = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        parsed = urlparse(self.path)
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        # Как и WordPress, метод можно передать заголовком (клиенты без PUT/DELETE)
+        method = headers.get('x-http-method-override', method).upper()
+        status, payload, extra = self.wordpress.handle(method, parsed.path, parse_qs(parsed.query), headers, body)
+
+        if isinstance(payload, bytes):
+            data = payload
+            content_type = extra.pop('Content-Type', 'application/octet-stream')
+        else:
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = 'application/json; charset=UTF-8'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in extra.items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def do_HEAD(self):
+        self._respond('GET')
+
+    def do_POST(self):
+        self._respond('POST')
+
+    def do_PUT(self):
+        self._respond('PUT')
+
+    def do_PATCH(self):
+        self._respond('PATCH')
+
+    def do_DELETE(self):
+        self._respond('DELETE')
+
+
+# Экспорт
+__all__ = ['FakeWordPress', 'FaultProfile', 'MAX_BATCH_REQUESTS']
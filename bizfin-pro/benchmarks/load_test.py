@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Нагрузочный тест публикации
+
+Очередь publish_queue во временной SQLite заполняется синтетическими
+статьями корпуса бенчмарков, после чего BulkPublisher публикует их на
+сервер WordPress (обычно FakeWordPress) с заданными параллельностью,
+лимитом запросов и размером пакета batch/v1. Задержка каждого ответа
+снимается слушателем клиента WordPress (без ожидания ограничителя), так
+что отчет показывает и пропускную способность, и p50/p95/p99 ответов
+сервера — настройки параллельности и лимитов подбираются без
+обращения к рабочему сайту.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Tuple
+import sys
+
+# Добавляем путь к модулям пайплайна
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config.wordpress import WordPressConfig
+from modules.publisher.rate_limiter import get_host_limiter
+from modules.publisher.wordpress_client import WordPressClient
+from modules.publisher.bulk_publisher import PublishQueueStore, BulkPublisher
+from scripts.init_sqlite_db import create_tables
+from benchmarks.corpus import generate_article, DEFAULT_KEYWORD, DEFAULT_SEED
+from benchmarks.fake_wordpress import FakeWordPress
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Перцентиль q (0-100) методом ближайшего ранга; None для пустого списка"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class LatencyRecorder:
+    """Задержки ответов WordPress (слушатель WordPressClient.add_listener)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: List[Tuple[str, float, Optional[int]]] = []
+
+    def __call__(self, method: str, latency: float, status_code: Optional[int]):
+        with self._lock:
+            self.samples.append((method, latency, status_code))
+
+    def statuses(self) -> Dict[str, int]:
+        """Число ответов по HTTP-коду ('error' — таймаут или сетевая ошибка)"""
+        with self._lock:
+            counts = Counter('error' if status is None else str(status) for _, _, status in self.samples)
+        return dict(sorted(counts.items()))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Число ответов и p50/p95/p99/max задержки в миллисекундах: всего и по HTTP-методам"""
+        with self._lock:
+            samples = list(self.samples)
+        groups: Dict[str, List[float]] = {'all': []}
+        for method, latency, _ in samples:
+            groups['all'].append(latency * 1000)
+            groups.setdefault(method, []).append(latency * 1000)
+        return {
+            name: {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 50), 1) if values else None,
+                'p95_ms': round(percentile(values, 95), 1) if values else None,
+                'p99_ms': round(percentile(values, 99), 1) if values else None,
+                'max_ms': round(max(values), 1) if values else None
+            }
+            for name, values in groups.items()
+        }
+
+
+@dataclass
+class LoadTestReport:
+    """Итоги нагрузочного теста"""
+    articles: int
+    workers: int
+    batch_size: int
+    requests_per_second: float
+    published: int = 0
+    retried: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    requests: int = 0
+    client_retries: int = 0
+    batches: int = 0
+    concurrency: Tuple[int, int, int] = (0, 0, 0)
+    latency: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    publish_p50: Optional[float] = None
+    publish_p95: Optional[float] = None
+    server: Optional[Dict[str, Any]] = None
+
+    @property
+    def throughput(self) -> float:
+        """Опубликованных статей в секунду"""
+        return self.published / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def request_rate(self) -> float:
+        """Запросов к WordPress в секунду"""
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['throughput'] = round(self.throughput, 3)
+        data['request_rate'] = round(self.request_rate, 3)
+        return data
+
+
+def prepare_queue(db_path: str, articles: int, size: str = 'small', seed: int = DEFAULT_SEED,
+                  keyword: str = DEFAULT_KEYWORD) -> PublishQueueStore:
+    """
+    Временная БД пайплайна с очередью из синтетических статей
+
+    Args:
+        db_path: Файл SQLite (схема scripts/init_sqlite_db.py)
+        articles: Статей в очереди
+        size: Размер статей корпуса (small, medium, large)
+        seed: Зерно генератора статей
+        keyword: Ключевая фраза статей
+
+    Returns:
+        Очередь публикации
+    """
+    if not create_tables(db_path):
+        raise RuntimeError(f"Не удалось создать схему БД: {db_path}")
+    connection = sqlite3.connect(db_path)
+    try:
+        rows = []
+        for index in range(1, articles + 1):
+            html = generate_article(seed + index, keyword, size)
+            focus_keyword = f"{keyword} {index}"
+            rows.append((index, index, index, html, html, f"{focus_keyword.capitalize()}: нагрузочный тест",
+                         f"{focus_keyword.capitalize()} — синтетическая статья нагрузочного теста публикации.",
+                         focus_keyword, f"load-test-{index}"))
+        connection.executemany(
+            "INSERT INTO articles_final (id, article_id, seo_check_id, content_final, html_final, meta_title, "
+            "meta_description, focus_keyword, slug) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        connection.executemany(
+            "INSERT INTO publish_queue (article_final_id, eec_json) VALUES (?, '{}')",
+            [(index,) for index in range(1, articles + 1)]
+        )
+        connection.commit()
+    finally:
+        connection.close()
+    return PublishQueueStore.sqlite(db_path)
+
+
+def run_load_test(api_url: str, articles: int = 200, workers: Optional[int] = None,
+                  requests_per_second: Optional[float] = None, burst: Optional[int] = None,
+                  batch_size: Optional[int] = None, retry_delay: float = 1.0, size: str = 'small',
+                  seed: int = DEFAULT_SEED, server: Optional[FakeWordPress] = None) -> LoadTestReport:
+    """
+    Публикация синтетической очереди на сервер WordPress с замером задержек
+
+    Args:
+        api_url: URL REST API (FakeWordPress.api_url или внешний стенд)
+        articles: Статей в очереди
+        workers: Максимум одновременных публикаций (WordPressConfig.PUBLISH_WORKERS)
+        requests_per_second: Лимит запросов к хосту (WordPressConfig.REQUESTS_PER_SECOND)
+        burst: Пачка запросов без ожидания (WordPressConfig.REQUESTS_BURST)
+        batch_size: Статей в одном запросе batch/v1 (WordPressConfig.BATCH_SIZE)
+        retry_delay: Пауза клиента перед первым повтором 429/5xx, секунды
+        size: Размер статей корпуса
+        seed: Зерно генератора статей
+        server: Локальный сервер — его счетчики попадут в отчет
+
+    Returns:
+        Итоги теста
+    """
+    limiter = get_host_limiter(api_url, requests_per_second, burst)
+    client = WordPressClient(api_url, 'load-test', 'load-test', retry_delay=retry_delay,
+                             pool_size=max(workers or WordPressConfig.PUBLISH_WORKERS, WordPressConfig.POOL_SIZE))
+    # Хеши полей тестовых записей не нужны в общем хранилище
+    client.field_hashes = None
+    recorder = LatencyRecorder()
+    client.add_listener(recorder)
+
+    directory = tempfile.mkdtemp(prefix='bizfin-load-')
+    store = prepare_queue(os.path.join(directory, 'load_test.db'), articles, size, seed)
+    try:
+        publisher = BulkPublisher(store, client=client, workers=workers, batch_size=batch_size)
+        stats = publisher.run()
+        durations = sorted(stats.durations)
+        report = LoadTestReport(
+            articles=articles,
+            workers=publisher.workers,
+            batch_size=publisher.batch_size,
+            requests_per_second=limiter.rate,
+            published=stats.published,
+            retried=stats.retried,
+            failed=stats.failed,
+            elapsed=stats.elapsed,
+            requests=client.stats['requests'],
+            client_retries=client.stats['retries'],
+            batches=client.stats['batches'],
+            concurrency=(publisher.concurrency.lowest_limit, publisher.concurrency.peak_limit,
+                         publisher.concurrency.adjustments),
+            latency=recorder.summary(),
+            statuses=recorder.statuses(),
+            publish_p50=round(percentile(durations, 50), 3) if durations else None,
+            publish_p95=round(percentile(durations, 95), 3) if durations else None,
+            server=server.stats() if server is not None else None
+        )
+    finally:
+        client.remove_listener(recorder)
+        store.close()
+        client.session.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return report
+
+
+def format_load_report(report: LoadTestReport) -> str:
+    """Текстовый отчет нагрузочного теста"""
+    lines = [
+        f"📤 Статей: {report.articles} | Потоков: до {report.workers} | Пакет: {report.batch_size} | "
+        f"Лимит: {report.requests_per_second:.2f} req/s",
+        f"✅ Опубликовано: {report.published} | 🔁 Отложено для повтора: {report.retried} | ❌ Ошибок: {report.failed}",
+        f"⏱️ Время: {report.elapsed:.2f} с | ⚡ {report.throughput:.2f} статей/с | "
+        f"🌐 {report.requests} запросов ({report.request_rate:.2f}/с), пакетов: {report.batches}, "
+        f"повторов клиента: {report.client_retries}",
+        f"⚙️ Параллельность: {report.concurrency[0]}–{report.concurrency[1]} (изменений: {report.concurrency[2]}) | "
+        f"публикация статьи p50/p95: {report.publish_p50} / {report.publish_p95} с",
+        "",
+        f"{'Запросы':<10} {'N':>7} {'p50, мс':>10} {'p95, мс':>10} {'p99, мс':>10} {'max, мс':>10}",
+        "-" * 62
+    ]
+    for name, row in report.latency.items():
+        lines.append(f"{name:<10} {row['count']:>7} {row['p50_ms'] or 0:>10.1f} {row['p95_ms'] or 0:>10.1f} "
+                     f"{row['p99_ms'] or 0:>10.1f} {row['max_ms'] or 0:>10.1f}")
+    lines.append("")
+    lines.append(f"📊 Ответы: {', '.join(f'{code}: {count}' for code, count in report.statuses.items()) or '—'}")
+    if report.server:
+        faults = report.server['faults']
+        lines.append(f"🧪 Сервер: записей {report.server['posts']}, дубликатов {report.server['duplicates']}, "
+                     f"внесено ошибок: {', '.join(f'{k}: {v}' for k, v in sorted(faults.items())) or 'нет'}")
+    return '\n'.join(lines)
+
+
+# Экспорт
+__all__ = ['LatencyRecorder', 'LoadTestReport', 'prepare_queue', 'run_load_test', 'format_load_report', 'percentile']
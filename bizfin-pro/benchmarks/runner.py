@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Замеры горячих функций и сравнение с базовой линией
+
+- Время: несколько прогонов по всему корпусу, min/медиана на прогон и на документ
+- Память: отдельный прогон под tracemalloc (пик и удержанная память, число блоков),
+  чтобы трассировка не искажала время
+- Результат функции сворачивается в сигнатуру (оценки, число заголовков и т.п.):
+  изменение сигнатуры — регрессия оценки, даже если скорость не изменилась
+- Базовая линия — локальный JSON; сравнение показывает изменение времени,
+  памяти и сигнатур
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Sequence
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+@dataclass
+class Benchmark:
+    """
+    Замер одной функции по корпусу
+
+    run выполняет функцию для всех документов и возвращает список результатов,
+    signature сворачивает каждый результат в JSON-совместимое значение,
+    reset сбрасывает кеши перед прогоном (вне замера времени).
+    """
+    name: str
+    run: Callable[[], Sequence[Any]]
+    items: int
+    signature: Callable[[Any], Any] = repr
+    reset: Optional[Callable[[], None]] = None
+
+
+@dataclass
+class BenchmarkResult:
+    """Результат замера функции"""
+    name: str
+    items: int
+    repeat: int
+    min_ms: float
+    median_ms: float
+    per_item_ms: float
+    peak_kb: float
+    retained_kb: float
+    allocations: int
+    signature: List[Any] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Comparison:
+    """Сравнение замера с базовой линией"""
+    name: str
+    current: BenchmarkResult
+    baseline: Optional[Dict[str, Any]]
+    time_ratio: Optional[float] = None
+    memory_ratio: Optional[float] = None
+    changed_outputs: int = 0
+    time_regression: bool = False
+    memory_regression: bool = False
+
+    @property
+    def regression(self) -> bool:
+        return self.time_regression or self.memory_regression or self.changed_outputs > 0
+
+
+def measure(benchmark: Benchmark, repeat: int = 5, warmup: int = 1) -> BenchmarkResult:
+    """
+    Замер функции: время по repeat прогонам и память по одному прогону под tracemalloc
+
+    Args:
+        benchmark: Описание замера
+        repeat: Прогонов для замера времени
+        warmup: Прогонов прогрева (импорты, ленивые словари, кеш лемм)
+
+    Returns:
+        Результат замера
+    """
+    outputs: Sequence[Any] = []
+    for _ in range(warmup):
+        if benchmark.reset:
+            benchmark.reset()
+        outputs = benchmark.run()
+
+    timings = []
+    for _ in range(repeat):
+        if benchmark.reset:
+            benchmark.reset()
+        gc.collect()
+        started = time.perf_counter()
+        outputs = benchmark.run()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    if benchmark.reset:
+        benchmark.reset()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        snapshot_before = tracemalloc.take_snapshot()
+        traced_outputs = benchmark.run()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    allocations = sum(max(stat.count_diff, 0) for stat in snapshot_after.compare_to(snapshot_before, 'filename'))
+    del traced_outputs
+
+    median_ms = statistics.median(timings)
+    return BenchmarkResult(
+        name=benchmark.name,
+        items=benchmark.items,
+        repeat=repeat,
+        min_ms=round(min(timings), 3),
+        median_ms=round(median_ms, 3),
+        per_item_ms=round(median_ms / max(benchmark.items, 1), 4),
+        peak_kb=round((peak - before) / 1024, 1),
+        retained_kb=round((current - before) / 1024, 1),
+        allocations=allocations,
+        signature=[benchmark.signature(output) for output in outputs]
+    )
+
+
+def load_baseline(path: str = DEFAULT_BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    """Базовая линия из JSON (None, если файла нет)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[BenchmarkResult], corpus: Dict[str, Any], path: str = DEFAULT_BASELINE_PATH):
+    """
+    Сохранение результатов как базовой линии
+
+    Args:
+        results: Результаты замеров
+        corpus: Описание корпуса (размер, зерно, число документов)
+        path: Путь к JSON
+    """
+    data = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'corpus': corpus,
+        'results': {result.name: result.to_dict() for result in results}
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def compare(results: List[BenchmarkResult], baseline: Optional[Dict[str, Any]],
+            time_tolerance: float = 0.2, memory_tolerance: float = 0.2) -> List[Comparison]:
+    """
+    Сравнение с базовой линией
+
+    Args:
+        results: Текущие результаты
+        baseline: Базовая линия (load_baseline)
+        time_tolerance: Допустимый рост минимального времени прогона (0.2 — на 20%);
+            минимум устойчивее медианы к фоновой нагрузке машины
+        memory_tolerance: Допустимый рост пиковой памяти
+
+    Returns:
+        Сравнения в порядке результатов
+    """
+    previous = (baseline or {}).get('results', {})
+    comparisons = []
+    for result in results:
+        base = previous.get(result.name)
+        comparison = Comparison(name=result.name, current=result, baseline=base)
+        if base:
+            if base['min_ms'] > 0:
+                comparison.time_ratio = result.min_ms / base['min_ms']
+                comparison.time_regression = comparison.time_ratio > 1 + time_tolerance
+            if base['peak_kb'] > 0:
+                comparison.memory_ratio = result.peak_kb / base['peak_kb']
+                comparison.memory_regression = comparison.memory_ratio > 1 + memory_tolerance
+            base_signature = base.get('signature', [])
+            # Сигнатуры сравниваются через JSON: кортежи в базовой линии стали списками
+            current_signature = json.loads(json.dumps(result.signature, ensure_ascii=False))
+            if len(base_signature) != len(current_signature):
+                comparison.changed_outputs = max(len(base_signature), len(current_signature))
+            else:
+                comparison.changed_outputs = sum(1 for a, b in zip(base_signature, current_signature) if a != b)
+        comparisons.append(comparison)
+    return comparisons
+
+
+def format_report(comparisons: List[Comparison], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Текстовый отчет: время, память и изменения относительно базовой линии"""
+    lines = []
+    if baseline:
+        corpus = baseline.get('corpus', {})
+        lines.append(f"📐 Базовая линия от {baseline.get('created')} (Python {baseline.get('python')}, "
+                     f"корпус {corpus.get('size')}, seed {corpus.get('seed')})")
+    lines.append(f"{'Функция':<34} {'мин, мс':>9} {'медиана, мс':>12} {'на док., мс':>12} {'пик, КБ':>10} {'блоков':>8}  "
+                 f"Изменение")
+    lines.append('-' * 110)
+    for comparison in comparisons:
+        result = comparison.current
+        if comparison.baseline is None:
+            change = 'нет в базовой линии'
+        else:
+            change_parts = []
+            if comparison.time_ratio is not None:
+                mark = '🔴' if comparison.time_regression else '🟢' if comparison.time_ratio < 0.9 else '⚪'
+                change_parts.append(f"{mark} время {comparison.time_ratio - 1:+.0%}")
+            if comparison.memory_ratio is not None:
+                mark = '🔴' if comparison.memory_regression else '⚪'
+                change_parts.append(f"{mark} память {comparison.memory_ratio - 1:+.0%}")
+            if comparison.changed_outputs:
+                change_parts.append(f"🔴 изменились результаты: {comparison.changed_outputs}")
+            change = ', '.join(change_parts)
+        lines.append(f"{result.name:<34} {result.min_ms:>9.2f} {result.median_ms:>12.2f} {result.per_item_ms:>12.3f} "
+                     f"{result.peak_kb:>10.1f} {result.allocations:>8}  {change}")
+    return '\n'.join(lines)
+
+
+# Экспорт
+__all__ = [
+    'Benchmark', 'BenchmarkResult', 'Comparison', 'measure', 'load_baseline', 'save_baseline',
+    'compare', 'format_report', 'DEFAULT_BASELINE_PATH'
+]
@@ -288,8 +288,32 @@ class DesignGenerator:
         }}
         """
     
+    # Классы общей таблицы стилей для элементов статьи
+    ELEMENT_CLASSES = {
+        "cta_button": "bizfin-cta-button",
+        "card": "bizfin-card",
+        "highlight": "bizfin-highlight",
+        "section": "bizfin-section",
+        "table": "bizfin-table",
+        "faq": "bizfin-faq"
+    }
+    
+    def get_element_class(self, element_type: str) -> str:
+        """
+        CSS-класс элемента из общей таблицы стилей
+        
+        Статьи ссылаются на классы, а сами стили подключаются один раз
+        через версионированный файл (modules/generator/stylesheet.py).
+        """
+        return self.ELEMENT_CLASSES.get(element_type, "")
+    
     def generate_inline_styles(self, element_type: str) -> str:
-        """Генерация инлайн стилей для конкретного элемента"""
+        """
+        Генерация инлайн стилей для конкретного элемента
+        
+        Только для мест, где внешняя таблица стилей недоступна (например, письма).
+        В статьях используйте get_element_class.
+        """
         if element_type == "cta_button":
             return (
                 f"background: {self.design.components['cta_button']['background']}; "
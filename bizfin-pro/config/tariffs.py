@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тарифы банковских гарантий для расчетов в статьях BizFin Pro
+
+При изменении ставок обязательно меняйте VERSION: по ней кешируются
+рассчитанные таблицы калькулятора (modules/generator/pricing.py).
+"""
+
+from typing import Dict, Any
+
+
+class BGTariffs:
+    """Тарифная сетка банков-партнеров (годовые ставки, %)"""
+
+    VERSION = '2024.4'
+
+    # Вид гарантии: диапазон годовой ставки
+    GUARANTEE_TYPES = {
+        'tender': {'name': 'Обеспечение заявки', 'min_rate': 1.5, 'max_rate': 3.0},
+        'performance': {'name': 'Исполнение контракта', 'min_rate': 2.0, 'max_rate': 4.0},
+        'advance': {'name': 'Возврат аванса', 'min_rate': 2.5, 'max_rate': 4.5},
+        'warranty': {'name': 'Гарантийные обязательства', 'min_rate': 1.8, 'max_rate': 3.5}
+    }
+
+    # Понижающие коэффициенты для крупных сумм: (нижняя граница суммы, коэффициент)
+    AMOUNT_TIERS = [
+        (0, 1.0),
+        (1_000_000, 0.9),
+        (5_000_000, 0.8),
+        (10_000_000, 0.7),
+        (50_000_000, 0.6)
+    ]
+
+    # Минимальная комиссия банка, руб.
+    MIN_COMMISSION = 1_000
+
+    # Сетка калькулятора по умолчанию
+    DEFAULT_AMOUNTS = [500_000, 1_000_000, 3_000_000, 5_000_000, 10_000_000, 30_000_000, 50_000_000, 100_000_000]
+    DEFAULT_TERMS = [3, 6, 12, 18, 24, 36]  # месяцев
+    # Срок из ключевой фразы больше этого не принимается (обычно это год: «в 2025 году»)
+    MAX_TERM = 120  # месяцев
+
+    @classmethod
+    def get_tariff(cls) -> Dict[str, Any]:
+        """Текущая тарифная сетка"""
+        return {
+            'version': cls.VERSION,
+            'guarantee_types': cls.GUARANTEE_TYPES,
+            'amount_tiers': cls.AMOUNT_TIERS,
+            'min_commission': cls.MIN_COMMISSION
+        }
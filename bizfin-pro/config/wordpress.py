@@ -22,11 +22,48 @@ class WordPressConfig:
     API_TIMEOUT = 30
     MAX_RETRIES = 3
     RETRY_DELAY = 5  # секунды
+    # Соединений в пуле клиента (не меньше числа потоков пакетной публикации)
+    POOL_SIZE = int(os.getenv('WP_POOL_SIZE', 8))
+    # Подзапросов в одном запросе /wp-json/batch/v1 (WordPress 5.6+, максимум 25; 1 — без пакетов)
+    BATCH_SIZE = min(int(os.getenv('WP_BATCH_SIZE', 25)), 25)
+    # Хеши полей последней публикации: обновление отправляет только изменившиеся поля
+    # (пустое значение — обновления целиком)
+    FIELD_HASHES_PATH = os.getenv(
+        'WP_FIELD_HASHES_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'wp_field_hashes.db')
+    )
+    
+    # Ограничение нагрузки на хостинг WordPress
+    REQUESTS_PER_SECOND = float(os.getenv('WP_REQUESTS_PER_SECOND', 1.0))
+    REQUESTS_BURST = int(os.getenv('WP_REQUESTS_BURST', 2))
+    
+    # Очередь публикации (publish_queue): максимум одновременных публикаций и рост
+    # задержки ответа WordPress относительно базовой, после которого параллельность снижается
+    PUBLISH_WORKERS = int(os.getenv('WP_PUBLISH_WORKERS', 4))
+    PUBLISH_LATENCY_FACTOR = float(os.getenv('WP_PUBLISH_LATENCY_FACTOR', 2.0))
+    # Спул публикации: готовые статьи, которые не удалось опубликовать (WordPress недоступен),
+    # публикуются позже с растущей паузой между попытками (пустой путь — без спула)
+    PUBLISH_SPOOL_PATH = os.getenv(
+        'WP_PUBLISH_SPOOL_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'publish_spool.db')
+    )
+    SPOOL_RETRY_DELAY = float(os.getenv('WP_SPOOL_RETRY_DELAY', 30))
+    SPOOL_MAX_DELAY = float(os.getenv('WP_SPOOL_MAX_DELAY', 1800))
+    # Проверка после публикации: HEAD-запросы к страницам статей (обычно их отдает
+    # кеш страниц, поэтому у них свой лимит, отдельный от лимита REST API)
+    VERIFY_HEAD_WORKERS = int(os.getenv('WP_VERIFY_HEAD_WORKERS', 8))
+    VERIFY_HEAD_RPS = float(os.getenv('WP_VERIFY_HEAD_RPS', 10.0))
     
     # Настройки публикации
     DEFAULT_STATUS = 'publish'
     DEFAULT_FORMAT = 'standard'
     DEFAULT_CATEGORY = 'Банковские гарантии'
+    # Автор записей (имя или slug пользователя; пусто — пользователь API) и метки записей
+    # (keyword — метка по ключевому слову статьи, пусто — без меток)
+    DEFAULT_AUTHOR = os.getenv('WP_DEFAULT_AUTHOR', '')
+    POST_TAGS = os.getenv('WP_POST_TAGS', 'keyword')
+    # Время жизни кеша ID рубрик, меток и авторов, секунды
+    TAXONOMY_CACHE_TTL = float(os.getenv('WP_TAXONOMY_CACHE_TTL', 3600))
     
     # Настройки SEO
     SEO_PLUGIN = 'yoast'  # yoast, rankmath, seopress
@@ -38,6 +75,23 @@ class WordPressConfig:
     IMAGE_QUALITY = 85
     MAX_IMAGE_SIZE = 1920  # пикселей
     SUPPORTED_FORMATS = ['jpg', 'jpeg', 'png', 'webp']
+    # Медиа-этап: процессов обработки изображений, индекс уже загруженных файлов
+    # (дедупликация по хешу содержимого и перцептивному хешу: максимум различающихся бит из 256)
+    MEDIA_WORKERS = int(os.getenv('WP_MEDIA_WORKERS', os.cpu_count() or 2))
+    MEDIA_INDEX_PATH = os.getenv(
+        'WP_MEDIA_INDEX_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'media_index.db')
+    )
+    MEDIA_SIMILARITY_BITS = int(os.getenv('WP_MEDIA_SIMILARITY_BITS', 8))
+    # Каталог локальных изображений статей (относительные src)
+    MEDIA_SOURCE_DIR = os.getenv(
+        'WP_MEDIA_SOURCE_DIR',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'images')
+    )
+
+    # Общая таблица стилей дизайн-системы (если тема уже подключает файл,
+    # укажите его URL — тогда загрузка в медиатеку не выполняется)
+    DESIGN_STYLESHEET_URL = os.getenv('WP_DESIGN_STYLESHEET_URL', '')
     
     # Настройки контента
     MAX_TITLE_LENGTH = 60
@@ -45,6 +99,26 @@ class WordPressConfig:
     MIN_ARTICLE_LENGTH = 2000
     TARGET_ARTICLE_LENGTH = 2500
     
+    # Лимит размера HTML статьи после минификации (байт, 0 — без лимита)
+    MAX_ARTICLE_BYTES = int(os.getenv('WP_MAX_ARTICLE_BYTES', 150000))
+
+    # Почти-дубликаты: порог оценки сходства Жаккара с уже опубликованными статьями
+    # и действие при превышении (block — не публиковать, flag — опубликовать с пометкой)
+    DUPLICATE_THRESHOLD = float(os.getenv('WP_DUPLICATE_THRESHOLD', 0.8))
+    DUPLICATE_ACTION = os.getenv('WP_DUPLICATE_ACTION', 'block')
+
+    # Офлайн SEO-анализ по правилам Yoast: минимальная оценка для публикации
+    # (71 — зеленый индикатор Yoast, 0 — не блокировать)
+    SEO_GATE_MIN_SCORE = int(os.getenv('WP_SEO_GATE_MIN_SCORE', 71))
+
+    # Проверка чисел: действие при ошибке в пересчитанных примерах комиссии
+    # (block — не публиковать, flag — опубликовать с пометкой)
+    NUMERIC_CHECK_ACTION = os.getenv('WP_NUMERIC_CHECK_ACTION', 'block')
+
+    # Линтер структуры HTML: действие при ошибках (пропуск уровня заголовка,
+    # пустой раздел, незакрытый тег, битый якорь, расхождение FAQ с разметкой)
+    HTML_LINT_ACTION = os.getenv('WP_HTML_LINT_ACTION', 'block')
+    
     @classmethod
     def get_auth_headers(cls) -> Dict[str, str]:
         """Получение заголовков аутентификации"""
@@ -66,6 +140,9 @@ class WordPressConfig:
             'timeout': cls.API_TIMEOUT,
             'max_retries': cls.MAX_RETRIES,
             'retry_delay': cls.RETRY_DELAY,
+            'pool_size': cls.POOL_SIZE,
+            'requests_per_second': cls.REQUESTS_PER_SECOND,
+            'requests_burst': cls.REQUESTS_BURST,
             'headers': cls.get_auth_headers()
         }
     
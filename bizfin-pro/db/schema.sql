@@ -61,6 +61,11 @@ CREATE TABLE articles (
     reading_time INTEGER DEFAULT 0, -- В минутах
     structure JSON, -- Структура статьи
     lsi_keywords_used JSON, -- Использованные LSI ключи
+    html_original_bytes INTEGER, -- Размер HTML до минификации
+    html_final_bytes INTEGER, -- Размер HTML после минификации
+    quality_score INTEGER DEFAULT 0, -- Оценка качества контента (0-100)
+    seo_score INTEGER DEFAULT 0, -- Оценка SEO (0-100)
+    content_rating INTEGER DEFAULT 0, -- Общий рейтинг контента (0-100)
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     generation_duration INTEGER, -- Время генерации в секундах
     FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE,
@@ -70,6 +75,19 @@ CREATE TABLE articles (
     INDEX idx_word_count (word_count)
 );
 
+-- Таблица истории оценок статей (генерация и пересчет)
+CREATE TABLE quality_metrics (
+    id INTEGER PRIMARY KEY AUTO_INCREMENT,
+    article_id INTEGER NOT NULL,
+    metric_type VARCHAR(50) NOT NULL, -- content_quality, seo_quality, content_rating
+    score INTEGER DEFAULT 0,
+    details TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
+    INDEX idx_article_id (article_id),
+    INDEX idx_metric_type (metric_type)
+);
+
 -- Таблица SEO-проверок (Этап 3)
 CREATE TABLE seo_checks (
     id INTEGER PRIMARY KEY AUTO_INCREMENT,
@@ -241,6 +259,26 @@ CREATE TABLE seo_meta_audit_log (
     INDEX idx_created_at (created_at)
 );
 
+-- Локальное зеркало записей WordPress (sync_wp_mirror.py); проверки Этапов 7-10 пока читают записи через REST API
+CREATE TABLE wp_posts_mirror (
+    wp_post_id INTEGER PRIMARY KEY,
+    slug VARCHAR(255),
+    status VARCHAR(20),
+    link VARCHAR(500),
+    title VARCHAR(500),
+    content LONGTEXT,
+    meta JSON,
+    focus_keyword VARCHAR(255),
+    meta_description TEXT,
+    modified DATETIME, -- Локальное время сайта (курсор modified_after)
+    modified_gmt DATETIME,
+    content_hash CHAR(64), -- SHA-256 содержимого
+    meta_hash CHAR(64), -- SHA-256 мета-полей
+    synced_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_slug (slug),
+    INDEX idx_modified (modified)
+);
+
 -- =====================================================
 -- ТЕХНИЧЕСКАЯ БИБЛИОТЕКА
 -- =====================================================
@@ -6,31 +6,43 @@ AI Assistant Client для BizFin Pro SEO Pipeline
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import os
+import sys
+
+# Добавляем путь к модулям проекта
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.quality.content_metrics import get_content_metrics
 
 class AIAssistantClient:
     """Клиент для работы с AI Assistant"""
     
-    def __init__(self, api_key: str = None, base_url: str = None):
+    def __init__(self, api_key: str = None, base_url: str = None, pool_size: int = None):
         """
         Инициализация AI Assistant клиента
         
         Args:
             api_key: API ключ для доступа
             base_url: Базовый URL API
+            pool_size: Размер пула соединений (параллельная генерация разделов)
         """
         self.api_key = api_key or os.getenv('AI_ASSISTANT_API_KEY', 'demo_key')
         self.base_url = base_url or os.getenv('AI_ASSISTANT_BASE_URL', 'http://localhost:8000')
+        self.pool_size = pool_size or int(os.getenv('AI_ASSISTANT_POOL_SIZE', 8))
         
         self.logger = logging.getLogger(__name__)
         
         # Настройка сессии
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json',
@@ -255,6 +267,59 @@ class AIAssistantClient:
             self.logger.error(f"❌ Ошибка генерации статьи: {e}")
             return self._fallback_article_generation(keyword, competitors_data, company_profile, target_words)
     
+    def generate_section(self, keyword: str, section_title: str, outline: List[str],
+                         company_profile: Dict, target_words: int = 300) -> Optional[Dict[str, Any]]:
+        """
+        Генерация одного раздела (H2) статьи через AI Assistant
+        
+        В отличие от generate_article, резервного контента здесь нет: при ошибке
+        возвращается None, а повтор запроса решает вызывающая сторона
+        (modules/generator/section_parallel.py).
+        
+        Args:
+            keyword: Ключевое слово
+            section_title: Заголовок раздела
+            outline: Полное оглавление статьи (контекст для связности)
+            company_profile: Профиль компании
+            target_words: Целевой объем раздела
+            
+        Returns:
+            Раздел {'title', 'content'} или None при ошибке
+        """
+        section_request = {
+            "action": "generate_section",
+            "keyword": keyword,
+            "section_title": section_title,
+            "outline": outline,
+            "company_profile": company_profile,
+            "target_words": target_words,
+            "style": {
+                "tone": "professional",
+                "language": "ru",
+                "target_audience": "business_owners"
+            }
+        }
+        
+        try:
+            response = self.session.post(
+                f"{self.base_url}/generate/section",
+                json=section_request,
+                timeout=60
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('content'):
+                    return data
+                self.logger.warning(f"⚠️ Пустой раздел '{section_title}'")
+            else:
+                self.logger.warning(f"⚠️ Ошибка генерации раздела '{section_title}': {response.status_code}")
+                
+        except Exception as e:
+            self.logger.warning(f"⚠️ Ошибка генерации раздела '{section_title}': {e}")
+        
+        return None
+    
     def _fallback_article_generation(self, keyword: str, competitors_data: Dict, 
                                    company_profile: Dict, target_words: int) -> Dict[str, Any]:
         """Резервная генерация статьи если AI Assistant недоступен"""
@@ -424,13 +489,12 @@ class AIAssistantClient:
     def _fallback_seo_optimization(self, content: str, keyword: str) -> Dict[str, Any]:
         """Резервная SEO-оптимизация если AI Assistant недоступен"""
         
-        # Базовые SEO метрики
-        words = content.lower().split()
-        keyword_count = content.lower().count(keyword.lower())
-        keyword_density = round((keyword_count / len(words)) * 100, 2) if words else 0
+        # Базовые SEO метрики (один разбор статьи)
+        metrics = get_content_metrics(content, keyword)
+        keyword_density = round(metrics.keyword_forms.density, 2)
         
-        sentences = content.count('.') + content.count('!') + content.count('?')
-        readability = min(100, max(0, 100 - (len(words) / sentences) if sentences > 0 else 50))
+        # Читаемость: русский индекс Флеша (Оборнева), 0-100
+        readability = int(min(100, max(0, round(metrics.readability.flesch_reading_ease))))
         
         return {
             'score': 85,
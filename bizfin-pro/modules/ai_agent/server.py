@@ -3,9 +3,14 @@ from fastapi import FastAPI, Header, HTTPException
 from starlette.responses import PlainTextResponse
 from pydantic import BaseModel
 import os
+import sys
 import uvicorn
 import re
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.quality.morphology import lemmatize
+
 
 class StructuredRequest(BaseModel):
     prompt: str
@@ -50,9 +55,13 @@ def structured(req: StructuredRequest, Authorization: Optional[str] = Header(def
         if key in ("primary", "secondary", "semantic_keywords", "trending_terms"):
             # Выделяем слова из темы
             words = re.findall(r"[а-яёa-z0-9\-]{4,}", prompt_lower)
+            # Словоформы одного слова («гарантия», «гарантии») не дублируем
             unique = []
+            seen_lemmas = set()
             for w in words:
-                if w not in unique:
+                lemma = lemmatize(w)
+                if lemma not in seen_lemmas:
+                    seen_lemmas.add(lemma)
                     unique.append(w)
                 if len(unique) >= 8:
                     break
@@ -17,6 +17,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ALwrity', '
 
 # Импорты AI Assistant
 from modules.ai_agent.ai_assistant_client import AIAssistantClient
+from modules.generator.section_parallel import SectionParallelGenerator
+from modules.quality.content_metrics import get_content_metrics
 
 # Импорты ALwrity модулей (если доступны)
 try:
@@ -210,6 +212,31 @@ class ALwrityClient:
             self.logger.error(f"❌ Ошибка генерации статьи: {e}")
             return self._create_fallback_article(keyword, competitors_data, company_profile)
     
+    def generate_article_sections(self, keyword: str, competitors_data: Dict, company_profile: Dict,
+                                  target_words: int = 2500, max_workers: int = None) -> Dict[str, Any]:
+        """
+        Генерация статьи по разделам параллельными запросами к AI Assistant
+        
+        Args:
+            keyword: Ключевое слово
+            competitors_data: Данные о конкурентах
+            company_profile: Профиль компании
+            target_words: Целевое количество слов
+            max_workers: Максимум одновременных запросов
+            
+        Returns:
+            Сгенерированная статья (FAQ — в ключе 'faq')
+        """
+        self.logger.info(f"✍️ Генерация статьи по разделам для: '{keyword}' через AI Assistant")
+        
+        try:
+            generator = SectionParallelGenerator(self.ai_assistant, max_workers=max_workers)
+            return generator.generate_article(keyword, competitors_data, company_profile, target_words)
+            
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка генерации статьи по разделам: {e}")
+            return self._create_fallback_article(keyword, competitors_data, company_profile)
+    
     def _create_fallback_article(self, keyword: str, competitors_data: Dict, 
                                 company_profile: Dict) -> Dict[str, Any]:
         """Создание резервной статьи если ALwrity недоступен"""
@@ -251,16 +278,13 @@ class ALwrityClient:
             }
     
     def _calculate_keyword_density(self, content: str, keyword: str) -> float:
-        """Расчет плотности ключевого слова"""
-        words = content.lower().split()
-        keyword_count = content.lower().count(keyword.lower())
-        return round((keyword_count / len(words)) * 100, 2) if words else 0
+        """Расчет плотности ключевого слова (по леммам, с учетом словоформ)"""
+        return round(get_content_metrics(content, keyword).keyword_forms.density, 2)
     
     def _calculate_readability(self, content: str) -> int:
-        """Расчет читаемости (упрощенный)"""
-        sentences = content.count('.') + content.count('!') + content.count('?')
-        words = len(content.split())
-        return min(100, max(0, 100 - (words / sentences) if sentences > 0 else 50))
+        """Читаемость: русский индекс Флеша (Оборнева), 0-100"""
+        flesch = get_content_metrics(content).readability.flesch_reading_ease
+        return int(min(100, max(0, round(flesch))))
     
     def _optimize_meta_tags(self, content: str, keyword: str) -> Dict[str, str]:
         """Оптимизация мета-тегов"""
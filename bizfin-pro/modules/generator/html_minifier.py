@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Минификация HTML статей и контроль размера перед публикацией
+
+Сгенерированный HTML содержит отступы шаблонов, пустые строки и
+вложенные обертки без атрибутов. Стадия убирает их, не трогая
+<pre>/<textarea>/<script>/<style> и служебные комментарии блоков
+WordPress (<!-- wp:... -->), и проверяет лимит размера статьи в байтах.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+import sys
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+
+# Блоки, содержимое которых переносится в результат без изменений
+_PRESERVED_RE = re.compile(
+    r'<(pre|textarea|script|style)\b[^>]*>.*?</\1\s*>|<!--\s*/?wp:.*?-->',
+    re.IGNORECASE | re.DOTALL
+)
+_PLACEHOLDER = '\x00{}\x00'
+_PLACEHOLDER_RE = re.compile(r'\x00(\d+)\x00')
+
+# Пробельные символы HTML: \s в Python совпадает и с неразрывным пробелом
+# (U+00A0), который format_rub ставит в суммах намеренно
+_WHITESPACE = ' \t\r\n\f'
+_WHITESPACE_RE = re.compile(r'[ \t\r\n\f]+')
+
+_COMMENT_RE = re.compile(r'<!--(?!\s*/?wp:).*?-->', re.DOTALL)
+_TAG_RE = re.compile(r'(<[^>]+>)')
+_DIV_OPEN_RE = re.compile(r'<div(\s[^>]*)?>$', re.IGNORECASE)
+_DIV_CLOSE_RE = re.compile(r'</div\s*>$', re.IGNORECASE)
+_TAG_NAME_RE = re.compile(r'<(/?)([a-zA-Z][\w-]*)')
+_ONLY_PLACEHOLDERS_RE = re.compile(r'(?:\x00\d+\x00[ \t\r\n\f]*)+')
+
+# Дочерние элементы, вокруг которых обертка <div> не меняет отображение
+_WRAPPABLE_TAGS = frozenset(('p', 'ul', 'ol', 'table', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'section'))
+# Элементы без закрывающего тега
+_VOID_TAGS = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                        'source', 'track', 'wbr'))
+
+# Элементы, между которыми пробелы не влияют на отображение
+_BLOCK_TAGS = (
+    'article|aside|blockquote|body|br|dd|details|div|dl|dt|figcaption|figure|footer|'
+    'h[1-6]|head|header|hr|html|li|link|main|meta|nav|ol|p|section|summary|'
+    'table|tbody|td|tfoot|th|thead|tr|ul'
+)
+_BLOCK_START = r'(?=</?(?:' + _BLOCK_TAGS + r')\b|\x00)'
+_BLOCK_GAP_RE = re.compile(
+    r'(</?(?:' + _BLOCK_TAGS + r')\b[^>]*>)[ \t\r\n\f]+' + _BLOCK_START +
+    r'|(\x00\d+\x00)[ \t\r\n\f]+' + _BLOCK_START,
+    re.IGNORECASE
+)
+
+
+@dataclass
+class HtmlOptimizationResult:
+    """Результат стадии минификации"""
+    html: str
+    original_bytes: int
+    final_bytes: int
+    budget_bytes: int
+    wrappers_removed: int
+
+    @property
+    def within_budget(self) -> bool:
+        return self.budget_bytes <= 0 or self.final_bytes <= self.budget_bytes
+
+    @property
+    def saved_percent(self) -> float:
+        if not self.original_bytes:
+            return 0.0
+        return round((self.original_bytes - self.final_bytes) / self.original_bytes * 100, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'original_bytes': self.original_bytes,
+            'final_bytes': self.final_bytes,
+            'budget_bytes': self.budget_bytes,
+            'within_budget': self.within_budget,
+            'saved_percent': self.saved_percent,
+            'wrappers_removed': self.wrappers_removed
+        }
+
+
+def _protect(html: str, preserved: List[str]) -> str:
+    """Замена неизменяемых блоков на плейсхолдеры"""
+    def store(match):
+        preserved.append(match.group(0))
+        return _PLACEHOLDER.format(len(preserved) - 1)
+    return _PRESERVED_RE.sub(store, html)
+
+
+def _restore(html: str, preserved: List[str]) -> str:
+    return _PLACEHOLDER_RE.sub(lambda m: preserved[int(m.group(1))], html)
+
+
+def _block_children_only(tokens: List[str], start: int, end: int) -> bool:
+    """Все дочерние элементы верхнего уровня блочные (p, ul, ol, table, h1-h6, div, section)"""
+    depth = 0
+    for token in tokens[start:end]:
+        if not token.startswith('<'):
+            # Текст верхнего уровня — строчное содержимое; плейсхолдеры (pre, script, блоки wp) не мешают
+            text = token.strip(_WHITESPACE)
+            if depth == 0 and text and not _ONLY_PLACEHOLDERS_RE.fullmatch(text):
+                return False
+            continue
+        match = _TAG_NAME_RE.match(token)
+        if not match:
+            continue
+        closing, name = match.group(1), match.group(2).lower()
+        if closing:
+            depth -= 1
+            continue
+        if depth == 0 and name not in _WRAPPABLE_TAGS:
+            return False
+        if name not in _VOID_TAGS and not token.endswith('/>'):
+            depth += 1
+    return True
+
+
+def collapse_wrappers(html: str) -> Tuple[str, int]:
+    """
+    Удаление избыточных оберток <div>
+
+    Удаляются пустые <div></div> без атрибутов, <div> без атрибутов,
+    все дочерние элементы которого блочные (строчное содержимое без
+    обертки слилось бы с соседними блоками), и внутренний <div>,
+    повторяющий внешний (тот же открывающий тег и единственный дочерний
+    элемент).
+
+    Args:
+        html: HTML (неизменяемые блоки уже заменены плейсхолдерами)
+
+    Returns:
+        HTML и число удаленных оберток
+    """
+    tokens = [t for t in _TAG_RE.split(html) if t]
+
+    # Пары открывающих и закрывающих <div>
+    pairs = {}
+    stack = []
+    for i, token in enumerate(tokens):
+        if _DIV_OPEN_RE.match(token):
+            stack.append(i)
+        elif _DIV_CLOSE_RE.match(token) and stack:
+            pairs[stack.pop()] = i
+    if stack:
+        # Несбалансированная разметка: не рискуем
+        return html, 0
+
+    def meaningful(start, end):
+        return [j for j in range(start, end) if tokens[j].strip(_WHITESPACE)]
+
+    removed = set()
+    for open_i, close_i in pairs.items():
+        inner = meaningful(open_i + 1, close_i)
+        bare = tokens[open_i].strip().lower() == '<div>'
+
+        if bare and not inner:
+            removed.update((open_i, close_i))
+        elif bare and _block_children_only(tokens, open_i + 1, close_i):
+            removed.update((open_i, close_i))
+        elif inner and inner[0] in pairs and pairs[inner[0]] == inner[-1] \
+                and tokens[inner[0]] == tokens[open_i]:
+            removed.update((inner[0], inner[-1]))
+
+    if not removed:
+        return html, 0
+    html = ''.join(t for i, t in enumerate(tokens) if i not in removed)
+    return html, len(removed) // 2
+
+
+def minify_html(html: str) -> Tuple[str, int]:
+    """
+    Безопасная минификация HTML
+
+    Args:
+        html: Исходный HTML
+
+    Returns:
+        Минифицированный HTML и число удаленных оберток
+    """
+    preserved: List[str] = []
+    html = _protect(html, preserved)
+
+    html = _COMMENT_RE.sub('', html)
+    html, wrappers_removed = collapse_wrappers(html)
+
+    # Пробелы внутри текста значимы — схлопываем до одного,
+    # между блочными тегами убираем полностью
+    html = _WHITESPACE_RE.sub(' ', html)
+    html = _BLOCK_GAP_RE.sub(lambda m: m.group(1) or m.group(2), html)
+    html = html.strip(_WHITESPACE)
+
+    return _restore(html, preserved), wrappers_removed
+
+
+def optimize_article_html(html: str, budget_bytes: Optional[int] = None) -> HtmlOptimizationResult:
+    """
+    Стадия после генерации: минификация и проверка лимита размера
+
+    Args:
+        html: HTML статьи
+        budget_bytes: Лимит в байтах (по умолчанию WordPressConfig.MAX_ARTICLE_BYTES, 0 — без лимита)
+
+    Returns:
+        Результат с итоговым HTML и размерами до/после
+    """
+    if budget_bytes is None:
+        budget_bytes = WordPressConfig.MAX_ARTICLE_BYTES
+
+    minified, wrappers_removed = minify_html(html)
+
+    return HtmlOptimizationResult(
+        html=minified,
+        original_bytes=len(html.encode('utf-8')),
+        final_bytes=len(minified.encode('utf-8')),
+        budget_bytes=budget_bytes,
+        wrappers_removed=wrappers_removed
+    )
+
+
+# Экспорт
+__all__ = ['HtmlOptimizationResult', 'minify_html', 'collapse_wrappers', 'optimize_article_html']
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Калькулятор стоимости банковских гарантий для статей BizFin Pro
+
+Матрица комиссий по сетке сумма × срок × вид гарантии считается одним
+векторизованным вызовом NumPy. Результат рендерится в HTML-таблицы для
+статей и в JSON для калькулятора на сайте. Расчеты кешируются по версии
+тарифа (в памяти и на диске), поэтому сотни страниц калькулятора
+собираются без повторных вычислений.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import sys
+
+import numpy as np
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.tariffs import BGTariffs
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'pricing')
+
+# Вид гарантии по словам ключевой фразы
+_TYPE_MARKERS = [
+    ('advance', ('аванс',)),
+    ('tender', ('заявк', 'участи', 'тендер')),
+    ('warranty', ('гарантийн',)),
+    ('performance', ('исполнени', 'контракт'))
+]
+
+_AMOUNT_RE = re.compile(r'(\d[\d\s]*(?:[.,]\d+)?)\s*(млн|миллион\w*|тыс\w*|₽|руб\w*)?', re.IGNORECASE)
+_TERM_RE = re.compile(r'(\d+)\s*(месяц\w*|мес\.?|год\w*|лет)', re.IGNORECASE)
+
+
+def format_rub(value: float) -> str:
+    """Сумма в рублях с разделителем разрядов: 150 000 ₽"""
+    # Неразрывные пробелы: сумма не переносится на другую строку
+    return f"{int(round(value)):,}".replace(',', '\u00a0') + '\u00a0₽'
+
+
+def format_amount(value: float) -> str:
+    """Короткая запись суммы гарантии: 500 тыс. / 5 млн"""
+    if value >= 1_000_000:
+        millions = value / 1_000_000
+        return f"{millions:g} млн ₽".replace('.', ',')
+    return f"{value / 1000:g} тыс. ₽"
+
+
+def parse_keyword_params(keyword: str) -> Dict[str, Any]:
+    """
+    Сумма, срок и вид гарантии из ключевой фразы
+
+    «калькулятор стоимости банковской гарантии 5 000 000 на 12 месяцев»
+    → {'amount': 5000000, 'term': 12, 'guarantee_type': 'performance'}
+
+    Год («в 2025 году») и срок больше BGTariffs.MAX_TERM сроком не считаются.
+    """
+    text = keyword.lower()
+    params: Dict[str, Any] = {'amount': None, 'term': None, 'guarantee_type': 'performance'}
+
+    for term_match in _TERM_RE.finditer(text):
+        value = int(term_match.group(1))
+        term = value * 12 if term_match.group(2).startswith(('год', 'лет')) else value
+        # «в 2025 году» — календарный год, а не срок; вне 1..MAX_TERM — сетка по умолчанию
+        if len(term_match.group(1)) == 4 or not 0 < term <= BGTariffs.MAX_TERM:
+            continue
+        params['term'] = term
+        text = text[:term_match.start()] + text[term_match.end():]
+        break
+
+    for match in _AMOUNT_RE.finditer(text):
+        number = float(re.sub(r'\s', '', match.group(1)).replace(',', '.'))
+        unit = (match.group(2) or '').lower()
+        if unit.startswith(('млн', 'миллион')):
+            number *= 1_000_000
+        elif unit.startswith('тыс'):
+            number *= 1_000
+        # Номера законов (44-ФЗ, 223-ФЗ) и годы не считаем суммой
+        if number >= 10_000:
+            params['amount'] = number
+            break
+
+    for guarantee_type, markers in _TYPE_MARKERS:
+        if any(marker in text for marker in markers):
+            params['guarantee_type'] = guarantee_type
+            break
+
+    return params
+
+
+class BGPricingEngine:
+    """Векторизованный расчет комиссий по тарифной сетке"""
+
+    def __init__(self, tariff: Optional[Dict[str, Any]] = None, cache_dir: Optional[str] = None):
+        """
+        Инициализация калькулятора
+
+        Args:
+            tariff: Тарифная сетка (по умолчанию BGTariffs.get_tariff())
+            cache_dir: Каталог дискового кеша (по умолчанию data/pricing)
+        """
+        self.tariff = tariff or BGTariffs.get_tariff()
+        self.version = self.tariff['version']
+        self.cache_dir = os.path.join(os.path.abspath(cache_dir or CACHE_DIR), self.version)
+        self.logger = logging.getLogger(__name__)
+
+        types = self.tariff['guarantee_types']
+        self.type_keys = list(types)
+        self._min_rates = np.array([types[key]['min_rate'] for key in self.type_keys], dtype=float)
+        self._max_rates = np.array([types[key]['max_rate'] for key in self.type_keys], dtype=float)
+
+        tiers = sorted(self.tariff['amount_tiers'])
+        self._tier_bounds = np.array([bound for bound, _ in tiers], dtype=float)
+        self._tier_factors = np.array([factor for _, factor in tiers], dtype=float)
+
+        self._cache: Dict[Tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'computed': 0, 'memory_hits': 0, 'disk_hits': 0}
+
+    def compute(self, amounts: Sequence[float], terms: Sequence[int],
+                guarantee_types: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Матрица комиссий одним векторизованным вызовом
+
+        Args:
+            amounts: Суммы гарантий, руб.
+            terms: Сроки, месяцев
+            guarantee_types: Виды гарантий (по умолчанию все из тарифа)
+
+        Returns:
+            {'min': массив (виды × суммы × сроки), 'max': ..., 'types': [...]}
+        """
+        type_keys = list(guarantee_types or self.type_keys)
+        type_idx = np.array([self.type_keys.index(key) for key in type_keys])
+
+        amounts_arr = np.asarray(amounts, dtype=float)
+        years = np.asarray(terms, dtype=float) / 12.0
+
+        tier_idx = np.searchsorted(self._tier_bounds, amounts_arr, side='right') - 1
+        factors = self._tier_factors[np.clip(tier_idx, 0, len(self._tier_factors) - 1)]
+
+        # (виды, 1, 1) × (1, суммы, 1) × (1, 1, сроки)
+        base = (amounts_arr * factors)[None, :, None] * years[None, None, :] / 100.0
+        min_commission = self.tariff['min_commission']
+
+        commission_min = np.maximum(min_commission, self._min_rates[type_idx][:, None, None] * base)
+        commission_max = np.maximum(min_commission, self._max_rates[type_idx][:, None, None] * base)
+
+        self.stats['computed'] += 1
+        return {
+            'types': type_keys,
+            'min': np.round(commission_min),
+            'max': np.round(commission_max)
+        }
+
+    def _cache_key(self, amounts, terms, guarantee_types) -> Tuple:
+        return (
+            self.version,
+            tuple(float(a) for a in amounts),
+            tuple(int(t) for t in terms),
+            tuple(guarantee_types or self.type_keys)
+        )
+
+    def get_table(self, amounts: Optional[Sequence[float]] = None, terms: Optional[Sequence[int]] = None,
+                  guarantee_types: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Таблица комиссий в JSON-совместимом виде (с кешем по версии тарифа)
+
+        Args:
+            amounts: Суммы гарантий (по умолчанию BGTariffs.DEFAULT_AMOUNTS)
+            terms: Сроки в месяцах (по умолчанию BGTariffs.DEFAULT_TERMS)
+            guarantee_types: Виды гарантий
+
+        Returns:
+            Данные для калькулятора: версия тарифа, оси сетки и комиссии по видам
+        """
+        amounts = sorted(set(amounts or BGTariffs.DEFAULT_AMOUNTS))
+        terms = sorted(set(terms or BGTariffs.DEFAULT_TERMS))
+        key = self._cache_key(amounts, terms, guarantee_types)
+
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            self.stats['memory_hits'] += 1
+            return cached
+
+        digest = hashlib.sha1(json.dumps(key, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+        cache_path = os.path.join(self.cache_dir, f"{digest}.json")
+
+        table = None
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, encoding='utf-8') as f:
+                    table = json.load(f)
+                self.stats['disk_hits'] += 1
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"⚠️ Поврежденный кеш тарифов {cache_path}: {e}")
+
+        if table is None:
+            matrix = self.compute(amounts, terms, guarantee_types)
+            types = self.tariff['guarantee_types']
+            table = {
+                'tariff_version': self.version,
+                'amounts': [int(a) for a in amounts],
+                'terms': terms,
+                'types': {
+                    key: {
+                        'name': types[key]['name'],
+                        'min_rate': types[key]['min_rate'],
+                        'max_rate': types[key]['max_rate'],
+                        'min': matrix['min'][i].astype(int).tolist(),
+                        'max': matrix['max'][i].astype(int).tolist()
+                    }
+                    for i, key in enumerate(matrix['types'])
+                }
+            }
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(table, f, ensure_ascii=False)
+
+        with self._lock:
+            self._cache[key] = table
+        return table
+
+    def to_json(self, **kwargs) -> str:
+        """JSON для калькулятора на сайте"""
+        return json.dumps(self.get_table(**kwargs), ensure_ascii=False, separators=(',', ':'))
+
+    def render_html_table(self, guarantee_type: str = 'performance',
+                          amounts: Optional[Sequence[float]] = None,
+                          terms: Optional[Sequence[int]] = None) -> str:
+        """
+        HTML-таблица «сумма × срок» для статьи
+
+        Args:
+            guarantee_type: Вид гарантии
+            amounts: Суммы гарантий
+            terms: Сроки в месяцах
+
+        Returns:
+            Таблица в формате блока WordPress
+        """
+        table = self.get_table(amounts, terms)
+        data = table['types'][guarantee_type]
+
+        header = ''.join(f"<th>{term} мес.</th>" for term in table['terms'])
+        rows = []
+        for i, amount in enumerate(table['amounts']):
+            cells = ''.join(
+                f"<td>{format_rub(low)} – {format_rub(high)}</td>"
+                for low, high in zip(data['min'][i], data['max'][i])
+            )
+            rows.append(f"<tr><td>{format_amount(amount)}</td>{cells}</tr>")
+
+        return (
+            f'<table class="wp-block-table bizfin-table">\n'
+            f"<caption>{data['name']}: комиссия банка ({data['min_rate']}–{data['max_rate']}% годовых, "
+            f"тарифы {table['tariff_version']})</caption>\n"
+            f"<thead>\n<tr><th>Сумма гарантии</th>{header}</tr>\n</thead>\n"
+            f"<tbody>\n" + '\n'.join(rows) + "\n</tbody>\n</table>"
+        )
+
+    def quote(self, amount: float, term: int, guarantee_type: str = 'performance') -> Dict[str, Any]:
+        """Диапазон комиссии для одной суммы и срока"""
+        table = self.get_table([amount], [term], [guarantee_type])
+        data = table['types'][guarantee_type]
+        return {
+            'amount': amount,
+            'term': term,
+            'guarantee_type': guarantee_type,
+            'name': data['name'],
+            'min': data['min'][0][0],
+            'max': data['max'][0][0]
+        }
+
+    def cost_examples(self, cases: Sequence[Tuple[float, int]], guarantee_type: str = 'performance') -> List[str]:
+        """
+        Примеры расчетов строками «Гарантия 5 млн ₽ на 12 мес.: комиссия ...»
+
+        Все примеры считаются одним вызовом по сетке из их сумм и сроков.
+        """
+        amounts = [amount for amount, _ in cases]
+        terms = [term for _, term in cases]
+        table = self.get_table(amounts, terms, [guarantee_type])
+        data = table['types'][guarantee_type]
+
+        examples = []
+        for amount, term in cases:
+            i = table['amounts'].index(int(amount))
+            j = table['terms'].index(int(term))
+            examples.append(
+                f"Гарантия {format_amount(amount)} на {term} мес.: "
+                f"комиссия {format_rub(data['min'][i][j])} – {format_rub(data['max'][i][j])}"
+            )
+        return examples
+
+    def render_cost_section(self, keyword: str, embed_json: bool = False) -> str:
+        """
+        Раздел стоимости для статьи по ключевой фразе
+
+        Сетка по умолчанию дополняется суммой и сроком из ключевой фразы,
+        расчет для них выводится отдельно перед таблицей.
+
+        Args:
+            keyword: Ключевое слово
+            embed_json: Встроить данные калькулятора (<script type="application/json">)
+
+        Returns:
+            HTML раздела
+        """
+        params = parse_keyword_params(keyword)
+        guarantee_type = params['guarantee_type']
+        amounts = list(BGTariffs.DEFAULT_AMOUNTS)
+        terms = list(BGTariffs.DEFAULT_TERMS)
+        if params['amount']:
+            amounts.append(params['amount'])
+        if params['term']:
+            terms.append(params['term'])
+
+        content = ''
+        if params['amount'] and params['term']:
+            quote = self.quote(params['amount'], params['term'], guarantee_type)
+            content += (
+                f'<div class="bizfin-highlight">\n'
+                f"<p><strong>{quote['name']} на {format_amount(quote['amount'])} сроком {quote['term']} мес.:</strong> "
+                f"комиссия от {format_rub(quote['min'])} до {format_rub(quote['max'])}</p>\n"
+                f"</div>\n\n"
+            )
+
+        content += self.render_html_table(guarantee_type, amounts, terms)
+        content += (
+            "\n\n<p>Расчет: Комиссия = Сумма гарантии × Ставка (% годовых) × Срок (в годах), "
+            f"но не менее {format_rub(self.tariff['min_commission'])}. "
+            "Итоговая ставка зависит от финансового состояния принципала и выбранного банка.</p>"
+        )
+
+        if embed_json:
+            content += (
+                f'\n<script type="application/json" id="bizfin-calculator-data">'
+                f"{self.to_json(amounts=amounts, terms=terms)}</script>"
+            )
+
+        return content
+
+
+_default_engine: Optional[BGPricingEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_pricing_engine() -> BGPricingEngine:
+    """Общий калькулятор текущей версии тарифа (кеш живет весь процесс)"""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None or _default_engine.version != BGTariffs.VERSION:
+            _default_engine = BGPricingEngine()
+        return _default_engine
+
+
+# Экспорт
+__all__ = ['BGPricingEngine', 'get_pricing_engine', 'parse_keyword_params', 'format_rub', 'format_amount']
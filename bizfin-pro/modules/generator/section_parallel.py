@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Параллельная генерация статьи по разделам для BizFin Pro SEO Pipeline
+
+Вместо одного длинного запроса generate_article каждый раздел (H2)
+запрашивается у AI Assistant отдельно, а FAQ — одновременно с разделами
+(ему нужны только ключевое слово и черновик-оглавление). Запросы идут
+с ограниченной параллельностью, неудавшиеся разделы повторяются по
+отдельности, статья собирается в порядке оглавления. Если AI Assistant
+недоступен или большая часть разделов не удалась, статья генерируется
+одним запросом generate_article (с его резервной статьей).
+"""
+
+import re
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+import sys
+import os
+
+# Добавляем путь к модулям проекта
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.ai_agent.ai_assistant_client import AIAssistantClient
+
+# Оглавление по умолчанию (совпадает со структурой резервной статьи)
+DEFAULT_OUTLINE = [
+    'Введение',
+    'Что такое {keyword}',
+    'Виды {keyword}',
+    'Стоимость и расчет {keyword}',
+    'Документы для получения {keyword}',
+    'Сравнение банков',
+    'Реальный кейс успеха',
+    'Заключение'
+]
+
+FAQ_TASK = '__faq__'
+
+# Доля резервных разделов, при которой статья генерируется одним запросом
+MAX_FAILED_SHARE = 0.5
+
+_HEADING_PREFIX_RE = re.compile(r'^\s*H[1-6]\s*:\s*', re.IGNORECASE)
+
+
+class SectionParallelGenerator:
+    """Генерация разделов статьи и FAQ параллельными запросами"""
+
+    def __init__(self, ai_client: Optional[AIAssistantClient] = None,
+                 max_workers: int = None, max_retries: int = 2, retry_delay: float = 1.0):
+        """
+        Инициализация генератора
+
+        Args:
+            ai_client: Клиент AI Assistant (общий пул соединений)
+            max_workers: Максимум одновременных запросов (по умолчанию AI_SECTION_WORKERS или 4)
+            max_retries: Повторов для каждого неудавшегося раздела
+            retry_delay: Базовая пауза между повторами (растет линейно)
+        """
+        self.ai_client = ai_client or AIAssistantClient()
+        self.max_workers = max(1, max_workers or int(os.getenv('AI_SECTION_WORKERS', 4)))
+        self.max_retries = max(0, max_retries)
+        self.retry_delay = retry_delay
+
+        self.logger = logging.getLogger(__name__)
+
+    def build_outline(self, keyword: str, competitors_data: Dict) -> List[str]:
+        """
+        Оглавление из анализа конкурентов или оглавление по умолчанию
+
+        Структура берется из content_structure (или structure) на верхнем
+        уровне или внутри обертки {'competitors': {...}}: список заголовков
+        ("H2: ...") либо словарь с sections/common_sections. FAQ генерируется
+        отдельно и в оглавление не входит.
+        """
+        wrapped = competitors_data.get('competitors')
+        sources = [competitors_data] + ([wrapped] if isinstance(wrapped, dict) else [])
+        structure = next((source.get(key) for source in sources for key in ('content_structure', 'structure')
+                          if source.get(key)), None) or {}
+        if isinstance(structure, dict):
+            structure = structure.get('sections') or structure.get('common_sections') or []
+
+        sections = []
+        for section in structure:
+            title = _HEADING_PREFIX_RE.sub('', str(section)).strip()
+            if title and title.upper() != 'FAQ':
+                sections.append(title)
+        if len(sections) >= 3:
+            return sections
+        return [title.format(keyword=keyword) for title in DEFAULT_OUTLINE]
+
+    def _generate_section(self, keyword: str, title: str, outline: List[str],
+                          company_profile: Dict, target_words: int) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Раздел с повторами: (данные или None, число попыток)"""
+        attempts = 0
+        while attempts <= self.max_retries:
+            attempts += 1
+            section = self.ai_client.generate_section(keyword, title, outline, company_profile, target_words)
+            if section:
+                return section, attempts
+            if attempts <= self.max_retries:
+                time.sleep(self.retry_delay * attempts)
+        return None, attempts
+
+    def _generate_faq(self, keyword: str, title: str, outline: List[str]) -> Dict[str, Any]:
+        """FAQ по черновику: заголовок и оглавление статьи"""
+        draft = '\n'.join([f"# {title}"] + [f"## {section}" for section in outline])
+        return self.ai_client.generate_faq(keyword, draft)
+
+    def _fallback_section(self, keyword: str, title: str) -> str:
+        """Резервный текст раздела, если все повторы не удались"""
+        return (
+            f"{title}: подробности о том, как {keyword} применяется на практике, "
+            f"уточняйте у экспертов Бизнес Финанс — мы подберем условия под ваш контракт."
+        )
+
+    def generate_article(self, keyword: str, competitors_data: Dict, company_profile: Dict,
+                         target_words: int = 2500, outline: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Генерация статьи по разделам
+
+        Args:
+            keyword: Ключевое слово
+            competitors_data: Данные о конкурентах
+            company_profile: Профиль компании
+            target_words: Целевое количество слов
+            outline: Заголовки разделов (по умолчанию из анализа конкурентов)
+
+        Returns:
+            Статья в формате AIAssistantClient.generate_article и FAQ в ключе 'faq'
+        """
+        # AI Assistant недоступен: каждый раздел ушел бы в повторы и резервный текст
+        if not self.ai_client.test_connection():
+            self.logger.warning("⚠️ AI Assistant недоступен — статья генерируется одним запросом")
+            return self.ai_client.generate_article(keyword, competitors_data, company_profile, target_words)
+
+        outline = outline or self.build_outline(keyword, competitors_data)
+        title = f"{keyword}: полное руководство по получению в {datetime.now().year} году"
+        section_words = max(150, target_words // len(outline))
+
+        self.logger.info(
+            f"✍️ Параллельная генерация: {len(outline)} разделов + FAQ, до {self.max_workers} запросов одновременно"
+        )
+        start_time = time.time()
+
+        sections: Dict[int, str] = {}
+        attempts: Dict[str, int] = {}
+        failed: List[str] = []
+        faq_data: Dict[str, Any] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._generate_faq, keyword, title, outline): FAQ_TASK
+            }
+            for index, section_title in enumerate(outline):
+                future = executor.submit(
+                    self._generate_section, keyword, section_title, outline, company_profile, section_words
+                )
+                futures[future] = index
+
+            for future in as_completed(futures):
+                task = futures[future]
+                if task == FAQ_TASK:
+                    try:
+                        faq_data = future.result()
+                    except Exception as e:
+                        self.logger.error(f"❌ Ошибка генерации FAQ: {e}")
+                    continue
+
+                section_title = outline[task]
+                try:
+                    section, section_attempts = future.result()
+                except Exception as e:
+                    self.logger.error(f"❌ Ошибка генерации раздела '{section_title}': {e}")
+                    section, section_attempts = None, 1
+
+                attempts[section_title] = section_attempts
+                if section:
+                    sections[task] = section['content']
+                else:
+                    self.logger.warning(f"⚠️ Раздел '{section_title}' заменен резервным текстом")
+                    failed.append(section_title)
+                    sections[task] = self._fallback_section(keyword, section_title)
+
+        # Статья из резервных разделов не публикуется
+        if len(failed) > len(outline) * MAX_FAILED_SHARE:
+            self.logger.error(
+                f"❌ Не удалось сгенерировать {len(failed)} из {len(outline)} разделов — "
+                f"статья генерируется одним запросом"
+            )
+            return self.ai_client.generate_article(keyword, competitors_data, company_profile, target_words)
+
+        # Сборка в порядке оглавления
+        parts = [f"# {title}"]
+        for index, section_title in enumerate(outline):
+            parts.append(f"## {section_title}\n\n{sections[index].strip()}")
+        content = '\n\n'.join(parts)
+
+        word_count = len(content.split())
+        duration = time.time() - start_time
+        self.logger.info(
+            f"✅ Статья собрана за {duration:.1f} с: {word_count} слов, "
+            f"повторов: {sum(attempts.values()) - len(attempts)}, резервных разделов: {len(failed)}"
+        )
+
+        return {
+            'title': title,
+            'content': content,
+            'word_count': word_count,
+            'reading_time': max(1, word_count // 200),
+            'structure': outline,
+            'lsi_keywords_used': competitors_data.get('common_themes', [])[:10],
+            'seo_optimized': False,
+            'generated_at': datetime.now().isoformat(),
+            'generation_method': 'section_parallel',
+            'section_attempts': attempts,
+            'failed_sections': failed,
+            'faq': faq_data
+        }
+
+
+# Экспорт
+__all__ = ['SectionParallelGenerator', 'DEFAULT_OUTLINE', 'MAX_FAILED_SHARE']
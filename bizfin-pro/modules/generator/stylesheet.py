@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Общая таблица стилей дизайн-системы BizFin Pro
+
+CSS дизайн-системы компилируется один раз, получает версию по хешу
+содержимого и загружается в WordPress отдельным файлом. Статьи подключают
+его через <link> и ссылаются на классы вместо того, чтобы нести полный
+<style>-блок в каждом посте.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional
+import sys
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+from config.design_system import DesignGenerator
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'assets')
+REGISTRY_FILE = 'stylesheet_registry.json'
+STYLESHEET_ID = 'bizfin-design-css'
+
+_STYLE_BLOCK_RE = re.compile(r'<style\b[^>]*>.*?</style>\s*', re.IGNORECASE | re.DOTALL)
+_STYLESHEET_LINK_RE = re.compile(
+    r'<link\b[^>]*id=["\']' + STYLESHEET_ID + r'["\'][^>]*>\s*', re.IGNORECASE
+)
+
+
+def minify_css(css: str) -> str:
+    """
+    Минификация CSS без внешних зависимостей
+
+    Удаляет комментарии и лишние пробелы вокруг разделителей.
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+class StylesheetAsset:
+    """Версионированный файл стилей дизайн-системы"""
+
+    def __init__(self, assets_dir: Optional[str] = None):
+        """
+        Инициализация ассета
+
+        Args:
+            assets_dir: Каталог для скомпилированных файлов (по умолчанию data/assets)
+        """
+        self.assets_dir = os.path.abspath(assets_dir or ASSETS_DIR)
+        self.logger = logging.getLogger(__name__)
+
+        self.css = minify_css(DesignGenerator().generate_css_styles())
+        self.version = hashlib.sha256(self.css.encode('utf-8')).hexdigest()[:10]
+        self.filename = f"bizfin-design-{self.version}.css"
+
+        self._registry = self._load_registry()
+
+    @property
+    def path(self) -> str:
+        """Путь к скомпилированному файлу"""
+        return os.path.join(self.assets_dir, self.filename)
+
+    @property
+    def url(self) -> Optional[str]:
+        """URL таблицы стилей текущей версии (None, если еще не загружена)"""
+        if WordPressConfig.DESIGN_STYLESHEET_URL:
+            return WordPressConfig.DESIGN_STYLESHEET_URL
+        entry = self._registry.get(self.version)
+        return entry['url'] if entry else None
+
+    def _load_registry(self) -> Dict[str, Any]:
+        """Реестр загруженных версий: version -> {url, media_id, uploaded_at}"""
+        registry_path = os.path.join(self.assets_dir, REGISTRY_FILE)
+        if not os.path.exists(registry_path):
+            return {}
+        try:
+            with open(registry_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️ Не удалось прочитать реестр стилей: {e}")
+            return {}
+
+    def _save_registry(self):
+        os.makedirs(self.assets_dir, exist_ok=True)
+        with open(os.path.join(self.assets_dir, REGISTRY_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self._registry, f, ensure_ascii=False, indent=2)
+
+    def compile(self) -> str:
+        """
+        Запись скомпилированного файла на диск (если этой версии еще нет)
+
+        Returns:
+            Путь к файлу
+        """
+        if not os.path.exists(self.path):
+            os.makedirs(self.assets_dir, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(self.css)
+            self.logger.info(f"🎨 Таблица стилей скомпилирована: {self.filename} ({len(self.css)} байт)")
+        return self.path
+
+    def upload(self, force: bool = False) -> str:
+        """
+        Загрузка таблицы стилей в медиатеку WordPress (один раз на версию)
+
+        Args:
+            force: Загрузить повторно, даже если версия уже есть в реестре
+
+        Returns:
+            URL загруженного файла
+        """
+        if self.url and not force:
+            return self.url
+
+        import requests
+        from modules.publisher.rate_limiter import get_host_limiter
+
+        self.compile()
+        headers = WordPressConfig.get_auth_headers()
+        headers.update({
+            'Content-Type': 'text/css',
+            'Content-Disposition': f'attachment; filename="{self.filename}"'
+        })
+
+        get_host_limiter(WordPressConfig.API_URL).acquire()
+        with open(self.path, 'rb') as f:
+            response = requests.post(
+                f"{WordPressConfig.API_URL}/media",
+                headers=headers,
+                data=f.read(),
+                timeout=WordPressConfig.API_TIMEOUT
+            )
+        response.raise_for_status()
+        media = response.json()
+
+        self._registry[self.version] = {
+            'url': media.get('source_url'),
+            'media_id': media.get('id'),
+            'uploaded_at': datetime.now().isoformat()
+        }
+        self._save_registry()
+        self.logger.info(f"✅ Таблица стилей загружена: {media.get('source_url')}")
+
+        return media.get('source_url')
+
+    def link_tag(self) -> str:
+        """Тег подключения таблицы стилей (пустая строка, пока файл не загружен)"""
+        if not self.url:
+            return ''
+        return self._format_link(self.url)
+
+    def inline_tag(self) -> str:
+        """Встроенный <style>-блок с CSS дизайн-системы"""
+        return f"<style>{self.css}</style>"
+
+    def article_styles(self) -> str:
+        """
+        Стили для статьи: <link> на загруженную таблицу стилей
+
+        Пока файл не загружен (publish_stylesheet.py --upload) и
+        WP_DESIGN_STYLESHEET_URL не задан, CSS встраивается в статью:
+        иначе классы дизайн-системы остались бы без стилей.
+        """
+        if not self.url:
+            self.logger.warning("⚠️ Таблица стилей не загружена — CSS встроен в статью "
+                                "(python bizfin-pro/scripts/publish_stylesheet.py --upload)")
+            return self.inline_tag()
+        return self._format_link(self.url)
+
+    def _format_link(self, url: str) -> str:
+        separator = '&' if '?' in url else '?'
+        return f'<link rel="stylesheet" id="{STYLESHEET_ID}" href="{url}{separator}ver={self.version}" />'
+
+    def measure_payload(self, html: str) -> Dict[str, Any]:
+        """
+        Размер статьи со встроенными стилями и с общей таблицей стилей
+
+        Args:
+            html: HTML статьи (с <style>-блоком или без)
+
+        Returns:
+            Размеры в байтах, экономия в процентах и linked — подключена ли
+            в статье общая таблица стилей (иначе CSS встроен и экономии нет)
+        """
+        body = _STYLESHEET_LINK_RE.sub('', _STYLE_BLOCK_RE.sub('', html))
+        body_bytes = len(body.encode('utf-8'))
+
+        inline_bytes = body_bytes + len(f"<style>{self.css}</style>".encode('utf-8'))
+        # До загрузки размер тега оцениваем по типичному URL медиатеки
+        link = self._format_link(self.url or f"{WordPressConfig.SITE_URL}/wp-content/uploads/{self.filename}")
+        linked_bytes = body_bytes + len(link.encode('utf-8'))
+        saved = inline_bytes - linked_bytes
+
+        return {
+            'linked': bool(_STYLESHEET_LINK_RE.search(html)),
+            'html_bytes': len(html.encode('utf-8')),
+            'inline_bytes': inline_bytes,
+            'linked_bytes': linked_bytes,
+            'stylesheet_bytes': len(self.css.encode('utf-8')),
+            'saved_bytes': saved,
+            'saved_percent': round(saved / inline_bytes * 100, 1) if inline_bytes else 0.0
+        }
+
+
+_default_asset: Optional[StylesheetAsset] = None
+
+
+def get_stylesheet() -> StylesheetAsset:
+    """Общий экземпляр ассета (CSS компилируется один раз за процесс)"""
+    global _default_asset
+    if _default_asset is None:
+        _default_asset = StylesheetAsset()
+    return _default_asset
+
+
+# Экспорт
+__all__ = ['StylesheetAsset', 'get_stylesheet', 'minify_css']
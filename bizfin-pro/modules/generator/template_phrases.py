@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Поиск и замена шаблонных фраз в статьях
+
+Известные заготовки генераторов («Подробное описание ситуации...»),
+канцелярские штампы и фразы, найденные в нашем же корпусе статей
+(майнинг повторяющихся n-грамм), компилируются в автомат Ахо — Корасик
+по последовательностям лемм. Один линейный проход по словам статьи
+находит все вхождения всех фраз в любых словоформах со смещениями в HTML.
+
+Заготовки заменяются данными исследования ключевого слова (факты,
+статистика, мнения экспертов), штампы — короткими вариантами, если
+найденная форма совпадает с исходной; фразы из корпуса только
+отмечаются в отчете.
+"""
+
+import html as html_lib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Any, List, Optional, Iterable, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.quality.morphology import lemmatize, keyword_lemmas
+
+TEMPLATE_PHRASES_PATH = os.getenv(
+    'TEMPLATE_PHRASES_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'template_phrases.json')
+)
+
+# Ключевое слово статьи в фразе: «особенности работы с {keyword}»
+KEYWORD_TOKEN = '{keyword}'
+
+# Граница блока (абзац, пункт списка, заголовок): фразы не переходят через нее
+BLOCK_BOUNDARY = '\n'
+
+_TOKEN_RE = re.compile(r'[0-9a-zа-яё]+', re.IGNORECASE)
+_MARKUP_RE = re.compile(r'<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>|<[^>]+>', re.IGNORECASE | re.DOTALL)
+_BLOCK_TAG_RE = re.compile(
+    r'</?(?:p|li|ul|ol|h[1-6]|div|table|tr|td|th|br|hr|section|article|blockquote|details|summary|dt|dd|figure)\b',
+    re.IGNORECASE
+)
+_TRAILING_PUNCT_RE = re.compile(r'[.…!]+')
+
+
+@dataclass
+class TemplatePhrase:
+    """
+    Шаблонная фраза
+
+    category: placeholder — заготовка генератора (заменяется данными исследования
+    из полей sources), cliche — штамп (заменяется на replacement при точном
+    совпадении формы), mined — повторяющаяся фраза корпуса (только отчет).
+    """
+    text: str
+    category: str = 'cliche'
+    sources: Tuple[str, ...] = ()
+    replacement: Optional[str] = None
+    documents: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['sources'] = list(self.sources)
+        return data
+
+
+@dataclass
+class TemplateHit:
+    """Вхождение шаблонной фразы в статью"""
+    phrase: TemplatePhrase
+    start: int
+    end: int
+    text: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'phrase': self.phrase.text, 'category': self.phrase.category,
+                'start': self.start, 'end': self.end, 'text': self.text}
+
+
+BUILTIN_PHRASES = (
+    # Заготовки генераторов статей
+    TemplatePhrase('Подробное описание ситуации, действий и результатов', 'placeholder', ('expert_opinions', 'key_facts_figures')),
+    TemplatePhrase('Детальный ответ на вопрос с практическими рекомендациями и примерами', 'placeholder',
+                   ('key_facts_figures', 'statistical_data')),
+    TemplatePhrase('Дополнительные рекомендации по решению данной проблемы', 'placeholder', ('expert_opinions', 'solutions')),
+    TemplatePhrase('Описание возникшей ситуации', 'placeholder', ('pain_points',)),
+    TemplatePhrase('Принятые меры и подходы', 'placeholder', ('solutions',)),
+    TemplatePhrase('Достигнутые результаты и выводы', 'placeholder', ('statistical_data', 'key_facts_figures')),
+    TemplatePhrase('Подробное описание процесса и рекомендации', 'placeholder', ('solutions', 'expert_opinions')),
+
+    # Канцелярские штампы
+    TemplatePhrase('является важным аспектом'),
+    TemplatePhrase('занимает особое место'),
+    TemplatePhrase('играет ключевую роль'),
+    TemplatePhrase('в современной деловой практике', replacement='на практике'),
+    TemplatePhrase('на сегодняшний день', replacement='сейчас'),
+    TemplatePhrase('в настоящее время', replacement='сейчас'),
+    TemplatePhrase('в данной статье', replacement='в статье'),
+    TemplatePhrase('в данной области', replacement='в этой сфере'),
+    TemplatePhrase('следует отметить что'),
+    TemplatePhrase('необходимо отметить что'),
+    TemplatePhrase('важно понимать что'),
+    TemplatePhrase('как известно'),
+    TemplatePhrase('не секрет что'),
+    TemplatePhrase('таким образом можно сделать вывод'),
+    TemplatePhrase('представленный материал содержит'),
+    TemplatePhrase('поможет вам лучше ориентироваться'),
+    TemplatePhrase('является необходимым условием'),
+    TemplatePhrase('помогут лучше понять особенности работы с'),
+    TemplatePhrase('дают следующие рекомендации по работе с'),
+)
+
+
+class PhraseAutomaton:
+    """Автомат Ахо — Корасик над последовательностями лемм"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._lengths: Dict[int, int] = {}
+
+    def add(self, lemmas: Tuple[str, ...], pattern_id: int):
+        """Добавление фразы (до compile)"""
+        state = 0
+        for lemma in lemmas:
+            next_state = self._goto[state].get(lemma)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][lemma] = next_state
+            state = next_state
+        self._output[state].append(pattern_id)
+        self._lengths[pattern_id] = len(lemmas)
+
+    def compile(self):
+        """Ссылки неудач обходом в ширину; выходы состояний наследуют выходы ссылок"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for lemma, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and lemma not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(lemma, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def scan(self, lemmas: List[str]) -> Iterable[Tuple[int, int, int]]:
+        """
+        Один проход по леммам текста
+
+        Returns:
+            (индекс первой леммы, индекс последней леммы, id фразы) для каждого вхождения
+        """
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        state = 0
+        for index, lemma in enumerate(lemmas):
+            while state and lemma not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(lemma, 0)
+            for pattern_id in output[state]:
+                yield index - lengths[pattern_id] + 1, index, pattern_id
+
+
+def phrase_lemmas(text: str) -> Tuple[str, ...]:
+    """Леммы фразы; {keyword} — один токен ключевого слова"""
+    lemmas: List[str] = []
+    for index, part in enumerate(text.split(KEYWORD_TOKEN)):
+        if index:
+            lemmas.append(KEYWORD_TOKEN)
+        lemmas.extend(lemmatize(word) for word in _TOKEN_RE.findall(part.lower()))
+    return tuple(lemmas)
+
+
+def lemma_stream(content: str, keyword: str = '') -> Tuple[List[str], List[int], List[int]]:
+    """
+    Леммы текста статьи со смещениями слов в исходном HTML
+
+    Слова ищутся между тегами, блочные теги дают лемму-границу BLOCK_BOUNDARY,
+    вхождения ключевого слова в любой форме сворачиваются в {keyword}.
+
+    Returns:
+        Леммы, начала и концы слов
+    """
+    lemmas, starts, ends = [], [], []
+
+    def add_words(start: int, end: int):
+        for match in _TOKEN_RE.finditer(content, start, end):
+            lemmas.append(lemmatize(match.group(0).lower()))
+            starts.append(match.start())
+            ends.append(match.end())
+
+    position = 0
+    for markup in _MARKUP_RE.finditer(content):
+        add_words(position, markup.start())
+        if lemmas and lemmas[-1] != BLOCK_BOUNDARY and _BLOCK_TAG_RE.match(markup.group(0)):
+            lemmas.append(BLOCK_BOUNDARY)
+            starts.append(markup.start())
+            ends.append(markup.start())
+        position = markup.end()
+    add_words(position, len(content))
+
+    key = keyword_lemmas(keyword) if keyword else ()
+    if not key or len(lemmas) < len(key):
+        return lemmas, starts, ends
+
+    first, size = key[0], len(key)
+    folded_lemmas, folded_starts, folded_ends = [], [], []
+    index = 0
+    while index < len(lemmas):
+        if lemmas[index] == first and tuple(lemmas[index:index + size]) == key:
+            folded_lemmas.append(KEYWORD_TOKEN)
+            folded_starts.append(starts[index])
+            folded_ends.append(ends[index + size - 1])
+            index += size
+            continue
+        folded_lemmas.append(lemmas[index])
+        folded_starts.append(starts[index])
+        folded_ends.append(ends[index])
+        index += 1
+    return folded_lemmas, folded_starts, folded_ends
+
+
+class TemplatePhraseIndex:
+    """Скомпилированный набор шаблонных фраз"""
+
+    def __init__(self, phrases: Iterable[TemplatePhrase] = BUILTIN_PHRASES):
+        self.phrases: List[TemplatePhrase] = []
+        self._automaton = PhraseAutomaton()
+        seen = set()
+        for phrase in phrases:
+            lemmas = phrase_lemmas(phrase.text)
+            if not lemmas or lemmas in seen:
+                continue
+            seen.add(lemmas)
+            self._automaton.add(lemmas, len(self.phrases))
+            self.phrases.append(phrase)
+        self._automaton.compile()
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    @classmethod
+    def load(cls, path: str = TEMPLATE_PHRASES_PATH, include_builtin: bool = True) -> 'TemplatePhraseIndex':
+        """Встроенные фразы плюс фразы из JSON (mine_template_phrases → save_phrases)"""
+        phrases = list(BUILTIN_PHRASES) if include_builtin else []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for item in json.load(f):
+                    item['sources'] = tuple(item.get('sources') or ())
+                    phrases.append(TemplatePhrase(**item))
+        return cls(phrases)
+
+    def find(self, content: str, keyword: str = '') -> List[TemplateHit]:
+        """
+        Все вхождения фраз за один проход по словам статьи
+
+        Args:
+            content: HTML статьи
+            keyword: Ключевое слово (для фраз с {keyword})
+
+        Returns:
+            Вхождения в порядке текста (перекрывающиеся — все)
+        """
+        lemmas, starts, ends = lemma_stream(content, keyword)
+        hits = [
+            TemplateHit(self.phrases[pattern_id], starts[first], ends[last], content[starts[first]:ends[last]])
+            for first, last, pattern_id in self._automaton.scan(lemmas)
+        ]
+        hits.sort(key=lambda hit: (hit.start, -hit.end))
+        return hits
+
+
+def _research_text(item: Any) -> str:
+    """Пункт исследования как фраза: «Доля онлайн-оформления: 35%» → «Доля онлайн-оформления — 35%»"""
+    text = str(item.get('text') or item.get('title') or '') if isinstance(item, dict) else str(item)
+    text = ' '.join(text.split()).rstrip('.…')
+    head, sep, tail = text.partition(': ')
+    return f"{head} — {tail}" if sep and tail else text
+
+
+class SmartContentRewriter:
+    """Замена шаблонных фраз статьи (заготовки — данными исследования, штампы — короткими вариантами)"""
+
+    def __init__(self, index: Optional[TemplatePhraseIndex] = None):
+        self.index = index or get_template_index()
+
+    def rewrite_content(self, content: str, keyword: str = '',
+                        research_data: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Замена шаблонных фраз
+
+        Args:
+            content: HTML статьи
+            keyword: Ключевое слово
+            research_data: Исследование ключевого слова (списки фактов, мнений, решений)
+
+        Returns:
+            Новый HTML и отчет: найдено, заменено, вхождения по категориям
+        """
+        started = time.perf_counter()
+        research_data = research_data or {}
+        hits = self.index.find(content, keyword)
+        # Заготовки одного пункта («Проблема / Решение / Результат») берут
+        # данные исследования с одним номером: пункт не смешивает разные кейсы
+        rotation: Dict[str, Any] = {'item': 0, 'used': set()}
+
+        parts, position, replaced = [], 0, 0
+        for hit in hits:
+            if hit.start < position:
+                continue  # перекрывается с уже замененной фразой
+            replacement, end = self._replacement(hit, content, research_data, rotation)
+            if replacement is None:
+                continue
+            parts.append(content[position:hit.start])
+            parts.append(replacement)
+            position = end
+            replaced += 1
+        parts.append(content[position:])
+
+        analysis = {
+            'template_count': len(hits),
+            'replaced': replaced,
+            'by_category': dict(Counter(hit.phrase.category for hit in hits)),
+            'hits': [hit.to_dict() for hit in hits],
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+        return ''.join(parts), analysis
+
+    @staticmethod
+    def _replacement(hit: TemplateHit, content: str, research_data: Dict[str, Any],
+                     rotation: Dict[str, Any]) -> Tuple[Optional[str], int]:
+        """Текст замены и конец заменяемого фрагмента (None — оставить как есть)"""
+        phrase = hit.phrase
+        if '<' in hit.text:
+            return None, hit.end  # фраза пересекает разметку
+
+        if phrase.category == 'placeholder':
+            # Повтор заготовки — начало следующего пункта
+            if phrase.text in rotation['used']:
+                rotation['item'] += 1
+                rotation['used'].clear()
+            rotation['used'].add(phrase.text)
+            for source in phrase.sources:
+                items = [item for item in research_data.get(source) or [] if _research_text(item)]
+                if items:
+                    # Текст исследования собран со страниц: в HTML статьи — только экранированным
+                    text = html_lib.escape(_research_text(items[rotation['item'] % len(items)]))
+                    # Многоточие заготовки заменяется точкой фразы исследования
+                    punct = _TRAILING_PUNCT_RE.match(content, hit.end)
+                    end = punct.end() if punct else hit.end
+                    return (text + '.' if punct else text), end
+            return None, hit.end
+
+        if phrase.category == 'cliche' and phrase.replacement and \
+                ' '.join(hit.text.lower().split()) == phrase.text.lower():
+            replacement = phrase.replacement
+            if hit.text[:1].isupper():
+                replacement = replacement[:1].upper() + replacement[1:]
+            return replacement, hit.end
+        return None, hit.end
+
+
+def mine_template_phrases(documents: Callable[[], Iterable[Tuple[str, str]]], ngram: int = 5,
+                          min_documents: int = 3, min_share: float = 0.2, limit: int = 100) -> List[TemplatePhrase]:
+    """
+    Повторяющиеся фразы корпуса статей (два прохода по корпусу)
+
+    Первый проход считает, в скольких статьях встречается каждая n-грамма лемм
+    внутри блока (ключевое слово статьи свернуто в {keyword}, поэтому заготовки
+    с разными ключами совпадают). Второй проход склеивает частые n-граммы каждой
+    статьи в максимальные фразы и считает статьи для них.
+
+    Args:
+        documents: Функция, возвращающая итератор (HTML, ключевое слово); вызывается дважды
+        ngram: Длина n-граммы в словах
+        min_documents: Минимум статей с фразой
+        min_share: Минимальная доля статей с фразой
+        limit: Максимум фраз в результате
+
+    Returns:
+        Фразы категории mined, по убыванию числа статей
+    """
+    ngram_documents: Counter = Counter()
+    total = 0
+    for html, keyword in documents():
+        lemmas, _, _ = lemma_stream(html, keyword)
+        grams = (tuple(lemmas[i:i + ngram]) for i in range(len(lemmas) - ngram + 1))
+        ngram_documents.update({hash(gram) for gram in grams if BLOCK_BOUNDARY not in gram})
+        total += 1
+    if not total:
+        return []
+
+    threshold = max(min_documents, int(total * min_share + 0.999))
+    frequent = {key for key, count in ngram_documents.items() if count >= threshold}
+    del ngram_documents
+
+    phrase_documents: Counter = Counter()
+    examples: Dict[Tuple[str, ...], str] = {}
+    for html, keyword in documents():
+        lemmas, starts, ends = lemma_stream(html, keyword)
+        covered = [hash(tuple(lemmas[i:i + ngram])) in frequent for i in range(len(lemmas) - ngram + 1)]
+        found = set()
+        index = 0
+        while index < len(covered):
+            if not covered[index]:
+                index += 1
+                continue
+            run_end = index
+            while run_end + 1 < len(covered) and covered[run_end + 1]:
+                run_end += 1
+            last = run_end + ngram - 1
+            key = tuple(lemmas[index:last + 1])
+            if key not in found:
+                found.add(key)
+                if key not in examples:
+                    examples[key] = _phrase_example(html, starts, ends, lemmas, index, last)
+            index = run_end + 1
+        phrase_documents.update(found)
+
+    mined = [
+        TemplatePhrase(examples[key], 'mined', documents=count)
+        for key, count in phrase_documents.most_common()
+        if count >= threshold
+    ]
+    return mined[:limit]
+
+
+def _phrase_example(html: str, starts: List[int], ends: List[int], lemmas: List[str], first: int, last: int) -> str:
+    """Текст фразы из статьи: слова через пробел, ключевое слово — {keyword}"""
+    words = [KEYWORD_TOKEN if lemmas[i] == KEYWORD_TOKEN else html[starts[i]:ends[i]].lower()
+             for i in range(first, last + 1)]
+    return ' '.join(words)
+
+
+def save_phrases(phrases: Iterable[TemplatePhrase], path: str = TEMPLATE_PHRASES_PATH):
+    """Сохранение фраз корпуса в JSON (подхватывается get_template_index)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([phrase.to_dict() for phrase in phrases], f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def phrase_report(index: TemplatePhraseIndex, documents: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Самые частые шаблонные фразы по корпусу статей
+
+    Args:
+        index: Набор фраз
+        documents: (HTML, ключевое слово) статей
+
+    Returns:
+        Фразы с числом статей и вхождений, по убыванию числа статей
+    """
+    occurrences: Counter = Counter()
+    articles: Counter = Counter()
+    examples: Dict[str, str] = {}
+    total = 0
+    for html, keyword in documents:
+        total += 1
+        seen = set()
+        for hit in index.find(html, keyword):
+            occurrences[hit.phrase.text] += 1
+            seen.add(hit.phrase.text)
+            examples.setdefault(hit.phrase.text, ' '.join(_MARKUP_RE.sub(' ', hit.text).split()))
+        articles.update(seen)
+
+    categories = {phrase.text: phrase.category for phrase in index.phrases}
+    return [
+        {
+            'phrase': text,
+            'category': categories.get(text, 'mined'),
+            'articles': count,
+            'share': round(count / total * 100, 1) if total else 0.0,
+            'occurrences': occurrences[text],
+            'example': examples[text]
+        }
+        for text, count in articles.most_common()
+    ]
+
+
+_index: Optional[TemplatePhraseIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_template_index() -> TemplatePhraseIndex:
+    """Общий для процесса набор фраз (встроенные + data/template_phrases.json)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = TemplatePhraseIndex.load()
+    return _index
+
+
+# Экспорт
+__all__ = [
+    'TemplatePhrase', 'TemplateHit', 'TemplatePhraseIndex', 'PhraseAutomaton', 'SmartContentRewriter',
+    'BUILTIN_PHRASES', 'KEYWORD_TOKEN', 'BLOCK_BOUNDARY', 'TEMPLATE_PHRASES_PATH', 'lemma_stream', 'phrase_lemmas',
+    'mine_template_phrases', 'save_phrases', 'phrase_report', 'get_template_index'
+]
@@ -0,0 +1,2 @@
+# WordPress Publisher Module
+
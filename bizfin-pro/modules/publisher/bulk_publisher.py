@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Публикация статей из очереди publish_queue
+
+PublishQueueStore выбирает готовые к публикации элементы очереди (по
+приоритету и scheduled_at), захватывает их (pending → processing) и пишет
+результат: строку published с кодом ответа и длительностью или ошибку
+с повтором по retry_count/max_retries.
+
+BulkPublisher разбирает очередь несколькими потоками; каждый поток
+захватывает до batch_size элементов и сохраняет их одним запросом
+к /wp-json/batch/v1 (WordPress 5.6+). Частоту запросов
+ограничивает общий ограничитель хоста WordPress, а число одновременных
+публикаций подстраивается под задержку ответов: при росте задержки
+(или 429/5xx) параллельность снижается вдвое, при нормальной — растет
+на единицу. Изображения статей до сохранения проходят медиа-этап
+(MediaPipeline): сжатие, дедупликация и загрузка в медиатеку. ID рубрик,
+меток и автора берутся из TaxonomyCache: недостающие метки пакета
+создаются одним проходом до его сохранения.
+
+Поддерживаются SQLite и MySQL (схема db/schema.sql).
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+import sys
+import os
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.database import DatabaseConfig
+from config.wordpress import WordPressConfig
+from modules.publisher.rate_limiter import get_host_limiter
+from modules.publisher.wordpress_client import WordPressClient, SaveResult, get_wordpress_client, RETRY_STATUSES
+from modules.publisher.taxonomy_cache import TaxonomyCache
+from modules.publisher.media_pipeline import MediaPipeline
+
+# Порядок приоритетов очереди (меньше — раньше)
+PRIORITY_ORDER = {'urgent': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+_PRIORITY_SQL = (
+    "CASE q.priority WHEN 'urgent' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END"
+)
+
+_DUE_ITEMS_SQL = (
+    "SELECT q.id, q.article_final_id, q.priority, q.retry_count, q.max_retries, "
+    "f.meta_title, f.html_final, f.slug, f.focus_keyword, f.meta_description, f.canonical_url "
+    "FROM publish_queue q JOIN articles_final f ON f.id = q.article_final_id "
+    "WHERE q.status = 'pending' AND (q.scheduled_at IS NULL OR q.scheduled_at <= {p}) "
+    f"ORDER BY {_PRIORITY_SQL}, COALESCE(q.scheduled_at, q.created_at), q.id "
+    "LIMIT {p}"
+)
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+@dataclass
+class QueueItem:
+    """Элемент очереди с данными статьи"""
+    id: int
+    article_final_id: int
+    priority: str
+    retry_count: int
+    max_retries: int
+    title: str
+    content: str
+    slug: str
+    focus_keyword: str
+    meta_description: str
+    canonical_url: Optional[str] = None
+    claimed_at: float = field(default_factory=time.perf_counter)
+
+
+class PublishQueueStore:
+    """Захват элементов publish_queue и запись результатов публикации"""
+
+    def __init__(self, connection, dialect: str):
+        """
+        Инициализация хранилища
+
+        Args:
+            connection: Соединение DB-API (sqlite3 или mysql.connector)
+            dialect: 'sqlite' или 'mysql'
+        """
+        self.connection = connection
+        self.dialect = dialect
+        self.placeholder = '?' if dialect == 'sqlite' else '%s'
+        # Одно соединение на все потоки публикации
+        self._lock = threading.Lock()
+
+    @classmethod
+    def sqlite(cls, db_path: str) -> 'PublishQueueStore':
+        """Очередь в файле SQLite"""
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"База данных не найдена: {db_path}")
+        return cls(sqlite3.connect(db_path, timeout=30, check_same_thread=False), 'sqlite')
+
+    @classmethod
+    def mysql(cls, config: Optional[Dict[str, Any]] = None) -> 'PublishQueueStore':
+        """Очередь в MySQL (по умолчанию DatabaseConfig)"""
+        import mysql.connector
+        return cls(mysql.connector.connect(**(config or DatabaseConfig.get_config_dict())), 'mysql')
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Запрос с фиксацией (вызывается под блокировкой), возвращает число затронутых строк"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            self.connection.commit()
+            return cursor.rowcount
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def enqueue(self, article_final_id: int, eec: Optional[Dict[str, Any]] = None, priority: str = 'medium',
+                scheduled_at: Optional[datetime] = None, max_retries: int = 3) -> int:
+        """
+        Добавление статьи в очередь
+
+        Args:
+            article_final_id: ID финальной статьи (articles_final)
+            eec: Данные EEC для eec_json
+            priority: low, medium, high или urgent
+            scheduled_at: Не публиковать раньше (локальное время)
+            max_retries: Попыток публикации до статуса failed
+
+        Returns:
+            ID элемента очереди
+        """
+        if priority not in PRIORITY_ORDER:
+            raise ValueError(f"Неизвестный приоритет: {priority}")
+        p = self.placeholder
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(
+                    f"INSERT INTO publish_queue (article_final_id, eec_json, priority, max_retries, scheduled_at) "
+                    f"VALUES ({p}, {p}, {p}, {p}, {p})",
+                    (article_final_id, json.dumps(eec or {}, ensure_ascii=False), priority, max_retries,
+                     scheduled_at.strftime(DATETIME_FORMAT) if scheduled_at else None)
+                )
+                self.connection.commit()
+                return cursor.lastrowid
+            except Exception:
+                self.connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def claim(self, limit: int = 1) -> List[QueueItem]:
+        """
+        Захват готовых элементов (pending → processing)
+
+        Элементы упорядочены по приоритету, затем по scheduled_at (или времени
+        добавления). Захват условный (WHERE status = 'pending'), поэтому
+        элемент не достанется двум процессам публикации.
+
+        Args:
+            limit: Сколько элементов захватить
+
+        Returns:
+            Захваченные элементы (пустой список, если готовых нет)
+        """
+        p = self.placeholder
+        now = datetime.now().strftime(DATETIME_FORMAT)
+        items: List[QueueItem] = []
+        with self._lock:
+            cursor = self.connection.cursor()
+            # С запасом: часть кандидатов могут захватить другие процессы
+            cursor.execute(_DUE_ITEMS_SQL.format(p=p), (now, limit * 2))
+            rows = cursor.fetchall()
+            cursor.close()
+            for row in rows:
+                if len(items) >= limit:
+                    break
+                claimed = self._execute(
+                    f"UPDATE publish_queue SET status = 'processing' WHERE id = {p} AND status = 'pending'", (row[0],)
+                )
+                if claimed:
+                    items.append(QueueItem(
+                        id=row[0], article_final_id=row[1], priority=row[2] or 'medium', retry_count=row[3] or 0,
+                        max_retries=row[4] if row[4] is not None else 3, title=row[5], content=row[6], slug=row[7],
+                        focus_keyword=row[8], meta_description=row[9], canonical_url=row[10]
+                    ))
+        return items
+
+    def next_scheduled(self) -> Optional[datetime]:
+        """Ближайшее время публикации среди отложенных элементов (None — отложенных нет)"""
+        with self._lock:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT MIN(scheduled_at) FROM publish_queue WHERE status = 'pending'")
+            value = cursor.fetchone()[0]
+            cursor.close()
+        if value is None or isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(str(value)[:19])
+
+    def mark_published(self, item: QueueItem, post: Dict[str, Any], response_code: int, duration: float) -> int:
+        """
+        Запись успешной публикации: строка published и статус элемента
+
+        Args:
+            item: Элемент очереди
+            post: Запись WordPress из ответа API
+            response_code: HTTP-код (201 — создана, 200 — обновлена, 304 — без изменений)
+            duration: Время публикации, секунды
+
+        Returns:
+            ID строки published
+        """
+        p = self.placeholder
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(
+                    f"INSERT INTO published (publish_queue_id, wp_post_id, permalink, response_code, response_data, "
+                    f"publish_duration) VALUES ({p}, {p}, {p}, {p}, {p}, {p})",
+                    (item.id, post['id'], post.get('link', ''), response_code,
+                     json.dumps(post, ensure_ascii=False), round(duration))
+                )
+                published_id = cursor.lastrowid
+                cursor.execute(
+                    f"UPDATE publish_queue SET status = 'published', error_message = NULL WHERE id = {p}", (item.id,)
+                )
+                self.connection.commit()
+                return published_id
+            except Exception:
+                self.connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def mark_failed(self, item: QueueItem, error: str, retry_at: Optional[datetime] = None) -> str:
+        """
+        Запись неудачной попытки
+
+        Элемент возвращается в очередь (pending, scheduled_at = retry_at),
+        пока retry_count меньше max_retries; иначе получает статус failed.
+
+        Args:
+            item: Элемент очереди
+            error: Текст ошибки
+            retry_at: Время следующей попытки (None — не повторять)
+
+        Returns:
+            Новый статус элемента
+        """
+        retry_count = item.retry_count + 1
+        status = 'pending' if retry_at and retry_count < item.max_retries else 'failed'
+        p = self.placeholder
+        with self._lock:
+            self._execute(
+                f"UPDATE publish_queue SET status = {p}, retry_count = {p}, error_message = {p}, "
+                f"scheduled_at = {p} WHERE id = {p}",
+                (status, retry_count, error[:1000],
+                 retry_at.strftime(DATETIME_FORMAT) if status == 'pending' else None, item.id)
+            )
+        return status
+
+    def recover_stale(self) -> int:
+        """
+        Возврат в очередь элементов, оставшихся в processing после прерванного запуска
+
+        Вызывать, только когда другие процессы публикации не запущены.
+
+        Returns:
+            Число возвращенных элементов
+        """
+        with self._lock:
+            return self._execute("UPDATE publish_queue SET status = 'pending' WHERE status = 'processing'")
+
+    def counts(self) -> Dict[str, int]:
+        """Число элементов очереди по статусам"""
+        with self._lock:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT status, COUNT(*) FROM publish_queue GROUP BY status")
+            result = {status: count for status, count in cursor.fetchall()}
+            cursor.close()
+        return result
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+class AdaptiveConcurrency:
+    """
+    Число одновременных публикаций по задержке ответов WordPress (AIMD)
+
+    Задержка сглаживается (EWMA) отдельно для каждого HTTP-метода: быстрые
+    GET-поиски не маскируют медленное создание записей. Базовая задержка
+    метода сразу опускается до лучшей сглаженной и медленно (drift)
+    подтягивается к текущей, если сервер стал стабильно медленнее.
+    Если задержка какого-либо метода выше базовой в latency_factor раз
+    или сервер ответил 429/5xx/таймаутом, лимит делится пополам и
+    следующие limit ответов не снижают его повторно; после limit быстрых
+    ответов подряд лимит растет на единицу.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial: Optional[int] = None,
+                 latency_factor: Optional[float] = None, smoothing: float = 0.3, drift: float = 0.01,
+                 noise_floor: float = 0.05):
+        """
+        Инициализация регулятора
+
+        Args:
+            max_limit: Максимум одновременных публикаций
+            min_limit: Минимум одновременных публикаций
+            initial: Начальный лимит (по умолчанию половина максимума)
+            latency_factor: Допустимый рост задержки относительно базовой
+            smoothing: Вес нового ответа в сглаженной задержке
+            drift: Скорость подтягивания базовой задержки к текущей
+            noise_floor: Базовая задержка не меньше, секунды (колебания
+                ответов в несколько миллисекунд — не рост нагрузки)
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = max(self.min_limit, min(initial or (self.max_limit + 1) // 2, self.max_limit))
+        self.latency_factor = latency_factor or WordPressConfig.PUBLISH_LATENCY_FACTOR
+        self.smoothing = smoothing
+        self.drift = drift
+        self.noise_floor = noise_floor
+
+        self.active = 0
+        self.latency: Dict[str, float] = {}
+        self.baseline: Dict[str, float] = {}
+        self.peak_limit = self.limit
+        self.lowest_limit = self.limit
+        self.adjustments = 0
+        self._fast_responses = 0
+        self._cooldown = 0
+        self._condition = threading.Condition()
+
+        self.logger = logging.getLogger(__name__)
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """
+        Ожидание свободного места (блокирует поток)
+
+        Returns:
+            False, если ожидание прервано событием stop
+        """
+        with self._condition:
+            while self.active >= self.limit:
+                if stop is not None and stop.is_set():
+                    return False
+                self._condition.wait(0.5)
+            self.active += 1
+            return True
+
+    def release(self):
+        """Освобождение места"""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    def observe(self, method: str, latency: float, status_code: Optional[int]):
+        """
+        Учет ответа WordPress (подписка на WordPressClient.add_listener)
+
+        Args:
+            method: HTTP-метод запроса
+            latency: Задержка ответа, секунды
+            status_code: HTTP-код (None — таймаут или сетевая ошибка)
+        """
+        with self._condition:
+            overloaded = status_code is None or status_code in RETRY_STATUSES
+            if not overloaded:
+                current = self.latency.get(method)
+                current = latency if current is None else self.smoothing * latency + (1 - self.smoothing) * current
+                self.latency[method] = current
+                baseline = self.baseline.get(method, current)
+                self.baseline[method] = min(current, baseline + (current - baseline) * self.drift)
+
+            slow = [
+                m for m, value in self.latency.items()
+                if value > max(self.baseline[m], self.noise_floor) * self.latency_factor
+            ]
+            if self._cooldown:
+                self._cooldown -= 1
+            elif overloaded or slow:
+                self._fast_responses = 0
+                if self.limit > self.min_limit:
+                    reason = f"HTTP {status_code}" if overloaded else f"{slow[0]} {self.latency[slow[0]]:.2f} с"
+                    self._set_limit(max(self.min_limit, self.limit // 2), reason)
+                    # Ответы на запросы, начатые до снижения, не снижают лимит повторно
+                    self._cooldown = self.limit
+                return
+
+            if slow or overloaded:
+                return
+            self._fast_responses += 1
+            if self._fast_responses >= self.limit and self.limit < self.max_limit:
+                self._fast_responses = 0
+                self._set_limit(self.limit + 1, ', '.join(f"{m} {v:.2f} с" for m, v in sorted(self.latency.items())))
+                self._condition.notify_all()
+
+    def _set_limit(self, limit: int, reason: str):
+        """Новый лимит (вызывается под блокировкой)"""
+        self.logger.info(f"⚙️ Параллельность публикации: {self.limit} → {limit} ({reason})")
+        self.limit = limit
+        self.adjustments += 1
+        self.peak_limit = max(self.peak_limit, limit)
+        self.lowest_limit = min(self.lowest_limit, limit)
+
+
+@dataclass
+class PublishStats:
+    """Итоги разбора очереди"""
+    published: int = 0
+    created: int = 0
+    updated: int = 0
+    retried: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    durations: List[float] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        """Публикаций в секунду"""
+        return self.published / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        durations = sorted(self.durations)
+        return {
+            'published': self.published,
+            'created': self.created,
+            'updated': self.updated,
+            'retried': self.retried,
+            'failed': self.failed,
+            'elapsed_seconds': round(self.elapsed, 2),
+            'rate_per_second': round(self.rate, 3),
+            'duration_p50': round(durations[len(durations) // 2], 3) if durations else None,
+            'duration_max': round(durations[-1], 3) if durations else None
+        }
+
+
+class BulkPublisher:
+    """Разбор publish_queue несколькими потоками под общим лимитом запросов"""
+
+    def __init__(self, store: PublishQueueStore, client: Optional[WordPressClient] = None,
+                 workers: Optional[int] = None, requests_per_second: Optional[float] = None,
+                 post_status: str = 'draft', retry_delay: float = 300, batch_size: Optional[int] = None,
+                 media: Optional[MediaPipeline] = None, taxonomy: Optional[TaxonomyCache] = None):
+        """
+        Инициализация публикатора
+
+        Args:
+            store: Очередь публикации
+            client: Клиент WordPress (по умолчанию общий для WordPressConfig.API_URL)
+            workers: Максимум одновременных публикаций (WordPressConfig.PUBLISH_WORKERS)
+            requests_per_second: Лимит запросов к хосту WordPress (None — текущий лимит хоста)
+            post_status: Статус создаваемых записей
+            retry_delay: Пауза перед повторной попыткой элемента, секунды (удваивается с каждой попыткой)
+            batch_size: Элементов в одном запросе batch/v1 (по умолчанию WordPressConfig.BATCH_SIZE, 1 — без пакетов)
+            media: Медиа-этап: изображения статей загружаются в медиатеку перед публикацией (None — без него)
+            taxonomy: Кеш рубрик, меток и авторов (None — записи без рубрик и меток)
+        """
+        self.store = store
+        self.client = client or get_wordpress_client()
+        self.workers = workers or WordPressConfig.PUBLISH_WORKERS
+        self.post_status = post_status
+        self.retry_delay = retry_delay
+        self.batch_size = max(1, batch_size or self.client.batch_size)
+        self.media = media
+        self.taxonomy = taxonomy
+        if requests_per_second:
+            get_host_limiter(self.client.api_url, requests_per_second)
+
+        self.concurrency = AdaptiveConcurrency(self.workers)
+        self.stats = PublishStats()
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._claimed = 0
+        self._limit: Optional[int] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    def build_post(self, item: QueueItem) -> Dict[str, Any]:
+        """Поля записи WordPress для элемента очереди (мета-поля SEO-плагина из WordPressConfig)"""
+        meta_fields = WordPressConfig.get_seo_meta_fields()
+        meta = {}
+        for name, value in (('focus_keyword', item.focus_keyword), ('meta_description', item.meta_description),
+                            ('title', item.title), ('canonical', item.canonical_url)):
+            if value and name in meta_fields:
+                meta[meta_fields[name]] = value
+        post = {
+            'title': item.title,
+            'content': item.content,
+            'slug': item.slug,
+            'status': self.post_status,
+            'meta': meta
+        }
+        if self.taxonomy is not None:
+            post.update(self.taxonomy.post_terms(item.focus_keyword))
+        return post
+
+    def publish_items(self, items: List[QueueItem]):
+        """
+        Публикация элементов одним пакетом batch/v1 и запись результата каждого в очередь
+
+        Args:
+            items: Захваченные элементы очереди
+        """
+        if self.taxonomy is not None:
+            # Метки пакета создаются одним проходом: поля записей разрешаются из кеша без запросов
+            self.taxonomy.prepare([item.focus_keyword for item in items])
+        posts = [self.build_post(item) for item in items]
+        if self.media is not None:
+            # Изображения всех статей пакета: сжатие, дедупликация и загрузка, затем ID вложений в HTML
+            media_results = self.media.process_articles([(post['content'], item.slug, item.focus_keyword)
+                                                         for post, item in zip(posts, items)])
+            for post, media in zip(posts, media_results):
+                post['content'] = media.html
+                if media.featured_media:
+                    post['featured_media'] = media.featured_media
+        results = self.client.save_posts([(post, item.focus_keyword) for post, item in zip(posts, items)])
+        for item, result in zip(items, results):
+            if result.ok:
+                self._record_published(item, result.post, result.status_code, result.created)
+            else:
+                self._record_failed(item, result)
+
+    def _record_published(self, item: QueueItem, post: Dict[str, Any], status_code: int, created: bool):
+        duration = time.perf_counter() - item.claimed_at
+        self.store.mark_published(item, post, status_code, duration)
+        with self._stats_lock:
+            self.stats.published += 1
+            self.stats.durations.append(duration)
+            if created:
+                self.stats.created += 1
+            else:
+                self.stats.updated += 1
+        self.logger.info(f"✅ Элемент {item.id} опубликован: WP ID {post['id']} ({duration:.2f} с)")
+
+    def _retry_at(self, item: QueueItem) -> datetime:
+        """Время следующей попытки: пауза удваивается с каждым повтором"""
+        return datetime.now() + timedelta(seconds=self.retry_delay * (2 ** item.retry_count))
+
+    def _mark_failed(self, item: QueueItem, error: str, retry_at: Optional[datetime]) -> str:
+        status = self.store.mark_failed(item, error, retry_at)
+        with self._stats_lock:
+            if status == 'failed':
+                self.stats.failed += 1
+            else:
+                self.stats.retried += 1
+        return status
+
+    def _record_failed(self, item: QueueItem, result: SaveResult):
+        # 4xx (кроме 429) не исправится повтором: неверные данные статьи или доступ
+        retry_at = self._retry_at(item) if result.retryable else None
+        error = f"HTTP {result.status_code}: {result.error}" if result.status_code else str(result.error)
+        status = self._mark_failed(item, error, retry_at)
+        self.logger.warning(f"❌ Элемент {item.id} ({item.slug}): {error} → {status}")
+
+    def _claim(self) -> List[QueueItem]:
+        with self._stats_lock:
+            size = self.batch_size
+            if self._limit is not None:
+                size = min(size, self._limit - self._claimed)
+                if size <= 0:
+                    return []
+            items = self.store.claim(size)
+            self._claimed += len(items)
+            return items
+
+    def _wait_for_schedule(self, wait_scheduled: bool) -> bool:
+        """Ожидание отложенных элементов; False — ждать нечего, поток завершается"""
+        if not wait_scheduled or (self._limit is not None and self._claimed >= self._limit):
+            return False
+        next_at = self.store.next_scheduled()
+        if next_at is None:
+            return False
+        delay = (next_at - datetime.now()).total_seconds()
+        self._stop.wait(min(max(delay, 0.5), 5.0))
+        return not self._stop.is_set()
+
+    def _worker(self, wait_scheduled: bool):
+        while not self._stop.is_set():
+            if not self.concurrency.acquire(self._stop):
+                return
+            items: List[QueueItem] = []
+            try:
+                items = self._claim()
+                if not items:
+                    if not self._wait_for_schedule(wait_scheduled):
+                        return
+                    continue
+                self.publish_items(items)
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка потока публикации: {e}")
+                # Непредвиденная ошибка: элементы не остаются в processing и повторяются
+                # с той же паузой, что и после 5xx (failed — после max_retries)
+                for item in items:
+                    self._mark_failed(item, str(e), self._retry_at(item))
+            finally:
+                self.concurrency.release()
+
+    def run(self, limit: Optional[int] = None, wait_scheduled: bool = False) -> PublishStats:
+        """
+        Разбор очереди до опустошения
+
+        Args:
+            limit: Максимум элементов за запуск
+            wait_scheduled: Ждать отложенные элементы (scheduled_at в будущем)
+
+        Returns:
+            Итоги разбора
+        """
+        self._limit = limit
+        self._stop.clear()
+        self.client.add_listener(self.concurrency.observe)
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._worker, args=(wait_scheduled,), name=f"publisher-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            # Начатые публикации завершаются, новые элементы не захватываются
+            self.stop()
+            for thread in threads:
+                thread.join()
+        finally:
+            self.client.remove_listener(self.concurrency.observe)
+            self.stats.elapsed = time.perf_counter() - started
+        return self.stats
+
+    def stop(self):
+        """Остановка после текущих публикаций"""
+        self._stop.set()
+
+
+# Экспорт
+__all__ = ['PublishQueueStore', 'QueueItem', 'AdaptiveConcurrency', 'PublishStats', 'BulkPublisher', 'PRIORITY_ORDER']
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Хеши полей последней публикации записей WordPress
+
+Для каждой записи хранятся SHA-256 полей, отправленных в последний раз
+(title, content, slug, excerpt, остальные поля верхнего уровня и каждое
+мета-поле отдельно как 'meta.<ключ>'), и modified_gmt записи после
+сохранения. Клиент WordPress по ним отправляет при обновлении только
+изменившиеся поля.
+
+Если modified_gmt записи на сайте отличается от сохраненного (запись
+правили в админке), хешам нет доверия: сравнение идет с полями самой
+записи.
+"""
+
+import json
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional, Tuple
+import sys
+import os
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+
+FIELD_HASHES_DDL = """
+    CREATE TABLE IF NOT EXISTS wp_published_fields (
+        site TEXT NOT NULL,
+        wp_post_id INTEGER NOT NULL,
+        modified_gmt TEXT,
+        hashes TEXT NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (site, wp_post_id)
+    )
+"""
+
+
+def _plain(value: Any) -> Any:
+    """Значение поля в том виде, в каком его отправляет пайплайн ({'raw': ...} → raw)"""
+    if isinstance(value, dict) and 'raw' in value:
+        return value['raw']
+    return value
+
+
+def _hash(value: Any) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def field_hashes(data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Хеши полей записи
+
+    Args:
+        data: Поля для отправки или запись WordPress (context=edit)
+
+    Returns:
+        Хеш по имени поля ('meta.<ключ>' для мета-полей)
+    """
+    hashes = {}
+    for key, value in data.items():
+        if key == 'meta' and isinstance(value, dict):
+            for meta_key, meta_value in value.items():
+                hashes[f"meta.{meta_key}"] = _hash(meta_value)
+        else:
+            hashes[key] = _hash(_plain(value))
+    return hashes
+
+
+def live_hashes(post: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Хеши полей записи на сайте (только тех, что есть в data)
+
+    Args:
+        post: Запись WordPress (context=edit)
+        data: Поля для отправки
+    """
+    subset = {key: post[key] for key in data if key != 'meta' and key in post}
+    post_meta = post.get('meta') if isinstance(post.get('meta'), dict) else {}
+    meta = {key: post_meta[key] for key in (data.get('meta') or {}) if key in post_meta}
+    if meta:
+        subset['meta'] = meta
+    return field_hashes(subset)
+
+
+def changed_fields(data: Dict[str, Any], previous: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Поля data, хеш которых отличается от previous
+
+    Args:
+        data: Поля для отправки
+        previous: Хеши последней публикации
+
+    Returns:
+        Только изменившиеся поля (мета — только изменившиеся ключи)
+    """
+    diff: Dict[str, Any] = {}
+    for key, value in data.items():
+        if key == 'meta' and isinstance(value, dict):
+            meta = {meta_key: meta_value for meta_key, meta_value in value.items()
+                    if previous.get(f"meta.{meta_key}") != _hash(meta_value)}
+            if meta:
+                diff['meta'] = meta
+        elif previous.get(key) != _hash(_plain(value)):
+            diff[key] = value
+    return diff
+
+
+class FieldHashStore:
+    """Хеши полей последней публикации в файле SQLite (общий для потоков и запусков)"""
+
+    def __init__(self, path: str):
+        """
+        Инициализация хранилища
+
+        Args:
+            path: Файл SQLite (создается при необходимости)
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute(FIELD_HASHES_DDL)
+        self.connection.commit()
+
+    def get(self, site: str, wp_post_id: int) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Хеши последней публикации записи
+
+        Returns:
+            modified_gmt записи после публикации и хеши полей (пустые, если записи нет)
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT modified_gmt, hashes FROM wp_published_fields WHERE site = ? AND wp_post_id = ?",
+                (site, wp_post_id)
+            ).fetchone()
+        if not row:
+            return None, {}
+        return row[0], json.loads(row[1])
+
+    def put(self, site: str, wp_post_id: int, hashes: Dict[str, str], modified_gmt: Optional[str] = None):
+        """
+        Сохранение хешей после публикации
+
+        Args:
+            site: URL REST API сайта
+            wp_post_id: ID записи
+            hashes: Хеши полей записи после публикации
+            modified_gmt: modified_gmt записи из ответа WordPress
+        """
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO wp_published_fields (site, wp_post_id, modified_gmt, hashes) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(site, wp_post_id) DO UPDATE SET modified_gmt = excluded.modified_gmt, "
+                "hashes = excluded.hashes, updated_at = CURRENT_TIMESTAMP",
+                (site, wp_post_id, modified_gmt, json.dumps(hashes, sort_keys=True))
+            )
+            self.connection.commit()
+
+    def forget(self, site: str, wp_post_id: int):
+        """Удаление хешей записи (следующее обновление отправит все поля)"""
+        with self._lock:
+            self.connection.execute("DELETE FROM wp_published_fields WHERE site = ? AND wp_post_id = ?",
+                                    (site, wp_post_id))
+            self.connection.commit()
+
+    def close(self):
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+
+
+_stores: Dict[str, FieldHashStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_field_hash_store(path: Optional[str] = None) -> Optional[FieldHashStore]:
+    """
+    Общее хранилище хешей полей для файла (по умолчанию WordPressConfig.FIELD_HASHES_PATH)
+
+    Returns:
+        Хранилище или None, если путь не задан (обновления отправляются целиком)
+    """
+    path = WordPressConfig.FIELD_HASHES_PATH if path is None else path
+    if not path:
+        return None
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = FieldHashStore(key)
+            _stores[key] = store
+        return store
+
+
+# Экспорт
+__all__ = ['FieldHashStore', 'get_field_hash_store', 'field_hashes', 'live_hashes', 'changed_fields']
@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Медиа-этап публикации: изображения статей в медиатеку WordPress
+
+- Источники из <img src>: локальные файлы (относительно MEDIA_SOURCE_DIR)
+  и внешние URL; изображения, уже лежащие в медиатеке сайта, не трогаются
+- Уменьшение до MAX_IMAGE_SIZE и сжатие с IMAGE_QUALITY в пуле процессов
+  (Pillow), WebP — если он есть в SUPPORTED_FORMATS
+- Дедупликация по локальному индексу загруженных файлов: SHA-256 исходного
+  файла и перцептивный хеш (dHash, 256 бит) при том же соотношении сторон,
+  в том числе внутри пакета
+- Загрузка в /wp/v2/media в несколько потоков под общим лимитом запросов
+  хоста, ID вложений подставляются в HTML (class wp-image-ID, width, height)
+"""
+
+import io
+import os
+import re
+import sqlite3
+import hashlib
+import logging
+import mimetypes
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, Future
+from multiprocessing import Pool
+from typing import Dict, Any, List, Optional, Tuple
+import sys
+
+import requests
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+from modules.publisher.wordpress_client import WordPressClient, get_wordpress_client
+
+try:
+    from PIL import Image, ImageOps, features
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = ImageOps = features = None
+    PIL_AVAILABLE = False
+
+_IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_WP_IMAGE_CLASS_RE = re.compile(r'\bwp-image-\d+\b')
+
+# Форматы Pillow → расширение и MIME-тип
+_FORMATS = {
+    'JPEG': ('jpg', 'image/jpeg'),
+    'PNG': ('png', 'image/png'),
+    'WEBP': ('webp', 'image/webp'),
+    'GIF': ('gif', 'image/gif')
+}
+
+MEDIA_INDEX_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS media_index (
+        site TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        phash TEXT,
+        media_id INTEGER NOT NULL,
+        source_url TEXT NOT NULL,
+        width INTEGER,
+        height INTEGER,
+        mime_type TEXT,
+        bytes INTEGER,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (site, content_hash)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS media_sources (
+        site TEXT NOT NULL,
+        src TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        PRIMARY KEY (site, src)
+    )
+    """
+]
+
+
+def _attr_pattern(name: str) -> str:
+    """Атрибут name, но не data-name / aria-name (граница слова есть и после дефиса)"""
+    return r'(?<![\w-])' + name + r'\s*=\s*(["\'])'
+
+
+def _attr(tag: str, name: str) -> Optional[str]:
+    match = re.search(_attr_pattern(name) + r'(.*?)\1', tag, re.IGNORECASE | re.DOTALL)
+    return match.group(2) if match else None
+
+
+def _set_attr(tag: str, name: str, value: Any) -> str:
+    """Значение атрибута тега (заменяется или добавляется перед закрытием тега)"""
+    pattern = re.compile(_attr_pattern(name) + r'.*?\1', re.IGNORECASE | re.DOTALL)
+    replacement = f'{name}="{value}"'
+    if pattern.search(tag):
+        return pattern.sub(lambda _: replacement, tag, count=1)
+    return re.sub(r'\s*/?>$', lambda m: f' {replacement}{m.group(0)}', tag, count=1)
+
+
+# Сторона сетки перцептивного хеша (HASH_SIZE² бит) и допуск соотношения сторон похожих изображений
+HASH_SIZE = 16
+ASPECT_TOLERANCE = 0.02
+
+
+def _hamming(left: str, right: str) -> int:
+    return bin(int(left, 16) ^ int(right, 16)).count('1')
+
+
+def _same_aspect(left: Tuple[Optional[int], Optional[int]], right: Tuple[Optional[int], Optional[int]]) -> bool:
+    if not all(left) or not all(right):
+        return False
+    return abs(left[0] / left[1] - right[0] / right[1]) <= ASPECT_TOLERANCE * (right[0] / right[1])
+
+
+def perceptual_hash(image) -> str:
+    """
+    Разностный хеш изображения (dHash): 256 бит в 64 hex-символах
+
+    Уменьшенная копия 17×16 в оттенках серого, бит — ярче ли пиксель
+    соседа справа. Устойчив к масштабу и сжатию: копии другого размера
+    и качества отличаются на единицы бит, разные изображения — на десятки.
+    """
+    small = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for column in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + column] > pixels[offset + column + 1])
+    return f"{value:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+@dataclass
+class ProcessedImage:
+    """Результат обработки изображения в процессе пула"""
+    content_hash: str
+    data: bytes = b''
+    extension: str = ''
+    mime_type: str = ''
+    width: Optional[int] = None
+    height: Optional[int] = None
+    phash: Optional[str] = None
+    source_bytes: int = 0
+    error: Optional[str] = None
+
+
+def process_image(job: Tuple[str, bytes, str, int, int, bool]) -> ProcessedImage:
+    """
+    Уменьшение и сжатие изображения (выполняется в процессе пула)
+
+    Args:
+        job: SHA-256 исходного файла, содержимое, имя источника,
+            максимальная сторона, качество, разрешен ли WebP
+
+    Returns:
+        Сжатое изображение (исходное, если сжатие его не уменьшило)
+    """
+    content_hash, raw, src, max_size, quality, webp = job
+    result = ProcessedImage(content_hash=content_hash, source_bytes=len(raw))
+    if not PIL_AVAILABLE:
+        # Без Pillow файл загружается как есть
+        mime_type = mimetypes.guess_type(src.split('?')[0])[0] or 'application/octet-stream'
+        result.data, result.mime_type = raw, mime_type
+        result.extension = mimetypes.guess_extension(mime_type) or ''
+        result.extension = result.extension.lstrip('.')
+        return result
+
+    try:
+        image = Image.open(io.BytesIO(raw))
+        source_format = image.format
+        if source_format not in _FORMATS:
+            raise ValueError(f"формат {source_format} не поддерживается")
+        result.phash = perceptual_hash(image)
+
+        if getattr(image, 'is_animated', False):
+            # Анимацию не пережимаем
+            result.data = raw
+            result.extension, result.mime_type = _FORMATS[source_format]
+            result.width, result.height = image.size
+            return result
+
+        image = ImageOps.exif_transpose(image)
+        resized = max(image.size) > max_size
+        if resized:
+            image.thumbnail((max_size, max_size), Image.LANCZOS)
+
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        if webp:
+            target = 'WEBP'
+        elif has_alpha or source_format == 'PNG':
+            target = 'PNG'
+        else:
+            target = 'JPEG'
+
+        output = io.BytesIO()
+        if target == 'WEBP':
+            image.save(output, 'WEBP', quality=quality, method=4)
+        elif target == 'PNG':
+            if image.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+                image = image.convert('RGBA')
+            image.save(output, 'PNG', optimize=True)
+        else:
+            image.convert('RGB').save(output, 'JPEG', quality=quality, optimize=True, progressive=True)
+
+        if not resized and output.tell() >= len(raw) and source_format != 'GIF':
+            # Исходный файл уже меньше: оставляем его
+            result.data = raw
+            result.extension, result.mime_type = _FORMATS[source_format]
+        else:
+            result.data = output.getvalue()
+            result.extension, result.mime_type = _FORMATS[target]
+        result.width, result.height = image.size
+    except Exception as e:
+        result.error = f"{e.__class__.__name__}: {e}"
+    return result
+
+
+@dataclass
+class MediaRecord:
+    """Файл, уже загруженный в медиатеку"""
+    media_id: int
+    source_url: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    mime_type: Optional[str] = None
+
+
+class MediaIndex:
+    """Локальный индекс загруженных изображений (SQLite, общий для потоков и запусков)"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Инициализация индекса
+
+        Args:
+            path: Файл SQLite (по умолчанию WordPressConfig.MEDIA_INDEX_PATH)
+        """
+        path = os.path.abspath(path or WordPressConfig.MEDIA_INDEX_PATH)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        for sql in MEDIA_INDEX_DDL:
+            self.connection.execute(sql)
+        self.connection.commit()
+        # Перцептивные хеши по сайту (загружаются при первом поиске похожих)
+        self._phashes: Dict[str, List[Tuple[str, MediaRecord]]] = {}
+
+    @staticmethod
+    def _record(row) -> MediaRecord:
+        return MediaRecord(media_id=row[0], source_url=row[1], width=row[2], height=row[3], mime_type=row[4])
+
+    def by_hash(self, site: str, content_hash: str) -> Optional[MediaRecord]:
+        """Файл с тем же содержимым источника"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT media_id, source_url, width, height, mime_type FROM media_index "
+                "WHERE site = ? AND content_hash = ?", (site, content_hash)
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def by_src(self, site: str, src: str) -> Optional[MediaRecord]:
+        """Файл, уже загруженный из этого URL"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT m.media_id, m.source_url, m.width, m.height, m.mime_type FROM media_sources s "
+                "JOIN media_index m ON m.site = s.site AND m.content_hash = s.content_hash "
+                "WHERE s.site = ? AND s.src = ?", (site, src)
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def similar(self, site: str, phash: str, max_bits: int,
+                size: Tuple[Optional[int], Optional[int]]) -> Optional[MediaRecord]:
+        """
+        Ближайший по перцептивному хешу файл
+
+        Args:
+            site: Сайт
+            phash: Перцептивный хеш изображения
+            max_bits: Максимум различающихся бит
+            size: Ширина и высота изображения (соотношение сторон должно совпадать)
+        """
+        with self._lock:
+            if site not in self._phashes:
+                rows = self.connection.execute(
+                    "SELECT phash, media_id, source_url, width, height, mime_type FROM media_index "
+                    "WHERE site = ? AND phash IS NOT NULL", (site,)
+                ).fetchall()
+                self._phashes[site] = [(row[0], self._record(row[1:])) for row in rows]
+            candidates = list(self._phashes[site])
+        best = None
+        best_distance = max_bits + 1
+        for candidate_hash, record in candidates:
+            if len(candidate_hash) != len(phash) or not _same_aspect(size, (record.width, record.height)):
+                continue
+            distance = _hamming(phash, candidate_hash)
+            if distance < best_distance:
+                best, best_distance = record, distance
+        return best
+
+    def add(self, site: str, content_hash: str, phash: Optional[str], record: MediaRecord,
+            size: Optional[int] = None, src: Optional[str] = None):
+        """Запись загруженного (или сопоставленного похожему) файла"""
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO media_index (site, content_hash, phash, media_id, source_url, width, height, "
+                "mime_type, bytes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (site, content_hash, phash, record.media_id, record.source_url, record.width, record.height,
+                 record.mime_type, size)
+            )
+            if src:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO media_sources (site, src, content_hash) VALUES (?, ?, ?)",
+                    (site, src, content_hash)
+                )
+            self.connection.commit()
+            if phash and site in self._phashes:
+                self._phashes[site].append((phash, record))
+
+    def add_source(self, site: str, src: str, content_hash: str):
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO media_sources (site, src, content_hash) VALUES (?, ?, ?)",
+                (site, src, content_hash)
+            )
+            self.connection.commit()
+
+    def close(self):
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+
+
+@dataclass
+class MediaResult:
+    """Статья после медиа-этапа"""
+    html: str
+    media_ids: List[int] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+    @property
+    def featured_media(self) -> Optional[int]:
+        """Первое изображение статьи — кандидат в миниатюру записи"""
+        return self.media_ids[0] if self.media_ids else None
+
+
+@dataclass
+class MediaStats:
+    """Статистика медиа-этапа"""
+    images: int = 0
+    uploaded: int = 0
+    reused: int = 0
+    similar: int = 0
+    failed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'images': self.images,
+            'uploaded': self.uploaded,
+            'reused': self.reused,
+            'similar': self.similar,
+            'failed': self.failed,
+            'bytes_before': self.bytes_before,
+            'bytes_after': self.bytes_after
+        }
+
+
+def _is_remote(src: str) -> bool:
+    return src.startswith(('http://', 'https://', '//'))
+
+
+def _slug_part(slug: str) -> str:
+    return re.sub(r'[^a-z0-9-]+', '-', (slug or 'image').lower()).strip('-')[:50] or 'image'
+
+
+class MediaPipeline:
+    """Обработка, дедупликация и загрузка изображений статей"""
+
+    def __init__(self, client: Optional[WordPressClient] = None, index: Optional[MediaIndex] = None,
+                 workers: Optional[int] = None, upload_workers: Optional[int] = None,
+                 source_dir: Optional[str] = None, webp: Optional[bool] = None):
+        """
+        Инициализация медиа-этапа
+
+        Args:
+            client: Клиент WordPress (по умолчанию общий)
+            index: Индекс загруженных файлов (по умолчанию WordPressConfig.MEDIA_INDEX_PATH)
+            workers: Процессов обработки изображений
+            upload_workers: Потоков загрузки (общий лимит запросов хоста соблюдается)
+            source_dir: Каталог для относительных src
+            webp: Конвертировать в WebP (по умолчанию — если webp в SUPPORTED_FORMATS)
+        """
+        self.client = client or get_wordpress_client()
+        self.index = index or MediaIndex()
+        self.workers = max(1, workers or WordPressConfig.MEDIA_WORKERS)
+        self.upload_workers = max(1, upload_workers or WordPressConfig.PUBLISH_WORKERS)
+        self.source_dir = source_dir or WordPressConfig.MEDIA_SOURCE_DIR
+        if webp is None:
+            webp = 'webp' in WordPressConfig.SUPPORTED_FORMATS
+        self.webp = webp and PIL_AVAILABLE and features.check('webp')
+        self.site = self.client.api_url.partition('/wp-json')[0]
+        self.stats = MediaStats()
+        # Статистика общая для потоков публикации
+        self._stats_lock = threading.Lock()
+        # Пул процессов — один на все потоки публикации; загрузки по хешу — одна на процесс
+        self._pool_lock = threading.Lock()
+        self._uploads_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._http = requests.Session()
+        self._http.headers.update({'User-Agent': 'BizFin-Pro-SEO-Pipeline/2.0'})
+        self.logger = logging.getLogger(__name__)
+        if not PIL_AVAILABLE:
+            self.logger.warning("⚠️ Pillow не установлен: изображения загружаются без сжатия")
+
+    def _count(self, **increments: int):
+        """Увеличение счетчиков статистики (под блокировкой)"""
+        with self._stats_lock:
+            for name, value in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+    def _image_refs(self, html: str) -> List[Tuple[str, str]]:
+        """(src, alt) изображений, которых еще нет в медиатеке сайта"""
+        refs = []
+        for tag in _IMG_TAG_RE.findall(html or ''):
+            src = (_attr(tag, 'src') or '').strip()
+            if not src or src.startswith('data:') or _WP_IMAGE_CLASS_RE.search(_attr(tag, 'class') or ''):
+                continue
+            if src.startswith(self.site) and '/wp-content/uploads/' in src:
+                continue
+            refs.append((src, _attr(tag, 'alt') or ''))
+        return refs
+
+    def _read(self, src: str) -> bytes:
+        if _is_remote(src):
+            response = self._http.get('https:' + src if src.startswith('//') else src,
+                                      timeout=WordPressConfig.API_TIMEOUT)
+            response.raise_for_status()
+            return response.content
+        path = src[len('file://'):] if src.startswith('file://') else src
+        if not os.path.isabs(path):
+            path = os.path.join(self.source_dir, path)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _process(self, jobs: List[Tuple[str, bytes, str, int, int, bool]]) -> List[ProcessedImage]:
+        if self.workers <= 1 or len(jobs) < 2:
+            return [process_image(job) for job in jobs]
+        with self._pool_lock, Pool(processes=min(self.workers, len(jobs))) as pool:
+            return pool.map(process_image, jobs)
+
+    def _upload(self, image: ProcessedImage, slug: str, alt: str) -> MediaRecord:
+        filename = f"{_slug_part(slug)}-{image.content_hash[:12]}.{image.extension}"
+        media = self.client.upload_media(image.data, filename, image.mime_type, {'alt_text': alt} if alt else None)
+        details = media.get('media_details') or {}
+        return MediaRecord(
+            media_id=media['id'],
+            source_url=media.get('source_url', ''),
+            width=details.get('width') or image.width,
+            height=details.get('height') or image.height,
+            mime_type=media.get('mime_type') or image.mime_type
+        )
+
+    def process_articles(self, articles: List[Tuple[str, str, Optional[str]]]) -> List[MediaResult]:
+        """
+        Медиа-этап для пакета статей
+
+        Изображения всех статей обрабатываются вместе: одинаковые и похожие
+        загружаются один раз. Изображение, которое не удалось загрузить,
+        остается в статье с исходным src.
+
+        Args:
+            articles: HTML, slug и ключевое слово (alt по умолчанию) каждой статьи
+
+        Returns:
+            Статьи с подставленными вложениями в порядке articles
+        """
+        resolved: Dict[str, MediaRecord] = {}
+        pending: Dict[str, Tuple[str, str]] = {}
+        for html, slug, keyword in articles:
+            for src, alt in self._image_refs(html):
+                self._count(images=1)
+                if src in resolved or src in pending:
+                    continue
+                record = self.index.by_src(self.site, src) if _is_remote(src) else None
+                if record:
+                    resolved[src] = record
+                    self._count(reused=1)
+                else:
+                    pending[src] = (slug, alt or keyword or '')
+
+        # Загрузка источников (внешние URL — в несколько потоков)
+        sources: Dict[str, bytes] = {}
+        failed: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as executor:
+            futures = {src: executor.submit(self._read, src) for src in pending}
+            for src, future in futures.items():
+                try:
+                    sources[src] = future.result()
+                except (OSError, requests.RequestException) as e:
+                    failed[src] = str(e)
+
+        # Точные повторы по содержимому
+        srcs_by_hash: Dict[str, List[str]] = {}
+        jobs = []
+        for src, raw in sources.items():
+            content_hash = hashlib.sha256(raw).hexdigest()
+            record = self.index.by_hash(self.site, content_hash)
+            if record:
+                resolved[src] = record
+                self._count(reused=1)
+                if _is_remote(src):
+                    self.index.add_source(self.site, src, content_hash)
+                continue
+            if content_hash not in srcs_by_hash:
+                jobs.append((content_hash, raw, src, WordPressConfig.MAX_IMAGE_SIZE,
+                             WordPressConfig.IMAGE_QUALITY, self.webp))
+            srcs_by_hash.setdefault(content_hash, []).append(src)
+
+        # Сжатие в пуле процессов, затем похожие (перцептивный хеш) — в индексе и внутри пакета
+        uploads: List[ProcessedImage] = []
+        aliases: Dict[str, ProcessedImage] = {}
+        for image in self._process(jobs):
+            srcs = srcs_by_hash[image.content_hash]
+            if image.error:
+                for src in srcs:
+                    failed[src] = image.error
+                continue
+            if image.phash:
+                record = self.index.similar(self.site, image.phash, WordPressConfig.MEDIA_SIMILARITY_BITS,
+                                            (image.width, image.height))
+                if record:
+                    self._resolve(srcs, image, record, resolved)
+                    self._count(similar=1)
+                    continue
+                twin = next((queued for queued in uploads if queued.phash
+                             and _same_aspect((image.width, image.height), (queued.width, queued.height))
+                             and _hamming(image.phash, queued.phash) <= WordPressConfig.MEDIA_SIMILARITY_BITS), None)
+                if twin:
+                    aliases[image.content_hash] = twin
+                    self._count(similar=1)
+                    continue
+            uploads.append(image)
+
+        # Загрузка в медиатеку (общий лимит запросов хоста)
+        uploaded: Dict[str, MediaRecord] = {}
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as executor:
+            futures = {}
+            owned = set()
+            for image in uploads:
+                slug, alt = pending[srcs_by_hash[image.content_hash][0]]
+                # Тот же файл уже загружает другой поток публикации — ждем его результат
+                with self._uploads_lock:
+                    future = self._inflight.get(image.content_hash)
+                    if future is None:
+                        future = executor.submit(self._upload, image, slug, alt)
+                        self._inflight[image.content_hash] = future
+                        owned.add(image.content_hash)
+                futures[image.content_hash] = future
+            for image in uploads:
+                srcs = srcs_by_hash[image.content_hash]
+                try:
+                    record = futures[image.content_hash].result()
+                except requests.RequestException as e:
+                    if image.content_hash in owned:
+                        with self._uploads_lock:
+                            self._inflight.pop(image.content_hash, None)
+                    for src in srcs:
+                        failed[src] = str(e)
+                    continue
+                uploaded[image.content_hash] = record
+                if image.content_hash in owned:
+                    self._count(uploaded=1, bytes_before=image.source_bytes, bytes_after=len(image.data))
+                self._resolve(srcs, image, record, resolved)
+                if image.content_hash in owned:
+                    # Файл уже в индексе: следующие пакеты найдут его по хешу
+                    with self._uploads_lock:
+                        self._inflight.pop(image.content_hash, None)
+
+        for content_hash, twin in aliases.items():
+            record = uploaded.get(twin.content_hash)
+            srcs = srcs_by_hash[content_hash]
+            if record is None:
+                for src in srcs:
+                    failed[src] = failed.get(srcs_by_hash[twin.content_hash][0], 'похожее изображение не загружено')
+                continue
+            self._resolve(srcs, ProcessedImage(content_hash=content_hash, phash=twin.phash), record, resolved)
+
+        for src, error in failed.items():
+            self._count(failed=1)
+            self.logger.warning(f"⚠️ Изображение {src}: {error}")
+
+        return [self._rewrite(html, resolved, failed) for html, _, _ in articles]
+
+    def process_article(self, html: str, slug: str, keyword: Optional[str] = None) -> MediaResult:
+        """Медиа-этап для одной статьи"""
+        return self.process_articles([(html, slug, keyword)])[0]
+
+    def _resolve(self, srcs: List[str], image: ProcessedImage, record: MediaRecord, resolved: Dict[str, MediaRecord]):
+        """Сопоставление источников с файлом медиатеки и запись в индекс"""
+        remote = [src for src in srcs if _is_remote(src)]
+        self.index.add(self.site, image.content_hash, image.phash, record, len(image.data) or None,
+                       remote[0] if remote else None)
+        for src in remote[1:]:
+            self.index.add_source(self.site, src, image.content_hash)
+        for src in srcs:
+            resolved[src] = record
+
+    def _rewrite(self, html: str, resolved: Dict[str, MediaRecord], failed: Dict[str, str]) -> MediaResult:
+        """Подстановка вложений в теги <img>"""
+        result = MediaResult(html=html)
+
+        def replace(match) -> str:
+            tag = match.group(0)
+            src = (_attr(tag, 'src') or '').strip()
+            record = resolved.get(src)
+            if record is None:
+                if src in failed:
+                    result.failed.append(src)
+                return tag
+            classes = ' '.join(filter(None, [_attr(tag, 'class'), f"wp-image-{record.media_id}"]))
+            tag = _set_attr(tag, 'src', record.source_url)
+            tag = _set_attr(tag, 'class', classes)
+            # srcset исходного файла больше не нужен: WordPress построит его по wp-image-ID
+            tag = re.sub(r'\s+srcset\s*=\s*(["\']).*?\1', '', tag, flags=re.IGNORECASE | re.DOTALL)
+            if record.width and record.height:
+                tag = _set_attr(tag, 'width', record.width)
+                tag = _set_attr(tag, 'height', record.height)
+            if record.media_id not in result.media_ids:
+                result.media_ids.append(record.media_id)
+            return tag
+
+        result.html = _IMG_TAG_RE.sub(replace, html or '')
+        return result
+
+    def close(self):
+        self._http.close()
+
+
+# Экспорт
+__all__ = [
+    'MediaPipeline', 'MediaIndex', 'MediaRecord', 'MediaResult', 'MediaStats', 'ProcessedImage',
+    'process_image', 'perceptual_hash', 'PIL_AVAILABLE'
+]
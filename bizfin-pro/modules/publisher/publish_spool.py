@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Спул публикации: готовые записи WordPress, которые не удалось опубликовать
+
+Если WordPress недоступен (сеть, 429, 5xx после всех повторов клиента),
+полностью подготовленные поля записи (title, content, slug, status, meta)
+и данные для записи результата в БД скрипта-источника сохраняются в файл
+SQLite, а не теряются вместе с результатом генерации. Отложенную
+публикацию можно положить в спул сразу (delay).
+
+PublishSpoolDrainer публикует записи спула с растущей паузой между
+попытками: при первой же ошибке, которую может исправить повтор, проход
+прекращается (сайт еще недоступен), остальные записи ждут следующего.
+Ошибки 4xx (кроме 429) повтором не исправить: запись получает статус
+dead и остается в спуле до requeue_dead.
+
+Статусы: pending → processing → published (запись есть в WordPress) →
+done (результат записан в БД источника). Запись в БД выполняет сам
+скрипт-источник (take_published/mark_done) в своем потоке, поэтому спул
+может разбирать и фоновый поток, и отдельный процесс (drain_publish_spool.py).
+"""
+
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+import sys
+import os
+
+import requests
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+from modules.publisher.wordpress_client import WordPressClient, get_wordpress_client, RETRY_STATUSES
+
+SPOOL_DDL = """
+    CREATE TABLE IF NOT EXISTS publish_spool (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        site TEXT NOT NULL,
+        slug TEXT NOT NULL, -- slug записи или payload:<SHA-256 полей>, если slug пуст
+        keyword TEXT,
+        source TEXT,
+        payload TEXT NOT NULL,
+        context TEXT,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        next_attempt_at REAL NOT NULL DEFAULT 0,
+        claimed_at REAL,
+        wp_post_id INTEGER,
+        wp_url TEXT,
+        wp_status TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (site, slug)
+    )
+"""
+
+SPOOL_INDEX = "CREATE INDEX IF NOT EXISTS idx_publish_spool_due ON publish_spool (status, next_attempt_at)"
+
+_COLUMNS = ("id, site, slug, keyword, source, payload, context, status, attempts, last_error, "
+            "wp_post_id, wp_url, wp_status")
+
+
+@dataclass
+class SpoolEntry:
+    """Запись спула"""
+    id: int
+    site: str
+    slug: str
+    keyword: Optional[str]
+    source: Optional[str]
+    payload: Dict[str, Any]
+    context: Dict[str, Any]
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    wp_post_id: Optional[int] = None
+    wp_url: Optional[str] = None
+    wp_status: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row) -> 'SpoolEntry':
+        return cls(row[0], row[1], row[2], row[3], row[4], json.loads(row[5]), json.loads(row[6] or '{}'),
+                   *row[7:])
+
+    @property
+    def wp_result(self) -> Dict[str, Any]:
+        """Результат публикации в формате publish_to_wordpress"""
+        return {'wp_id': self.wp_post_id, 'wp_url': self.wp_url, 'status': self.wp_status}
+
+
+def _spool_key(payload: Dict[str, Any]) -> str:
+    """
+    Ключ записи спула на сайте: slug, а без него — хеш полей записи
+
+    Записи без slug (WordPress сгенерирует его из заголовка) иначе
+    совпали бы по пустому ключу и заменяли друг друга.
+    """
+    slug = (payload.get('slug') or '').strip()
+    if slug:
+        return slug
+    digest = hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"payload:{digest}"
+
+
+class PublishSpool:
+    """Спул публикации в файле SQLite (общий для потоков и процессов)"""
+
+    def __init__(self, path: str):
+        """
+        Инициализация спула
+
+        Args:
+            path: Файл SQLite (создается при необходимости)
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute(SPOOL_DDL)
+        self.connection.execute(SPOOL_INDEX)
+        self.connection.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Запрос с фиксацией (вызывается под блокировкой), возвращает число затронутых строк"""
+        cursor = self.connection.execute(sql, params)
+        self.connection.commit()
+        return cursor.rowcount
+
+    def put(self, site: str, payload: Dict[str, Any], keyword: Optional[str] = None,
+            source: Optional[str] = None, context: Optional[Dict[str, Any]] = None,
+            error: Optional[str] = None, delay: float = 0) -> int:
+        """
+        Сохранение записи для публикации позже
+
+        Повторная запись той же статьи (сайт и slug; без slug — те же
+        поля записи) заменяет поля и возвращает ее в ожидание.
+
+        Args:
+            site: URL REST API сайта
+            payload: Поля записи WordPress (как для save_post)
+            keyword: Ключевое слово (поиск уже созданной записи)
+            source: Скрипт-источник, который запишет результат в свою БД
+            context: Данные источника для записи результата (JSON-совместимые)
+            error: Ошибка, из-за которой публикация отложена
+            delay: Не публиковать раньше, секунды
+
+        Returns:
+            ID записи спула
+        """
+        key = _spool_key(payload)
+        with self._lock:
+            self._execute(
+                "INSERT INTO publish_spool (site, slug, keyword, source, payload, context, last_error, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(site, slug) DO UPDATE SET keyword = excluded.keyword, source = excluded.source, "
+                "payload = excluded.payload, context = excluded.context, status = 'pending', "
+                "last_error = excluded.last_error, next_attempt_at = excluded.next_attempt_at, "
+                "updated_at = CURRENT_TIMESTAMP",
+                (site, key, keyword, source, json.dumps(payload, ensure_ascii=False),
+                 json.dumps(context or {}, ensure_ascii=False), error, time.time() + delay)
+            )
+            row = self.connection.execute("SELECT id FROM publish_spool WHERE site = ? AND slug = ?",
+                                          (site, key)).fetchone()
+        return row[0]
+
+    def claim_due(self, site: Optional[str] = None, limit: int = 10) -> List[SpoolEntry]:
+        """
+        Захват записей, время публикации которых наступило (pending → processing)
+
+        Args:
+            site: Только записи этого сайта
+            limit: Максимум записей
+        """
+        sql = f"SELECT {_COLUMNS} FROM publish_spool WHERE status = 'pending' AND next_attempt_at <= ?"
+        params: tuple = (time.time(),)
+        if site:
+            sql += " AND site = ?"
+            params += (site,)
+        sql += " ORDER BY next_attempt_at, id LIMIT ?"
+        with self._lock:
+            candidates = [SpoolEntry.from_row(row) for row in self.connection.execute(sql, params + (limit,))]
+            # Спул может разбирать и другой процесс: захвачены только записи, которые еще pending
+            entries = [
+                entry for entry in candidates
+                if self.connection.execute(
+                    "UPDATE publish_spool SET status = 'processing', claimed_at = ?, updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id = ? AND status = 'pending'", (time.time(), entry.id)
+                ).rowcount == 1
+            ]
+            self.connection.commit()
+        return entries
+
+    def mark_published(self, entry: SpoolEntry, post: Dict[str, Any]):
+        """Запись опубликована: ждет записи результата в БД источника"""
+        with self._lock:
+            self._execute(
+                "UPDATE publish_spool SET status = 'published', attempts = attempts + 1, last_error = NULL, "
+                "wp_post_id = ?, wp_url = ?, wp_status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (post['id'], post.get('link', ''), post.get('status', 'draft'), entry.id)
+            )
+
+    def mark_failed(self, entry: SpoolEntry, error: str, retry_delay: Optional[float]):
+        """
+        Неудачная попытка публикации
+
+        Args:
+            entry: Запись спула
+            error: Текст ошибки
+            retry_delay: Пауза до следующей попытки, секунды (None — ошибка не исправится повтором: dead)
+        """
+        status = 'dead' if retry_delay is None else 'pending'
+        with self._lock:
+            self._execute(
+                "UPDATE publish_spool SET status = ?, attempts = attempts + 1, last_error = ?, next_attempt_at = ?, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (status, error, time.time() + (retry_delay or 0), entry.id)
+            )
+
+    def release(self, entries: List[SpoolEntry]):
+        """Возврат захваченных, но не опубликованных записей без учета попытки"""
+        if not entries:
+            return
+        with self._lock:
+            self._execute(
+                f"UPDATE publish_spool SET status = 'pending' WHERE status = 'processing' "
+                f"AND id IN ({', '.join('?' * len(entries))})",
+                tuple(entry.id for entry in entries)
+            )
+
+    def take_published(self, source: str, limit: int = 100) -> List[SpoolEntry]:
+        """Опубликованные записи источника, результат которых еще не записан в его БД"""
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT {_COLUMNS} FROM publish_spool WHERE status = 'published' AND source = ? ORDER BY id LIMIT ?",
+                (source, limit)
+            ).fetchall()
+        return [SpoolEntry.from_row(row) for row in rows]
+
+    def mark_done(self, entry: SpoolEntry):
+        """Результат записан в БД источника: поля записи больше не нужны"""
+        with self._lock:
+            self._execute(
+                "UPDATE publish_spool SET status = 'done', payload = '{}', context = NULL, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?", (entry.id,)
+            )
+
+    def next_due(self, site: Optional[str] = None) -> Optional[float]:
+        """Секунд до ближайшей попытки (None — ждать нечего)"""
+        sql = "SELECT MIN(next_attempt_at) FROM publish_spool WHERE status = 'pending'"
+        params: tuple = ()
+        if site:
+            sql += " AND site = ?"
+            params = (site,)
+        with self._lock:
+            row = self.connection.execute(sql, params).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def recover_stale(self, older_than: float = 600) -> int:
+        """Возврат в ожидание записей processing прерванного разбора"""
+        with self._lock:
+            return self._execute(
+                "UPDATE publish_spool SET status = 'pending', updated_at = CURRENT_TIMESTAMP "
+                "WHERE status = 'processing' AND claimed_at < ?", (time.time() - older_than,)
+            )
+
+    def requeue_dead(self) -> int:
+        """Возврат записей dead в ожидание (после исправления причины ошибки)"""
+        with self._lock:
+            return self._execute(
+                "UPDATE publish_spool SET status = 'pending', attempts = 0, next_attempt_at = 0, "
+                "updated_at = CURRENT_TIMESTAMP WHERE status = 'dead'"
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """Число записей по статусам"""
+        with self._lock:
+            rows = self.connection.execute("SELECT status, COUNT(*) FROM publish_spool GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+
+
+@dataclass
+class SpoolDrainStats:
+    """Итоги разбора спула"""
+    published: int = 0
+    retried: int = 0
+    dead: int = 0
+    passes: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'published': self.published, 'retried': self.retried, 'dead': self.dead, 'passes': self.passes}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Ошибку может исправить повтор позже (сеть, 429, 5xx)"""
+    response = getattr(error, 'response', None)
+    return response is None or response.status_code in RETRY_STATUSES
+
+
+class PublishSpoolDrainer:
+    """Публикация записей спула с растущей паузой, пока WordPress недоступен"""
+
+    def __init__(self, spool: PublishSpool, client: Optional[WordPressClient] = None,
+                 retry_delay: Optional[float] = None, max_delay: Optional[float] = None, batch: int = 10):
+        """
+        Инициализация разборщика
+
+        Args:
+            spool: Спул публикации
+            client: Клиент WordPress (по умолчанию общий для WordPressConfig.API_URL)
+            retry_delay: Пауза после первой неудачи, секунды (далее удваивается; WordPressConfig.SPOOL_RETRY_DELAY)
+            max_delay: Максимальная пауза, секунды (WordPressConfig.SPOOL_MAX_DELAY)
+            batch: Записей за один захват
+        """
+        self.spool = spool
+        self.client = client or get_wordpress_client()
+        self.retry_delay = WordPressConfig.SPOOL_RETRY_DELAY if retry_delay is None else retry_delay
+        self.max_delay = WordPressConfig.SPOOL_MAX_DELAY if max_delay is None else max_delay
+        self.batch = batch
+        self.stats = SpoolDrainStats()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def backoff(self, attempts: int) -> float:
+        """Пауза перед следующей попыткой после attempts неудачных"""
+        return min(self.max_delay, self.retry_delay * (2 ** max(0, attempts)))
+
+    def drain_once(self) -> SpoolDrainStats:
+        """
+        Один проход: публикация всех записей, время которых наступило
+
+        Returns:
+            Накопленные итоги разбора
+        """
+        self.stats.passes += 1
+        while not self._stop.is_set():
+            entries = self.spool.claim_due(self.client.api_url, self.batch)
+            if not entries:
+                break
+            for index, entry in enumerate(entries):
+                try:
+                    post, _ = self.client.save_post(entry.payload, entry.keyword)
+                except requests.RequestException as e:
+                    if is_retryable(e):
+                        delay = self.backoff(entry.attempts)
+                        self.spool.mark_failed(entry, str(e), delay)
+                        self.stats.retried += 1
+                        # Сайт все еще недоступен: остальные записи ждут следующего прохода
+                        self.spool.release(entries[index + 1:])
+                        self.logger.warning(f"⏳ Спул: '{entry.slug}' не опубликована ({e}), "
+                                            f"повтор через {delay:.0f} с")
+                        return self.stats
+                    self.spool.mark_failed(entry, str(e), None)
+                    self.stats.dead += 1
+                    self.stats.errors.append(f"{entry.slug}: {e}")
+                    self.logger.error(f"❌ Спул: '{entry.slug}' отклонена WordPress: {e}")
+                    continue
+                except Exception as e:
+                    # Непредвиденная ошибка (например, не JSON в ответе): запись не остается в processing
+                    self.spool.mark_failed(entry, str(e), self.backoff(entry.attempts))
+                    self.stats.retried += 1
+                    self.logger.error(f"❌ Спул: '{entry.slug}': {e}")
+                    continue
+                self.spool.mark_published(entry, post)
+                self.stats.published += 1
+                self.logger.info(f"✅ Спул: '{entry.slug}' опубликована (WP ID {post['id']})")
+        return self.stats
+
+    def _run(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.drain_once()
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка разбора спула: {e}")
+            wait = self.spool.next_due(self.client.api_url)
+            self._stop.wait(interval if wait is None else min(max(wait, 1.0), interval))
+
+    def start(self, interval: float = 30) -> 'PublishSpoolDrainer':
+        """
+        Разбор в фоновом потоке
+
+        Args:
+            interval: Максимальная пауза между проверками спула, секунды
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name='publish-spool', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Остановка фонового потока после текущей публикации"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._stop.clear()
+
+
+_spools: Dict[str, PublishSpool] = {}
+_spools_lock = threading.Lock()
+
+
+def get_publish_spool(path: Optional[str] = None) -> Optional[PublishSpool]:
+    """
+    Общий спул публикации для файла (по умолчанию WordPressConfig.PUBLISH_SPOOL_PATH)
+
+    Returns:
+        Спул или None, если путь не задан (неудачная публикация не сохраняется)
+    """
+    path = WordPressConfig.PUBLISH_SPOOL_PATH if path is None else path
+    if not path:
+        return None
+    key = os.path.abspath(path)
+    with _spools_lock:
+        spool = _spools.get(key)
+        if spool is None:
+            spool = PublishSpool(key)
+            _spools[key] = spool
+        return spool
+
+
+# Экспорт
+__all__ = [
+    'PublishSpool', 'SpoolEntry', 'PublishSpoolDrainer', 'SpoolDrainStats', 'get_publish_spool', 'is_retryable'
+]
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ограничитель частоты запросов к WordPress для BizFin Pro SEO Pipeline
+
+Token bucket, общий для всех потоков, которые обращаются к одному хосту
+WordPress. Заменяет фиксированные паузы между ключевыми словами: ждать
+приходится только перед реальным запросом к REST API.
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import sys
+import os
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+
+
+class RateLimiter:
+    """Потокобезопасный token bucket"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Инициализация ограничителя
+
+        Args:
+            rate: Допустимое число запросов в секунду
+            burst: Максимальное число запросов подряд без ожидания
+        """
+        if rate <= 0:
+            raise ValueError("rate должен быть больше нуля")
+
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+    def _refill(self, now: float):
+        """Пополнение корзины за прошедшее время (вызывается под блокировкой)"""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Получение разрешения на запрос (блокирует поток до появления токена)
+
+        Args:
+            tokens: Стоимость запроса в токенах
+
+        Returns:
+            Время ожидания в секундах
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Получение разрешения без ожидания"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def set_rate(self, rate: float):
+        """Изменение допустимой частоты на лету"""
+        if rate <= 0:
+            raise ValueError("rate должен быть больше нуля")
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+        self.logger.info(f"⏱️ Лимит запросов к WordPress: {rate:.2f} req/s")
+
+
+_host_limiters: Dict[str, RateLimiter] = {}
+_host_limiters_lock = threading.Lock()
+
+
+def get_host_limiter(url: str, rate: Optional[float] = None, burst: Optional[int] = None) -> RateLimiter:
+    """
+    Общий ограничитель для хоста WordPress
+
+    Все стадии, работающие с одним сайтом (публикация, медиа, проверки),
+    получают один и тот же экземпляр и делят общий бюджет запросов.
+
+    Args:
+        url: Любой URL сайта или REST API
+        rate: Запросов в секунду (по умолчанию WordPressConfig.REQUESTS_PER_SECOND)
+        burst: Размер пачки (по умолчанию WordPressConfig.REQUESTS_BURST)
+
+    Returns:
+        Ограничитель для хоста
+    """
+    host = urlparse(url).netloc.lower() or url
+
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = RateLimiter(
+                rate or WordPressConfig.REQUESTS_PER_SECOND,
+                burst or WordPressConfig.REQUESTS_BURST
+            )
+            _host_limiters[host] = limiter
+        elif rate and rate != limiter.rate:
+            limiter.set_rate(rate)
+        return limiter
+
+
+# Экспорт
+__all__ = ['RateLimiter', 'get_host_limiter']
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Кеш рубрик, меток и авторов WordPress
+
+REST API принимает в записи ID терминов и автора, а конфигурация и
+статьи оперируют именами (WordPressConfig.DEFAULT_CATEGORY, ключевые
+слова). TaxonomyCache один раз загружает все рубрики, метки и
+пользователей постранично (per_page=100, _fields только с id, name и
+slug) и разрешает имена локально: публикация записи не делает запросов
+поиска.
+
+- справочник перезагружается по истечении TTL (WordPressConfig.TAXONOMY_CACHE_TTL)
+  или при промахе — не чаще miss_refresh_interval, чтобы отсутствующее
+  имя не перезагружало справочник на каждой записи
+- ensure_tags создает недостающие метки одним проходом перед пакетом
+  публикации (batch/v1, до 25 меток за запрос); term_exists означает, что
+  метку уже создал другой процесс, — берется ее ID из ответа
+- недоступность справочников не останавливает публикацию: post_terms
+  возвращает те поля, которые удалось разрешить
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Iterable
+import sys
+import os
+
+import requests
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+from modules.publisher.wordpress_client import WordPressClient, get_wordpress_client
+
+# Справочники и поля, которые запрашиваются у WordPress (_fields)
+TAXONOMY_FIELDS = {
+    'categories': 'id,name,slug',
+    'tags': 'id,name,slug',
+    'users': 'id,name,slug'
+}
+
+
+def term_key(name: Any) -> str:
+    """Ключ поиска термина: без учета регистра и лишних пробелов"""
+    return ' '.join(str(name).split()).lower()
+
+
+def _term_id(body: Any) -> Optional[int]:
+    """ID созданного термина или уже существующего (ошибка term_exists)"""
+    if not isinstance(body, dict):
+        return None
+    if body.get('id'):
+        return int(body['id'])
+    if body.get('code') == 'term_exists':
+        term_id = (body.get('data') or {}).get('term_id')
+        return int(term_id) if term_id else None
+    return None
+
+
+class TaxonomyCache:
+    """ID рубрик, меток и авторов WordPress по имени или slug"""
+
+    def __init__(self, client: Optional[WordPressClient] = None, ttl: Optional[float] = None,
+                 miss_refresh_interval: float = 60):
+        """
+        Инициализация кеша
+
+        Args:
+            client: Клиент WordPress (по умолчанию общий для WordPressConfig.API_URL)
+            ttl: Время жизни загруженного справочника, секунды (WordPressConfig.TAXONOMY_CACHE_TTL)
+            miss_refresh_interval: Минимальная пауза между перезагрузками справочника при промахе, секунды
+        """
+        self.client = client or get_wordpress_client()
+        self.ttl = WordPressConfig.TAXONOMY_CACHE_TTL if ttl is None else ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self._index: Dict[str, Dict[str, int]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self.stats = {'loads': 0, 'requests': 0, 'hits': 0, 'misses': 0, 'created': 0}
+        self.logger = logging.getLogger(__name__)
+
+    def load(self, taxonomy: str) -> Dict[str, int]:
+        """
+        Загрузка справочника целиком (постранично по 100)
+
+        Args:
+            taxonomy: categories, tags или users
+
+        Returns:
+            Ключ имени и slug → ID
+        """
+        index: Dict[str, int] = {}
+        params = {'_fields': TAXONOMY_FIELDS[taxonomy], 'per_page': 100, 'orderby': 'id', 'order': 'asc'}
+        page = 1
+        while True:
+            response = self.client.request('GET', taxonomy, params={**params, 'page': page})
+            self.stats['requests'] += 1
+            if taxonomy == 'users' and response.status_code in (401, 403):
+                # Без права list_users авторы не разрешаются: записи публикуются от пользователя API
+                self.logger.warning(f"⚠️ Список пользователей WordPress недоступен (HTTP {response.status_code})")
+                break
+            response.raise_for_status()
+            for item in response.json():
+                for value in (item.get('slug'), item.get('name')):
+                    if value:
+                        index.setdefault(term_key(value), int(item['id']))
+            if page >= int(response.headers.get('X-WP-TotalPages', 1) or 1):
+                break
+            page += 1
+        with self._lock:
+            self._index[taxonomy] = index
+            self._loaded_at[taxonomy] = time.monotonic()
+            self.stats['loads'] += 1
+        self.logger.info(f"📚 {taxonomy}: загружено {len(set(index.values()))} (запросов: {page})")
+        return index
+
+    def _current(self, taxonomy: str) -> Dict[str, int]:
+        """Справочник из кеша (загружается при первом обращении и по истечении TTL)"""
+        with self._lock:
+            loaded_at = self._loaded_at.get(taxonomy)
+            if loaded_at is not None and time.monotonic() - loaded_at < self.ttl:
+                return self._index[taxonomy]
+            return self.load(taxonomy)
+
+    def _refresh_on_miss(self, taxonomy: str) -> bool:
+        """Перезагрузка справочника после промаха (не чаще miss_refresh_interval)"""
+        with self._lock:
+            loaded_at = self._loaded_at.get(taxonomy)
+            if loaded_at is not None and time.monotonic() - loaded_at < self.miss_refresh_interval:
+                return False
+            self.load(taxonomy)
+            return True
+
+    def lookup(self, taxonomy: str, name: str) -> Optional[int]:
+        """
+        ID термина или пользователя по имени или slug
+
+        Args:
+            taxonomy: categories, tags или users
+            name: Имя или slug
+
+        Returns:
+            ID или None, если такого нет и после перезагрузки справочника
+
+        Raises:
+            requests.RequestException: Справочник не удалось загрузить
+        """
+        key = term_key(name)
+        with self._lock:
+            term_id = self._current(taxonomy).get(key)
+            if term_id is None and self._refresh_on_miss(taxonomy):
+                term_id = self._index[taxonomy].get(key)
+            self.stats['hits' if term_id is not None else 'misses'] += 1
+            return term_id
+
+    def category_ids(self, names: Optional[Iterable[str]] = None) -> List[int]:
+        """ID рубрик (по умолчанию WordPressConfig.DEFAULT_CATEGORY); неизвестные рубрики пропускаются"""
+        names = [WordPressConfig.DEFAULT_CATEGORY] if names is None else names
+        ids = []
+        for name in names:
+            term_id = self.lookup('categories', name) if name else None
+            if term_id is None:
+                if name:
+                    self.logger.warning(f"⚠️ Рубрика '{name}' не найдена в WordPress")
+                continue
+            if term_id not in ids:
+                ids.append(term_id)
+        return ids
+
+    def author_id(self, name: Optional[str] = None) -> Optional[int]:
+        """ID автора по имени или slug (по умолчанию WordPressConfig.DEFAULT_AUTHOR; None — пользователь API)"""
+        name = WordPressConfig.DEFAULT_AUTHOR if name is None else name
+        if not name:
+            return None
+        author = self.lookup('users', name)
+        if author is None:
+            self.logger.warning(f"⚠️ Автор '{name}' не найден в WordPress")
+        return author
+
+    def ensure_tags(self, names: Iterable[str]) -> Dict[str, int]:
+        """
+        ID меток с созданием недостающих одним проходом
+
+        Args:
+            names: Имена меток (например, ключевые слова пакета статей)
+
+        Returns:
+            Ключ имени → ID (метки, которые не удалось создать, отсутствуют)
+
+        Raises:
+            requests.RequestException: Справочник меток не удалось загрузить
+        """
+        wanted: Dict[str, str] = {}
+        for name in names:
+            if name and str(name).strip():
+                wanted.setdefault(term_key(name), ' '.join(str(name).split()))
+        if not wanted:
+            return {}
+
+        with self._lock:
+            index = self._current('tags')
+            missing = [key for key in wanted if key not in index]
+            if missing and self._refresh_on_miss('tags'):
+                index = self._index['tags']
+                missing = [key for key in missing if key not in index]
+            if missing:
+                created = self._create_tags([wanted[key] for key in missing])
+                for name, term_id in created.items():
+                    index[term_key(name)] = term_id
+                self.stats['created'] += len(created)
+            self.stats['hits'] += len(wanted) - len(missing)
+            self.stats['misses'] += len(missing)
+            return {key: index[key] for key in wanted if key in index}
+
+    def _create_tags(self, names: List[str]) -> Dict[str, int]:
+        """Создание меток пакетами batch/v1 (без batch API — по одной)"""
+        created: Dict[str, int] = {}
+        pending = list(names)
+        batch_size = max(1, self.client.batch_size)
+        if self.client.batch_supported is not False and self.client.batch_url:
+            while pending:
+                chunk = pending[:batch_size]
+                sub_requests = [{'method': 'POST', 'path': f"{self.client.route_prefix}/tags", 'body': {'name': name}}
+                                for name in chunk]
+                # Создание метки идемпотентно (term_exists), поэтому пакет можно повторять
+                response = self.client.request('POST', self.client.batch_url,
+                                               json={'validation': 'normal', 'requests': sub_requests})
+                self.stats['requests'] += 1
+                if response.status_code not in (200, 207):
+                    break
+                for name, item in zip(chunk, response.json().get('responses', [])):
+                    term_id = _term_id(item.get('body'))
+                    if term_id:
+                        created[name] = term_id
+                    else:
+                        self.logger.warning(f"⚠️ Метка '{name}' не создана: HTTP {item.get('status')}")
+                pending = pending[batch_size:]
+        for name in pending:
+            response = self.client.request('POST', 'tags', json={'name': name})
+            self.stats['requests'] += 1
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            term_id = _term_id(body)
+            if term_id:
+                created[name] = term_id
+            else:
+                self.logger.warning(f"⚠️ Метка '{name}' не создана: HTTP {response.status_code}")
+        if created:
+            self.logger.info(f"🏷️ Создано меток: {len(created)}")
+        return created
+
+    def keyword_tags(self, keywords: Iterable[str]) -> List[str]:
+        """Метки записей для ключевых слов (WordPressConfig.POST_TAGS: keyword — метка по ключевому слову)"""
+        if WordPressConfig.POST_TAGS != 'keyword':
+            return []
+        return [keyword for keyword in keywords if keyword]
+
+    def prepare(self, keywords: Iterable[str]) -> Dict[str, int]:
+        """
+        Подготовка к пакету публикации: справочники загружены, метки ключевых слов созданы
+
+        Ошибка загрузки справочников не прерывает пакет (записи публикуются без терминов).
+
+        Args:
+            keywords: Ключевые слова статей пакета
+
+        Returns:
+            Ключ имени метки → ID
+        """
+        try:
+            self.category_ids()
+            self.author_id()
+            return self.ensure_tags(self.keyword_tags(keywords))
+        except requests.RequestException as e:
+            self.logger.warning(f"⚠️ Рубрики и метки WordPress недоступны: {e}")
+            return {}
+
+    def post_terms(self, keyword: Optional[str] = None, categories: Optional[Iterable[str]] = None,
+                   tags: Optional[Iterable[str]] = None, author: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Поля categories, tags и author записи WordPress
+
+        Args:
+            keyword: Ключевое слово статьи (метка по WordPressConfig.POST_TAGS)
+            categories: Имена рубрик (по умолчанию WordPressConfig.DEFAULT_CATEGORY)
+            tags: Имена дополнительных меток
+            author: Имя или slug автора (по умолчанию WordPressConfig.DEFAULT_AUTHOR)
+
+        Returns:
+            Поля для post_data (только разрешенные)
+        """
+        fields: Dict[str, Any] = {}
+        try:
+            category_ids = self.category_ids(categories)
+            if category_ids:
+                fields['categories'] = category_ids
+            tag_names = self.keyword_tags([keyword] if keyword else []) + list(tags or [])
+            if tag_names:
+                tag_ids = list(dict.fromkeys(self.ensure_tags(tag_names).values()))
+                if tag_ids:
+                    fields['tags'] = tag_ids
+            author_id = self.author_id(author)
+            if author_id is not None:
+                fields['author'] = author_id
+        except requests.RequestException as e:
+            self.logger.warning(f"⚠️ Рубрики и метки WordPress недоступны: {e}")
+        return fields
+
+    def invalidate(self, taxonomy: Optional[str] = None):
+        """Сброс справочника (None — всех): следующее обращение загрузит его заново"""
+        with self._lock:
+            for name in ([taxonomy] if taxonomy else list(self._loaded_at)):
+                self._loaded_at.pop(name, None)
+                self._index.pop(name, None)
+
+
+_caches: Dict[str, TaxonomyCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_taxonomy_cache(client: Optional[WordPressClient] = None) -> TaxonomyCache:
+    """
+    Общий кеш справочников для сайта WordPress
+
+    Args:
+        client: Клиент WordPress (по умолчанию общий для WordPressConfig.API_URL)
+
+    Returns:
+        Кеш рубрик, меток и авторов
+    """
+    client = client or get_wordpress_client()
+    with _caches_lock:
+        cache = _caches.get(client.api_url)
+        if cache is None:
+            cache = TaxonomyCache(client)
+            _caches[client.api_url] = cache
+        return cache
+
+
+# Экспорт
+__all__ = ['TaxonomyCache', 'get_taxonomy_cache', 'term_key', 'TAXONOMY_FIELDS']
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Проверка статей после публикации (Этапы 7-10 пайплайна)
+
+Для опубликованных статей (published), еще не прошедших проверку:
+
+- Этап 7: запись найдена в WordPress, страница отвечает (publish_status:
+  HTTP-код и время ответа HEAD-запроса к постоянной ссылке)
+- Этап 8: ожидаемые SEO-мета статьи фиксируются в seo_meta_expected
+- Этап 9: фокусное ключевое слово и мета-описание в WordPress сравниваются
+  с ожидаемыми (wp_meta_verification)
+- Этап 10: итог и список проблем в seo_meta_audit_log
+
+Записи запрашиваются по 100 за запрос (include=<ids>, только нужные поля),
+страницы проверяются HEAD-запросами в несколько потоков, строки всех трех
+таблиц пишутся пакетно — одна транзакция на порцию.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+import sys
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.database import DatabaseConfig
+from config.wordpress import WordPressConfig
+from modules.publisher.rate_limiter import RateLimiter
+from modules.publisher.wordpress_client import WordPressClient, get_wordpress_client, LOOKUP_STATUSES
+
+# Поля записи, нужные для проверки
+VERIFY_FIELDS = 'id,link,status,meta,yoast_head_json'
+
+# Мета-поле оценки SEO Yoast
+YOAST_SCORE_META = '_yoast_wpseo_linkdex'
+
+
+@dataclass
+class VerificationTarget:
+    """Опубликованная статья и ожидаемые SEO-мета"""
+    published_id: int
+    wp_post_id: int
+    permalink: str
+    keyword_id: int
+    article_id: int
+    seo_check_id: int
+    article_final_id: int
+    focus_keyword: str
+    title: str
+    meta_description: str
+    expected_id: Optional[int] = None
+
+
+@dataclass
+class VerificationStats:
+    """Итоги проверки"""
+    checked: int = 0
+    success: int = 0
+    partial: int = 0
+    failed: int = 0
+    meta_ok: int = 0
+    meta_mismatch: int = 0
+    expected_created: int = 0
+    api_requests: int = 0
+    head_checks: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'checked': self.checked,
+            'success': self.success,
+            'partial': self.partial,
+            'failed': self.failed,
+            'meta_ok': self.meta_ok,
+            'meta_mismatch': self.meta_mismatch,
+            'expected_created': self.expected_created,
+            'api_requests': self.api_requests,
+            'head_checks': self.head_checks,
+            'elapsed_seconds': round(self.elapsed, 2)
+        }
+
+
+def _normalize(value: Any) -> str:
+    return ' '.join(str(value or '').split()).lower()
+
+
+def _meta_value(meta: Dict[str, Any], key: Optional[str]) -> Optional[str]:
+    """Значение мета-поля (ключ с подчеркиванием и без)"""
+    if not key:
+        return None
+    value = meta.get(key, meta.get(key.lstrip('_')))
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return None if value is None else str(value)
+
+
+class PublishVerifier:
+    """Пакетная проверка опубликованных статей"""
+
+    def __init__(self, connection, dialect: str, client: Optional[WordPressClient] = None,
+                 head_workers: Optional[int] = None, head_rps: Optional[float] = None):
+        """
+        Инициализация проверки
+
+        Args:
+            connection: Соединение DB-API (sqlite3 или mysql.connector)
+            dialect: 'sqlite' или 'mysql'
+            client: Клиент WordPress (по умолчанию общий для WordPressConfig.API_URL)
+            head_workers: Потоков проверки страниц (WordPressConfig.VERIFY_HEAD_WORKERS)
+            head_rps: Лимит HEAD-запросов в секунду (WordPressConfig.VERIFY_HEAD_RPS)
+        """
+        self.connection = connection
+        self.dialect = dialect
+        self.placeholder = '?' if dialect == 'sqlite' else '%s'
+        self.client = client or get_wordpress_client()
+        self.head_workers = max(1, head_workers or WordPressConfig.VERIFY_HEAD_WORKERS)
+        self.head_limiter = RateLimiter(head_rps or WordPressConfig.VERIFY_HEAD_RPS, self.head_workers)
+
+        # Страницы проверяются так, как их видит посетитель: без авторизации
+        self.http = requests.Session()
+        self.http.headers.update({'User-Agent': 'BizFin-Pro-SEO-Pipeline/2.0'})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.head_workers, max_retries=0)
+        self.http.mount('https://', adapter)
+        self.http.mount('http://', adapter)
+
+        meta_fields = WordPressConfig.get_seo_meta_fields()
+        self.focus_key = meta_fields.get('focus_keyword')
+        self.metadesc_key = meta_fields.get('meta_description')
+        self.stats = VerificationStats()
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def sqlite(cls, db_path: str, **kwargs) -> 'PublishVerifier':
+        """Проверка для БД SQLite (scripts/init_sqlite_db.py)"""
+        return cls(sqlite3.connect(db_path, timeout=30), 'sqlite', **kwargs)
+
+    @classmethod
+    def mysql(cls, config: Optional[Dict[str, Any]] = None, **kwargs) -> 'PublishVerifier':
+        """Проверка для БД MySQL (по умолчанию DatabaseConfig)"""
+        import mysql.connector
+        return cls(mysql.connector.connect(**(config or DatabaseConfig.get_config_dict())), 'mysql', **kwargs)
+
+    def pending(self, limit: Optional[int] = None, recheck: bool = False) -> List[VerificationTarget]:
+        """
+        Опубликованные статьи для проверки
+
+        Args:
+            limit: Максимум статей
+            recheck: Проверить и уже проверенные статьи
+
+        Returns:
+            Статьи с ожидаемыми SEO-мета (из seo_meta_expected или articles_final)
+        """
+        sql = """
+            SELECT p.id, p.wp_post_id, p.permalink, a.keyword_id, af.article_id, af.seo_check_id, af.id,
+                   COALESCE(e.focus_keyword, af.focus_keyword), COALESCE(e.title, af.meta_title),
+                   COALESCE(e.meta_description, af.meta_description), e.id
+            FROM published p
+            JOIN publish_queue q ON q.id = p.publish_queue_id
+            JOIN articles_final af ON af.id = q.article_final_id
+            JOIN articles a ON a.id = af.article_id
+            LEFT JOIN seo_meta_expected e ON e.id = (
+                SELECT MAX(x.id) FROM seo_meta_expected x WHERE x.article_final_id = af.id
+            )
+        """
+        if not recheck:
+            sql += " WHERE NOT EXISTS (SELECT 1 FROM publish_status ps WHERE ps.published_id = p.id)"
+        sql += " ORDER BY p.id"
+        params: Tuple = ()
+        if limit:
+            sql += f" LIMIT {self.placeholder}"
+            params = (limit,)
+
+        cursor = self.connection.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return [VerificationTarget(*row[:7], focus_keyword=row[7] or '', title=row[8] or '',
+                                   meta_description=row[9] or '', expected_id=row[10]) for row in rows]
+
+    def _expected_rows(self, targets: List[VerificationTarget]) -> List[Tuple]:
+        """Этап 8: строки seo_meta_expected для статей, у которых их еще нет"""
+        rows = []
+        for target in targets:
+            if target.expected_id is not None:
+                continue
+            description = target.meta_description
+            rows.append((
+                target.article_final_id, target.keyword_id, target.focus_keyword, target.title, description,
+                _normalize(description).startswith(_normalize(target.focus_keyword)) if target.focus_keyword else False,
+                len(description) <= WordPressConfig.MAX_META_DESCRIPTION_LENGTH
+            ))
+        return rows
+
+    def fetch_posts(self, post_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Записи WordPress по ID (по 100 за запрос, только поля проверки)
+
+        Args:
+            post_ids: ID записей
+
+        Returns:
+            Найденные записи по ID (удаленные и в корзине отсутствуют)
+        """
+        posts: Dict[int, Dict[str, Any]] = {}
+        unique_ids = sorted(set(post_ids))
+        for start in range(0, len(unique_ids), 100):
+            chunk = unique_ids[start:start + 100]
+            response = self.client.request('GET', 'posts', params={
+                'include': ','.join(map(str, chunk)), 'per_page': 100, 'status': LOOKUP_STATUSES,
+                'context': 'edit', '_fields': VERIFY_FIELDS
+            })
+            response.raise_for_status()
+            self.stats.api_requests += 1
+            for post in response.json():
+                posts[post['id']] = post
+        return posts
+
+    def check_permalink(self, url: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        HEAD-запрос к странице статьи
+
+        Returns:
+            HTTP-код после перенаправлений и время ответа в миллисекундах
+            (None — сетевая ошибка)
+        """
+        self.head_limiter.acquire()
+        started = time.perf_counter()
+        try:
+            response = self.http.head(url, allow_redirects=True, timeout=WordPressConfig.API_TIMEOUT)
+            if response.status_code in (405, 501):
+                # Сервер не поддерживает HEAD
+                response = self.http.get(url, allow_redirects=True, stream=True, timeout=WordPressConfig.API_TIMEOUT)
+                response.close()
+        except requests.RequestException as e:
+            self.logger.warning(f"⚠️ {url}: {e.__class__.__name__}")
+            return None, None
+        return response.status_code, int((time.perf_counter() - started) * 1000)
+
+    def _verify_meta(self, target: VerificationTarget, post: Dict[str, Any]) -> Tuple[Tuple, List[Dict[str, Any]]]:
+        """Этап 9: сравнение мета-полей записи с ожидаемыми"""
+        meta = post.get('meta') if isinstance(post.get('meta'), dict) else {}
+        wp_focuskw = _meta_value(meta, self.focus_key)
+        wp_metadesc = _meta_value(meta, self.metadesc_key)
+        focuskw_match = _normalize(wp_focuskw) == _normalize(target.focus_keyword)
+        metadesc_match = _normalize(wp_metadesc) == _normalize(target.meta_description)
+        begins_with_kw = bool(wp_focuskw) and _normalize(wp_metadesc).startswith(_normalize(wp_focuskw))
+        length_ok = len(wp_metadesc or '') <= WordPressConfig.MAX_META_DESCRIPTION_LENGTH
+
+        issues = []
+        if not meta:
+            issues.append({'code': 'meta_unavailable', 'message': 'REST API не вернул мета-поля записи'})
+        if not focuskw_match:
+            issues.append({'code': 'focuskw_mismatch', 'expected': target.focus_keyword, 'actual': wp_focuskw})
+        if not metadesc_match:
+            issues.append({'code': 'metadesc_mismatch', 'expected': target.meta_description, 'actual': wp_metadesc})
+        if wp_metadesc and not begins_with_kw:
+            issues.append({'code': 'metadesc_without_kw', 'message': 'Мета-описание не начинается с ключевого слова'})
+        if not length_ok:
+            issues.append({'code': 'metadesc_too_long', 'length': len(wp_metadesc or '')})
+
+        yoast_head = post.get('yoast_head_json')
+        yoast_score = _meta_value(meta, YOAST_SCORE_META)
+        row = (
+            target.published_id, target.keyword_id, target.article_id, target.article_final_id, target.wp_post_id,
+            post.get('link') or target.permalink, wp_focuskw, wp_metadesc, focuskw_match, metadesc_match,
+            begins_with_kw, length_ok, None if 'yoast_head_json' not in post else bool(yoast_head),
+            int(yoast_score) if yoast_score and yoast_score.isdigit() else None
+        )
+        return row, issues
+
+    def verify(self, targets: List[VerificationTarget], executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Проверка порции статей и пакетная запись результатов
+
+        Args:
+            targets: Статьи (до 100 — один запрос к REST API)
+            executor: Пул потоков HEAD-запросов (по умолчанию создается на порцию)
+        """
+        posts = self.fetch_posts([target.wp_post_id for target in targets])
+
+        # Этап 7: страницы опубликованных записей (черновики посетителю недоступны — не проверяются)
+        own_executor = executor is None
+        executor = executor or ThreadPoolExecutor(max_workers=self.head_workers)
+        try:
+            futures = {
+                target.published_id: executor.submit(self.check_permalink, posts[target.wp_post_id]['link'])
+                for target in targets
+                if target.wp_post_id in posts and posts[target.wp_post_id].get('status') == 'publish'
+                and posts[target.wp_post_id].get('link')
+            }
+            heads = {published_id: future.result() for published_id, future in futures.items()}
+        finally:
+            if own_executor:
+                executor.shutdown()
+        self.stats.head_checks += len(heads)
+
+        status_rows = []
+        verification_rows = []
+        audits: Dict[int, Tuple[str, List[Dict[str, Any]]]] = {}
+        for target in targets:
+            post = posts.get(target.wp_post_id)
+            http_code, response_time = heads.get(target.published_id, (None, None))
+            if post is None:
+                status = 'failed'
+                audits[target.published_id] = ('wp_error', [{'code': 'post_missing',
+                                                             'message': 'Запись не найдена в WordPress'}])
+            else:
+                head_failed = target.published_id in heads and not (http_code and 200 <= http_code < 400)
+                status = 'partial' if head_failed else 'success'
+                row, issues = self._verify_meta(target, post)
+                verification_rows.append(row)
+                if head_failed:
+                    issues.append({'code': 'permalink_http', 'url': post.get('link'), 'http_code': http_code})
+                if any(issue['code'].endswith('_mismatch') for issue in issues):
+                    audit_status = 'mismatch'
+                    self.stats.meta_mismatch += 1
+                else:
+                    audit_status = 'partial' if issues else 'ok'
+                    self.stats.meta_ok += 1
+                audits[target.published_id] = (audit_status, issues)
+            setattr(self.stats, status, getattr(self.stats, status) + 1)
+            status_rows.append((
+                target.published_id, target.keyword_id, target.article_id, target.seo_check_id,
+                target.article_final_id, status, (post or {}).get('link') or target.permalink, http_code, response_time
+            ))
+        self.stats.checked += len(targets)
+        self._write(targets, status_rows, verification_rows, audits)
+
+    def _latest_ids(self, cursor, table: str, published_ids: List[int]) -> Dict[int, int]:
+        p = self.placeholder
+        cursor.execute(
+            f"SELECT published_id, MAX(id) FROM {table} WHERE published_id IN ({', '.join([p] * len(published_ids))}) "
+            f"GROUP BY published_id", published_ids
+        )
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def _write(self, targets: List[VerificationTarget], status_rows: List[Tuple], verification_rows: List[Tuple],
+               audits: Dict[int, Tuple[str, List[Dict[str, Any]]]]):
+        """Пакетная запись строк всех этапов одной транзакцией"""
+        p = self.placeholder
+        published_ids = [target.published_id for target in targets]
+        expected_rows = self._expected_rows(targets)
+        cursor = self.connection.cursor()
+        try:
+            if expected_rows:
+                cursor.executemany(
+                    f"INSERT INTO seo_meta_expected (article_final_id, keyword_id, focus_keyword, title, "
+                    f"meta_description, begins_with_kw, length_le_160) VALUES ({', '.join([p] * 7)})",
+                    expected_rows
+                )
+            cursor.executemany(
+                f"INSERT INTO publish_status (published_id, keyword_id, article_id, seo_check_id, article_final_id, "
+                f"status, url, http_code, response_time) VALUES ({', '.join([p] * 9)})",
+                status_rows
+            )
+            if verification_rows:
+                cursor.executemany(
+                    f"INSERT INTO wp_meta_verification (published_id, keyword_id, article_id, article_final_id, "
+                    f"wp_post_id, permalink, wp_focuskw, wp_metadesc, focuskw_match, metadesc_match, "
+                    f"metadesc_begins_with_kw, metadesc_length_le_160, yoast_indexable_ok, yoast_seo_score) "
+                    f"VALUES ({', '.join([p] * 14)})",
+                    verification_rows
+                )
+
+            status_ids = self._latest_ids(cursor, 'publish_status', published_ids)
+            verification_ids = self._latest_ids(cursor, 'wp_meta_verification', published_ids) if verification_rows else {}
+            audit_rows = [
+                (status_ids[published_id], verification_ids.get(published_id), audit_status,
+                 json.dumps(issues, ensure_ascii=False), audit_status == 'ok')
+                for published_id, (audit_status, issues) in audits.items()
+            ]
+            cursor.executemany(
+                f"INSERT INTO seo_meta_audit_log (publish_status_id, wp_meta_verif_id, status, issues, resolved) "
+                f"VALUES ({', '.join([p] * 5)})",
+                audit_rows
+            )
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        self.stats.expected_created += len(expected_rows)
+
+    def run(self, limit: Optional[int] = None, recheck: bool = False, chunk_size: int = 100) -> VerificationStats:
+        """
+        Проверка всех ожидающих статей порциями
+
+        Args:
+            limit: Максимум статей
+            recheck: Проверить и уже проверенные статьи
+            chunk_size: Статей в порции (не больше 100 — один запрос к REST API)
+
+        Returns:
+            Итоги проверки
+        """
+        started = time.perf_counter()
+        self.stats = VerificationStats()
+        targets = self.pending(limit, recheck)
+        chunk_size = max(1, min(chunk_size, 100))
+        with ThreadPoolExecutor(max_workers=self.head_workers) as executor:
+            for start in range(0, len(targets), chunk_size):
+                chunk = targets[start:start + chunk_size]
+                try:
+                    self.verify(chunk, executor)
+                except requests.RequestException as e:
+                    # Порция останется непроверенной и попадет в следующий запуск
+                    self.logger.error(f"❌ Проверка {len(chunk)} статей: {e}")
+        self.stats.elapsed = time.perf_counter() - started
+        self.logger.info(f"🔎 Проверка публикаций: {self.stats.to_dict()}")
+        return self.stats
+
+    def close(self):
+        self.http.close()
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+# Экспорт
+__all__ = ['PublishVerifier', 'VerificationTarget', 'VerificationStats']
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Клиент WordPress REST API для BizFin Pro SEO Pipeline
+
+- Одна сессия requests на сайт: соединения переиспользуются пулом
+  (keep-alive), авторизация задается один раз
+- Повторы с экспоненциальной паузой при 429/5xx и сетевых ошибках
+  (WordPressConfig.MAX_RETRIES, RETRY_DELAY), Retry-After учитывается
+- Каждый запрос проходит через общий ограничитель хоста
+- Создание записи идемпотентно: перед созданием запись ищется по slug
+  и ключевому слову, повторный запуск обновляет найденный черновик
+- Пакетное сохранение через /wp-json/batch/v1 (WordPress 5.6+): до 25
+  созданий и обновлений за один запрос, результат по каждой записи;
+  на сайтах без batch API — по одной записи
+- Обновление отправляет только поля, изменившиеся с последней публикации
+  (хеши полей в FieldHashStore); без изменений запрос не выполняется
+- Загрузка файлов в медиатеку (повтор — только если файл не сохранился)
+"""
+
+import json
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import sys
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+from modules.publisher.rate_limiter import get_host_limiter
+from modules.publisher.field_hashes import get_field_hash_store, field_hashes, live_hashes, changed_fields
+
+# Ответы, после которых запрос стоит повторить
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Статусы записей, среди которых ищется уже созданная статья
+LOOKUP_STATUSES = 'publish,future,draft,pending,private'
+
+# Ключи мета-поля фокусного ключевого слова (с подчеркиванием и без)
+FOCUS_KEYWORD_KEYS = ('_yoast_wpseo_focuskw', 'yoast_wpseo_focuskw', '_rank_math_focus_keyword')
+
+
+@dataclass
+class SaveResult:
+    """Результат сохранения одной записи (в том числе внутри пакета)"""
+    post: Optional[Dict[str, Any]] = None
+    created: bool = False
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    # Поля не изменились с последней публикации: запрос не отправлялся (status_code 304)
+    unchanged: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.post is not None
+
+    @property
+    def retryable(self) -> bool:
+        """Ошибку может исправить повтор позже (сеть, 429, 5xx)"""
+        return not self.ok and (self.status_code is None or self.status_code in RETRY_STATUSES)
+
+
+class WordPressClient:
+    """Пул соединений с WordPress REST API с повторами и идемпотентным созданием записей"""
+
+    def __init__(self, api_url: Optional[str] = None, username: Optional[str] = None,
+                 app_password: Optional[str] = None, timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None, retry_delay: Optional[float] = None,
+                 pool_size: Optional[int] = None):
+        """
+        Инициализация клиента
+
+        Args:
+            api_url: URL REST API (по умолчанию WordPressConfig.API_URL)
+            username: Пользователь WordPress
+            app_password: Пароль приложения
+            timeout: Таймаут запроса, секунды
+            max_retries: Повторов после первой попытки
+            retry_delay: Пауза перед первым повтором, секунды (далее удваивается)
+            pool_size: Соединений в пуле (не меньше числа потоков публикации)
+        """
+        self.api_url = (api_url or WordPressConfig.API_URL).rstrip('/')
+        self.timeout = timeout or WordPressConfig.API_TIMEOUT
+        self.max_retries = WordPressConfig.MAX_RETRIES if max_retries is None else max_retries
+        self.retry_delay = WordPressConfig.RETRY_DELAY if retry_delay is None else retry_delay
+        self.limiter = get_host_limiter(self.api_url)
+
+        pool_size = pool_size or WordPressConfig.POOL_SIZE
+        self.session = requests.Session()
+        self.session.auth = (username or WordPressConfig.USERNAME, app_password or WordPressConfig.APP_PASSWORD)
+        self.session.headers.update({'User-Agent': 'BizFin-Pro-SEO-Pipeline/2.0'})
+        # Повторы выполняет сам клиент: адаптер не повторяет запросы
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # batch/v1 находится рядом с wp/v2: https://site/wp-json/batch/v1, пути внутри пакета — /wp/v2/...
+        root, separator, route = self.api_url.partition('/wp-json')
+        self.batch_url = f"{root}/wp-json/batch/v1" if separator else None
+        self.route_prefix = route
+        self.batch_size = WordPressConfig.BATCH_SIZE
+        # None — еще не проверено, False — сайт не поддерживает batch API
+        self.batch_supported: Optional[bool] = None if self.batch_url and self.batch_size > 1 else False
+
+        # Хеши полей последней публикации (None — обновления отправляются целиком)
+        self.field_hashes = get_field_hash_store()
+
+        self.stats = {'requests': 0, 'retries': 0, 'created': 0, 'updated': 0, 'batches': 0,
+                      'unchanged': 0, 'bytes_saved': 0, 'media': 0}
+        self._listeners: List[Callable[[str, float, Optional[int]], None]] = []
+        self.logger = logging.getLogger(__name__)
+
+    def add_listener(self, listener: Callable[[str, float, Optional[int]], None]):
+        """
+        Подписка на ответы сервера
+
+        Args:
+            listener: Вызывается после каждого запроса с HTTP-методом,
+                задержкой ответа в секундах (без ожидания ограничителя)
+                и HTTP-кодом (None — таймаут или сетевая ошибка)
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, float, Optional[int]], None]):
+        """Отмена подписки на ответы сервера"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, method: str, latency: float, status_code: Optional[int]):
+        for listener in list(self._listeners):
+            listener(method, latency, status_code)
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith('http') else f"{self.api_url}/{path.lstrip('/')}"
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Пауза перед повтором: экспонента от retry_delay или Retry-After сервера"""
+        delay = self.retry_delay * (2 ** attempt)
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+        return delay
+
+    def send(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Один запрос без повторов (под общим ограничителем хоста)
+
+        Args:
+            method: HTTP-метод
+            path: Путь относительно REST API или полный URL
+            **kwargs: Аргументы requests (json, params, data, headers)
+
+        Returns:
+            Ответ сервера
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        self.limiter.acquire()
+        self.stats['requests'] += 1
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self._url(path), **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            self._notify(method, time.perf_counter() - started, None)
+            raise
+        self._notify(method, time.perf_counter() - started, response.status_code)
+        return response
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Запрос с повторами при 429/5xx и сетевых ошибках
+
+        Только для идемпотентных запросов (чтение, обновление записи по ID):
+        создание записи повторяется через save_post.
+
+        Args:
+            method: HTTP-метод
+            path: Путь относительно REST API или полный URL
+            **kwargs: Аргументы requests
+
+        Returns:
+            Последний ответ сервера
+
+        Raises:
+            requests.RequestException: Сетевая ошибка после всех повторов
+        """
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self.send(method, path, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                self.logger.warning(f"⚠️ {method} {path}: {e.__class__.__name__}, повтор через {delay:.0f} с")
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                delay = self._backoff(attempt, response)
+                self.logger.warning(f"⚠️ {method} {path}: HTTP {response.status_code}, повтор через {delay:.0f} с")
+            self.stats['retries'] += 1
+            time.sleep(delay)
+
+    def find_post(self, slug: str, keyword: Optional[str] = None, title: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Поиск уже созданной записи (в любом статусе)
+
+        Сначала по slug, затем поиском по ключевому слову: подходит запись,
+        у которой фокусное ключевое слово или заголовок совпадают с искомыми.
+
+        Args:
+            slug: Slug статьи
+            keyword: Ключевое слово статьи
+            title: Заголовок статьи
+
+        Returns:
+            Запись WordPress или None
+        """
+        params = {'status': LOOKUP_STATUSES, 'context': 'edit', 'per_page': 10}
+        if slug:
+            response = self.request('GET', 'posts', params={**params, 'slug': slug})
+            response.raise_for_status()
+            posts = response.json()
+            if posts:
+                return posts[0]
+
+        if not keyword:
+            return None
+        response = self.request('GET', 'posts', params={**params, 'search': keyword, 'per_page': 20})
+        response.raise_for_status()
+        for post in response.json():
+            meta = post.get('meta') or {}
+            if isinstance(meta, dict) and any(meta.get(key) == keyword for key in FOCUS_KEYWORD_KEYS):
+                return post
+            raw_title = (post.get('title') or {}).get('raw')
+            if title and raw_title == title:
+                return post
+        return None
+
+    def save_post(self, post_data: Dict[str, Any], keyword: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Создание записи или обновление уже существующей
+
+        Перед каждой попыткой создания запись ищется заново: если прошлая
+        попытка завершилась таймаутом или 5xx уже после того, как WordPress
+        сохранил запись, повтор обновит ее, а не создаст дубликат.
+        При обновлении статус записи не меняется (опубликованную статью
+        повторный запуск не переводит в черновик) и отправляются только
+        изменившиеся поля; если ничего не изменилось, запрос не выполняется
+        и возвращается найденная запись.
+
+        Args:
+            post_data: Поля записи (title, content, slug, status, meta)
+            keyword: Ключевое слово для поиска записи без slug
+
+        Returns:
+            Запись WordPress и признак создания (False — обновлена)
+
+        Raises:
+            requests.RequestException: Ошибка WordPress или сети после всех повторов
+        """
+        slug = post_data.get('slug', '')
+        title = post_data.get('title')
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            existing = self.find_post(slug, keyword, title)
+            if existing:
+                update = {key: value for key, value in post_data.items() if key != 'status'}
+                changes, previous = self._changes(existing['id'], update, existing)
+                if not changes:
+                    self._record_unchanged(update)
+                    return existing, False
+                response = self.request('POST', f"posts/{existing['id']}", json=changes)
+                response.raise_for_status()
+                post = response.json()
+                self.stats['updated'] += 1
+                self._record_update(existing['id'], update, changes, previous, post)
+                return post, False
+
+            try:
+                response = self.send('POST', 'posts', json=post_data)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                self.logger.warning(f"⚠️ Создание записи '{slug}': {e.__class__.__name__}, повтор через {delay:.0f} с")
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    post = response.json()
+                    self.stats['created'] += 1
+                    self._record_update(post['id'], post_data, post_data, {}, post)
+                    return post, True
+                delay = self._backoff(attempt, response)
+                self.logger.warning(f"⚠️ Создание записи '{slug}': HTTP {response.status_code}, "
+                                    f"повтор через {delay:.0f} с")
+            self.stats['retries'] += 1
+            time.sleep(delay)
+
+    def _changes(self, post_id: int, data: Dict[str, Any],
+                 live: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Поля, изменившиеся с последней публикации
+
+        Сохраненным хешам доверяем, если modified_gmt записи на сайте
+        совпадает с сохраненным (или запись не загружалась); иначе
+        сравнение идет с полями самой записи.
+
+        Args:
+            post_id: ID записи
+            data: Поля для отправки
+            live: Запись WordPress, если уже загружена (context=edit)
+
+        Returns:
+            Изменившиеся поля и хеши, с которыми шло сравнение
+        """
+        if self.field_hashes is None:
+            return data, {}
+        modified_gmt, previous = self.field_hashes.get(self.api_url, post_id)
+        if live is not None and (not previous or live.get('modified_gmt') != modified_gmt):
+            previous = live_hashes(live, data)
+        return changed_fields(data, previous), previous
+
+    def _record_update(self, post_id: int, full: Dict[str, Any], sent: Dict[str, Any],
+                       previous: Dict[str, str], post: Dict[str, Any]):
+        """Хеши отправленных полей и экономия относительно полного обновления"""
+        self.stats['bytes_saved'] += max(0, _payload_size(full) - _payload_size(sent))
+        if self.field_hashes is not None:
+            self.field_hashes.put(self.api_url, post_id, {**previous, **field_hashes(sent)},
+                                  (post or {}).get('modified_gmt'))
+
+    def _record_unchanged(self, full: Dict[str, Any]):
+        self.stats['unchanged'] += 1
+        self.stats['bytes_saved'] += _payload_size(full)
+
+    def find_posts_by_slug(self, slugs: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Уже созданные записи для нескольких slug одним запросом
+
+        Args:
+            slugs: Slug статей (не больше 100)
+
+        Returns:
+            Записи WordPress по slug
+        """
+        response = self.request('GET', 'posts', params={
+            'status': LOOKUP_STATUSES, 'context': 'edit', 'per_page': 100, 'slug': ','.join(slugs)
+        })
+        response.raise_for_status()
+        found: Dict[str, Dict[str, Any]] = {}
+        for post in response.json():
+            found.setdefault(post.get('slug'), post)
+        return found
+
+    def save_posts(self, posts: List[Tuple[Dict[str, Any], Optional[str]]]) -> List[SaveResult]:
+        """
+        Пакетное создание и обновление записей
+
+        Записи со slug группируются по batch_size в запросы к batch/v1.
+        Перед каждой попыткой пакета записи ищутся по slug одним запросом:
+        найденные обновляются (статус не меняется), остальные создаются,
+        поэтому повтор пакета после таймаута не создает дубликатов.
+        Подзапросы с ответом 429/5xx повторяются отдельным пакетом, пакет
+        с ответом 413 делится пополам. Обновления содержат только
+        изменившиеся поля, записи без изменений в пакет не попадают
+        (SaveResult.unchanged). Записи без slug и сайты без
+        batch API сохраняются по одной через save_post.
+
+        Args:
+            posts: Поля записи и ключевое слово для каждой статьи
+
+        Returns:
+            Результаты в порядке posts
+        """
+        results: List[Optional[SaveResult]] = [None] * len(posts)
+        batched = [i for i, (data, _) in enumerate(posts) if data.get('slug')]
+        if self.batch_supported is False or len(batched) < 2:
+            batched = []
+        single = [i for i in range(len(posts)) if i not in set(batched)]
+
+        operations: List[List[Any]] = [[None, data] for data, _ in posts]
+        for start in range(0, len(batched), self.batch_size):
+            chunk = batched[start:start + self.batch_size]
+            try:
+                self._save_chunk(posts, operations, chunk, results)
+            except requests.RequestException as e:
+                self._fail(chunk, results, e)
+        self._save_each(posts, single, results)
+        return results
+
+    def _save_chunk(self, posts: List[Tuple[Dict[str, Any], Optional[str]]], operations: List[List[Any]],
+                    indexes: List[int], results: List[Optional[SaveResult]], attempt: int = 0):
+        """
+        Один пакет batch/v1 с повторами
+
+        Args:
+            posts: Статьи для создания или обновления
+            operations: [ID записи или None, поля] для каждой статьи
+            indexes: Номера статей в пакете
+            results: Результаты (заполняются)
+            attempt: Номер попытки
+        """
+        live: Dict[int, Dict[str, Any]] = {}
+        existing = self.find_posts_by_slug([operations[i][1]['slug'] for i in indexes])
+        for i in indexes:
+            post = existing.get(operations[i][1]['slug'])
+            operations[i][0] = post['id'] if post else None
+            if post:
+                live[i] = post
+
+        # Обновления — только изменившиеся поля; записи без изменений в пакет не попадают
+        sent = []
+        changes: Dict[int, Tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]] = {}
+        sub_requests = []
+        for i in indexes:
+            post_id, data = operations[i]
+            if post_id is None:
+                changes[i] = (data, data, {})
+                sub_requests.append({'method': 'POST', 'path': f"{self.route_prefix}/posts", 'body': data})
+            else:
+                full = {key: value for key, value in data.items() if key != 'status'}
+                body, previous = self._changes(post_id, full, live.get(i))
+                if not body:
+                    self._record_unchanged(full)
+                    results[i] = SaveResult(post=live.get(i) or {'id': post_id}, status_code=304, unchanged=True)
+                    continue
+                changes[i] = (full, body, previous)
+                sub_requests.append({'method': 'POST', 'path': f"{self.route_prefix}/posts/{post_id}", 'body': body})
+            sent.append(i)
+        if not sent:
+            return
+        indexes = sent
+
+        try:
+            response = self.send('POST', self.batch_url, json={'validation': 'normal', 'requests': sub_requests})
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self._retry_chunk(posts, operations, indexes, results, attempt, e.__class__.__name__)
+            return
+
+        if response.status_code in (404, 405) or (response.status_code == 400 and 'rest_no_route' in response.text):
+            self.logger.warning("⚠️ WordPress не поддерживает /batch/v1: записи сохраняются по одной")
+            self.batch_supported = False
+            self._save_each(posts, indexes, results)
+            return
+        if response.status_code == 413 and len(indexes) > 1:
+            middle = len(indexes) // 2
+            self._save_chunk(posts, operations, indexes[:middle], results, attempt)
+            self._save_chunk(posts, operations, indexes[middle:], results, attempt)
+            return
+        if response.status_code in RETRY_STATUSES:
+            self._retry_chunk(posts, operations, indexes, results, attempt, f"HTTP {response.status_code}", response)
+            return
+        if response.status_code not in (200, 207):
+            for i in indexes:
+                results[i] = SaveResult(status_code=response.status_code, error=_error_message(response.text))
+            return
+
+        self.batch_supported = True
+        self.stats['batches'] += 1
+        responses = response.json().get('responses', [])
+        retry = []
+        for position, i in enumerate(indexes):
+            item = responses[position] if position < len(responses) else {}
+            status_code = item.get('status')
+            body = item.get('body')
+            if status_code in (200, 201):
+                created = operations[i][0] is None
+                results[i] = SaveResult(post=body, created=created, status_code=status_code)
+                self.stats['created' if created else 'updated'] += 1
+                full, sent_body, previous = changes[i]
+                self._record_update(body.get('id', operations[i][0]), full, sent_body, previous, body)
+                continue
+            results[i] = SaveResult(status_code=status_code, error=_error_message(body) or 'нет ответа в пакете')
+            if status_code in RETRY_STATUSES:
+                retry.append(i)
+        if retry:
+            self._retry_chunk(posts, operations, retry, results, attempt, f"подзапросов с 429/5xx: {len(retry)}")
+
+    def _retry_chunk(self, posts, operations, indexes, results, attempt, reason, response=None):
+        """Повтор пакета (или его неудачных подзапросов) после паузы"""
+        if attempt >= self.max_retries:
+            for i in indexes:
+                if results[i] is None:
+                    results[i] = SaveResult(status_code=response.status_code if response is not None else None,
+                                            error=reason)
+            return
+        delay = self._backoff(attempt, response)
+        self.logger.warning(f"⚠️ Пакет из {len(indexes)} записей: {reason}, повтор через {delay:.0f} с")
+        self.stats['retries'] += 1
+        time.sleep(delay)
+        self._save_chunk(posts, operations, indexes, results, attempt + 1)
+
+    def _save_each(self, posts, indexes, results):
+        """Сохранение записей по одной (без batch API)"""
+        for i in indexes:
+            data, keyword = posts[i]
+            try:
+                post, created = self.save_post(data, keyword)
+                results[i] = SaveResult(post=post, created=created, status_code=201 if created else 200)
+            except requests.RequestException as e:
+                self._fail([i], results, e)
+
+    @staticmethod
+    def _fail(indexes, results, error: requests.RequestException):
+        response = getattr(error, 'response', None)
+        for i in indexes:
+            results[i] = SaveResult(status_code=response.status_code if response is not None else None,
+                                    error=str(error))
+
+    def find_media(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Уже загруженный файл медиатеки по имени (без расширения)
+
+        Args:
+            filename: Имя файла, с которым он загружался
+
+        Returns:
+            Запись медиатеки или None
+        """
+        stem = os.path.splitext(filename)[0]
+        response = self.request('GET', 'media', params={
+            'search': stem, 'per_page': 20, '_fields': 'id,source_url,mime_type,media_details'
+        })
+        response.raise_for_status()
+        for media in response.json():
+            if stem in (media.get('source_url') or ''):
+                return media
+        return None
+
+    def upload_media(self, data: bytes, filename: str, mime_type: str,
+                     fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Загрузка файла в медиатеку (/wp/v2/media)
+
+        Как и создание записи, загрузка повторяется только после проверки,
+        что файл с таким именем не сохранился при прошлой попытке: имя
+        должно быть уникальным для содержимого (например, с хешем).
+
+        Args:
+            data: Содержимое файла
+            filename: Имя файла
+            mime_type: MIME-тип
+            fields: Поля вложения (alt_text, title, caption)
+
+        Returns:
+            Запись медиатеки
+
+        Raises:
+            requests.RequestException: Ошибка WordPress или сети после всех повторов
+        """
+        headers = {'Content-Type': mime_type, 'Content-Disposition': f'attachment; filename="{filename}"'}
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            if attempt:
+                existing = self.find_media(filename)
+                if existing:
+                    return existing
+            try:
+                response = self.send('POST', 'media', data=data, headers=headers, params=fields or {})
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                self.logger.warning(f"⚠️ Загрузка '{filename}': {e.__class__.__name__}, повтор через {delay:.0f} с")
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    self.stats['media'] += 1
+                    return response.json()
+                delay = self._backoff(attempt, response)
+                self.logger.warning(f"⚠️ Загрузка '{filename}': HTTP {response.status_code}, повтор через {delay:.0f} с")
+            self.stats['retries'] += 1
+            time.sleep(delay)
+
+    def close(self):
+        """Закрытие соединений пула"""
+        self.session.close()
+
+
+def _payload_size(data: Dict[str, Any]) -> int:
+    """Размер JSON тела запроса, байты"""
+    return len(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+
+def _error_message(body: Any) -> str:
+    """Текст ошибки WordPress из тела ответа (JSON с message или строка)"""
+    if isinstance(body, dict):
+        return body.get('message') or body.get('code') or ''
+    return str(body or '')[:300]
+
+
+_clients: Dict[Tuple[str, str], WordPressClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_wordpress_client(api_url: Optional[str] = None, username: Optional[str] = None,
+                         app_password: Optional[str] = None) -> WordPressClient:
+    """
+    Общий клиент для сайта и пользователя WordPress
+
+    Скрипты публикации, генератор и пакетный режим получают один экземпляр
+    и делят пул соединений.
+
+    Args:
+        api_url: URL REST API (по умолчанию WordPressConfig.API_URL)
+        username: Пользователь WordPress
+        app_password: Пароль приложения
+
+    Returns:
+        Клиент WordPress
+    """
+    key = ((api_url or WordPressConfig.API_URL).rstrip('/'), username or WordPressConfig.USERNAME)
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = WordPressClient(key[0], key[1], app_password)
+            _clients[key] = client
+        return client
+
+
+# Экспорт
+__all__ = ['WordPressClient', 'SaveResult', 'get_wordpress_client', 'RETRY_STATUSES']
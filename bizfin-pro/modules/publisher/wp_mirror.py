@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Локальное зеркало записей WordPress и их SEO-мета
+
+Таблица wp_posts_mirror хранит копию содержимого и мета-полей записей
+для отчетов и выборок без REST API (get, get_by_slug, iter_posts).
+Проверки после публикации (verification.py) пока по-прежнему читают
+записи через REST API. Синхронизация инкрементальная:
+
+- выбираются только записи, измененные после последней синхронизации
+  (modified_after по максимальному modified в зеркале, с перекрытием в секунду)
+- _fields оставляет в ответе только нужные поля, per_page=100
+- хеши содержимого и мета-полей: неизмененные записи не перезаписываются,
+  отчет показывает, какие записи действительно изменились
+
+Первая синхронизация 5 тыс. записей — один проход (50 страниц),
+последующие — несколько запросов.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Iterator
+import sys
+import os
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.database import DatabaseConfig
+from config.wordpress import WordPressConfig
+from modules.publisher.wordpress_client import WordPressClient, get_wordpress_client, LOOKUP_STATUSES
+
+# Поля записи, которые запрашиваются у WordPress (_fields)
+MIRROR_FIELDS = ['id', 'slug', 'status', 'link', 'modified', 'modified_gmt', 'title', 'content', 'meta']
+
+# Перекрытие окна modified_after: записи, измененные в ту же секунду, не теряются
+SYNC_OVERLAP = timedelta(seconds=1)
+
+MIRROR_DDL = {
+    'sqlite': """
+        CREATE TABLE IF NOT EXISTS wp_posts_mirror (
+            wp_post_id INTEGER PRIMARY KEY,
+            slug TEXT,
+            status TEXT,
+            link TEXT,
+            title TEXT,
+            content TEXT,
+            meta TEXT,
+            focus_keyword TEXT,
+            meta_description TEXT,
+            modified DATETIME,
+            modified_gmt DATETIME,
+            content_hash TEXT,
+            meta_hash TEXT,
+            synced_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'mysql': """
+        CREATE TABLE IF NOT EXISTS wp_posts_mirror (
+            wp_post_id INTEGER PRIMARY KEY,
+            slug VARCHAR(255),
+            status VARCHAR(20),
+            link VARCHAR(500),
+            title VARCHAR(500),
+            content LONGTEXT,
+            meta JSON,
+            focus_keyword VARCHAR(255),
+            meta_description TEXT,
+            modified DATETIME,
+            modified_gmt DATETIME,
+            content_hash CHAR(64),
+            meta_hash CHAR(64),
+            synced_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_slug (slug),
+            INDEX idx_modified (modified)
+        )
+    """
+}
+
+MIRROR_INDEXES_SQLITE = [
+    "CREATE INDEX IF NOT EXISTS idx_wp_posts_mirror_slug ON wp_posts_mirror(slug)",
+    "CREATE INDEX IF NOT EXISTS idx_wp_posts_mirror_modified ON wp_posts_mirror(modified)"
+]
+
+_COLUMNS = [
+    'wp_post_id', 'slug', 'status', 'link', 'title', 'content', 'meta', 'focus_keyword', 'meta_description',
+    'modified', 'modified_gmt', 'content_hash', 'meta_hash'
+]
+# Колонки, изменение которых требует перезаписи строки (содержимое и мета — по хешам)
+_COMPARED_COLUMNS = ['slug', 'status', 'link', 'title', 'modified', 'modified_gmt', 'content_hash', 'meta_hash']
+
+WP_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 текста (содержимое записи или JSON мета-полей)"""
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def _rendered(value: Any) -> str:
+    """Поле WordPress вида {'raw': ..., 'rendered': ...} (raw в контексте edit)"""
+    if isinstance(value, dict):
+        return value.get('raw') if value.get('raw') is not None else value.get('rendered', '')
+    return value or ''
+
+
+def _meta_value(meta: Dict[str, Any], field_name: str) -> Optional[str]:
+    """Значение SEO-поля с ключом плагина (с подчеркиванием и без)"""
+    key = WordPressConfig.get_seo_meta_fields().get(field_name)
+    if not key:
+        return None
+    return meta.get(key) or meta.get(key.lstrip('_')) or None
+
+
+@dataclass
+class MirroredPost:
+    """Запись WordPress из локального зеркала"""
+    wp_post_id: int
+    slug: str
+    status: str
+    link: str
+    title: str
+    content: str
+    meta: Dict[str, Any]
+    focus_keyword: Optional[str]
+    meta_description: Optional[str]
+    modified: str
+    content_hash: str
+    meta_hash: str
+
+
+@dataclass
+class SyncReport:
+    """Итоги синхронизации зеркала"""
+    since: Optional[str] = None
+    pages: int = 0
+    fetched: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    elapsed: float = 0.0
+    changed_ids: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'since': self.since,
+            'pages': self.pages,
+            'fetched': self.fetched,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'removed': self.removed,
+            'elapsed_seconds': round(self.elapsed, 2)
+        }
+
+
+class WordPressMirror:
+    """Инкрементальное зеркало записей WordPress в SQLite или MySQL"""
+
+    def __init__(self, connection, dialect: str, client: Optional[WordPressClient] = None):
+        """
+        Инициализация зеркала
+
+        Args:
+            connection: Соединение DB-API (sqlite3 или mysql.connector)
+            dialect: 'sqlite' или 'mysql'
+            client: Клиент WordPress (по умолчанию общий для WordPressConfig.API_URL)
+        """
+        self.connection = connection
+        self.dialect = dialect
+        self.placeholder = '?' if dialect == 'sqlite' else '%s'
+        self.client = client or get_wordpress_client()
+        self.logger = logging.getLogger(__name__)
+        self.ensure_schema()
+
+    @classmethod
+    def sqlite(cls, db_path: str, client: Optional[WordPressClient] = None) -> 'WordPressMirror':
+        """Зеркало в файле SQLite (файл создается при необходимости)"""
+        return cls(sqlite3.connect(db_path, timeout=30, check_same_thread=False), 'sqlite', client)
+
+    @classmethod
+    def mysql(cls, config: Optional[Dict[str, Any]] = None,
+              client: Optional[WordPressClient] = None) -> 'WordPressMirror':
+        """Зеркало в MySQL (по умолчанию DatabaseConfig)"""
+        import mysql.connector
+        return cls(mysql.connector.connect(**(config or DatabaseConfig.get_config_dict())), 'mysql', client)
+
+    def ensure_schema(self):
+        """Таблица зеркала (если ее еще нет)"""
+        cursor = self.connection.cursor()
+        cursor.execute(MIRROR_DDL[self.dialect])
+        if self.dialect == 'sqlite':
+            for sql in MIRROR_INDEXES_SQLITE:
+                cursor.execute(sql)
+        self.connection.commit()
+        cursor.close()
+
+    def cursor_position(self) -> Optional[datetime]:
+        """Время последнего изменения среди записей зеркала (локальное время сайта)"""
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT MAX(modified) FROM wp_posts_mirror")
+        value = cursor.fetchone()[0]
+        cursor.close()
+        if value is None or isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(str(value).replace(' ', 'T')[:19])
+
+    def sync(self, full: bool = False, prune: bool = False, per_page: int = 100) -> SyncReport:
+        """
+        Синхронизация зеркала с WordPress
+
+        Args:
+            full: Выбрать все записи, а не только измененные
+            prune: Удалить из зеркала записи, которых больше нет на сайте
+                (дополнительный проход только по id)
+            per_page: Записей на страницу (максимум REST API — 100)
+
+        Returns:
+            Итоги синхронизации
+        """
+        started = time.perf_counter()
+        report = SyncReport()
+        params: Dict[str, Any] = {
+            'status': LOOKUP_STATUSES,
+            'context': 'edit',
+            '_fields': ','.join(MIRROR_FIELDS),
+            'orderby': 'modified',
+            'order': 'asc',
+            'per_page': per_page
+        }
+        since = None if full else self.cursor_position()
+        if since is not None:
+            # modified_after сравнивается с post_modified (локальное время сайта)
+            report.since = (since - SYNC_OVERLAP).strftime(WP_DATETIME_FORMAT)
+            params['modified_after'] = report.since
+
+        for posts in self._pages(params, report):
+            self._store_page(posts, report)
+
+        if prune:
+            report.removed = self.prune(per_page)
+        report.elapsed = time.perf_counter() - started
+        self.logger.info(f"🪞 Зеркало WordPress: {report.to_dict()}")
+        return report
+
+    def _pages(self, params: Dict[str, Any], report: SyncReport) -> Iterator[List[Dict[str, Any]]]:
+        """Страницы записей (X-WP-TotalPages)"""
+        page = 1
+        while True:
+            response = self.client.request('GET', 'posts', params={**params, 'page': page})
+            if response.status_code == 400 and page > 1:
+                # Записей стало меньше, чем при запросе первой страницы
+                return
+            response.raise_for_status()
+            posts = response.json()
+            report.pages += 1
+            report.fetched += len(posts)
+            if posts:
+                yield posts
+            if page >= int(response.headers.get('X-WP-TotalPages', 1) or 1):
+                return
+            page += 1
+
+    @staticmethod
+    def _compared(values) -> tuple:
+        """Сравниваемые колонки строкой (MySQL возвращает DATETIME объектом)"""
+        return tuple('' if value is None else str(value) for value in values)
+
+    def _existing_rows(self, post_ids: List[int]) -> Dict[int, tuple]:
+        p = self.placeholder
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"SELECT wp_post_id, {', '.join(_COMPARED_COLUMNS)} FROM wp_posts_mirror "
+            f"WHERE wp_post_id IN ({', '.join([p] * len(post_ids))})",
+            post_ids
+        )
+        result = {row[0]: self._compared(row[1:]) for row in cursor.fetchall()}
+        cursor.close()
+        return result
+
+    def _store_page(self, posts: List[Dict[str, Any]], report: SyncReport):
+        """
+        Запись страницы одной транзакцией (только новые и измененные записи)
+
+        Запись перезаписывается при изменении любой зеркалируемой колонки:
+        статуса, заголовка, slug, ссылки, времени изменения (курсор
+        modified_after), содержимого или мета.
+        """
+        existing = self._existing_rows([post['id'] for post in posts])
+        rows = []
+        for post in posts:
+            content = _rendered(post.get('content'))
+            meta = post.get('meta') if isinstance(post.get('meta'), dict) else {}
+            meta_json = json.dumps(meta, ensure_ascii=False, sort_keys=True)
+            row = (
+                post['id'], post.get('slug'), post.get('status'), post.get('link'), _rendered(post.get('title')),
+                content, meta_json, _meta_value(meta, 'focus_keyword'), _meta_value(meta, 'meta_description'),
+                (post.get('modified') or '').replace('T', ' '), (post.get('modified_gmt') or '').replace('T', ' '),
+                content_hash(content), content_hash(meta_json)
+            )
+            previous = existing.get(post['id'])
+            if previous == self._compared(row[_COLUMNS.index(column)] for column in _COMPARED_COLUMNS):
+                report.unchanged += 1
+                continue
+            if previous is None:
+                report.inserted += 1
+            else:
+                report.updated += 1
+            report.changed_ids.append(post['id'])
+            rows.append(row)
+        if not rows:
+            return
+
+        p = self.placeholder
+        columns = ', '.join(_COLUMNS)
+        values = ', '.join([p] * len(_COLUMNS))
+        updates = [column for column in _COLUMNS if column != 'wp_post_id']
+        if self.dialect == 'sqlite':
+            sql = (f"INSERT INTO wp_posts_mirror ({columns}) VALUES ({values}) ON CONFLICT(wp_post_id) DO UPDATE SET "
+                   + ', '.join(f"{c} = excluded.{c}" for c in updates) + ", synced_at = CURRENT_TIMESTAMP")
+        else:
+            sql = (f"INSERT INTO wp_posts_mirror ({columns}) VALUES ({values}) ON DUPLICATE KEY UPDATE "
+                   + ', '.join(f"{c} = VALUES({c})" for c in updates))
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(sql, rows)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def prune(self, per_page: int = 100) -> int:
+        """
+        Удаление записей, которых больше нет на сайте (удалены или в корзине)
+
+        Returns:
+            Число удаленных из зеркала записей
+        """
+        report = SyncReport()
+        live = set()
+        params = {'status': LOOKUP_STATUSES, 'context': 'edit', '_fields': 'id', 'per_page': per_page}
+        for posts in self._pages(params, report):
+            live.update(post['id'] for post in posts)
+
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT wp_post_id FROM wp_posts_mirror")
+        stale = [row[0] for row in cursor.fetchall() if row[0] not in live]
+        if stale:
+            cursor.executemany(f"DELETE FROM wp_posts_mirror WHERE wp_post_id = {self.placeholder}",
+                               [(post_id,) for post_id in stale])
+            self.connection.commit()
+        cursor.close()
+        return len(stale)
+
+    def _row_to_post(self, row) -> MirroredPost:
+        meta = row[6]
+        if isinstance(meta, (str, bytes)):
+            meta = json.loads(meta or '{}')
+        return MirroredPost(
+            wp_post_id=row[0], slug=row[1] or '', status=row[2] or '', link=row[3] or '', title=row[4] or '',
+            content=row[5] or '', meta=meta or {}, focus_keyword=row[7], meta_description=row[8],
+            modified=str(row[9] or ''), content_hash=row[11] or '', meta_hash=row[12] or ''
+        )
+
+    def get(self, wp_post_id: int) -> Optional[MirroredPost]:
+        """Запись зеркала по ID WordPress"""
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT {', '.join(_COLUMNS)} FROM wp_posts_mirror WHERE wp_post_id = {self.placeholder}",
+                       (wp_post_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        return self._row_to_post(row) if row else None
+
+    def get_by_slug(self, slug: str) -> Optional[MirroredPost]:
+        """Запись зеркала по slug"""
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT {', '.join(_COLUMNS)} FROM wp_posts_mirror WHERE slug = {self.placeholder}", (slug,))
+        row = cursor.fetchone()
+        cursor.close()
+        return self._row_to_post(row) if row else None
+
+    def iter_posts(self, ids: Optional[List[int]] = None, chunk_size: int = 500) -> Iterator[MirroredPost]:
+        """
+        Записи зеркала порциями по возрастанию ID
+
+        Args:
+            ids: Только эти записи (например, SyncReport.changed_ids)
+            chunk_size: Записей в одной выборке
+        """
+        p = self.placeholder
+        if ids is not None:
+            ids = sorted(ids)
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                cursor = self.connection.cursor()
+                cursor.execute(f"SELECT {', '.join(_COLUMNS)} FROM wp_posts_mirror "
+                               f"WHERE wp_post_id IN ({', '.join([p] * len(chunk))}) ORDER BY wp_post_id", chunk)
+                rows = cursor.fetchall()
+                cursor.close()
+                yield from (self._row_to_post(row) for row in rows)
+            return
+
+        last_id = 0
+        while True:
+            cursor = self.connection.cursor()
+            cursor.execute(f"SELECT {', '.join(_COLUMNS)} FROM wp_posts_mirror "
+                           f"WHERE wp_post_id > {p} ORDER BY wp_post_id LIMIT {p}", (last_id, chunk_size))
+            rows = cursor.fetchall()
+            cursor.close()
+            if not rows:
+                return
+            yield from (self._row_to_post(row) for row in rows)
+            last_id = rows[-1][0]
+
+    def count(self) -> int:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM wp_posts_mirror")
+        result = cursor.fetchone()[0]
+        cursor.close()
+        return result
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+# Экспорт
+__all__ = ['WordPressMirror', 'MirroredPost', 'SyncReport', 'MIRROR_FIELDS', 'content_hash']
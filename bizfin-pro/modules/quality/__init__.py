@@ -0,0 +1,2 @@
+# Content Quality Module
+
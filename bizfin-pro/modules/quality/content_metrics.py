@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Единый разбор статьи для оценщиков качества и SEO
+
+ContentMetrics разбирает HTML один раз и собирает все, что нужно
+оценщикам: поток слов, дерево заголовков, счетчики списков, таблиц и
+ссылок, позиции ключевого слова и его плотность. Оценщики больше не
+переводят статью в нижний регистр, не разбивают ее на слова и не считают
+теги через str.count каждый заново.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache, cached_property
+from typing import Dict, Any, List
+import sys
+import os
+
+# Добавляем путь к модулям проекта
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from modules.quality.readability import ReadabilityScores, analyze_text
+from modules.quality.morphology import KeywordDensity, keyword_density, lemmatize_words, tokenize
+
+# Разметка: комментарии и теги
+_MARKUP_RE = re.compile(r'<!--.*?-->|<[^>]*>', re.DOTALL)
+_OPEN_TAG_RE = re.compile(r'<([a-z][a-z0-9]*)')
+_COMMENT_RE = re.compile(r'<!--(.*?)-->', re.DOTALL)
+_LINK_RE = re.compile(r'<a\s[^>]*?\bhref\s*=\s*["\']?([^"\'\s>]*)', re.IGNORECASE)
+_HEADING_RE = re.compile(r'<(h[1-6])\b[^>]*>(.*?)</\1\s*>', re.IGNORECASE | re.DOTALL)
+_WORD_RE = re.compile(r'[0-9a-zа-яё]+(?:-[0-9a-zа-яё]+)*', re.IGNORECASE)
+
+
+@dataclass
+class Heading:
+    """Заголовок статьи с вложенными подзаголовками"""
+    level: int
+    text: str
+    children: List['Heading'] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'level': self.level,
+            'text': self.text,
+            'children': [child.to_dict() for child in self.children]
+        }
+
+
+class ContentMetrics:
+    """Метрики статьи, собранные за один разбор HTML"""
+
+    def __init__(self, content: str, keyword: str = ''):
+        """
+        Разбор статьи
+
+        Args:
+            content: HTML (или обычный текст/markdown) статьи
+            keyword: Ключевое слово для позиций и плотности
+        """
+        self.content = content
+        self.keyword = keyword.lower().strip()
+        self.content_lower = content.lower()
+
+        # Совместимость с прежними оценщиками: они считали объем и уникальность
+        # по content.lower().split() (вместе с фрагментами разметки)
+        self.raw_tokens = self.content_lower.split()
+        self.raw_word_count = len(self.raw_tokens)
+
+        self.tag_counts: Counter = Counter()
+        self.headings: List[Heading] = []
+        self.heading_tree: List[Heading] = []
+        self.links: List[str] = []
+        self.comments: List[str] = []
+
+        self._parse()
+
+        self.keyword_positions = self._find_keyword_positions()
+
+    def _parse(self):
+        """
+        Разбор разметки: каждый счетчик собирается регулярным выражением
+        на уровне C, без цикла Python по каждому тегу
+        """
+        self.tag_counts = Counter(_OPEN_TAG_RE.findall(self.content_lower))
+        self.comments = [comment.strip() for comment in _COMMENT_RE.findall(self.content)]
+        self.links = _LINK_RE.findall(self.content)
+
+        heading_stack: List[Heading] = []
+        for tag, inner in _HEADING_RE.findall(self.content):
+            heading = Heading(int(tag[1]), ' '.join(_MARKUP_RE.sub(' ', inner).split()))
+            self.headings.append(heading)
+
+            # Дерево: подзаголовок вкладывается в ближайший заголовок уровнем выше
+            while heading_stack and heading_stack[-1].level >= heading.level:
+                heading_stack.pop()
+            if heading_stack:
+                heading_stack[-1].children.append(heading)
+            else:
+                self.heading_tree.append(heading)
+            heading_stack.append(heading)
+
+    def _find_keyword_positions(self) -> List[int]:
+        """Позиции ключевого слова в документе (как content.lower().count)"""
+        positions = []
+        if not self.keyword:
+            return positions
+        start = self.content_lower.find(self.keyword)
+        while start != -1:
+            positions.append(start)
+            start = self.content_lower.find(self.keyword, start + len(self.keyword))
+        return positions
+
+    # Текст и слова: вычисляются один раз и только если нужны оценщику
+
+    @cached_property
+    def text(self) -> str:
+        """Текст без разметки в нижнем регистре"""
+        return _MARKUP_RE.sub(' ', self.content_lower)
+
+    @cached_property
+    def words(self) -> List[str]:
+        return _WORD_RE.findall(self.text)
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Слова текста для морфологии (дефис разделяет слова)"""
+        return tokenize(self.text)
+
+    @cached_property
+    def lemmas(self) -> List[str]:
+        """Леммы слов текста (общий кеш лемм modules/quality/morphology.py)"""
+        return lemmatize_words(self.tokens)
+
+    @cached_property
+    def keyword_forms(self) -> KeywordDensity:
+        """Вхождения ключевого слова во всех словоформах и плотность по леммам"""
+        return keyword_density(self.tokens, self.keyword, self.lemmas)
+
+    @cached_property
+    def readability(self) -> ReadabilityScores:
+        """Читаемость по русским формулам Флеша (modules/quality/readability.py)"""
+        return analyze_text(self.content)
+
+    @cached_property
+    def sentence_count(self) -> int:
+        text = self.text
+        return text.count('.') + text.count('!') + text.count('?')
+
+    # Счетчики для оценщиков
+
+    @property
+    def word_count(self) -> int:
+        """Число слов текста (без разметки)"""
+        return len(self.words)
+
+    @property
+    def unique_word_count(self) -> int:
+        return len(set(self.words))
+
+    def heading_count(self, level: int) -> int:
+        return self.tag_counts[f'h{level}']
+
+    @property
+    def list_count(self) -> int:
+        return self.tag_counts['ul'] + self.tag_counts['ol']
+
+    @property
+    def table_count(self) -> int:
+        return self.tag_counts['table']
+
+    @property
+    def link_count(self) -> int:
+        return len(self.links)
+
+    def has_tag(self, name: str) -> bool:
+        return self.tag_counts[name] > 0
+
+    def raw_markup_count(self, fragment: str) -> int:
+        """
+        Точные вхождения фрагмента разметки с учетом регистра (шкала прежних
+        оценщиков: '<ul>' не совпадает с '<ul class="...">', '<h2' — совпадает)
+        """
+        return self.content.count(fragment)
+
+    def has_comment(self, prefix: str) -> bool:
+        """Есть ли служебный комментарий (например, 'wp:more')"""
+        return any(comment.startswith(prefix) for comment in self.comments)
+
+    @property
+    def keyword_occurrences(self) -> int:
+        return len(self.keyword_positions)
+
+    @property
+    def keyword_density(self) -> float:
+        """Плотность ключевого слова в процентах (к raw_word_count, как раньше)"""
+        if not self.raw_word_count:
+            return 0.0
+        return self.keyword_occurrences / self.raw_word_count * 100
+
+    def keyword_in_prefix(self, chars: int) -> bool:
+        """Встречается ли ключевое слово в первых chars символах документа"""
+        return bool(self.keyword_positions) and self.keyword_positions[0] + len(self.keyword) <= chars
+
+    @property
+    def uniqueness_ratio(self) -> float:
+        """Доля уникальных слов текста"""
+        return self.unique_word_count / self.word_count if self.words else 0.0
+
+    @property
+    def raw_uniqueness_ratio(self) -> float:
+        """Доля уникальных токенов content.lower().split() (шкала прежних оценщиков)"""
+        return len(set(self.raw_tokens)) / self.raw_word_count if self.raw_tokens else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сводка метрик (для логов и quality_metrics.details)"""
+        return {
+            'word_count': self.word_count,
+            'raw_word_count': self.raw_word_count,
+            'unique_word_count': self.unique_word_count,
+            'sentence_count': self.sentence_count,
+            'headings': {f'h{level}': self.heading_count(level) for level in range(1, 4)},
+            'lists': self.list_count,
+            'tables': self.table_count,
+            'links': self.link_count,
+            'keyword_occurrences': self.keyword_occurrences,
+            'keyword_density': round(self.keyword_density, 2)
+        }
+
+
+@lru_cache(maxsize=32)
+def get_content_metrics(content: str, keyword: str = '') -> ContentMetrics:
+    """
+    Метрики статьи с кешем: оценщики, вызванные для одной и той же статьи,
+    получают один и тот же разбор
+    """
+    return ContentMetrics(content, keyword)
+
+
+# Экспорт
+__all__ = ['ContentMetrics', 'Heading', 'get_content_metrics']
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Линтер структуры HTML статей
+
+За один разбор lxml строит дерево заголовков и проверяет: вложенность
+заголовков (пропуск уровней), пустые разделы и заголовки, повторный H1,
+повторные id, якорные ссылки на несуществующие id и согласованность
+FAQ с разметкой schema.org (FAQPage в JSON-LD). lxml восстанавливает
+поврежденную разметку молча, поэтому незакрытые и лишние закрывающие
+теги ищутся отдельным проходом по токенам тегов со стеком.
+
+Результат — список замечаний с кодами (для логов, БД и гейта перед
+публикацией); разбор статьи занимает около миллисекунды.
+"""
+
+import re
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+# lxml (опционально): без него линтер пропускает проверки
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    etree = None
+    LXML_AVAILABLE = False
+
+_HEADING_TAGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+
+# Элементы, которые сами по себе — содержимое раздела
+_MEDIA_TAGS = frozenset(['img', 'table', 'iframe', 'video', 'audio', 'figure', 'svg', 'picture', 'canvas', 'form'])
+
+# Пустые элементы и элементы, закрывающий тег которых HTML разрешает опускать
+_VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'
+])
+_OPTIONAL_END_TAGS = frozenset([
+    'p', 'li', 'dt', 'dd', 'tr', 'td', 'th', 'thead', 'tbody', 'tfoot', 'option', 'colgroup', 'caption'
+])
+
+_RAW_TEXT_RE = re.compile(r'<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_TOKEN_RE = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9-]*)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*?(/?)>')
+_QUESTION_NORMALIZE_RE = re.compile(r'[^0-9a-zа-яё]+')
+
+
+@dataclass
+class LintIssue:
+    """Замечание линтера"""
+    code: str
+    severity: str  # error, warning
+    message: str
+    line: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'code': self.code, 'severity': self.severity, 'message': self.message, 'line': self.line}
+
+
+@dataclass
+class LintReport:
+    """Результат проверки статьи"""
+    issues: List[LintIssue] = field(default_factory=list)
+    headings: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def errors(self) -> List[LintIssue]:
+        return [issue for issue in self.issues if issue.severity == 'error']
+
+    @property
+    def warnings(self) -> List[LintIssue]:
+        return [issue for issue in self.issues if issue.severity == 'warning']
+
+    @property
+    def passed(self) -> bool:
+        return not self.errors
+
+    def add(self, code: str, severity: str, message: str, line: Optional[int] = None):
+        self.issues.append(LintIssue(code, severity, message, line))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'passed': self.passed,
+            'errors': len(self.errors),
+            'warnings': len(self.warnings),
+            'issues': [issue.to_dict() for issue in self.issues],
+            'heading_tree': self.headings,
+            'elapsed_ms': round(self.elapsed_ms, 2)
+        }
+
+
+def _normalize_question(text: str) -> str:
+    return _QUESTION_NORMALIZE_RE.sub(' ', text.lower()).strip()
+
+
+def check_tag_balance(content: str, report: LintReport):
+    """
+    Незакрытые и лишние закрывающие теги (проход по токенам со стеком)
+
+    Незакрытые p, li, td и другие теги с необязательным закрытием —
+    предупреждение, остальные — ошибка.
+    """
+    content = _RAW_TEXT_RE.sub(lambda m: f'<{m.group(1)}></{m.group(1)}>' if m.group(1) else '', content)
+    stack: List[Tuple[str, int]] = []
+
+    def line_of(position: int) -> int:
+        return content.count('\n', 0, position) + 1
+
+    def report_unclosed(name: str, position: int):
+        severity = 'warning' if name in _OPTIONAL_END_TAGS else 'error'
+        report.add('unclosed_tag', severity, f'Тег <{name}> не закрыт', line_of(position))
+
+    for match in _TAG_TOKEN_RE.finditer(content):
+        closing, name, self_closing = match.group(1), match.group(2).lower(), match.group(3)
+        if name in _VOID_TAGS:
+            continue
+        if not closing:
+            if not self_closing:
+                stack.append((name, match.start()))
+            continue
+        if stack and stack[-1][0] == name:
+            stack.pop()
+        elif any(open_name == name for open_name, _ in stack):
+            # Закрывается внешний тег: все вложенные остались незакрытыми
+            while stack[-1][0] != name:
+                report_unclosed(*stack.pop())
+            stack.pop()
+        else:
+            report.add('unexpected_end_tag', 'error', f'Лишний закрывающий тег </{name}>', line_of(match.start()))
+
+    for name, position in stack:
+        report_unclosed(name, position)
+
+
+def _heading_tree(headings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Дерево заголовков: подзаголовок вкладывается в ближайший заголовок уровнем выше"""
+    tree: List[Dict[str, Any]] = []
+    stack: List[Dict[str, Any]] = []
+    for heading in headings:
+        node = {'level': heading['level'], 'text': heading['text'], 'line': heading['line'], 'children': []}
+        while stack and stack[-1]['level'] >= node['level']:
+            stack.pop()
+        (stack[-1]['children'] if stack else tree).append(node)
+        stack.append(node)
+    return tree
+
+
+def check_faq_schema(schemas: List[Tuple[str, int]], visible_text: str, report: LintReport):
+    """Разметка FAQPage: корректный JSON-LD, каждый вопрос с ответом есть в тексте статьи"""
+    for raw, line in schemas:
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            report.add('invalid_schema', 'error', f'JSON-LD не разбирается: {e}', line)
+            continue
+
+        items = data if isinstance(data, list) else data.get('@graph', [data]) if isinstance(data, dict) else []
+        for item in items:
+            if not isinstance(item, dict) or item.get('@type') != 'FAQPage':
+                continue
+            entities = item.get('mainEntity') or []
+            if not entities:
+                report.add('faq_schema_mismatch', 'error', 'FAQPage без вопросов', line)
+            for entity in entities if isinstance(entities, list) else [entities]:
+                question = (entity.get('name') or '').strip()
+                answer = (entity.get('acceptedAnswer') or {}).get('text', '').strip()
+                if not answer:
+                    report.add('faq_schema_mismatch', 'error', f'Нет ответа в разметке: «{question[:80]}»', line)
+                if not question or _normalize_question(question) not in visible_text:
+                    report.add('faq_schema_mismatch', 'error', f'Вопроса из разметки нет в статье: «{question[:80]}»', line)
+
+
+def lint_html(content: str) -> LintReport:
+    """
+    Проверка структуры статьи
+
+    Args:
+        content: HTML статьи (фрагмент без <html>/<body>)
+
+    Returns:
+        Замечания, дерево заголовков и время проверки
+    """
+    started = time.perf_counter()
+    report = LintReport()
+
+    check_tag_balance(content, report)
+
+    if not LXML_AVAILABLE:
+        report.add('linter_unavailable', 'warning', 'lxml не установлен: проверена только парность тегов')
+        report.elapsed_ms = (time.perf_counter() - started) * 1000
+        return report
+
+    parser = etree.HTMLParser(recover=True, remove_comments=True, remove_pis=True)
+    root = etree.fromstring(f'<html><body>{content}</body></html>', parser)
+    if root is None:
+        report.add('empty_document', 'error', 'Пустая статья')
+        return report
+
+    headings: List[Dict[str, Any]] = []
+    ids: Counter = Counter()
+    anchors: List[Tuple[str, int]] = []
+    schemas: List[Tuple[str, int]] = []
+    text_parts: List[str] = []
+    heading_elements = set()
+
+    def mark_content():
+        if headings:
+            headings[-1]['has_content'] = True
+
+    # Один проход по дереву в порядке документа
+    for element in root.iter():
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue
+        if element in heading_elements:
+            continue
+
+        element_id = element.get('id')
+        if element_id:
+            ids[element_id] += 1
+        if tag == 'a':
+            anchor_name = element.get('name')
+            if anchor_name and anchor_name != element_id:
+                ids[anchor_name] += 1
+            href = (element.get('href') or '').strip()
+            if href.startswith('#') and len(href) > 1:
+                anchors.append((href[1:], element.sourceline))
+
+        if tag in ('script', 'style'):
+            if tag == 'script' and (element.get('type') or '').lower() == 'application/ld+json':
+                schemas.append((element.text or '', element.sourceline))
+            if element.tail and element.tail.strip():
+                mark_content()
+                text_parts.append(element.tail)
+            continue
+
+        level = _HEADING_TAGS.get(tag)
+        if level:
+            text = ' '.join(''.join(element.itertext()).split())
+            heading_elements.update(element.iterdescendants())
+            headings.append({'level': level, 'text': text, 'line': element.sourceline, 'has_content': False})
+            text_parts.append(text)
+            if element.tail and element.tail.strip():
+                mark_content()
+                text_parts.append(element.tail)
+            continue
+
+        if tag in _MEDIA_TAGS:
+            mark_content()
+        for text in (element.text, element.tail):
+            if text and text.strip():
+                mark_content()
+                text_parts.append(text)
+
+    # Заголовки: один H1, без пропуска уровней, без пустых заголовков и разделов
+    h1_count = sum(1 for heading in headings if heading['level'] == 1)
+    if h1_count == 0:
+        report.add('missing_h1', 'warning', 'В статье нет H1')
+    for heading in [heading for heading in headings if heading['level'] == 1][1:]:
+        report.add('duplicate_h1', 'error', f'Повторный H1: «{heading["text"][:80]}»', heading['line'])
+
+    previous_level = 1
+    for index, heading in enumerate(headings):
+        level = heading['level']
+        if not heading['text']:
+            report.add('empty_heading', 'error', f'Пустой заголовок H{level}', heading['line'])
+        if level > previous_level + 1:
+            report.add('heading_skip', 'error',
+                       f'H{level} после H{previous_level}: «{heading["text"][:80]}»', heading['line'])
+        previous_level = level
+
+        following = headings[index + 1] if index + 1 < len(headings) else None
+        has_subsections = following is not None and following['level'] > level
+        if not heading['has_content'] and not has_subsections:
+            report.add('empty_section', 'error', f'Раздел без содержимого: «{heading["text"][:80]}»', heading['line'])
+
+    # id и якорные ссылки
+    for element_id, count in ids.items():
+        if count > 1:
+            report.add('duplicate_id', 'error', f'id="{element_id}" встречается {count} раз')
+    for target, line in anchors:
+        if target not in ids:
+            report.add('broken_anchor', 'error', f'Ссылка на несуществующий якорь #{target}', line)
+
+    # FAQ: повторы вопросов и согласованность с разметкой
+    questions = Counter(_normalize_question(heading['text']) for heading in headings if heading['text'].endswith('?'))
+    for question, count in questions.items():
+        if count > 1:
+            report.add('duplicate_faq_question', 'warning', f'Вопрос повторяется {count} раз: «{question[:80]}»')
+    if schemas:
+        check_faq_schema(schemas, _normalize_question(' '.join(text_parts)), report)
+
+    report.headings = _heading_tree(headings)
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
+
+
+def lint_articles(contents: Iterable[str], workers: int = 1) -> List[LintReport]:
+    """
+    Пакетная проверка статей
+
+    Args:
+        contents: HTML статей
+        workers: Число процессов (1 — в текущем процессе)
+
+    Returns:
+        Отчеты в порядке статей
+    """
+    contents = list(contents)
+    if workers <= 1 or len(contents) < 2:
+        return [lint_html(content) for content in contents]
+    with Pool(processes=workers) as pool:
+        return pool.map(lint_html, contents, chunksize=max(1, len(contents) // (workers * 4)))
+
+
+# Экспорт
+__all__ = ['LintIssue', 'LintReport', 'lint_html', 'lint_articles', 'check_tag_balance', 'LXML_AVAILABLE']
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Морфология для оценки ключевых слов
+
+Плотность ключевого слова через content.lower().count(keyword) не видит
+словоформ («банковской гарантии», «банковскую гарантию») и подталкивает
+к неестественным повторам точного вхождения. Здесь слова приводятся к
+нормальной форме (pymorphy, если установлен, иначе встроенный стеммер
+Snowball для русского), формы кешируются в общем для процесса LRU-кеше,
+а ключевое слово сопоставляется с текстом по последовательности лемм
+за один проход.
+
+Кеш общий для оценщиков, сервера ai_agent и извлечения LSI у конкурентов:
+все они вызывают lemmatize() этого модуля.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Iterable, Tuple
+
+# Лемматизатор (опционально): pymorphy3 или pymorphy2
+try:
+    import pymorphy3 as pymorphy
+    MORPH_AVAILABLE = True
+except ImportError:
+    try:
+        import pymorphy2 as pymorphy
+        MORPH_AVAILABLE = True
+    except ImportError:
+        pymorphy = None
+        MORPH_AVAILABLE = False
+
+LEMMA_CACHE_SIZE = int(os.getenv('LEMMA_CACHE_SIZE', 200000))
+
+# Дефис разделяет слова: «44-ФЗ» и «44 ФЗ» дают одинаковые леммы
+_TOKEN_RE = re.compile(r'[0-9a-zа-яё]+', re.IGNORECASE)
+
+# Разделитель лемм при поиске n-грамм через str.count (не встречается в словах)
+_SEP = '\x00'
+
+_morph = pymorphy.MorphAnalyzer() if MORPH_AVAILABLE else None
+
+
+# Стеммер Snowball для русского языка (если pymorphy не установлен)
+
+_RU_VOWELS = 'аеиоуыэюя'
+
+_PERFECTIVE_GERUND = (('в', 'вши', 'вшись'), ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'))
+_ADJECTIVE = (
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем', 'им', 'ым', 'ом',
+    'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю', 'ая', 'яя', 'ою', 'ею'
+)
+_PARTICIPLE = (('ем', 'нн', 'вш', 'ющ', 'щ'), ('ивш', 'ывш', 'ующ'))
+_REFLEXIVE = ('ся', 'сь')
+_VERB = (
+    ('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет', 'ют', 'ны', 'ть', 'ешь', 'нно'),
+    ('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй', 'ил', 'ыл', 'им', 'ым', 'ен',
+     'ило', 'ыло', 'ено', 'ят', 'ует', 'уют', 'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю')
+)
+_NOUN = (
+    'а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и', 'ией', 'ей', 'ой', 'ий', 'й',
+    'иям', 'ям', 'ием', 'ем', 'ам', 'ом', 'о', 'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я'
+)
+_SUPERLATIVE = ('ейше', 'ейш')
+_DERIVATIONAL = ('ость', 'ост')
+
+
+def _by_length(endings: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sorted(endings, key=len, reverse=True))
+
+
+_PERFECTIVE_GERUND = (_by_length(_PERFECTIVE_GERUND[0]), _by_length(_PERFECTIVE_GERUND[1]))
+_ADJECTIVE = _by_length(_ADJECTIVE)
+_PARTICIPLE = (_by_length(_PARTICIPLE[0]), _by_length(_PARTICIPLE[1]))
+_VERB = (_by_length(_VERB[0]), _by_length(_VERB[1]))
+_NOUN = _by_length(_NOUN)
+
+
+def _strip_ending(region: str, endings: Tuple[str, ...]) -> str:
+    """Удаление самого длинного окончания из списка (region без изменений, если не найдено)"""
+    for ending in endings:
+        if region.endswith(ending):
+            return region[:-len(ending)]
+    return region
+
+
+def _strip_grouped(region: str, groups: Tuple[Tuple[str, ...], Tuple[str, ...]]) -> str:
+    """Окончания первой группы удаляются только после «а»/«я», второй — всегда"""
+    candidates = []
+    for ending in groups[0]:
+        if region.endswith(ending) and region[:-len(ending)].endswith(('а', 'я')):
+            candidates.append(ending)
+            break
+    for ending in groups[1]:
+        if region.endswith(ending):
+            candidates.append(ending)
+            break
+    if not candidates:
+        return region
+    return region[:-len(max(candidates, key=len))]
+
+
+def _regions(word: str) -> Tuple[int, int]:
+    """Начала областей RV и R2 алгоритма Snowball"""
+    rv = len(word)
+    for i, char in enumerate(word):
+        if char in _RU_VOWELS:
+            rv = i + 1
+            break
+
+    def next_region(start: int) -> int:
+        for i in range(start + 1, len(word)):
+            if word[i] not in _RU_VOWELS and word[i - 1] in _RU_VOWELS:
+                return i + 1
+        return len(word)
+
+    r1 = next_region(0)
+    return rv, next_region(r1)
+
+
+def stem_russian(word: str) -> str:
+    """Основа слова по алгоритму Snowball для русского языка"""
+    word = word.replace('ё', 'е')
+    rv, r2 = _regions(word)
+    prefix, region = word[:rv], word[rv:]
+
+    # Шаг 1: деепричастие, иначе возвратность + прилагательное/глагол/существительное
+    stripped = _strip_grouped(region, _PERFECTIVE_GERUND)
+    if stripped == region:
+        region = _strip_ending(region, _REFLEXIVE)
+        stripped = _strip_ending(region, _ADJECTIVE)
+        if stripped != region:
+            stripped = _strip_grouped(stripped, _PARTICIPLE)
+        else:
+            stripped = _strip_grouped(region, _VERB)
+            if stripped == region:
+                stripped = _strip_ending(region, _NOUN)
+    region = stripped
+
+    # Шаг 2: конечное «и»
+    if region.endswith('и'):
+        region = region[:-1]
+
+    # Шаг 3: словообразовательный суффикс в R2
+    for ending in _DERIVATIONAL:
+        if region.endswith(ending) and rv + len(region) - len(ending) >= r2:
+            region = region[:-len(ending)]
+            break
+
+    # Шаг 4: «нн» → «н», превосходная степень, мягкий знак
+    if region.endswith('нн'):
+        region = region[:-1]
+    else:
+        superlative = _strip_ending(region, _SUPERLATIVE)
+        if superlative != region:
+            region = superlative[:-1] if superlative.endswith('нн') else superlative
+        elif region.endswith('ь'):
+            region = region[:-1]
+
+    return prefix + region
+
+
+# Общий кеш лемм процесса
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize(word: str) -> str:
+    """
+    Нормальная форма слова (с кешем на процесс)
+
+    Args:
+        word: Слово в нижнем регистре
+
+    Returns:
+        Лемма (pymorphy) или основа (стеммер Snowball); числа — без изменений
+    """
+    if not word or word[0].isdigit() or not re.search('[а-яё]', word):
+        return word
+    if _morph is not None:
+        return _morph.parse(word)[0].normal_form.replace('ё', 'е')
+    return stem_russian(word)
+
+
+def tokenize(text: str) -> List[str]:
+    """Слова текста в нижнем регистре (части слов через дефис — отдельно)"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def lemmatize_words(words: Iterable[str]) -> List[str]:
+    """Леммы последовательности слов (повторы берутся из кеша)"""
+    return list(map(lemmatize, words))
+
+
+@lru_cache(maxsize=1024)
+def keyword_lemmas(keyword: str) -> Tuple[str, ...]:
+    """Последовательность лемм ключевого слова (вычисляется один раз на ключ)"""
+    return tuple(lemmatize_words(tokenize(keyword)))
+
+
+def count_lemma_ngram(lemmas: List[str], pattern: Tuple[str, ...]) -> int:
+    """
+    Число вхождений последовательности лемм в тексте (без перекрытий)
+
+    Поиск идет одним проходом str.count по леммам, склеенным разделителем,
+    которого нет в словах.
+    """
+    if not pattern or len(pattern) > len(lemmas):
+        return 0
+    haystack = _SEP + (_SEP * 2).join(lemmas) + _SEP
+    needle = _SEP + (_SEP * 2).join(pattern) + _SEP
+    return haystack.count(needle)
+
+
+@dataclass
+class KeywordDensity:
+    """Вхождения ключевого слова с учетом словоформ"""
+    keyword: str
+    occurrences: int
+    word_count: int
+
+    @property
+    def density(self) -> float:
+        """Плотность в процентах (вхождения ключа к числу слов текста)"""
+        return self.occurrences / self.word_count * 100 if self.word_count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'keyword': self.keyword,
+            'occurrences': self.occurrences,
+            'word_count': self.word_count,
+            'density': round(self.density, 2)
+        }
+
+
+def keyword_density(words: List[str], keyword: str, lemmas: List[str] = None) -> KeywordDensity:
+    """
+    Плотность ключевого слова по леммам
+
+    Args:
+        words: Слова текста (tokenize)
+        keyword: Ключевое слово
+        lemmas: Уже вычисленные леммы words (если есть)
+
+    Returns:
+        Вхождения и плотность
+    """
+    if lemmas is None:
+        lemmas = lemmatize_words(words)
+    return KeywordDensity(keyword, count_lemma_ngram(lemmas, keyword_lemmas(keyword.lower())), len(words))
+
+
+def lemma_cache_info() -> Dict[str, Any]:
+    """Статистика общего кеша лемм (для логов и мониторинга)"""
+    info = lemmatize.cache_info()
+    total = info.hits + info.misses
+    return {
+        'backend': 'pymorphy' if MORPH_AVAILABLE else 'snowball',
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'hits': info.hits,
+        'misses': info.misses,
+        'hit_rate': round(info.hits / total, 3) if total else 0.0
+    }
+
+
+# Экспорт
+__all__ = [
+    'lemmatize', 'lemmatize_words', 'keyword_lemmas', 'tokenize', 'stem_russian',
+    'count_lemma_ngram', 'keyword_density', 'KeywordDensity', 'lemma_cache_info', 'MORPH_AVAILABLE'
+]
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Индекс почти-дубликатов статей (MinHash + LSH)
+
+evaluate_content_uniqueness оценивает одну статью, а шаблонные генераторы
+дают почти одинаковые статьи для разных ключевых слов. Попарное сравнение
+со всем корпусом — O(n²), поэтому каждая статья сводится к MinHash-подписи
+по словесным шинглам, подпись разбивается на полосы (LSH banding), и
+кандидаты в дубликаты находятся по совпадению корзин полос — без обхода
+всего корпуса. Для кандидатов сходство Жаккара оценивается по подписям.
+
+Подписи и корзины хранятся в той же SQLite БД, что и таблица articles.
+"""
+
+import zlib
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+import sys
+import os
+
+import numpy as np
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+from modules.quality.content_metrics import get_content_metrics
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Максимум параметров в одном запросе SQLite
+_SQL_BATCH = 500
+
+
+def _keyword_key(keyword: str) -> str:
+    """Ключевое слово без учета регистра и лишних пробелов"""
+    return ' '.join(keyword.split()).lower()
+
+
+@dataclass
+class SimilarArticle:
+    """Похожая статья корпуса"""
+    article_id: int
+    keyword: str
+    similarity: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'article_id': self.article_id,
+            'keyword': self.keyword,
+            'similarity': round(self.similarity, 3)
+        }
+
+
+@dataclass
+class DuplicateCheck:
+    """Результат проверки новой статьи по корпусу"""
+    threshold: float
+    similar: List[SimilarArticle] = field(default_factory=list)
+    candidates: int = 0
+    # Прежние версии той же статьи (то же ключевое слово): повторная публикация — обновление, не дубликат
+    previous: List[SimilarArticle] = field(default_factory=list)
+
+    @property
+    def max_similarity(self) -> float:
+        return self.similar[0].similarity if self.similar else 0.0
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.max_similarity >= self.threshold
+
+    @property
+    def duplicates(self) -> List[SimilarArticle]:
+        return [article for article in self.similar if article.similarity >= self.threshold]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'threshold': self.threshold,
+            'max_similarity': round(self.max_similarity, 3),
+            'is_duplicate': self.is_duplicate,
+            'candidates': self.candidates,
+            'similar': [article.to_dict() for article in self.similar],
+            'previous': [article.to_dict() for article in self.previous]
+        }
+
+
+class NearDuplicateIndex:
+    """MinHash-подписи статей с LSH-корзинами в SQLite"""
+
+    def __init__(self, connection: sqlite3.Connection, num_perm: int = 128, bands: int = 32,
+                 shingle_size: int = 5, seed: int = 1):
+        """
+        Инициализация индекса
+
+        Args:
+            connection: Соединение с БД статей
+            num_perm: Длина подписи (число хеш-функций)
+            bands: Число полос LSH (num_perm должно делиться на bands)
+            shingle_size: Длина шингла в словах
+            seed: Зерно хеш-функций (подписи сравнимы только при одинаковом зерне)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) должно делиться на bands ({bands})")
+
+        self.connection = connection
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        # Хеш-функции вида (a * x + b) mod p; RandomState воспроизводим между запусками
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 1 << 61, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 61, size=num_perm, dtype=np.uint64)
+
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """Таблицы подписей и LSH-корзин"""
+        cursor = self.connection.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_minhash (
+                article_id INTEGER PRIMARY KEY,
+                keyword TEXT,
+                signature BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_lsh_buckets (
+                bucket INTEGER NOT NULL,
+                article_id INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_lsh_bucket ON article_lsh_buckets(bucket)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_lsh_article ON article_lsh_buckets(article_id)")
+        self.connection.commit()
+
+    # Подписи
+
+    def shingles(self, content: str) -> np.ndarray:
+        """Хеши словесных шинглов статьи (текст без разметки)"""
+        words = get_content_metrics(content).words
+        size = self.shingle_size
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        if len(words) < size:
+            size = len(words)
+        count = len(words) - size + 1
+        hashes = np.fromiter(
+            (zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) for i in range(count)),
+            dtype=np.uint64,
+            count=count
+        )
+        return np.unique(hashes)
+
+    def signature(self, content: str) -> Optional[np.ndarray]:
+        """
+        MinHash-подпись статьи
+
+        Returns:
+            Массив uint32 длины num_perm или None для статьи без текста
+        """
+        hashes = self.shingles(content)
+        if not hashes.size:
+            return None
+        # Переполнение uint64 допустимо: это все равно семейство хеш-функций
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def as_signature(self, signature: Any) -> Optional[np.ndarray]:
+        """Подпись из списка (например, из чекпоинта пакетного режима)"""
+        if signature is None:
+            return None
+        signature = np.asarray(signature, dtype=np.uint32)
+        return signature if signature.size == self.num_perm else None
+
+    def buckets(self, signature: np.ndarray) -> List[int]:
+        """Корзины LSH: номер полосы в старших битах, CRC32 полосы — в младших"""
+        return [
+            (band << 32) | zlib.crc32(signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    # Запросы
+
+    def _candidates(self, signature: np.ndarray, exclude_id: Optional[int] = None) -> List[int]:
+        buckets = self.buckets(signature)
+        placeholders = ', '.join('?' * len(buckets))
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"SELECT DISTINCT article_id FROM article_lsh_buckets WHERE bucket IN ({placeholders})",
+            buckets
+        )
+        return [row[0] for row in cursor.fetchall() if row[0] != exclude_id]
+
+    def _load_signatures(self, article_ids: List[int]) -> Iterable[Tuple[int, str, bytes]]:
+        cursor = self.connection.cursor()
+        for start in range(0, len(article_ids), _SQL_BATCH):
+            batch = article_ids[start:start + _SQL_BATCH]
+            cursor.execute(
+                f"SELECT article_id, keyword, signature FROM article_minhash "
+                f"WHERE article_id IN ({', '.join('?' * len(batch))})",
+                batch
+            )
+            yield from cursor.fetchall()
+
+    def query(self, signature: np.ndarray, top_k: int = 5, min_similarity: float = 0.0,
+              exclude_id: Optional[int] = None, exclude_keyword: Optional[str] = None
+              ) -> Tuple[List[SimilarArticle], int]:
+        """
+        Похожие статьи корпуса
+
+        Args:
+            signature: Подпись статьи
+            top_k: Сколько похожих вернуть
+            min_similarity: Нижняя граница оценки Жаккара
+            exclude_id: Не учитывать эту статью (при проверке уже сохраненной)
+            exclude_keyword: Не учитывать статьи с этим ключевым словом (прежние версии проверяемой)
+
+        Returns:
+            Похожие статьи по убыванию сходства и число кандидатов LSH
+        """
+        similar, _, candidates = self._query(signature, top_k, min_similarity, exclude_id, exclude_keyword)
+        return similar, candidates
+
+    def _query(self, signature: np.ndarray, top_k: int, min_similarity: float, exclude_id: Optional[int],
+               exclude_keyword: Optional[str]) -> Tuple[List[SimilarArticle], List[SimilarArticle], int]:
+        """Похожие статьи, прежние версии статьи с exclude_keyword и число кандидатов LSH"""
+        candidate_ids = self._candidates(signature, exclude_id)
+        if not candidate_ids:
+            return [], [], 0
+
+        ids, keywords, signatures = [], [], []
+        for article_id, keyword, blob in self._load_signatures(candidate_ids):
+            stored = np.frombuffer(blob, dtype=np.uint32)
+            if stored.size != self.num_perm:
+                continue
+            ids.append(article_id)
+            keywords.append(keyword or '')
+            signatures.append(stored)
+        if not ids:
+            return [], [], len(candidate_ids)
+
+        # Оценка Жаккара: доля совпавших минимумов подписи
+        similarities = (np.vstack(signatures) == signature).mean(axis=1)
+        order = np.argsort(-similarities, kind='stable')
+
+        own_key = _keyword_key(exclude_keyword) if exclude_keyword else None
+        similar, previous = [], []
+        for i in order:
+            article = SimilarArticle(ids[i], keywords[i], float(similarities[i]))
+            if own_key is not None and _keyword_key(keywords[i]) == own_key:
+                previous.append(article)
+            elif len(similar) < top_k and similarities[i] >= min_similarity:
+                similar.append(article)
+        return similar, previous, len(candidate_ids)
+
+    def check(self, signature: Optional[np.ndarray], threshold: Optional[float] = None,
+              top_k: int = 5, keyword: Optional[str] = None) -> DuplicateCheck:
+        """
+        Проверка новой статьи перед публикацией
+
+        Args:
+            signature: Подпись статьи (None — статья без текста, проверка пропускается)
+            threshold: Порог сходства (по умолчанию WordPressConfig.DUPLICATE_THRESHOLD)
+            top_k: Сколько похожих статей вернуть
+            keyword: Ключевое слово статьи: ее прежние версии попадают в previous, а не в similar
+                (повторный запуск обновляет уже опубликованную запись)
+
+        Returns:
+            Результат проверки с похожими статьями
+        """
+        if threshold is None:
+            threshold = WordPressConfig.DUPLICATE_THRESHOLD
+        result = DuplicateCheck(threshold=threshold)
+        if signature is None:
+            return result
+        result.similar, result.previous, result.candidates = self._query(signature, top_k, 0.0, None, keyword)
+        return result
+
+    # Запись
+
+    def add(self, article_id: int, keyword: str, signature: Optional[np.ndarray], commit: bool = True):
+        """Добавление (или замена) подписи статьи в индексе"""
+        if signature is None:
+            return
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM article_lsh_buckets WHERE article_id = ?", (article_id,))
+        cursor.execute(
+            "INSERT OR REPLACE INTO article_minhash (article_id, keyword, signature) VALUES (?, ?, ?)",
+            (article_id, keyword, signature.astype(np.uint32).tobytes())
+        )
+        cursor.executemany(
+            "INSERT INTO article_lsh_buckets (bucket, article_id) VALUES (?, ?)",
+            [(bucket, article_id) for bucket in self.buckets(signature)]
+        )
+        if commit:
+            self.connection.commit()
+
+    def remove(self, article_id: int):
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM article_lsh_buckets WHERE article_id = ?", (article_id,))
+        cursor.execute("DELETE FROM article_minhash WHERE article_id = ?", (article_id,))
+        self.connection.commit()
+
+    def index_articles(self, rows: Iterable[Tuple[int, str, str]]) -> int:
+        """
+        Пакетное добавление статей (article_id, keyword, html) одной транзакцией
+
+        Returns:
+            Число проиндексированных статей
+        """
+        indexed = 0
+        for article_id, keyword, html in rows:
+            signature = self.signature(html)
+            if signature is not None:
+                self.add(article_id, keyword, signature, commit=False)
+                indexed += 1
+        self.connection.commit()
+        return indexed
+
+    def count(self) -> int:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM article_minhash")
+        return cursor.fetchone()[0]
+
+
+# Экспорт
+__all__ = ['NearDuplicateIndex', 'DuplicateCheck', 'SimilarArticle']
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Проверка числовых утверждений статьи
+
+Статьи полны чисел («комиссия 25-40 тыс. руб.», «2.5-4% годовых»,
+«5-7 рабочих дней»). Здесь каждое числовое утверждение извлекается из
+HTML, единицы приводятся к базовым (рубли, проценты, дни, месяцы,
+минуты), и утверждение ищется в индексе чисел сохраненных страниц
+исследования (PageArtifact.content_plain и tables_tsv из web_research):
+совпадение значений — подтверждено, попадание в диапазон источника —
+согласуется, иначе — не подтверждено.
+
+Примеры расчета комиссии пересчитываются: формулы «a × b × c = d»,
+примеры «Гарантия 5 млн ₽ на 12 мес.: комиссия ...» и таблицы комиссий
+сверяются с калькулятором modules/generator/pricing.py по текущему
+тарифу. Поиск в индексе идет по отсортированным массивам NumPy, проверка
+статьи занимает миллисекунды и выполняется при подготовке статьи.
+"""
+
+import re
+import json
+import time
+import pickle
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+import sys
+import os
+
+import numpy as np
+
+# Добавляем путь к модулям проекта
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.database_sqlite import DB_CONFIG
+from modules.generator.pricing import get_pricing_engine
+from modules.quality.readability import html_to_text
+
+logger = logging.getLogger(__name__)
+
+# Число: «150 000», «5,000,000», «2,5», «2.5»
+_NUMBER = r'\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?:[.,]\d+)?|\d{1,3}(?:,\d{3})+(?![.,]?\d)|\d+(?:[.,]\d+)?'
+_NUMBER_RE = re.compile(_NUMBER)
+_THOUSANDS_COMMA_RE = re.compile(r'^\d{1,3}(?:,\d{3})+$')
+
+_UNIT = (
+    r'%|процент\w*|₽|руб\w*|р\.|рабоч\w*\s+(?:дн\w*|день)|календарн\w*\s+(?:дн\w*|день)|дн(?:я|ей|ях|и)\b|день|'
+    r'сут\w*|недел\w*|месяц\w*|мес\b\.?|год\w*|лет\b|г\.|час\w*|минут\w*|мин\b\.?'
+)
+_CLAIM_RE = re.compile(
+    r'(?<![\w.,])(?P<low>' + _NUMBER + r')(?:\s*(?P<low_unit>%))?'
+    r'(?:\s*(?:-|–|—|до)\s*(?P<high>' + _NUMBER + r'))?'
+    r'(?P<plus>\s*\+)?'
+    r'(?:\s*(?P<mult>тыс|млн|млрд|трлн)(?![а-яё])\.?)?'
+    r'(?:\s*(?P<unit>' + _UNIT + r'))?',
+    re.IGNORECASE
+)
+_PHONE_RE = re.compile(r'(?:\+7|\b8)\s*\(?\d{3}\)?\s*\d{3}[-\s]?\d{2}[-\s]?\d{2}')
+
+_MULTIPLIERS = {'тыс': 1e3, 'млн': 1e6, 'млрд': 1e9, 'трлн': 1e12}
+
+# Расчеты: формула «5,000,000 × 0.03 × 1 = 150,000 руб.»
+_FORMULA_RE = re.compile(
+    r'(?P<factors>(?:' + _NUMBER + r')(?:\s*[×xх*]\s*(?:' + _NUMBER + r'))+)\s*=\s*(?P<result>' + _NUMBER + r')'
+)
+
+
+def _money_pattern(name: str) -> str:
+    """Сумма с необязательным множителем и рублями: «5 млн ₽», «72 000 ₽», «150,000 руб.»"""
+    return r'(?P<' + name + r'>' + _NUMBER + r')\s*(?P<' + name + r'_mult>тыс|млн|млрд)?\.?\s*(?:₽|руб\w*\.?)?'
+
+
+# Пример калькулятора: «Гарантия 5 млн ₽ на 12 мес.: комиссия 72 000 ₽ – 144 000 ₽»
+_EXAMPLE_RE = re.compile(
+    _money_pattern('amount') + r'\s*(?:на|сроком)\s+(?P<term>\d+)\s*мес\w*\.?[^.\d]{0,20}?комисси\w*'
+    r'\s*(?:от\s+)?' + _money_pattern('low') + r'\s*(?:–|-|—|до)\s*' + _money_pattern('high'),
+    re.IGNORECASE
+)
+_TABLE_RE = re.compile(r'<table\b[^>]*>.*?</table\s*>', re.IGNORECASE | re.DOTALL)
+_CAPTION_RE = re.compile(r'<caption[^>]*>(.*?)</caption\s*>', re.IGNORECASE | re.DOTALL)
+_ROW_RE = re.compile(r'<tr[^>]*>(.*?)</tr\s*>', re.IGNORECASE | re.DOTALL)
+_CELL_RE = re.compile(r'<t[dh][^>]*>(.*?)</t[dh]\s*>', re.IGNORECASE | re.DOTALL)
+
+# Относительный допуск сравнения (округление в тексте)
+TOLERANCE = 0.005
+
+
+def parse_number(text: str) -> float:
+    """Число из записи с пробелами, запятыми-разделителями разрядов или десятичной запятой"""
+    text = re.sub(r'[ \u00a0\u202f]', '', text)
+    if _THOUSANDS_COMMA_RE.match(text):
+        return float(text.replace(',', ''))
+    return float(text.replace(',', '.'))
+
+
+def normalize_unit(unit: str, low: float, high: float) -> Tuple[str, float, float]:
+    """
+    Базовая единица и значения в ней
+
+    Returns:
+        (unit, low, high): percent, rub, days, months, minutes, year или number
+    """
+    unit = (unit or '').lower()
+    if not unit:
+        return 'number', low, high
+    if unit.startswith(('%', 'процент')):
+        return 'percent', low, high
+    if unit.startswith(('₽', 'руб', 'р.')):
+        return 'rub', low, high
+    if unit.startswith(('рабоч', 'календарн', 'дн', 'день', 'сут')):
+        return 'days', low, high
+    if unit.startswith('недел'):
+        return 'days', low * 7, high * 7
+    if unit.startswith('мес'):
+        return 'months', low, high
+    if unit.startswith(('год', 'лет', 'г.')):
+        # «в 2024 году» — календарный год, «3 года» — срок
+        if 1900 <= low <= 2100:
+            return 'year', low, high
+        return 'months', low * 12, high * 12
+    if unit.startswith('час'):
+        return 'minutes', low * 60, high * 60
+    return 'minutes', low, high
+
+
+@dataclass
+class NumericClaim:
+    """Числовое утверждение с нормализованными значениями"""
+    text: str
+    low: float
+    high: float
+    unit: str
+    start: int = 0
+    end: int = 0
+    at_least: bool = False
+
+    @property
+    def is_range(self) -> bool:
+        return self.low != self.high
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'text': self.text, 'low': self.low, 'high': self.high, 'unit': self.unit}
+
+
+def extract_claims(text: str) -> List[NumericClaim]:
+    """
+    Числовые утверждения текста
+
+    Берутся числа с единицей (%, руб., дни, месяцы, годы, часы, минуты),
+    а также диапазоны и оценки «150+» без единицы. Одиночные числа без
+    единицы (номера законов, пунктов, даты) не считаются утверждениями.
+    """
+    text = _PHONE_RE.sub(lambda m: ' ' * len(m.group(0)), text)
+    claims = []
+    for match in _CLAIM_RE.finditer(text):
+        unit = match.group('unit') or match.group('low_unit')
+        high_text = match.group('high')
+        plus = bool(match.group('plus'))
+        if not unit and not match.group('mult') and not high_text and not plus:
+            continue
+
+        low = parse_number(match.group('low'))
+        high = parse_number(high_text) if high_text else low
+        multiplier = _MULTIPLIERS.get((match.group('mult') or '').lower(), 1.0)
+        unit, low, high = normalize_unit(unit, low * multiplier, high * multiplier)
+        if unit == 'rub' and multiplier == 1.0 and not high_text and low < 1:
+            continue
+        claims.append(NumericClaim(
+            text=match.group(0).strip(),
+            low=min(low, high),
+            high=max(low, high),
+            unit=unit,
+            start=match.start(),
+            end=match.end(),
+            at_least=plus
+        ))
+    return claims
+
+
+@dataclass
+class ClaimMatch:
+    """Результат поиска утверждения в индексе исследования"""
+    claim: NumericClaim
+    status: str  # confirmed, consistent, calculated, keyword, unverified
+    sources: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.claim.to_dict(), 'status': self.status, 'sources': self.sources}
+
+
+@dataclass
+class CalculationCheck:
+    """Пересчитанный пример комиссии"""
+    kind: str  # formula, example, table
+    text: str
+    stated: Any
+    expected: Any
+    ok: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'text': self.text, 'stated': self.stated, 'expected': self.expected, 'ok': self.ok}
+
+
+@dataclass
+class NumericVerification:
+    """Итог проверки чисел статьи"""
+    claims: List[ClaimMatch] = field(default_factory=list)
+    calculations: List[CalculationCheck] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(1 for match in self.claims if match.status == status)
+
+    @property
+    def unverified(self) -> List[ClaimMatch]:
+        return [match for match in self.claims if match.status == 'unverified']
+
+    @property
+    def calculation_errors(self) -> List[CalculationCheck]:
+        return [check for check in self.calculations if not check.ok]
+
+    @property
+    def coverage(self) -> float:
+        """Доля подтвержденных утверждений (исследованием или пересчетом), %"""
+        if not self.claims:
+            return 100.0
+        return (len(self.claims) - len(self.unverified)) / len(self.claims) * 100
+
+    @property
+    def passed(self) -> bool:
+        """Нет ошибок в пересчитанных примерах"""
+        return not self.calculation_errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'claims': len(self.claims),
+            'confirmed': self.count('confirmed'),
+            'consistent': self.count('consistent'),
+            'calculated': self.count('calculated'),
+            'keyword': self.count('keyword'),
+            'unverified': [match.to_dict() for match in self.unverified],
+            'coverage': round(self.coverage, 1),
+            'calculations': len(self.calculations),
+            'calculation_errors': [check.to_dict() for check in self.calculation_errors],
+            'passed': self.passed,
+            'elapsed_ms': round(self.elapsed_ms, 2)
+        }
+
+
+class EvidenceIndex:
+    """Индекс чисел из страниц исследования (по единицам, в массивах NumPy)"""
+
+    def __init__(self):
+        self.sources: List[str] = []
+        self._rows: Dict[str, List[Tuple[float, float, int]]] = {}
+        self._arrays: Optional[Dict[str, Dict[str, np.ndarray]]] = None
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._rows.values())
+
+    def add_text(self, text: str, source: str = '') -> int:
+        """
+        Добавление чисел текста источника
+
+        Returns:
+            Число добавленных утверждений
+        """
+        source_id = len(self.sources)
+        self.sources.append(source)
+        claims = extract_claims(text)
+        for claim in claims:
+            self._rows.setdefault(claim.unit, []).append((claim.low, claim.high, source_id))
+        self._arrays = None
+        return len(claims)
+
+    def add_page(self, page: Any) -> int:
+        """Добавление страницы исследования (PageArtifact, словарь или текст)"""
+        if isinstance(page, str):
+            return self.add_text(page)
+        get = page.get if isinstance(page, dict) else lambda name, default=None: getattr(page, name, default)
+        source = str(get('url', '') or '')
+        # Строки таблиц — отдельными предложениями, ячейки не склеиваются в одно число
+        tables = '\n'.join(table.replace('\t', ' ; ') for table in get('tables_tsv', []) or [])
+        return self.add_text(f"{get('content_plain', '') or ''}\n{tables}", source)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Any]) -> 'EvidenceIndex':
+        index = cls()
+        for page in pages:
+            index.add_page(page)
+        return index
+
+    @classmethod
+    def from_research_db(cls, db_path: Optional[str] = None, keyword: Optional[str] = None,
+                         limit: int = 200) -> 'EvidenceIndex':
+        """
+        Индекс по сохраненным исследованиям (таблица web_research)
+
+        Args:
+            db_path: SQLite БД исследований (по умолчанию DB_CONFIG)
+            keyword: Только исследования по ключевому слову
+            limit: Последних исследований
+
+        Returns:
+            Индекс (пустой, если БД или таблицы нет)
+        """
+        index = cls()
+        db_path = db_path or DB_CONFIG.get_config_dict()['database']
+        if not os.path.exists(db_path):
+            return index
+
+        conn = sqlite3.connect(db_path)
+        try:
+            query = "SELECT pages_data, evidence_pack FROM web_research"
+            params: Tuple = ()
+            if keyword:
+                query += " WHERE keyword = ?"
+                params = (keyword,)
+            rows = conn.execute(query + " ORDER BY id DESC LIMIT ?", params + (limit,)).fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            conn.close()
+
+        for pages_blob, evidence_json in rows:
+            try:
+                pages = pickle.loads(pages_blob) if pages_blob else []
+            except Exception as e:
+                # Страницы сохранены как PageArtifact: без pydantic они не читаются
+                logger.warning(f"⚠️ Страницы исследования не загружены: {e}")
+                pages = []
+            for page in pages if isinstance(pages, list) else [pages]:
+                index.add_page(page)
+            for fact in json.loads(evidence_json or '[]'):
+                index.add_text(fact.get('quote', ''), fact.get('source_url', ''))
+        return index
+
+    def _build(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Отсортированные массивы значений и диапазонов по единицам"""
+        if self._arrays is None:
+            arrays = {}
+            for unit, rows in self._rows.items():
+                data = np.array(rows, dtype=np.float64)
+                endpoints = data[:, :2].ravel()
+                endpoint_sources = np.repeat(data[:, 2], 2)
+                order = np.argsort(endpoints, kind='stable')
+                arrays[unit] = {
+                    'values': endpoints[order],
+                    'value_sources': endpoint_sources[order].astype(np.int64),
+                    'lows': data[:, 0],
+                    'highs': data[:, 1],
+                    'range_sources': data[:, 2].astype(np.int64)
+                }
+            self._arrays = arrays
+        return self._arrays
+
+    def _find_value(self, arrays: Dict[str, np.ndarray], value: float) -> Optional[int]:
+        """Источник, где встречается значение (с допуском), или None"""
+        values = arrays['values']
+        tolerance = abs(value) * TOLERANCE
+        left = np.searchsorted(values, value - tolerance, side='left')
+        if left < len(values) and values[left] <= value + tolerance:
+            return int(arrays['value_sources'][left])
+        return None
+
+    def match(self, claim: NumericClaim) -> ClaimMatch:
+        """Поиск утверждения: все значения найдены — confirmed, внутри диапазона источника — consistent"""
+        arrays = self._build().get(claim.unit)
+        if arrays is None:
+            return ClaimMatch(claim, 'unverified')
+
+        found = [self._find_value(arrays, value) for value in {claim.low, claim.high}]
+        if all(source is not None for source in found):
+            return ClaimMatch(claim, 'confirmed', self._source_names(found))
+
+        tolerance = claim.high * TOLERANCE
+        inside = np.nonzero((arrays['lows'] <= claim.low + tolerance) & (arrays['highs'] >= claim.high - tolerance))[0]
+        if len(inside):
+            return ClaimMatch(claim, 'consistent', self._source_names(arrays['range_sources'][inside[:3]]))
+        return ClaimMatch(claim, 'unverified')
+
+    def _source_names(self, source_ids: Iterable[int]) -> List[str]:
+        names = []
+        for source_id in source_ids:
+            name = self.sources[int(source_id)]
+            if name and name not in names:
+                names.append(name)
+        return names[:3]
+
+
+# Пересчет примеров комиссии
+
+def _money(match: re.Match, group: str) -> float:
+    value = parse_number(match.group(group))
+    return value * _MULTIPLIERS.get((match.group(f'{group}_mult') or '').lower(), 1.0)
+
+
+def check_formulas(text: str) -> List[Tuple[CalculationCheck, Tuple[int, int]]]:
+    """Формулы «a × b × c = d»: произведение пересчитывается"""
+    checks = []
+    for match in _FORMULA_RE.finditer(text):
+        factors = [parse_number(number) for number in _NUMBER_RE.findall(match.group('factors'))]
+        stated = parse_number(match.group('result'))
+        expected = float(np.prod(factors))
+        ok = abs(expected - stated) <= max(1.0, abs(expected) * TOLERANCE)
+        checks.append((CalculationCheck('formula', match.group(0), stated, round(expected, 2), ok), match.span()))
+    return checks
+
+
+def _commission_matrix(amounts: List[float], terms: List[int]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Комиссии калькулятора по всем видам гарантий: (виды, min, max) формы виды × суммы × сроки"""
+    engine = get_pricing_engine()
+    matrix = engine.compute(amounts, terms)
+    return matrix['types'], matrix['min'], matrix['max']
+
+
+def check_examples(text: str) -> List[Tuple[CalculationCheck, Tuple[int, int]]]:
+    """Примеры «Гарантия X на N мес.: комиссия A – B» сверяются с калькулятором по всем видам гарантий"""
+    matches = list(_EXAMPLE_RE.finditer(text))
+    if not matches:
+        return []
+
+    amounts = [_money(match, 'amount') for match in matches]
+    terms = [int(match.group('term')) for match in matches]
+    # Одна матрица на все примеры статьи
+    types, low_matrix, high_matrix = _commission_matrix(amounts, terms)
+
+    checks = []
+    for i, match in enumerate(matches):
+        stated = [_money(match, 'low'), _money(match, 'high')]
+        lows, highs = low_matrix[:, i, i], high_matrix[:, i, i]
+        exact = np.nonzero((np.abs(lows - stated[0]) <= 1) & (np.abs(highs - stated[1]) <= 1))[0]
+        if len(exact):
+            expected = [int(lows[exact[0]]), int(highs[exact[0]])]
+        else:
+            # Ближайший вид гарантии — для сообщения об ошибке
+            nearest = int(np.argmin(np.abs(lows - stated[0]) + np.abs(highs - stated[1])))
+            expected = [int(lows[nearest]), int(highs[nearest])]
+        checks.append((
+            CalculationCheck('example', ' '.join(match.group(0).split()), stated, expected, bool(len(exact))),
+            match.span()
+        ))
+    return checks
+
+
+def check_commission_tables(content: str) -> List[CalculationCheck]:
+    """Таблицы комиссий «сумма × срок» пересчитываются по текущему тарифу"""
+    engine = get_pricing_engine()
+    names = {data['name']: key for key, data in engine.tariff['guarantee_types'].items()}
+    checks = []
+    for table in _TABLE_RE.findall(content):
+        caption = _CAPTION_RE.search(table)
+        caption_text = html_to_text(caption.group(1)) if caption else ''
+        if 'комисси' not in caption_text.lower():
+            continue
+        guarantee_type = next((key for name, key in names.items() if caption_text.startswith(name)), None)
+
+        rows = [[html_to_text(cell).strip() for cell in _CELL_RE.findall(row)] for row in _ROW_RE.findall(table)]
+        if len(rows) < 2:
+            continue
+        terms = [int(term) for term in re.findall(r'(\d+)\s*мес', ' '.join(rows[0][1:]))]
+        amount_claims = [extract_claims(row[0]) for row in rows[1:]]
+        if not terms or not all(amount_claims):
+            continue
+        amounts = [claims[0].low for claims in amount_claims]
+
+        types, low_matrix, high_matrix = _commission_matrix(amounts, terms)
+        type_indexes = [types.index(guarantee_type)] if guarantee_type in types else range(len(types))
+
+        stated_low = np.zeros((len(amounts), len(terms)))
+        stated_high = np.zeros((len(amounts), len(terms)))
+        # Ячейки с диапазоном «от – до»; одно число или текст не сверяются
+        parsed = np.zeros((len(amounts), len(terms)), dtype=bool)
+        for i, row in enumerate(rows[1:]):
+            for j, cell in enumerate(row[1:1 + len(terms)]):
+                values = [parse_number(number) for number in _NUMBER_RE.findall(cell)]
+                if len(values) >= 2:
+                    stated_low[i, j], stated_high[i, j] = values[0], values[1]
+                    parsed[i, j] = True
+        cells = int(np.count_nonzero(parsed))
+        if not cells:
+            continue
+
+        # Таблица верна, если все разобранные ячейки совпали с одним видом гарантии
+        errors = min(
+            int(np.count_nonzero(parsed & (
+                (np.abs(low_matrix[t] - stated_low) > 1) | (np.abs(high_matrix[t] - stated_high) > 1)
+            )))
+            for t in type_indexes
+        )
+        # Для таблицы stated — число сверенных ячеек, expected — сколько из них верны
+        checks.append(CalculationCheck(
+            'table', caption_text[:120], cells, cells - errors, errors == 0
+        ))
+    return checks
+
+
+def verify_article(content: str, index: Optional[EvidenceIndex] = None, keyword: str = '') -> NumericVerification:
+    """
+    Проверка чисел статьи
+
+    Args:
+        content: HTML статьи
+        index: Индекс чисел исследования (без индекса проверяются только расчеты)
+        keyword: Ключевая фраза (числа из нее — «на 12 месяцев» — не требуют источника)
+
+    Returns:
+        Утверждения со статусами и пересчитанные примеры
+    """
+    started = time.perf_counter()
+    result = NumericVerification()
+
+    # Таблицы комиссий проверяются целиком и не попадают в список утверждений
+    result.calculations.extend(check_commission_tables(content))
+    text = html_to_text(_TABLE_RE.sub(
+        lambda m: '\n' if 'комисси' in m.group(0).lower() and '<caption' in m.group(0).lower() else m.group(0),
+        content
+    ))
+
+    spans = []
+    for check, span in check_formulas(text) + check_examples(text):
+        result.calculations.append(check)
+        spans.append(span)
+
+    keyword_values = {(claim.unit, claim.low, claim.high) for claim in extract_claims(keyword)}
+    for claim in extract_claims(text):
+        if any(start <= claim.start < end for start, end in spans):
+            result.claims.append(ClaimMatch(claim, 'calculated'))
+        elif (claim.unit, claim.low, claim.high) in keyword_values:
+            result.claims.append(ClaimMatch(claim, 'keyword'))
+        elif index is not None:
+            result.claims.append(index.match(claim))
+        else:
+            result.claims.append(ClaimMatch(claim, 'unverified'))
+
+    result.elapsed_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+_default_index: Optional[EvidenceIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_evidence_index(reload: bool = False) -> EvidenceIndex:
+    """Общий индекс сохраненных исследований (загружается один раз на процесс)"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None or reload:
+            _default_index = EvidenceIndex.from_research_db()
+        return _default_index
+
+
+# Экспорт
+__all__ = [
+    'NumericClaim', 'ClaimMatch', 'CalculationCheck', 'NumericVerification', 'EvidenceIndex',
+    'extract_claims', 'parse_number', 'normalize_unit', 'check_formulas', 'check_examples',
+    'check_commission_tables', 'verify_article', 'get_evidence_index'
+]
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Читаемость русского текста
+
+Формулы Флеша и производные от него с коэффициентами, подобранными для
+русского языка: индекс удобочитаемости Флеша в адаптации Оборневой
+(шкала 0-100 английского индекса), уровень Флеша-Кинкейда, SMOG,
+Коулмана-Лиау и ARI (коэффициенты проекта «Простой русский»). Слоги
+считаются по гласным кириллицы (и латиницы для вкраплений), сложным
+считается слово от 4 слогов, границы предложений учитывают русские
+сокращения (т.е., руб., млн.) и блочные теги HTML.
+
+Пакетный режим: счетчики каждого текста собираются регулярными
+выражениями, все формулы считаются одним векторным проходом NumPy —
+тысячи статей или разделов за раз.
+"""
+
+import re
+import html as html_lib
+from dataclasses import dataclass
+from typing import Dict, Any, List, Iterable
+
+import numpy as np
+
+_VOWELS = 'аеёиоуыэюяaeiouy'
+
+_WORD_RE = re.compile(r'[^\W\d_]+(?:-[^\W\d_]+)*')
+_COMPLEX_WORD_RE = re.compile(
+    r'\b(?:[^\W\d_' + _VOWELS + r']*[' + _VOWELS + r']){4}[^\W\d_]*(?:-[^\W\d_]+)*'
+)
+
+# Разметка: блочные теги завершают предложение (пункты списков и заголовки — без точки)
+_SKIP_BLOCKS_RE = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+_BLOCK_END_RE = re.compile(
+    r'</(?:p|li|h[1-6]|td|th|tr|div|blockquote|dt|dd|figcaption|caption)\s*>|<br\s*/?>|<hr\b[^>]*>',
+    re.IGNORECASE
+)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Русские сокращения, после точки которых предложение продолжается
+_ABBREVIATIONS = frozenset([
+    'т.е', 'т.к', 'т.н', 'т.ч', 'и.т.д', 'и.т.п', 'в.т.ч', 'г', 'гг', 'руб', 'коп', 'тыс', 'млн', 'млрд',
+    'трлн', 'ст', 'ч', 'п', 'пп', 'стр', 'им', 'др', 'пр', 'см', 'рис', 'табл', 'напр', 'ок', 'ул', 'д',
+    'кв', 'обл', 'кол', 'шт', 'мес', 'мин', 'сек'
+])
+_SENTENCE_SPLIT_RE = re.compile(r'([.!?…]+(?=\s|$)|\n+)')
+
+# Столбцы счетчиков в пакетном режиме
+_COUNT_COLUMNS = ('words', 'sentences', 'syllables', 'letters', 'complex_words')
+
+
+@dataclass
+class ReadabilityScores:
+    """Показатели читаемости текста"""
+    words: int
+    sentences: int
+    syllables: int
+    letters: int
+    complex_words: int
+    flesch_reading_ease: float
+    flesch_kincaid_grade: float
+    smog: float
+    coleman_liau: float
+    ari: float
+
+    @property
+    def avg_sentence_length(self) -> float:
+        return self.words / self.sentences if self.sentences else 0.0
+
+    @property
+    def avg_syllables_per_word(self) -> float:
+        return self.syllables / self.words if self.words else 0.0
+
+    @property
+    def complex_words_percent(self) -> float:
+        return self.complex_words / self.words * 100 if self.words else 0.0
+
+    @property
+    def level(self) -> str:
+        """Словесная оценка по индексу Флеша"""
+        return readability_level(self.flesch_reading_ease)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'flesch_reading_ease': round(self.flesch_reading_ease, 1),
+            'flesch_kincaid_grade': round(self.flesch_kincaid_grade, 1),
+            'smog': round(self.smog, 1),
+            'coleman_liau': round(self.coleman_liau, 1),
+            'ari': round(self.ari, 1),
+            'avg_sentence_length': round(self.avg_sentence_length, 1),
+            'avg_syllables_per_word': round(self.avg_syllables_per_word, 2),
+            'complex_words_percent': round(self.complex_words_percent, 1),
+            'level': self.level,
+            'words': self.words,
+            'sentences': self.sentences
+        }
+
+
+def readability_level(flesch: float) -> str:
+    """Словесная оценка индекса Флеша (шкала Оборневой совпадает с английской)"""
+    if flesch >= 80:
+        return 'Очень легко'
+    if flesch >= 60:
+        return 'Легко'
+    if flesch >= 40:
+        return 'Средне'
+    if flesch >= 20:
+        return 'Сложно'
+    return 'Очень сложно'
+
+
+def html_to_text(content: str) -> str:
+    """Текст из HTML с переводом строки на месте блочных тегов"""
+    content = _SKIP_BLOCKS_RE.sub(' ', content)
+    content = _BLOCK_END_RE.sub('\n', content)
+    content = _TAG_RE.sub(' ', content)
+    return html_lib.unescape(content)
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Предложения текста (фрагменты без слов отбрасываются)
+
+    Точка после сокращения (руб., т.е.) не завершает предложение, если
+    следующий фрагмент начинается со строчной буквы или цифры.
+    """
+    parts = _SENTENCE_SPLIT_RE.split(text)
+    sentences = []
+    current = parts[0]
+    for index in range(1, len(parts) - 1, 2):
+        separator, following = parts[index], parts[index + 1]
+        tokens = current.rsplit(None, 1)
+        last_token = tokens[-1].lstrip('(«"').lower() if tokens else ''
+        next_text = following.lstrip()
+        if separator.startswith('.') and last_token in _ABBREVIATIONS and next_text and not next_text[0].isupper():
+            current += separator + following
+        else:
+            sentences.append(current)
+            current = following
+    sentences.append(current)
+    return [sentence for sentence in sentences if _WORD_RE.search(sentence)]
+
+
+def count_syllables(word: str) -> int:
+    """Слоги слова по числу гласных (у аббревиатур без гласных — один слог)"""
+    word = word.lower()
+    return max(1, sum(word.count(vowel) for vowel in _VOWELS))
+
+
+def text_counts(text: str) -> List[int]:
+    """
+    Счетчики текста для формул: слова, предложения, слоги, буквы, сложные слова
+
+    Все счетчики собираются регулярными выражениями и str.count, без
+    цикла Python по словам.
+    """
+    lower = text.lower()
+    words = _WORD_RE.findall(lower)
+    if not words:
+        return [0, 0, 0, 0, 0]
+
+    letters = len(''.join(words).replace('-', ''))
+    vowels = sum(lower.count(vowel) for vowel in _VOWELS)
+    # У слов без гласных (ФЗ, НДС) один слог
+    syllables = max(vowels, len(words))
+    sentences = max(1, len(split_sentences(text)))
+
+    return [len(words), sentences, syllables, letters, len(_COMPLEX_WORD_RE.findall(lower))]
+
+
+def scores_from_counts(counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Формулы читаемости по матрице счетчиков (векторно)
+
+    Args:
+        counts: Матрица N x 5 (words, sentences, syllables, letters, complex_words)
+
+    Returns:
+        Массивы показателей длины N (у пустых текстов — 0)
+    """
+    counts = np.asarray(counts, dtype=np.float64).reshape(-1, len(_COUNT_COLUMNS))
+    words, sentences, syllables, letters, complex_words = counts.T
+
+    has_text = words > 0
+    safe_words = np.where(has_text, words, 1.0)
+    safe_sentences = np.where(sentences > 0, sentences, 1.0)
+
+    asl = words / safe_sentences            # слов в предложении
+    asw = syllables / safe_words            # слогов в слове
+    letters_per_word = letters / safe_words
+
+    scores = {
+        # Индекс Флеша для русского (Оборнева): 206.835 − 1.52·ASL − 65.14·ASW
+        'flesch_reading_ease': 206.835 - 1.52 * asl - 65.14 * asw,
+        # Коэффициенты «Простого русского» для формул Флеша-Кинкейда, SMOG, Коулмана-Лиау и ARI
+        'flesch_kincaid_grade': 0.318 * asl + 14.2 * asw - 30.5,
+        'smog': 1.1 * np.sqrt(64.6 * complex_words / safe_sentences) + 0.05,
+        'coleman_liau': 0.055 * letters_per_word * 100 - 0.35 * (sentences / safe_words * 100) - 20.33,
+        'ari': 6.26 * letters_per_word + 0.2 * asl - 31.04
+    }
+    return {name: np.where(has_text, values, 0.0) for name, values in scores.items()}
+
+
+def analyze_texts(texts: Iterable[str], is_html: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Пакетный расчет читаемости
+
+    Args:
+        texts: Статьи или разделы
+        is_html: Тексты в HTML (блочные теги считаются границами предложений)
+
+    Returns:
+        Массивы показателей и счетчиков (по одному значению на текст)
+    """
+    rows = [text_counts(html_to_text(text) if is_html else text) for text in texts]
+    counts = np.array(rows, dtype=np.int64).reshape(-1, len(_COUNT_COLUMNS))
+
+    result = scores_from_counts(counts)
+    for index, column in enumerate(_COUNT_COLUMNS):
+        result[column] = counts[:, index]
+    return result
+
+
+def analyze_text(text: str, is_html: bool = True) -> ReadabilityScores:
+    """Читаемость одного текста"""
+    batch = analyze_texts([text], is_html=is_html)
+    return ReadabilityScores(**{name: values[0].item() for name, values in batch.items()})
+
+
+# Экспорт
+__all__ = [
+    'ReadabilityScores', 'analyze_text', 'analyze_texts', 'scores_from_counts',
+    'text_counts', 'split_sentences', 'count_syllables', 'html_to_text', 'readability_level'
+]
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Массовый пересчет оценок статей
+
+Когда меняются правила оценки, quality_score/seo_score/content_rating уже
+сохраненных статей устаревают. BulkRescorer читает HTML статей порциями
+(постраничная выборка по id, в памяти не больше двух порций), оценивает
+их в пуле процессов и записывает оценки и строки quality_metrics
+пакетными транзакциями — по одной на порцию.
+
+Поддерживаются SQLite и MySQL и две раскладки таблиц:
+- automation — БД корневых скриптов (articles.keyword, articles.content)
+- pipeline — БД BizFin Pro Pipeline (articles.html_raw, keywords.keyword)
+"""
+
+import time
+import sqlite3
+import logging
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from typing import Dict, Any, List, Optional, Callable, Iterator, Tuple
+import sys
+import os
+
+# Добавляем путь к конфигурации
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.database import DatabaseConfig
+
+# Раскладки таблиц: выборка порции статей (id, ключевое слово, HTML) после заданного id
+ARTICLE_LAYOUTS = {
+    'automation': {
+        'select': (
+            "SELECT id, keyword, content FROM articles "
+            "WHERE content IS NOT NULL AND id > {p} ORDER BY id LIMIT {p}"
+        ),
+        'count': "SELECT COUNT(*) FROM articles WHERE content IS NOT NULL",
+        'columns': ('keyword', 'content')
+    },
+    'pipeline': {
+        'select': (
+            "SELECT a.id, k.keyword, a.html_raw FROM articles a "
+            "JOIN keywords k ON k.id = a.keyword_id "
+            "WHERE a.id > {p} ORDER BY a.id LIMIT {p}"
+        ),
+        'count': "SELECT COUNT(*) FROM articles",
+        'columns': ('keyword_id', 'html_raw')
+    }
+}
+
+SCORE_COLUMNS = ['quality_score', 'seo_score', 'content_rating']
+
+# Типы метрик quality_metrics для каждой оценки (как при сохранении статьи)
+METRIC_TYPES = {
+    'quality_score': ('content_quality', 'Пересчет оценки качества контента'),
+    'seo_score': ('seo_quality', 'Пересчет оценки SEO оптимизации'),
+    'content_rating': ('content_rating', 'Пересчет общего рейтинга контента')
+}
+
+QUALITY_METRICS_DDL = {
+    'sqlite': """
+        CREATE TABLE IF NOT EXISTS quality_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER,
+            metric_type TEXT,
+            score INTEGER,
+            details TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'mysql': """
+        CREATE TABLE IF NOT EXISTS quality_metrics (
+            id INTEGER PRIMARY KEY AUTO_INCREMENT,
+            article_id INTEGER NOT NULL,
+            metric_type VARCHAR(50) NOT NULL,
+            score INTEGER DEFAULT 0,
+            details TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_article_id (article_id)
+        )
+    """
+}
+
+ArticleRow = Tuple[int, str, str]
+
+
+class ArticleStore:
+    """Порционное чтение статей и пакетная запись оценок"""
+
+    def __init__(self, connection, dialect: str, layout: str = 'automation'):
+        """
+        Инициализация хранилища
+
+        Args:
+            connection: Соединение DB-API (sqlite3 или mysql.connector)
+            dialect: 'sqlite' или 'mysql'
+            layout: Раскладка таблиц ('automation' или 'pipeline')
+        """
+        if layout not in ARTICLE_LAYOUTS:
+            raise ValueError(f"Неизвестная раскладка таблиц: {layout}")
+
+        self.connection = connection
+        self.dialect = dialect
+        self.layout = layout
+        self.placeholder = '?' if dialect == 'sqlite' else '%s'
+
+        queries = ARTICLE_LAYOUTS[layout]
+        self._select_sql = queries['select'].format(p=self.placeholder)
+        self._count_sql = queries['count']
+
+    @classmethod
+    def sqlite(cls, db_path: str, layout: str = 'automation') -> 'ArticleStore':
+        """Хранилище в файле SQLite"""
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"База данных не найдена: {db_path}")
+        return cls(sqlite3.connect(db_path, timeout=30), 'sqlite', layout)
+
+    @classmethod
+    def mysql(cls, layout: str = 'pipeline', config: Optional[Dict[str, Any]] = None) -> 'ArticleStore':
+        """Хранилище в MySQL (по умолчанию DatabaseConfig)"""
+        import mysql.connector
+        return cls(mysql.connector.connect(**(config or DatabaseConfig.get_config_dict())), 'mysql', layout)
+
+    def _existing_columns(self, table: str) -> set:
+        cursor = self.connection.cursor()
+        if self.dialect == 'sqlite':
+            cursor.execute(f"PRAGMA table_info({table})")
+            return {row[1] for row in cursor.fetchall()}
+        cursor.execute(f"SHOW COLUMNS FROM {table}")
+        return {row[0] for row in cursor.fetchall()}
+
+    def check_layout(self):
+        """
+        Проверка колонок articles, из которых читаются статьи
+
+        Raises:
+            ValueError: Колонки нет (например, БД создана до сохранения HTML статей)
+        """
+        missing = [column for column in ARTICLE_LAYOUTS[self.layout]['columns']
+                   if column not in self._existing_columns('articles')]
+        if missing:
+            raise ValueError(
+                f"В таблице articles нет колонок {', '.join(missing)} (раскладка {self.layout}). "
+                f"Для БД скриптов автоматизации колонку content добавит следующий запуск скрипта, "
+                f"HTML сохраняется для статей, опубликованных после этого"
+            )
+
+    def ensure_schema(self):
+        """Колонки оценок и таблица quality_metrics для БД, созданных до их появления"""
+        cursor = self.connection.cursor()
+        existing = self._existing_columns('articles')
+        for column in SCORE_COLUMNS:
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE articles ADD COLUMN {column} INTEGER DEFAULT 0")
+        cursor.execute(QUALITY_METRICS_DDL[self.dialect])
+        self.connection.commit()
+
+    def count(self) -> int:
+        cursor = self.connection.cursor()
+        cursor.execute(self._count_sql)
+        return cursor.fetchone()[0]
+
+    def iter_chunks(self, chunk_size: int, start_after: int = 0) -> Iterator[List[ArticleRow]]:
+        """
+        Порции статей по возрастанию id
+
+        Каждая порция выбирается отдельным запросом (WHERE id > последний id),
+        поэтому курсор не держится открытым между записями и в памяти
+        находится только текущая порция.
+        """
+        last_id = start_after
+        while True:
+            cursor = self.connection.cursor()
+            cursor.execute(self._select_sql, (last_id, chunk_size))
+            rows = [(row[0], row[1] or '', row[2] or '') for row in cursor.fetchall()]
+            cursor.close()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+            if len(rows) < chunk_size:
+                return
+
+    def write_scores(self, results: List[Dict[str, Any]], record_metrics: bool = True):
+        """
+        Запись оценок порции одной транзакцией
+
+        Args:
+            results: Оценки статей ({'article_id', 'quality_score', 'seo_score', 'content_rating'})
+            record_metrics: Добавлять ли строки в quality_metrics
+        """
+        if not results:
+            return
+
+        p = self.placeholder
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(
+                f"UPDATE articles SET quality_score = {p}, seo_score = {p}, content_rating = {p} WHERE id = {p}",
+                [(r['quality_score'], r['seo_score'], r['content_rating'], r['article_id']) for r in results]
+            )
+            if record_metrics:
+                cursor.executemany(
+                    f"INSERT INTO quality_metrics (article_id, metric_type, score, details) VALUES ({p}, {p}, {p}, {p})",
+                    [
+                        (r['article_id'], metric_type, r[column], details)
+                        for r in results
+                        for column, (metric_type, details) in METRIC_TYPES.items()
+                    ]
+                )
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+@dataclass
+class RescoreProgress:
+    """Ход пересчета: обработано, скорость и оставшееся время"""
+    total: int
+    done: int = 0
+    errors: int = 0
+    last_id: int = 0
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Статей в секунду"""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if not self.rate:
+            return None
+        return max(0, self.total - self.done) / self.rate
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'done': self.done,
+            'errors': self.errors,
+            'last_id': self.last_id,
+            'elapsed_seconds': round(self.elapsed, 1),
+            'rate_per_second': round(self.rate, 1)
+        }
+
+
+# Функция оценки в процессах пула (задается инициализатором)
+_score_func: Optional[Callable[[str, str], Dict[str, int]]] = None
+
+
+def _init_worker(score_func: Callable[[str, str], Dict[str, int]]):
+    global _score_func
+    _score_func = score_func
+
+
+def _score_row(row: ArticleRow) -> Dict[str, Any]:
+    """Оценка одной статьи в процессе пула; ошибка не прерывает порцию"""
+    article_id, keyword, html = row
+    try:
+        scores = _score_func(keyword, html)
+        return {'article_id': article_id, **scores}
+    except Exception as e:
+        return {'article_id': article_id, 'error': str(e)}
+
+
+class BulkRescorer:
+    """Пересчет оценок всех статей хранилища в пуле процессов"""
+
+    def __init__(self, store: ArticleStore, score_func: Callable[[str, str], Dict[str, int]],
+                 workers: int = None, chunk_size: int = 500, record_metrics: bool = True):
+        """
+        Инициализация пересчета
+
+        Args:
+            store: Хранилище статей
+            score_func: Функция верхнего уровня (keyword, html) -> оценки;
+                должна импортироваться по имени, чтобы передаваться в процессы
+            workers: Число процессов (по умолчанию RESCORE_WORKERS или число CPU)
+            chunk_size: Статей в порции (и в одной транзакции записи)
+            record_metrics: Добавлять ли строки в quality_metrics
+        """
+        self.store = store
+        self.score_func = score_func
+        self.workers = max(1, workers or int(os.getenv('RESCORE_WORKERS', 0)) or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.record_metrics = record_metrics
+
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, start_after: int = 0, limit: Optional[int] = None, dry_run: bool = False,
+            on_progress: Optional[Callable[[RescoreProgress], None]] = None) -> RescoreProgress:
+        """
+        Пересчет оценок
+
+        Пока пул оценивает порцию, из БД читается следующая; запись
+        порции идет одной транзакцией после ее оценки.
+
+        Args:
+            start_after: Продолжить с id больше указанного (last_id прерванного запуска)
+            limit: Максимум статей
+            dry_run: Оценить без записи в БД
+            on_progress: Вызывается после каждой порции
+
+        Returns:
+            Итоговый ход пересчета
+        """
+        self.store.ensure_schema()
+
+        total = self.store.count()
+        if limit:
+            total = min(total, limit)
+        progress = RescoreProgress(total=total, last_id=start_after)
+
+        self.logger.info(
+            f"🔁 Пересчет оценок: {total} статей, {self.workers} процессов, порция {self.chunk_size}"
+        )
+
+        chunks = self._limited_chunks(start_after, limit)
+        with Pool(self.workers, initializer=_init_worker, initargs=(self.score_func,)) as pool:
+            chunk = next(chunks, None)
+            pending = pool.map_async(_score_row, chunk, chunksize=self._map_chunksize(chunk)) if chunk else None
+
+            while pending is not None:
+                next_chunk = next(chunks, None)
+                results = pending.get()
+                pending = (
+                    pool.map_async(_score_row, next_chunk, chunksize=self._map_chunksize(next_chunk))
+                    if next_chunk else None
+                )
+
+                scored = [r for r in results if 'error' not in r]
+                for failed in results:
+                    if 'error' in failed:
+                        self.logger.warning(f"⚠️ Статья {failed['article_id']} не оценена: {failed['error']}")
+
+                if not dry_run:
+                    self.store.write_scores(scored, self.record_metrics)
+
+                progress.done += len(results)
+                progress.errors += len(results) - len(scored)
+                progress.last_id = results[-1]['article_id']
+                if on_progress:
+                    on_progress(progress)
+
+        self.logger.info(
+            f"✅ Пересчитано {progress.done - progress.errors} статей за {progress.elapsed:.1f} с "
+            f"({progress.rate:.0f} ст/с), ошибок: {progress.errors}"
+        )
+        return progress
+
+    def _limited_chunks(self, start_after: int, limit: Optional[int]) -> Iterator[List[ArticleRow]]:
+        remaining = limit
+        for chunk in self.store.iter_chunks(self.chunk_size, start_after):
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            if chunk:
+                yield chunk
+            if remaining is not None and remaining <= 0:
+                return
+
+    def _map_chunksize(self, chunk: List[ArticleRow]) -> int:
+        """Размер задачи для процесса: несколько задач на процесс для равномерной загрузки"""
+        return max(1, len(chunk) // (self.workers * 4))
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Оставшееся время в виде ч:мм:сс"""
+    if seconds is None:
+        return '—'
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+# Экспорт
+__all__ = ['ArticleStore', 'BulkRescorer', 'RescoreProgress', 'ARTICLE_LAYOUTS', 'format_eta']
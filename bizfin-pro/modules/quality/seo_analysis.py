@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Офлайн SEO-анализ статьи по правилам Yoast SEO
+
+Повторяет основные проверки Yoast на сгенерированном HTML до публикации,
+без отправки черновика в WordPress и чтения оценки обратно: ключевая
+фраза в SEO-заголовке, вводном абзаце, мета-описании и слаге, длина
+мета-описания и заголовка, распределение подзаголовков, ключ в
+подзаголовках, внутренние и внешние ссылки, alt изображений, плотность
+ключа и объем текста.
+
+Шкала как у Yoast: каждая проверка дает от -20 до 9 баллов (до 4 —
+плохо, 5–7 — нормально, 8–9 — хорошо), итог — сумма в процентах от
+максимума. Ключевая фраза сопоставляется по леммам (modules/quality/
+morphology.py), поэтому словоформы засчитываются, как в Yoast Premium.
+"""
+
+import re
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from urllib.parse import urlparse
+import sys
+import os
+
+# Добавляем путь к модулям проекта
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.wordpress import WordPressConfig
+from modules.quality.content_metrics import get_content_metrics
+from modules.quality.morphology import lemmatize_words, stem_russian, tokenize
+from modules.quality.readability import html_to_text, split_sentences
+
+# Служебные слова не обязательны для совпадения ключевой фразы (как function words в Yoast)
+_FUNCTION_WORDS = frozenset([
+    'в', 'во', 'на', 'для', 'и', 'или', 'с', 'со', 'по', 'о', 'об', 'от', 'к', 'ко', 'без', 'при',
+    'из', 'за', 'до', 'под', 'над', 'у', 'не', 'что', 'как', 'а', 'но', 'же', 'ли'
+])
+
+_TRANSLIT = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'zh', 'з': 'z',
+    'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya'
+}
+
+_PARAGRAPH_RE = re.compile(r'<p\b[^>]*>(.*?)</p\s*>', re.IGNORECASE | re.DOTALL)
+_SUBHEADING_SPLIT_RE = re.compile(r'<h[2-6]\b[^>]*>.*?</h[2-6]\s*>', re.IGNORECASE | re.DOTALL)
+_ANCHOR_RE = re.compile(r'<a\s[^>]*>', re.IGNORECASE)
+_IMAGE_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_HREF_RE = re.compile(r'\bhref\s*=\s*["\']?([^"\'\s>]*)', re.IGNORECASE)
+_REL_RE = re.compile(r'\brel\s*=\s*["\']([^"\']*)', re.IGNORECASE)
+_ALT_RE = re.compile(r'\balt\s*=\s*["\']([^"\']*)', re.IGNORECASE)
+
+# Пороги Yoast
+META_DESCRIPTION_MIN = 120
+META_DESCRIPTION_MAX = 156
+TITLE_MIN_LENGTH = 30
+SUBHEADING_SECTION_WORDS = 300
+SUBHEADING_SECTION_WORDS_MAX = 350
+DENSITY_MIN = 0.5
+DENSITY_MAX = 3.0
+
+
+@dataclass
+class SeoCheck:
+    """Результат одной проверки"""
+    name: str
+    score: int
+    message: str
+
+    @property
+    def rating(self) -> str:
+        """good / ok / bad по шкале Yoast"""
+        if self.score >= 8:
+            return 'good'
+        if self.score >= 5:
+            return 'ok'
+        return 'bad'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'score': self.score, 'rating': self.rating, 'message': self.message}
+
+
+@dataclass
+class SeoAnalysis:
+    """Итог офлайн-анализа статьи"""
+    keyword: str
+    min_score: int
+    checks: List[SeoCheck] = field(default_factory=list)
+
+    @property
+    def score(self) -> int:
+        """Итоговая оценка 0–100 (сумма баллов от максимума, как у Yoast)"""
+        if not self.checks:
+            return 0
+        total = sum(check.score for check in self.checks)
+        return max(0, round(total / (len(self.checks) * 9) * 100))
+
+    @property
+    def rating(self) -> str:
+        if self.score > 70:
+            return 'good'
+        if self.score > 40:
+            return 'ok'
+        return 'bad'
+
+    @property
+    def passed(self) -> bool:
+        return self.score >= self.min_score
+
+    @property
+    def problems(self) -> List[SeoCheck]:
+        """Проверки с плохим результатом"""
+        return [check for check in self.checks if check.rating == 'bad']
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'keyword': self.keyword,
+            'score': self.score,
+            'rating': self.rating,
+            'passed': self.passed,
+            'min_score': self.min_score,
+            'checks': [check.to_dict() for check in self.checks]
+        }
+
+
+def transliterate(text: str) -> str:
+    """Транслитерация для сравнения со слагом"""
+    return ''.join(_TRANSLIT.get(char, char) for char in text.lower())
+
+
+def _content_lemmas(keyword: str) -> Tuple[str, ...]:
+    """Леммы значимых слов ключевой фразы (без служебных)"""
+    words = [word for word in tokenize(keyword) if word not in _FUNCTION_WORDS] or tokenize(keyword)
+    return tuple(lemmatize_words(words))
+
+
+def _contains_lemmas(text: str, lemmas: Tuple[str, ...]) -> bool:
+    """Все ли значимые слова ключа встречаются в тексте (в любой словоформе)"""
+    text_lemmas = set(lemmatize_words(tokenize(text)))
+    return bool(lemmas) and all(lemma in text_lemmas for lemma in lemmas)
+
+
+def _starts_with_keyphrase(text: str, keyword: str) -> bool:
+    """Начинается ли текст с ключевой фразы (в любой словоформе)"""
+    pattern = lemmatize_words(tokenize(keyword))
+    return bool(pattern) and lemmatize_words(tokenize(text)[:len(pattern)]) == pattern
+
+
+def _site_host(site_url: str) -> str:
+    host = urlparse(site_url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+# Проверки
+
+def check_title(title: str, keyword: str, lemmas: Tuple[str, ...]) -> SeoCheck:
+    """Ключевая фраза в SEO-заголовке (лучше всего — в начале)"""
+    if _starts_with_keyphrase(title, keyword):
+        return SeoCheck('keyphrase_in_title', 9, 'Ключевая фраза в начале SEO-заголовка')
+    if _contains_lemmas(title, lemmas):
+        return SeoCheck('keyphrase_in_title', 6, 'Ключевая фраза в заголовке, но не в начале')
+    return SeoCheck('keyphrase_in_title', 2, 'В SEO-заголовке нет всех слов ключевой фразы')
+
+
+def check_title_length(title: str) -> SeoCheck:
+    """Длина SEO-заголовка (вместо ширины в пикселях у Yoast)"""
+    length = len(title.strip())
+    if not length:
+        return SeoCheck('title_length', 1, 'Нет SEO-заголовка')
+    if length > WordPressConfig.MAX_TITLE_LENGTH:
+        return SeoCheck('title_length', 3, f'SEO-заголовок длиннее {WordPressConfig.MAX_TITLE_LENGTH} символов ({length})')
+    if length < TITLE_MIN_LENGTH:
+        return SeoCheck('title_length', 6, f'SEO-заголовок короче {TITLE_MIN_LENGTH} символов ({length})')
+    return SeoCheck('title_length', 9, f'Длина SEO-заголовка в норме ({length})')
+
+
+def check_introduction(content: str, lemmas: Tuple[str, ...]) -> SeoCheck:
+    """Ключевая фраза в первом абзаце: в одном предложении — хорошо, в абзаце — нормально"""
+    introduction = ''
+    for paragraph in _PARAGRAPH_RE.findall(content):
+        if tokenize(html_to_text(paragraph)):
+            introduction = html_to_text(paragraph)
+            break
+    if any(_contains_lemmas(sentence, lemmas) for sentence in split_sentences(introduction)):
+        return SeoCheck('keyphrase_in_introduction', 9, 'Ключевая фраза в первом абзаце')
+    if _contains_lemmas(introduction, lemmas):
+        return SeoCheck('keyphrase_in_introduction', 6, 'Слова ключевой фразы в первом абзаце, но в разных предложениях')
+    return SeoCheck('keyphrase_in_introduction', 3, 'Нет ключевой фразы в первом абзаце')
+
+
+def check_meta_description(meta_description: str, lemmas: Tuple[str, ...]) -> SeoCheck:
+    """Ключевая фраза в мета-описании: 1–2 раза"""
+    matches = sum(1 for sentence in split_sentences(meta_description) if _contains_lemmas(sentence, lemmas))
+    if not matches:
+        return SeoCheck('keyphrase_in_meta_description', 3, 'Нет ключевой фразы в мета-описании')
+    if matches > 2:
+        return SeoCheck('keyphrase_in_meta_description', 3, f'Ключевая фраза в мета-описании {matches} раз')
+    return SeoCheck('keyphrase_in_meta_description', 9, 'Ключевая фраза в мета-описании')
+
+
+def check_meta_description_length(meta_description: str) -> SeoCheck:
+    """Длина мета-описания 120–156 символов"""
+    length = len(meta_description.strip())
+    if not length:
+        return SeoCheck('meta_description_length', 1, 'Нет мета-описания')
+    if length < META_DESCRIPTION_MIN:
+        return SeoCheck('meta_description_length', 6, f'Мета-описание короче {META_DESCRIPTION_MIN} символов ({length})')
+    if length > META_DESCRIPTION_MAX:
+        return SeoCheck('meta_description_length', 6, f'Мета-описание длиннее {META_DESCRIPTION_MAX} символов ({length})')
+    return SeoCheck('meta_description_length', 9, f'Длина мета-описания в норме ({length})')
+
+
+def check_slug(slug: str, keyword: str) -> SeoCheck:
+    """Слова ключевой фразы в слаге (по транслитерированным основам)"""
+    words = [word for word in tokenize(keyword) if word not in _FUNCTION_WORDS] or tokenize(keyword)
+    slug_words = re.split(r'[^a-z0-9]+', slug.lower())
+    found = sum(
+        1 for word in words
+        if any(slug_word.startswith(transliterate(stem_russian(word))) for slug_word in slug_words if slug_word)
+    )
+    if words and found == len(words):
+        return SeoCheck('keyphrase_in_slug', 9, 'Ключевая фраза в слаге')
+    if found * 2 > len(words):
+        return SeoCheck('keyphrase_in_slug', 6, 'В слаге больше половины слов ключевой фразы')
+    return SeoCheck('keyphrase_in_slug', 3, 'Ключевой фразы нет в слаге')
+
+
+def check_subheading_distribution(content: str, word_count: int) -> SeoCheck:
+    """Текст между подзаголовками не длиннее 300 слов"""
+    sections = [len(tokenize(html_to_text(section))) for section in _SUBHEADING_SPLIT_RE.split(content)]
+    if len(sections) == 1:
+        if word_count > SUBHEADING_SECTION_WORDS:
+            return SeoCheck('subheading_distribution', 2, 'Длинный текст без подзаголовков')
+        return SeoCheck('subheading_distribution', 9, 'Короткий текст, подзаголовки не нужны')
+    longest = max(sections)
+    if longest > SUBHEADING_SECTION_WORDS_MAX:
+        return SeoCheck('subheading_distribution', 3, f'Раздел без подзаголовка: {longest} слов')
+    if longest > SUBHEADING_SECTION_WORDS:
+        return SeoCheck('subheading_distribution', 6, f'Раздел без подзаголовка: {longest} слов')
+    return SeoCheck('subheading_distribution', 9, 'Подзаголовки распределены равномерно')
+
+
+def check_subheadings_keyphrase(metrics, lemmas: Tuple[str, ...]) -> SeoCheck:
+    """Доля подзаголовков H2–H3 с ключевой фразой: 30–75%"""
+    subheadings = [heading.text for heading in metrics.headings if heading.level in (2, 3)]
+    if not subheadings:
+        return SeoCheck('keyphrase_in_subheadings', 3, 'Нет подзаголовков H2–H3')
+    # Подзаголовок «отражает тему», если в нем больше половины значимых слов ключа
+    reflecting = 0
+    for text in subheadings:
+        heading_lemmas = set(lemmatize_words(tokenize(text)))
+        if sum(1 for lemma in lemmas if lemma in heading_lemmas) * 2 > len(lemmas):
+            reflecting += 1
+    share = reflecting / len(subheadings) * 100
+    if share < 30:
+        return SeoCheck('keyphrase_in_subheadings', 3, f'Ключевая фраза в {share:.0f}% подзаголовков (меньше 30%)')
+    if share > 75:
+        return SeoCheck('keyphrase_in_subheadings', 3, f'Ключевая фраза в {share:.0f}% подзаголовков (больше 75%)')
+    return SeoCheck('keyphrase_in_subheadings', 9, f'Ключевая фраза в {share:.0f}% подзаголовков')
+
+
+def check_links(content: str, site_url: str) -> Tuple[SeoCheck, SeoCheck]:
+    """Внутренние и внешние ссылки (nofollow учитываются отдельно)"""
+    host = _site_host(site_url)
+    internal = {'follow': 0, 'nofollow': 0}
+    outbound = {'follow': 0, 'nofollow': 0}
+    for anchor in _ANCHOR_RE.findall(content):
+        href_match = _HREF_RE.search(anchor)
+        href = href_match.group(1) if href_match else ''
+        if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+            continue
+        rel = _REL_RE.search(anchor)
+        follow = 'nofollow' if rel and 'nofollow' in rel.group(1).lower() else 'follow'
+        link_host = urlparse(href).netloc.lower()
+        link_host = link_host[4:] if link_host.startswith('www.') else link_host
+        if not link_host or link_host == host:
+            internal[follow] += 1
+        else:
+            outbound[follow] += 1
+
+    if internal['follow']:
+        internal_check = SeoCheck('internal_links', 9, f"Внутренних ссылок: {sum(internal.values())}")
+    elif internal['nofollow']:
+        internal_check = SeoCheck('internal_links', 7, 'Все внутренние ссылки с nofollow')
+    else:
+        internal_check = SeoCheck('internal_links', 3, 'Нет внутренних ссылок')
+
+    if outbound['follow']:
+        outbound_check = SeoCheck('outbound_links', 8, f"Внешних ссылок: {sum(outbound.values())}")
+    elif outbound['nofollow']:
+        outbound_check = SeoCheck('outbound_links', 7, 'Все внешние ссылки с nofollow')
+    else:
+        outbound_check = SeoCheck('outbound_links', 3, 'Нет внешних ссылок')
+    return internal_check, outbound_check
+
+
+def check_image_alt(content: str, lemmas: Tuple[str, ...]) -> SeoCheck:
+    """Изображения и ключевая фраза в alt"""
+    images = _IMAGE_RE.findall(content)
+    if not images:
+        return SeoCheck('image_keyphrase', 3, 'В статье нет изображений')
+    alts = [match.group(1) for match in map(_ALT_RE.search, images) if match and match.group(1).strip()]
+    if len(alts) < len(images):
+        return SeoCheck('image_keyphrase', 3, f'Без alt: {len(images) - len(alts)} из {len(images)} изображений')
+    if any(_contains_lemmas(alt, lemmas) for alt in alts):
+        return SeoCheck('image_keyphrase', 9, 'Ключевая фраза в alt изображений')
+    return SeoCheck('image_keyphrase', 6, 'В alt изображений нет ключевой фразы')
+
+
+def check_keyphrase_density(metrics) -> SeoCheck:
+    """Плотность ключевой фразы 0.5–3%"""
+    density = metrics.keyword_forms.density
+    if density < DENSITY_MIN:
+        return SeoCheck('keyphrase_density', 4, f'Плотность ключевой фразы {density:.1f}% (ниже {DENSITY_MIN}%)')
+    if density > DENSITY_MAX:
+        return SeoCheck('keyphrase_density', -10, f'Плотность ключевой фразы {density:.1f}% (выше {DENSITY_MAX}%)')
+    return SeoCheck('keyphrase_density', 9, f'Плотность ключевой фразы {density:.1f}%')
+
+
+def check_text_length(word_count: int) -> SeoCheck:
+    """Объем текста от 300 слов"""
+    if word_count >= 300:
+        return SeoCheck('text_length', 9, f'Объем текста: {word_count} слов')
+    if word_count >= 250:
+        return SeoCheck('text_length', 6, f'Объем текста: {word_count} слов')
+    if word_count >= 200:
+        return SeoCheck('text_length', 3, f'Объем текста: {word_count} слов')
+    if word_count >= 100:
+        return SeoCheck('text_length', -10, f'Объем текста: {word_count} слов')
+    return SeoCheck('text_length', -20, f'Объем текста: {word_count} слов')
+
+
+def analyze_article(content: str, keyword: str, title: str, meta_description: str = '', slug: str = '',
+                    site_url: Optional[str] = None, min_score: Optional[int] = None) -> SeoAnalysis:
+    """
+    SEO-анализ статьи перед публикацией
+
+    Args:
+        content: HTML статьи
+        keyword: Фокусная ключевая фраза
+        title: SEO-заголовок
+        meta_description: Мета-описание
+        slug: Слаг записи
+        site_url: Адрес сайта для разделения ссылок (по умолчанию WordPressConfig.SITE_URL)
+        min_score: Порог прохождения (по умолчанию WordPressConfig.SEO_GATE_MIN_SCORE)
+
+    Returns:
+        Проверки и итоговая оценка
+    """
+    if min_score is None:
+        min_score = WordPressConfig.SEO_GATE_MIN_SCORE
+    metrics = get_content_metrics(content, keyword)
+    lemmas = _content_lemmas(keyword)
+    word_count = len(metrics.tokens)
+
+    analysis = SeoAnalysis(keyword=keyword, min_score=min_score)
+    analysis.checks.extend([
+        check_title(title, keyword, lemmas),
+        check_title_length(title),
+        check_introduction(content, lemmas),
+        check_meta_description(meta_description, lemmas),
+        check_meta_description_length(meta_description),
+        check_slug(slug, keyword),
+        check_subheading_distribution(content, word_count),
+        check_subheadings_keyphrase(metrics, lemmas),
+        *check_links(content, site_url or WordPressConfig.SITE_URL),
+        check_image_alt(content, lemmas),
+        check_keyphrase_density(metrics),
+        check_text_length(word_count)
+    ])
+    return analysis
+
+
+def _analyze_prepared(article: Dict[str, Any]) -> SeoAnalysis:
+    return analyze_article(
+        article['content'], article['keyword'], article.get('title', ''),
+        article.get('meta_description', ''), article.get('slug', ''),
+        min_score=article.get('min_score')
+    )
+
+
+def analyze_articles(articles: Iterable[Dict[str, Any]], workers: int = 1) -> List[SeoAnalysis]:
+    """
+    Пакетный SEO-анализ подготовленных статей
+
+    Args:
+        articles: Словари с ключами content, keyword, title, meta_description, slug
+        workers: Число процессов (1 — в текущем процессе)
+
+    Returns:
+        Результаты в порядке статей
+    """
+    articles = list(articles)
+    if workers <= 1 or len(articles) < 2:
+        return [_analyze_prepared(article) for article in articles]
+    with Pool(processes=workers) as pool:
+        return pool.map(_analyze_prepared, articles, chunksize=max(1, len(articles) // (workers * 4)))
+
+
+# Экспорт
+__all__ = [
+    'META_DESCRIPTION_MIN', 'META_DESCRIPTION_MAX', 'SeoCheck', 'SeoAnalysis', 'analyze_article', 'analyze_articles', 'transliterate',
+    'check_title', 'check_title_length', 'check_introduction', 'check_meta_description',
+    'check_meta_description_length', 'check_slug', 'check_subheading_distribution',
+    'check_subheadings_keyphrase', 'check_links', 'check_image_alt', 'check_keyphrase_density',
+    'check_text_length'
+]
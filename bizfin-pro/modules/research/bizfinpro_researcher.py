@@ -305,7 +305,7 @@ def extract_page_artifact(html_bytes: bytes, base_url: str, fallback_title: str=
         ):
             calculators.append({
                 "name": form.get("id") or "calculator",
-                "inputs": list({*labels} or {*inputs}),
+                "inputs": ", ".join(dict.fromkeys(labels or inputs)),
                 "formula": "N/A",
                 "notes": "Heuristic detection of calculator form"
             })
@@ -12,7 +12,7 @@ from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 import sys
@@ -22,6 +22,8 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from config.legal_compliance import LegalCompliance, ComplianceChecker
+from modules.quality.readability import analyze_text, analyze_texts, readability_level
+from modules.quality.morphology import lemmatize
 
 @dataclass
 class CompetitorData:
@@ -41,6 +43,7 @@ class CompetitorData:
     reading_time: int
     domain: str
     analysis_date: datetime
+    readability: Dict[str, Any] = field(default_factory=dict)
 
 class CompetitorAnalyzer:
     """Анализатор конкурентов"""
@@ -221,6 +224,8 @@ class CompetitorAnalyzer:
             faq_count = self._count_faq(soup)
             cta_count = self._count_cta(soup)
             reading_time = self._calculate_reading_time(word_count)
+            # Скрипты и стили уже удалены в _count_words; блоки разделяем переводом строки
+            readability = analyze_text(soup.get_text('\n'), is_html=False).to_dict()
             
             competitor_data = CompetitorData(
                 url=url,
@@ -237,7 +242,8 @@ class CompetitorAnalyzer:
                 cta_count=cta_count,
                 reading_time=reading_time,
                 domain=urlparse(url).netloc,
-                analysis_date=datetime.now()
+                analysis_date=datetime.now(),
+                readability=readability
             )
             
             self.logger.info(f"Анализ завершен: {word_count} слов, {len(lsi_keywords)} LSI ключей")
@@ -306,16 +312,21 @@ class CompetitorAnalyzer:
         
         text = soup.get_text().lower()
         
-        # Ищем часто встречающиеся слова (простая реализация)
+        # Ищем часто встречающиеся слова, словоформы считаем вместе по лемме
         words = re.findall(r'\b[а-яё]{4,}\b', text)
-        word_freq = {}
+        lemma_freq = {}
+        form_freq = {}
         
         for word in words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Возвращаем топ-10 наиболее частых слов
-        lsi_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:10]
-        return [word for word, freq in lsi_keywords if freq > 2]
+            lemma = lemmatize(word)
+            lemma_freq[lemma] = lemma_freq.get(lemma, 0) + 1
+            forms = form_freq.setdefault(lemma, {})
+            forms[word] = forms.get(word, 0) + 1
+        
+        # Возвращаем топ-10 лемм в самой частой словоформе
+        lsi_keywords = sorted(lemma_freq.items(), key=lambda x: x[1], reverse=True)[:10]
+        return [max(form_freq[lemma].items(), key=lambda x: x[1])[0]
+                for lemma, freq in lsi_keywords if freq > 2]
     
     def _extract_internal_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Извлечение внутренних ссылок"""
@@ -437,6 +448,8 @@ class CompetitorAnalyzer:
         avg_images = sum(c.images_count for c in competitors) / len(competitors)
         avg_faq = sum(c.faq_count for c in competitors) / len(competitors)
         avg_cta = sum(c.cta_count for c in competitors) / len(competitors)
+        flesch_values = [c.readability['flesch_reading_ease'] for c in competitors if c.readability.get('words')]
+        avg_flesch = sum(flesch_values) / len(flesch_values) if flesch_values else 0.0
         
         # Общие LSI ключевые слова
         all_lsi = []
@@ -471,7 +484,8 @@ class CompetitorAnalyzer:
                     'cta_count': c.cta_count,
                     'lsi_keywords': c.lsi_keywords,
                     'structure': c.structure,
-                    'domain': c.domain
+                    'domain': c.domain,
+                    'readability': c.readability
                 }
                 for c in competitors
             ],
@@ -481,6 +495,7 @@ class CompetitorAnalyzer:
                 'avg_images': int(avg_images),
                 'avg_faq': int(avg_faq),
                 'avg_cta': int(avg_cta),
+                'avg_flesch_reading_ease': round(avg_flesch, 1),
                 'total_competitors': len(competitors)
             },
             'lsi_keywords': [word for word, freq in top_lsi],
@@ -490,6 +505,50 @@ class CompetitorAnalyzer:
             'status': 'completed'
         }
     
+    def compare_readability(self, content: str, competitors: List[Any]) -> Dict[str, Any]:
+        """
+        Сравнение читаемости нашей статьи и ее разделов со страницами конкурентов
+        
+        Разделы статьи (по H2) оцениваются одним пакетным вызовом.
+        
+        Args:
+            content: HTML нашей статьи
+            competitors: CompetitorData или словари из analyze_keyword()['competitors']
+            
+        Returns:
+            Индекс Флеша статьи, среднее по конкурентам и разделы сложнее конкурентов
+        """
+        competitor_values = []
+        for competitor in competitors:
+            readability = competitor.readability if isinstance(competitor, CompetitorData) else competitor.get('readability', {})
+            if readability.get('words'):
+                competitor_values.append(readability['flesch_reading_ease'])
+        competitor_flesch = sum(competitor_values) / len(competitor_values) if competitor_values else None
+        
+        article = analyze_text(content)
+        
+        sections = [section for section in re.split(r'(?=<h2\b)', content, flags=re.IGNORECASE) if section.strip()]
+        section_scores = analyze_texts(sections)
+        headings = [
+            re.sub(r'<[^>]+>', '', match.group(1)).strip() if match else 'Введение'
+            for match in (re.search(r'<h2\b[^>]*>(.*?)</h2>', section, re.IGNORECASE | re.DOTALL) for section in sections)
+        ]
+        
+        harder_sections = []
+        if competitor_flesch is not None:
+            for heading, flesch, words in zip(headings, section_scores['flesch_reading_ease'], section_scores['words']):
+                if words and flesch < competitor_flesch:
+                    harder_sections.append({'heading': heading, 'flesch_reading_ease': round(float(flesch), 1)})
+        
+        return {
+            'article_flesch_reading_ease': round(article.flesch_reading_ease, 1),
+            'article_level': article.level,
+            'competitor_flesch_reading_ease': round(competitor_flesch, 1) if competitor_flesch is not None else None,
+            'competitor_level': readability_level(competitor_flesch) if competitor_flesch is not None else None,
+            'difference': round(article.flesch_reading_ease - competitor_flesch, 1) if competitor_flesch is not None else None,
+            'harder_sections': sorted(harder_sections, key=lambda s: s['flesch_reading_ease'])
+        }
+    
     def _identify_gaps(self, competitors: List[CompetitorData]) -> List[str]:
         """Выявление пробелов у конкурентов"""
         gaps = []
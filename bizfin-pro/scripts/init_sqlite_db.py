@@ -18,13 +18,13 @@ def setup_logging():
     )
     return logging.getLogger(__name__)
 
-def create_tables():
-    """Создание таблиц в SQLite"""
+def create_tables(db_path=None):
+    """Создание таблиц в SQLite (по умолчанию db/bizfin_pro.db)"""
     logger = setup_logging()
     
     try:
         # Путь к базе данных SQLite
-        db_path = os.path.join(os.path.dirname(__file__), '..', 'db', 'bizfin_pro.db')
+        db_path = db_path or os.path.join(os.path.dirname(__file__), '..', 'db', 'bizfin_pro.db')
         
         # Подключаемся к базе данных
         connection = sqlite3.connect(db_path)
@@ -82,6 +82,11 @@ def create_tables():
             reading_time INTEGER DEFAULT 0,
             structure TEXT, -- JSON как TEXT
             lsi_keywords_used TEXT, -- JSON как TEXT
+            html_original_bytes INTEGER,
+            html_final_bytes INTEGER,
+            quality_score INTEGER DEFAULT 0,
+            seo_score INTEGER DEFAULT 0,
+            content_rating INTEGER DEFAULT 0,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             generation_duration INTEGER,
             FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE,
@@ -89,6 +94,19 @@ def create_tables():
         );
         """
         
+        # SQL для создания таблицы quality_metrics (история оценок)
+        create_quality_metrics_table = """
+        CREATE TABLE IF NOT EXISTS quality_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER NOT NULL,
+            metric_type TEXT NOT NULL,
+            score INTEGER DEFAULT 0,
+            details TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE
+        );
+        """
+        
         # SQL для создания таблицы seo_checks
         create_seo_checks_table = """
         CREATE TABLE IF NOT EXISTS seo_checks (
@@ -192,16 +210,78 @@ def create_tables():
         );
         """
         
+        # SQL для создания таблиц пост-публикационного контура (Этапы 8-10)
+        create_seo_meta_expected_table = """
+        CREATE TABLE IF NOT EXISTS seo_meta_expected (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_final_id INTEGER NOT NULL,
+            keyword_id INTEGER NOT NULL,
+            focus_keyword TEXT NOT NULL,
+            title TEXT NOT NULL,
+            meta_description TEXT NOT NULL,
+            begins_with_kw BOOLEAN NOT NULL,
+            length_le_160 BOOLEAN NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (article_final_id) REFERENCES articles_final(id) ON DELETE CASCADE,
+            FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE
+        );
+        """
+        
+        create_wp_meta_verification_table = """
+        CREATE TABLE IF NOT EXISTS wp_meta_verification (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            published_id INTEGER NOT NULL,
+            keyword_id INTEGER NOT NULL,
+            article_id INTEGER NOT NULL,
+            article_final_id INTEGER NOT NULL,
+            wp_post_id INTEGER NOT NULL,
+            permalink TEXT NOT NULL,
+            wp_focuskw TEXT,
+            wp_metadesc TEXT,
+            focuskw_match BOOLEAN NOT NULL,
+            metadesc_match BOOLEAN NOT NULL,
+            metadesc_begins_with_kw BOOLEAN NOT NULL,
+            metadesc_length_le_160 BOOLEAN NOT NULL,
+            yoast_indexable_ok BOOLEAN,
+            yoast_seo_score INTEGER,
+            checked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (published_id) REFERENCES published(id) ON DELETE CASCADE,
+            FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE,
+            FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
+            FOREIGN KEY (article_final_id) REFERENCES articles_final(id) ON DELETE CASCADE
+        );
+        """
+        
+        create_seo_meta_audit_log_table = """
+        CREATE TABLE IF NOT EXISTS seo_meta_audit_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            publish_status_id INTEGER NOT NULL,
+            wp_meta_verif_id INTEGER,
+            status TEXT NOT NULL CHECK(status IN ('ok', 'mismatch', 'wp_error', 'partial')),
+            issues TEXT, -- JSON как TEXT
+            resolved BOOLEAN DEFAULT FALSE,
+            resolution_attempts INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            resolved_at DATETIME,
+            FOREIGN KEY (publish_status_id) REFERENCES publish_status(id) ON DELETE CASCADE,
+            FOREIGN KEY (wp_meta_verif_id) REFERENCES wp_meta_verification(id) ON DELETE SET NULL
+        );
+        """
+        
         # Создаем все таблицы
         tables = [
             ("keywords", create_keywords_table),
             ("analysis", create_analysis_table),
             ("articles", create_articles_table),
+            ("quality_metrics", create_quality_metrics_table),
             ("seo_checks", create_seo_checks_table),
             ("articles_final", create_articles_final_table),
             ("publish_queue", create_publish_queue_table),
             ("published", create_published_table),
-            ("publish_status", create_publish_status_table)
+            ("publish_status", create_publish_status_table),
+            ("seo_meta_expected", create_seo_meta_expected_table),
+            ("wp_meta_verification", create_wp_meta_verification_table),
+            ("seo_meta_audit_log", create_seo_meta_audit_log_table)
         ]
         
         for table_name, create_sql in tables:
@@ -218,8 +298,13 @@ def create_tables():
             "CREATE INDEX IF NOT EXISTS idx_keywords_date_added ON keywords(date_added);",
             "CREATE INDEX IF NOT EXISTS idx_analysis_keyword_id ON analysis(keyword_id);",
             "CREATE INDEX IF NOT EXISTS idx_articles_keyword_id ON articles(keyword_id);",
+            "CREATE INDEX IF NOT EXISTS idx_quality_metrics_article_id ON quality_metrics(article_id);",
             "CREATE INDEX IF NOT EXISTS idx_seo_checks_article_id ON seo_checks(article_id);",
-            "CREATE INDEX IF NOT EXISTS idx_seo_checks_seo_score ON seo_checks(seo_score);"
+            "CREATE INDEX IF NOT EXISTS idx_seo_checks_seo_score ON seo_checks(seo_score);",
+            "CREATE INDEX IF NOT EXISTS idx_publish_status_published_id ON publish_status(published_id);",
+            "CREATE INDEX IF NOT EXISTS idx_seo_meta_expected_article_final_id ON seo_meta_expected(article_final_id);",
+            "CREATE INDEX IF NOT EXISTS idx_wp_meta_verification_published_id ON wp_meta_verification(published_id);",
+            "CREATE INDEX IF NOT EXISTS idx_seo_meta_audit_log_status ON seo_meta_audit_log(status);"
         ]
         
         for index_sql in indexes:
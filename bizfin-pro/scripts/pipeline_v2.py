@@ -29,6 +29,9 @@ from config.company_profile import CompanyData
 from config.legal_compliance import ComplianceChecker
 from modules.research.competitor_analyzer import CompetitorAnalyzer
 from modules.alwrity_integration.alwrity_client import ALwrityClient
+from config.design_system import DesignGenerator
+from modules.generator.stylesheet import get_stylesheet
+from modules.generator.html_minifier import optimize_article_html
 import mysql.connector
 from mysql.connector import Error
 
@@ -45,8 +48,16 @@ class PipelineResult:
 class BizFinProPipeline:
     """Основной класс пайплайна BizFin Pro"""
     
-    def __init__(self):
-        """Инициализация пайплайна"""
+    def __init__(self, parallel_sections: bool = False, section_workers: int = None):
+        """
+        Инициализация пайплайна
+        
+        Args:
+            parallel_sections: Генерировать разделы и FAQ параллельными запросами
+            section_workers: Максимум одновременных запросов к AI Assistant
+        """
+        self.parallel_sections = parallel_sections
+        self.section_workers = section_workers
         self.db_config = DB_CONFIG.get_config_dict()
         self.connection = None
         self.competitor_analyzer = CompetitorAnalyzer()
@@ -269,33 +280,72 @@ class BizFinProPipeline:
             keyword = result[1]  # k.keyword
             target_volume = result[2]  # k.target_volume
             competitors_data = json.loads(result[6])  # competitors_data
+            content_structure = json.loads(result[3] or '{}')  # structure — оглавления конкурентов
             
             self.logger.info(f"✍️ Динамическая генерация статьи для: '{keyword}'")
             
             # Генерируем статью через ALwrity
             start_time = time.time()
-            article_data = self.alwrity_client.generate_article(
-                keyword=keyword,
-                competitors_data={'competitors': competitors_data},
-                company_profile=self.company_data.get_company_stats(),
-                target_words=target_volume
-            )
+            if self.parallel_sections:
+                # Разделы и FAQ генерируются одновременно
+                article_data = self.alwrity_client.generate_article_sections(
+                    keyword=keyword,
+                    competitors_data={'competitors': competitors_data, 'content_structure': content_structure},
+                    company_profile=self.company_data.get_company_stats(),
+                    target_words=target_volume,
+                    max_workers=self.section_workers
+                )
+            else:
+                article_data = self.alwrity_client.generate_article(
+                    keyword=keyword,
+                    competitors_data={'competitors': competitors_data, 'content_structure': content_structure},
+                    company_profile=self.company_data.get_company_stats(),
+                    target_words=target_volume
+                )
             generation_duration = int(time.time() - start_time)
             
             # SEO-оптимизация
             seo_optimized = self.alwrity_client.optimize_seo(article_data['content'], keyword)
             
-            # Генерация FAQ
-            faq_data = self.alwrity_client.generate_faq(keyword, article_data['content'])
+            # Генерация FAQ (в параллельном режиме уже готов)
+            faq_data = article_data.get('faq') or self.alwrity_client.generate_faq(keyword, article_data['content'])
             
             # Создаем HTML версию
             html_content = self._create_html_article(article_data, faq_data, keyword)
+            payload = get_stylesheet().measure_payload(html_content)
+            if payload['linked']:
+                self.logger.info(
+                    f"📦 Размер HTML: {payload['linked_bytes']} байт "
+                    f"(со встроенным CSS было бы {payload['inline_bytes']}, экономия {payload['saved_percent']}%)"
+                )
+            else:
+                self.logger.info(
+                    f"📦 Размер HTML: {payload['html_bytes']} байт (CSS встроен, таблица стилей не подключена)"
+                )
+            
+            # Минификация и лимит размера перед сохранением
+            optimized = optimize_article_html(html_content)
+            self.logger.info(
+                f"🗜️ Минификация HTML: {optimized.original_bytes} → {optimized.final_bytes} байт "
+                f"(-{optimized.saved_percent}%, удалено оберток: {optimized.wrappers_removed})"
+            )
+            if not optimized.within_budget:
+                self.logger.error(
+                    f"❌ Превышен лимит размера статьи: {optimized.final_bytes} > {optimized.budget_bytes} байт"
+                )
+                cursor.execute(
+                    "UPDATE keywords SET status = 'error' WHERE id = (SELECT keyword_id FROM analysis WHERE id = %s)",
+                    (analysis_id,)
+                )
+                self.connection.commit()
+                return None
             
             # Сохраняем статью
             insert_query = """
                 INSERT INTO articles (keyword_id, analysis_id, title, content_raw, html_raw, 
-                                    word_count, reading_time, structure, lsi_keywords_used, generation_duration)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                                    word_count, reading_time, structure, lsi_keywords_used, generation_duration,
+                                    html_original_bytes, html_final_bytes)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
             values = (
@@ -303,12 +353,14 @@ class BizFinProPipeline:
                 analysis_id,
                 article_data['title'],
                 article_data['content'],
-                html_content,
+                optimized.html,
                 article_data.get('word_count', len(article_data['content'].split())),
                 article_data.get('reading_time', 12),
                 json.dumps(article_data.get('structure', [])),
                 json.dumps(article_data.get('lsi_keywords_used', [])),
-                generation_duration
+                generation_duration,
+                optimized.original_bytes,
+                optimized.final_bytes
             )
             
             cursor.execute(insert_query, values)
@@ -327,7 +379,8 @@ class BizFinProPipeline:
             if cursor:
                 cursor.close()
     
-    def _create_html_article(self, article_data: Dict[str, Any], faq_data: Dict[str, Any], keyword: str) -> str:
+    def _create_html_article(self, article_data: Dict[str, Any], faq_data: Dict[str, Any], keyword: str,
+                             inline_css: bool = False) -> str:
         """
         Создание HTML версии статьи в фирменном стиле BizFin Pro
         
@@ -335,19 +388,19 @@ class BizFinProPipeline:
             article_data: Данные статьи
             faq_data: Данные FAQ
             keyword: Ключевое слово
+            inline_css: Встроить CSS дизайн-системы в статью вместо общей таблицы стилей
+                (пока таблица стилей не загружена, CSS встраивается всегда)
             
         Returns:
             HTML контент статьи
         """
-        from config.design_system import DesignGenerator
-        
+        stylesheet = get_stylesheet()
+        styles = stylesheet.inline_tag() if inline_css else stylesheet.article_styles()
         design = DesignGenerator()
-        css_styles = design.generate_css_styles()
+        section = design.get_element_class('section')
         
         html = f"""
-        <style>
-        {css_styles}
-        </style>
+        {styles}
         
         <article class="bizfin-article">
             <header class="article-header">
@@ -355,27 +408,27 @@ class BizFinProPipeline:
                 <p class="article-meta">Получите {keyword} быстро и выгодно! Экспертное руководство с калькулятором, сравнением банков и реальными кейсами.</p>
             </header>
             
-            <div class="bizfin-section">
+            <div class="{section}">
                 <div class="article-content">
                     {article_data['content']}
                 </div>
             </div>
             
-            <div class="bizfin-section">
+            <div class="{section}">
                 <h2 class="bizfin-h2">Часто задаваемые вопросы</h2>
                 {faq_data.get('html', '')}
             </div>
             
-            <div class="bizfin-section">
-                <div class="bizfin-highlight">
+            <div class="{section}">
+                <div class="{design.get_element_class('highlight')}">
                     <h3 class="bizfin-h3">🚀 Готовы получить {keyword}?</h3>
                     <p>Наши эксперты помогут вам сэкономить время, деньги и нервы при получении {keyword}</p>
-                    <button class="bizfin-cta-button">📞 Получить бесплатную консультацию</button>
+                    <button class="{design.get_element_class('cta_button')}">📞 Получить бесплатную консультацию</button>
                 </div>
             </div>
             
             <footer class="article-footer">
-                <div class="bizfin-card">
+                <div class="{design.get_element_class('card')}">
                     <h3>О компании Бизнес Финанс</h3>
                     <p>{self.company_data.get_company_intro()}</p>
                     <p><strong>Контакты:</strong> {self.company_data.get_contact_info()['phone']}</p>
@@ -573,10 +626,9 @@ class BizFinProPipeline:
             # Этап 4: Улучшение статьи
             # Этап 5: Формирование EEC
             # Этап 6: Публикация в WordPress
-            # Этап 7: Проверка публикации
-            # Этап 8: Фиксация SEO-мета
-            # Этап 9: Верификация WordPress
-            # Этап 10: Финальный аудит
+            # Этапы 7-10 (проверка публикации, фиксация SEO-мета, верификация WordPress,
+            # финальный аудит) выполняются пакетно после публикации:
+            # modules/publisher/verification.py (verify_published.py)
             
             self.stats['keywords_processed'] += 1
             self.stats['articles_generated'] += 1
@@ -628,12 +680,17 @@ def main():
     parser.add_argument('--priority', default='medium', choices=['low', 'medium', 'high', 'urgent'], help='Приоритет')
     parser.add_argument('--target-volume', type=int, default=2500, help='Целевой объем статьи')
     parser.add_argument('--intent', default='informational', choices=['informational', 'commercial', 'educational', 'faq', 'review'], help='Тип интента')
+    parser.add_argument('--parallel-sections', action='store_true', help='Генерировать разделы и FAQ параллельно')
+    parser.add_argument('--section-workers', type=int, help='Одновременных запросов к AI Assistant при генерации разделов')
     parser.add_argument('--verbose', '-v', action='store_true', help='Подробный вывод')
     
     args = parser.parse_args()
     
     # Создаем и запускаем пайплайн
-    pipeline = BizFinProPipeline()
+    pipeline = BizFinProPipeline(
+        parallel_sections=args.parallel_sections,
+        section_workers=args.section_workers
+    )
     
     result = pipeline.run_full_pipeline(
         keyword=args.keyword,
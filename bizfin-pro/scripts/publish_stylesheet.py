@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Публикация общей таблицы стилей дизайн-системы BizFin Pro
+
+- Компиляция и версионирование CSS (data/assets/bizfin-design-<версия>.css)
+- Загрузка в медиатеку WordPress один раз на версию (--upload)
+- Отчет о размере статей: встроенный CSS против подключаемого файла
+"""
+
+import os
+import sys
+import sqlite3
+import logging
+import argparse
+
+# Добавляем путь к модулям проекта
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.generator.stylesheet import StylesheetAsset
+
+
+def setup_logging():
+    """Настройка логирования"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    return logging.getLogger(__name__)
+
+
+def size_report(asset: StylesheetAsset, db_path: str, limit: int) -> None:
+    """Отчет о размере сохраненных статей"""
+    connection = sqlite3.connect(db_path)
+    try:
+        rows = connection.execute(
+            "SELECT id, title, html_raw FROM articles WHERE html_raw IS NOT NULL ORDER BY id DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+    finally:
+        connection.close()
+
+    if not rows:
+        print("📭 В базе нет статей с HTML")
+        return
+
+    total_inline = total_linked = 0
+    print(f"\n📊 Размер статей ({len(rows)} шт.)")
+    print("-" * 70)
+    for article_id, title, html in rows:
+        payload = asset.measure_payload(html)
+        total_inline += payload['inline_bytes']
+        total_linked += payload['linked_bytes']
+        print(f"#{article_id:<5} {payload['inline_bytes']:>8} → {payload['linked_bytes']:>8} байт "
+              f"(-{payload['saved_percent']}%)  {title[:35]}")
+
+    print("-" * 70)
+    saved_percent = (total_inline - total_linked) / total_inline * 100 if total_inline else 0
+    print(f"Итого: {total_inline} → {total_linked} байт (-{saved_percent:.1f}%)")
+    print(f"Таблица стилей: {len(asset.css)} байт, загружается браузером один раз")
+
+
+def main():
+    """Основная функция"""
+    logger = setup_logging()
+
+    parser = argparse.ArgumentParser(description='Общая таблица стилей BizFin Pro')
+    parser.add_argument('--upload', action='store_true', help='Загрузить текущую версию в WordPress')
+    parser.add_argument('--force', action='store_true', help='Загрузить повторно, даже если версия уже есть')
+    parser.add_argument('--db', default=os.path.join(os.path.dirname(__file__), '..', 'data', 'bizfin_pro.db'),
+                        help='SQLite БД со статьями для отчета о размере')
+    parser.add_argument('--limit', type=int, default=50, help='Сколько последних статей включить в отчет')
+
+    args = parser.parse_args()
+
+    asset = StylesheetAsset()
+    path = asset.compile()
+    logger.info(f"🎨 Версия {asset.version}: {path}")
+
+    if args.upload:
+        url = asset.upload(force=args.force)
+        logger.info(f"🔗 {asset.link_tag() or url}")
+    elif asset.url:
+        logger.info(f"🔗 Уже загружена: {asset.url}")
+    else:
+        logger.info("ℹ️ Версия еще не загружена (запустите с --upload)")
+
+    if os.path.exists(args.db):
+        size_report(asset, args.db, args.limit)
+    else:
+        logger.warning(f"⚠️ База данных не найдена: {args.db}")
+
+
+if __name__ == "__main__":
+    main()
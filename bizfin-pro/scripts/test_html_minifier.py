@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тестовый скрипт минификации HTML статей (modules/generator/html_minifier.py)
+"""
+
+import sys
+import os
+
+# Добавляем путь к модулям проекта
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.generator.html_minifier import minify_html
+
+
+def test_inline_wrappers_kept():
+    """Обертки со строчным содержимым не удаляются: строки статьи не сливаются"""
+    html = '<div><strong>A</strong> text <em>b</em></div><div><span>c</span></div>'
+    minified, removed = minify_html(html)
+    assert minified == html, minified
+    assert removed == 0
+
+    minified, removed = minify_html('<div><p>Абзац</p>хвост</div>')
+    assert minified == '<div><p>Абзац</p>хвост</div>', minified
+    assert removed == 0
+
+
+def test_block_wrappers_removed():
+    """Обертки только вокруг блочных элементов удаляются"""
+    minified, removed = minify_html('<div>\n  <p>a</p>\n  <ul><li>b</li></ul>\n</div>\n<div></div>')
+    assert minified == '<p>a</p><ul><li>b</li></ul>', minified
+    assert removed == 2
+
+    minified, removed = minify_html('<div class="card"><div class="card"><h2>x</h2></div></div>')
+    assert minified == '<div class="card"><h2>x</h2></div>', minified
+    assert removed == 1
+
+
+def test_nbsp_kept():
+    """Неразрывные пробелы в суммах (format_rub) не схлопываются"""
+    html = '<p>\n  Сумма:\u00a01\u00a0250\u00a0000\u00a0₽\u00a0</p>\n<p>x</p>'
+    minified, _ = minify_html(html)
+    assert minified == '<p> Сумма:\u00a01\u00a0250\u00a0000\u00a0₽\u00a0</p><p>x</p>', repr(minified)
+
+    minified, removed = minify_html('<div>\u00a0<p>a</p></div>')
+    assert minified == '<div>\u00a0<p>a</p></div>', repr(minified)
+    assert removed == 0
+
+
+def main():
+    """Основная функция"""
+    print("🧪 Тестирование минификации HTML")
+    for test in (test_inline_wrappers_kept, test_block_wrappers_removed, test_nbsp_kept):
+        test()
+        print(f"✅ {test.__doc__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Разбор спула публикации WordPress
+- Публикует статьи, которые не удалось опубликовать из-за недоступности WordPress
+- Пауза между попытками растет (WP_SPOOL_RETRY_DELAY, удваивается до WP_SPOOL_MAX_DELAY)
+- Отклоненные WordPress (4xx) записи остаются в спуле со статусом dead (--requeue-dead)
+- Записи в БД статей делает скрипт-источник при следующем запуске: опубликованная
+  статья повторно не генерируется и не публикуется
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from config.wordpress import WordPressConfig
+from modules.publisher.publish_spool import get_publish_spool, PublishSpoolDrainer
+
+
+def print_counts(spool):
+    """Число записей спула по статусам"""
+    counts = spool.counts()
+    print(f"📬 Спул: ожидают {counts.get('pending', 0)} | в работе {counts.get('processing', 0)} | "
+          f"опубликованы {counts.get('published', 0)} | записаны в БД {counts.get('done', 0)} | "
+          f"отклонены {counts.get('dead', 0)}")
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Разбор спула публикации WordPress')
+    parser.add_argument('--spool', default=WordPressConfig.PUBLISH_SPOOL_PATH, help='Файл спула (SQLite)')
+    parser.add_argument('--follow', action='store_true', help='Разбирать спул, пока не будет прерван (Ctrl+C)')
+    parser.add_argument('--interval', type=float, default=30, help='Максимальная пауза между проверками, с')
+    parser.add_argument('--requeue-dead', action='store_true', help='Вернуть отклоненные записи в ожидание')
+    parser.add_argument('--status', action='store_true', help='Только показать состояние спула')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Подробный вывод')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    spool = get_publish_spool(args.spool)
+    if spool is None:
+        parser.error('Спул публикации отключен: укажите --spool или WP_PUBLISH_SPOOL_PATH')
+
+    print_counts(spool)
+    if args.status:
+        return
+
+    if args.requeue_dead:
+        print(f"🔁 Возвращено в ожидание: {spool.requeue_dead()}")
+
+    stale = spool.recover_stale()
+    if stale:
+        print(f"🔁 Возвращено после прерванного разбора: {stale}")
+
+    drainer = PublishSpoolDrainer(spool)
+    print(f"🚀 Разбор спула: {drainer.client.api_url}")
+    print("=" * 60)
+    if args.follow:
+        drainer.start(args.interval)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n⏹️ Остановка разбора...")
+        finally:
+            drainer.stop()
+    else:
+        drainer.drain_once()
+
+    stats = drainer.stats
+    print(f"✅ Опубликовано: {stats.published} | ⏳ Отложено: {stats.retried} | ❌ Отклонено: {stats.dead}")
+    for error in stats.errors:
+        print(f"   ❌ {error}")
+    next_due = spool.next_due(drainer.client.api_url)
+    if next_due is not None:
+        print(f"⏱️ Следующая попытка через {next_due:.0f} с")
+    print_counts(spool)
+    if spool.counts().get('published'):
+        print("💾 Опубликованные статьи будут записаны в БД при следующем запуске скрипта-источника")
+    spool.close()
+
+
+if __name__ == "__main__":
+    main()
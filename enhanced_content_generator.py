@@ -8,7 +8,6 @@
 - SEO-оптимизация без переоптимизации
 """
 
-import requests
 import sqlite3
 import json
 import re
@@ -16,6 +15,15 @@ from datetime import datetime
 import time
 from urllib.parse import quote
 import random
+import sys
+import os
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from config.wordpress import WordPressConfig
+from modules.generator.pricing import get_pricing_engine
+from modules.publisher.wordpress_client import get_wordpress_client
 
 class EnhancedContentGenerator:
     """Улучшенный генератор контента для SEO-статей"""
@@ -25,8 +33,8 @@ class EnhancedContentGenerator:
         self.wp_user = wp_user
         self.wp_password = wp_password
         self.db_path = db_path
-        self.session = requests.Session()
-        self.session.auth = (wp_user, wp_password)
+        # Общий с автоматизацией клиент WordPress (один пул соединений на сайт)
+        self.wp_client = get_wordpress_client(wp_url, wp_user, wp_password)
         
         # Реальные данные для контента
         self.real_data = self.load_real_content_data()
@@ -51,12 +59,13 @@ class EnhancedContentGenerator:
                 "Документы по контракту (извещение, проект договора)",
                 "Техническое задание к контракту"
             ],
-            'cost_examples': [
-                "Гарантия 1 млн руб. на 12 месяцев: комиссия 25-40 тыс. руб.",
-                "Гарантия 5 млн руб. на 6 месяцев: комиссия 75-125 тыс. руб.",
-                "Гарантия 10 млн руб. на 24 месяца: комиссия 200-400 тыс. руб.",
-                "Гарантия 50 млн руб. на 36 месяцев: комиссия 1-2 млн руб."
-            ],
+            # Расчет по текущим тарифам (config/tariffs.py), кешируется по версии тарифа
+            'cost_examples': get_pricing_engine().cost_examples([
+                (1_000_000, 12),
+                (5_000_000, 6),
+                (10_000_000, 24),
+                (50_000_000, 36)
+            ]),
             'process_steps': [
                 "Подача заявки и первичная консультация (1 день)",
                 "Анализ документов и финансового состояния (2-3 дня)",
@@ -176,21 +185,29 @@ class EnhancedContentGenerator:
             }
     
     def generate_natural_title(self, keyword):
-        """Генерация естественного заголовка"""
+        """
+        Генерация естественного заголовка: ключевая фраза в начале (проверка
+        офлайн SEO-анализа), пояснение — если заголовок укладывается в MAX_TITLE_LENGTH
+        """
         keyword_variations = {
-            'калькулятор': 'Калькулятор стоимости банковской гарантии: расчет комиссии онлайн',
-            'документы': 'Документы для банковской гарантии: полный список и требования',
-            'проверить': 'Как проверить банковскую гарантию в реестре ЕИС',
-            'оформить': 'Как оформить банковскую гарантию: пошаговая инструкция'
+            'калькулятор': 'расчет комиссии онлайн',
+            'документы': 'полный список и требования',
+            'проверить': 'проверка в реестре ЕИС',
+            'оформить': 'пошаговая инструкция'
         }
         
         keyword_lower = keyword.lower()
-        for key, title in keyword_variations.items():
+        suffix = 'полное руководство'
+        for key, variation in keyword_variations.items():
             if key in keyword_lower:
-                return title
-        
-        # Базовый заголовок
-        return f"Банковская гарантия: полное руководство по оформлению и использованию"
+                suffix = variation
+                break
+        
+        base_title = keyword[:1].upper() + keyword[1:]
+        title = f"{base_title}: {suffix}"
+        if len(title) <= WordPressConfig.MAX_TITLE_LENGTH:
+            return title
+        return base_title
     
     def generate_high_quality_content(self, keyword, outline, intent_analysis):
         """Генерация качественного контента"""
@@ -243,15 +260,8 @@ class EnhancedContentGenerator:
         word_count = section["word_count"]
         focus = section["focus"]
         
-        # Определяем уровень заголовка
-        if section_num <= 2:
-            header_tag = "h2"
-            header_class = "section-title"
-        else:
-            header_tag = "h3"
-            header_class = "subsection-title"
-        
-        content = f"""<{header_tag} class="{header_class}">{section_title}</{header_tag}>
+        # Разделы оглавления — равноправные H2, блоки внутри раздела — H3
+        content = f"""<h2 class="section-title">{section_title}</h2>
 
 """
         
@@ -261,7 +271,7 @@ class EnhancedContentGenerator:
         elif focus == 'cost_factors':
             content += self.generate_cost_factors_content()
         elif focus == 'calculation_examples':
-            content += self.generate_calculation_examples_content()
+            content += self.generate_calculation_examples_content(keyword)
         elif focus == 'required_documents':
             content += self.generate_documents_content()
         elif focus == 'verification_process':
@@ -279,7 +289,7 @@ class EnhancedContentGenerator:
         """Генерация определения банковской гарантии"""
         return """<p>Банковская гарантия — это письменное обязательство банка выплатить определенную сумму бенефициару (заказчику) в случае невыполнения принципалом (исполнителем) своих обязательств по контракту.</p>
 
-<h4>Основные характеристики:</h4>
+<h3>Основные характеристики:</h3>
 <ul>
 <li><strong>Безотзывность:</strong> Банк не может отозвать гарантию без согласия бенефициара</li>
 <li><strong>Независимость:</strong> Гарантия не зависит от основного договора</li>
@@ -293,7 +303,7 @@ class EnhancedContentGenerator:
         """Генерация контента о факторах стоимости"""
         return f"""<p>Стоимость банковской гарантии зависит от множества факторов, которые банк учитывает при принятии решения.</p>
 
-<h4>Ключевые факторы стоимости:</h4>
+<h3>Ключевые факторы стоимости:</h3>
 <ul>
 <li><strong>Финансовое состояние компании:</strong> Чем лучше показатели, тем ниже ставка</li>
 <li><strong>Размер гарантии:</strong> Крупные суммы обычно имеют более выгодные условия</li>
@@ -303,7 +313,7 @@ class EnhancedContentGenerator:
 <li><strong>Банк-гарант:</strong> Разные банки предлагают разные условия</li>
 </ul>
 
-<h4>Типичные ставки в 2024 году:</h4>
+<h3>Типичные ставки в 2024 году:</h3>
 <table class="wp-block-table">
 <thead>
 <tr><th>Сумма гарантии</th><th>Ставка (годовых)</th><th>Комиссия за год</th></tr>
@@ -318,13 +328,13 @@ class EnhancedContentGenerator:
 
 <p>Для получения точной стоимости рекомендуется обратиться в несколько банков для сравнения условий.</p>"""
     
-    def generate_calculation_examples_content(self):
-        """Генерация примеров расчетов"""
+    def generate_calculation_examples_content(self, keyword=None):
+        """Генерация примеров расчетов (с таблицей комиссий по ключевому слову)"""
         examples = self.real_data['cost_examples']
         
         content = """<p>Рассмотрим конкретные примеры расчета стоимости банковской гарантии для разных сумм и сроков.</p>
 
-<h4>Примеры расчетов:</h4>
+<h3>Примеры расчетов:</h3>
 """
         
         for example in examples:
@@ -334,7 +344,7 @@ class EnhancedContentGenerator:
 </div>
 """
         
-        content += """<h4>Формула расчета:</h4>
+        content += """<h3>Формула расчета:</h3>
 <p>Комиссия = Сумма гарантии × Ставка (%) × Срок (в годах)</p>
 
 <div class="calculation-formula">
@@ -344,6 +354,12 @@ class EnhancedContentGenerator:
 
 <p>Важно учитывать, что банки могут применять дополнительные комиссии и налоги, поэтому итоговая стоимость может отличаться от расчета по формуле.</p>"""
         
+        if keyword:
+            content += f"""
+
+<h3>Таблица комиссий по сумме и сроку:</h3>
+{get_pricing_engine().render_cost_section(keyword)}"""
+        
         return content
     
     def generate_documents_content(self):
@@ -352,7 +368,7 @@ class EnhancedContentGenerator:
         
         content = """<p>Для получения банковской гарантии необходимо подготовить полный пакет документов согласно требованиям банка.</p>
 
-<h4>Обязательные документы:</h4>
+<h3>Обязательные документы:</h3>
 <ul>
 """
         
@@ -361,7 +377,7 @@ class EnhancedContentGenerator:
         
         content += """</ul>
 
-<h4>Требования к документам:</h4>
+<h3>Требования к документам:</h3>
 <ul>
 <li><strong>Актуальность:</strong> Документы должны быть действующими на момент подачи заявки</li>
 <li><strong>Заверение:</strong> Учредительные документы требуют нотариального заверения</li>
@@ -377,14 +393,14 @@ class EnhancedContentGenerator:
         """Генерация контента о проверке"""
         return """<p>Проверка банковской гарантии — это обязательная процедура для подтверждения подлинности документа и его соответствия требованиям.</p>
 
-<h4>Где проверить банковскую гарантию:</h4>
+<h3>Где проверить банковскую гарантию:</h3>
 <ul>
 <li><strong>Реестр ЕИС:</strong> <a href="https://zakupki.gov.ru" target="_blank">zakupki.gov.ru</a> — официальный реестр</li>
 <li><strong>Сайт банка-гаранта:</strong> Прямая проверка на сайте выдавшего банка</li>
 <li><strong>Обращение в банк:</strong> Официальный запрос по телефону или письменно</li>
 </ul>
 
-<h4>Пошаговая инструкция проверки в реестре ЕИС:</h4>
+<h3>Пошаговая инструкция проверки в реестре ЕИС:</h3>
 <ol>
 <li>Перейдите на сайт zakupki.gov.ru</li>
 <li>Выберите раздел "Реестр банковских гарантий"</li>
@@ -393,7 +409,7 @@ class EnhancedContentGenerator:
 <li>Сохраните результат проверки</li>
 </ol>
 
-<h4>Что проверить в реестре:</h4>
+<h3>Что проверить в реестре:</h3>
 <table class="wp-block-table">
 <thead>
 <tr><th>Параметр</th><th>Что проверить</th></tr>
@@ -415,7 +431,7 @@ class EnhancedContentGenerator:
         
         content = """<p>Процесс оформления банковской гарантии состоит из нескольких этапов, каждый из которых имеет свои особенности и сроки.</p>
 
-<h4>Пошаговый алгоритм оформления:</h4>
+<h3>Пошаговый алгоритм оформления:</h3>
 <ol>
 """
         
@@ -424,7 +440,7 @@ class EnhancedContentGenerator:
         
         content += """</ol>
 
-<h4>Детальное описание каждого этапа:</h4>
+<h3>Детальное описание каждого этапа:</h3>
 
 <div class="process-stage">
 <h4>1. Подача заявки и консультация</h4>
@@ -462,7 +478,7 @@ class EnhancedContentGenerator:
         
         content = """<p>Практические советы помогут избежать типичных ошибок и успешно оформить банковскую гарантию.</p>
 
-<h4>✅ Что рекомендуется делать:</h4>
+<h3>✅ Что рекомендуется делать:</h3>
 <ul>
 """
         
@@ -471,7 +487,7 @@ class EnhancedContentGenerator:
         
         content += """</ul>
 
-<h4>❌ Частые ошибки, которых следует избегать:</h4>
+<h3>❌ Частые ошибки, которых следует избегать:</h3>
 <ul>
 """
         
@@ -480,7 +496,7 @@ class EnhancedContentGenerator:
         
         content += """</ul>
 
-<h4>💡 Дополнительные рекомендации:</h4>
+<h3>💡 Дополнительные рекомендации:</h3>
 <ul>
 <li><strong>Планируйте заранее:</strong> Начинайте оформление за 2-3 недели до срока</li>
 <li><strong>Ведите переговоры:</strong> Обсуждайте условия со специалистами банка</li>
@@ -498,7 +514,7 @@ class EnhancedContentGenerator:
         if focus == 'types':
             return """<p>Существует несколько видов банковских гарантий, каждый из которых имеет свои особенности и назначение.</p>
 
-<h4>Основные виды банковских гарантий:</h4>
+<h3>Основные виды банковских гарантий:</h3>
 <ul>
 <li><strong>Исполнение контракта:</strong> Гарантирует выполнение условий договора</li>
 <li><strong>Возврат аванса:</strong> Обеспечивает возврат предоплаты</li>
@@ -511,7 +527,7 @@ class EnhancedContentGenerator:
         elif focus == 'pros_cons':
             return """<p>Банковская гарантия имеет как преимущества, так и недостатки, которые важно учитывать при принятии решения.</p>
 
-<h4>Преимущества банковской гарантии:</h4>
+<h3>Преимущества банковской гарантии:</h3>
 <ul>
 <li>Не требует отвлечения собственных средств</li>
 <li>Повышает доверие заказчика</li>
@@ -519,7 +535,7 @@ class EnhancedContentGenerator:
 <li>Снижает риски для обеих сторон</li>
 </ul>
 
-<h4>Недостатки:</h4>
+<h3>Недостатки:</h3>
 <ul>
 <li>Дополнительные расходы на комиссию</li>
 <li>Сложность процедуры оформления</li>
@@ -532,7 +548,7 @@ class EnhancedContentGenerator:
         else:
             return """<p>Дополнительная информация по теме банковских гарантий поможет лучше понять все аспекты данного инструмента.</p>
 
-<h4>Важные моменты:</h4>
+<h3>Важные моменты:</h3>
 <ul>
 <li>Банковская гарантия не облагается НДС</li>
 <li>Срок действия обычно соответствует сроку контракта</li>
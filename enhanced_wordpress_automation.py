@@ -8,23 +8,53 @@
 - Проверка качества контента
 """
 
-import requests
 import json
 import sqlite3
 import re
 from datetime import datetime
-import time
+import sys
+import os
 from enhanced_content_generator import EnhancedContentGenerator
 
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from modules.publisher.rate_limiter import get_host_limiter
+from modules.publisher.wordpress_client import get_wordpress_client
+from modules.publisher.publish_spool import get_publish_spool, PublishSpoolDrainer, is_retryable
+from modules.publisher.taxonomy_cache import get_taxonomy_cache
+from modules.generator.html_minifier import optimize_article_html
+from modules.quality.content_metrics import get_content_metrics
+from modules.quality.near_duplicates import NearDuplicateIndex
+from modules.quality.seo_analysis import analyze_article, META_DESCRIPTION_MAX
+from modules.quality.numeric_claims import verify_article, get_evidence_index
+from modules.quality.html_lint import lint_html
+from config.wordpress import WordPressConfig
+
 class EnhancedWordPressAutomation:
     def __init__(self):
-        self.wp_url = "https://bizfin-pro.ru/wp-json/wp/v2"
-        self.wp_username = "bizfin_pro_r"
-        self.wp_app_password = "U3Ep gU2T clRu FcwN QU6l Dsda"
+        # Сайт задается WP_SITE_URL/WP_USERNAME/WP_APP_PASSWORD (например, локальный
+        # стенд load_test_publisher.py --serve вместо рабочего сайта)
+        self.wp_url = WordPressConfig.API_URL
+        self.wp_username = WordPressConfig.USERNAME
+        self.wp_app_password = WordPressConfig.APP_PASSWORD
         self.wp_auth = (self.wp_username, self.wp_app_password)
         self.db_path = "wordpress_articles_enhanced.db"
         self.conn = None
         
+        # Общий лимит запросов к WordPress (вместо фиксированных пауз)
+        self.wp_rate_limiter = get_host_limiter(self.wp_url)
+        # Общий клиент REST API: пул соединений, повторы, поиск статьи перед созданием
+        self.wp_client = get_wordpress_client(self.wp_url, self.wp_username, self.wp_app_password)
+        # Спул публикации: готовая статья не теряется, если WordPress недоступен
+        self.publish_spool = get_publish_spool()
+        self.spool_source = f"{self.__class__.__name__}:{os.path.abspath(self.db_path)}"
+        self.spool_drainer = PublishSpoolDrainer(self.publish_spool, self.wp_client) if self.publish_spool else None
+        self.last_publish_error = None
+        self.last_publish_exception = None
+        # ID рубрики, меток и автора по именам: справочники загружаются один раз
+        self.taxonomy = get_taxonomy_cache(self.wp_client)
+        
         # Ключевые слова для обработки
         self.keywords = [
             "банковская гарантия для исполнения контракта 44 фз онлайн",
@@ -48,7 +78,8 @@ class EnhancedWordPressAutomation:
     
     def initialize_db(self):
         """Инициализация базы данных"""
-        self.conn = sqlite3.connect(self.db_path)
+        # timeout и check_same_thread нужны для пакетного режима с пулом потоков
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
         cursor = self.conn.cursor()
         
         # Таблица для исследований
@@ -86,6 +117,9 @@ class EnhancedWordPressAutomation:
                 word_count INTEGER DEFAULT 0,
                 quality_score INTEGER DEFAULT 0,
                 seo_score INTEGER DEFAULT 0,
+                html_original_bytes INTEGER,
+                html_final_bytes INTEGER,
+                content TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -102,9 +136,28 @@ class EnhancedWordPressAutomation:
             )
         ''')
         
+        # Колонки, добавленные после первых запусков (существующие БД)
+        self.ensure_columns('articles', {
+            'html_original_bytes': 'INTEGER',
+            'html_final_bytes': 'INTEGER',
+            'content': 'TEXT'
+        })
+        
+        # Индекс почти-дубликатов (MinHash-подписи рядом с таблицей articles)
+        self.duplicate_index = NearDuplicateIndex(self.conn)
+        
         self.conn.commit()
         print("✅ Улучшенная база данных инициализирована")
     
+    def ensure_columns(self, table, columns):
+        """Добавление недостающих колонок в существующую таблицу"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+    
     def analyze_keyword(self, keyword):
         """Анализ ключевого слова с помощью улучшенного генератора"""
         print(f"   🔍 Анализ ключевого слова: {keyword}")
@@ -238,12 +291,14 @@ class EnhancedWordPressAutomation:
             print(f"   ⚠️ Ошибка генерации контента: {str(e)}")
             return self.get_fallback_content(keyword), 0, 0
     
-    def evaluate_content_quality(self, content, keyword):
+    @staticmethod
+    def evaluate_content_quality(content, keyword):
         """Оценка качества контента"""
+        metrics = get_content_metrics(content, keyword)
         score = 0
         
         # Проверка объема (30 баллов)
-        word_count = len(content.split())
+        word_count = metrics.raw_word_count
         if word_count >= 2000:
             score += 30
         elif word_count >= 1500:
@@ -252,63 +307,73 @@ class EnhancedWordPressAutomation:
             score += 10
         
         # Проверка структуры (25 баллов)
-        if '<h1>' in content:
+        if metrics.heading_count(1):
             score += 5
-        if '<h2>' in content:
+        if metrics.heading_count(2):
             score += 10
-        if '<h3>' in content:
+        if metrics.heading_count(3):
             score += 10
         
         # Проверка разнообразия контента (25 баллов)
-        if '<ul>' in content:
+        if metrics.has_tag('ul'):
             score += 8
-        if '<ol>' in content:
+        if metrics.has_tag('ol'):
             score += 7
-        if '<table' in content:
+        if metrics.has_tag('table'):
             score += 10
         
         # Проверка уникальности (20 баллов)
-        keyword_occurrences = content.lower().count(keyword.lower())
+        keyword_occurrences = metrics.keyword_forms.occurrences  # во всех словоформах
         if keyword_occurrences <= 10 and keyword_occurrences >= 3:
             score += 20
         elif keyword_occurrences <= 15:
             score += 10
         
+        # Читаемость по русскому индексу Флеша (до 5 баллов; шкала Оборневой
+        # на 10-15 баллов ниже коэффициентов «Простого русского»)
+        flesch = metrics.readability.flesch_reading_ease
+        if flesch >= 30:
+            score += 5
+        elif flesch >= 15:
+            score += 3
+        elif flesch >= 0:
+            score += 1
+        
         return min(score, 100)
     
-    def evaluate_seo_quality(self, content, keyword):
+    @staticmethod
+    def evaluate_seo_quality(content, keyword):
         """Оценка SEO качества"""
+        metrics = get_content_metrics(content, keyword)
         score = 0
         
         # Проверка заголовка H1 (25 баллов)
-        if f'<h1' in content and keyword.lower() in content.lower():
+        if metrics.has_tag('h1') and metrics.keyword_forms.occurrences:
             score += 25
         
         # Проверка ключевого слова в начале (25 баллов)
-        first_200_chars = content[:200].lower()
-        if keyword.lower() in first_200_chars:
+        if metrics.keyword_in_prefix(200):
             score += 25
         
         # Проверка структуры заголовков (25 баллов)
-        if '<h2>' in content:
+        if metrics.heading_count(2):
             score += 15
-        if '<h3>' in content:
+        if metrics.heading_count(3):
             score += 10
         
         # Проверка внутренних ссылок (25 баллов)
-        if '<a href=' in content:
+        if metrics.link_count:
             score += 25
         
         return min(score, 100)
     
-    def publish_to_wordpress(self, keyword, content, title, slug, quality_score, seo_score):
-        """Публикация статьи в WordPress с мета-данными"""
-        print(f"   📤 Публикация в WordPress: {title}")
+    def build_post_data(self, keyword, content, title, slug, quality_score, seo_score, meta_description=None):
+        """Поля записи WordPress с мета-данными (рубрика, метка и автор — по ID из кеша справочников)"""
+        # Мета-описание (обычно уже создано и проверено при подготовке статьи)
+        if not meta_description:
+            meta_description = self.generate_meta_description(keyword, title, content)
         
-        # Создаем мета-описание
-        meta_description = self.generate_meta_description(keyword, title, content)
-        
-        post_data = {
+        return {
             'title': title,
             'content': content,
             'slug': slug,
@@ -322,81 +387,163 @@ class EnhancedWordPressAutomation:
                 '_yoast_wpseo_meta-robots-nofollow': "0",
                 'quality_score': quality_score,
                 'seo_score': seo_score
-            }
+            },
+            **self.taxonomy.post_terms(keyword)
         }
+    
+    def publish_to_wordpress(self, keyword, content, title, slug, quality_score, seo_score, meta_description=None,
+                             post_data=None):
+        """Публикация статьи в WordPress с мета-данными (post_data — уже собранные поля записи)"""
+        print(f"   📤 Публикация в WordPress: {title}")
+        
+        post_data = post_data or self.build_post_data(
+            keyword, content, title, slug, quality_score, seo_score, meta_description
+        )
         
         try:
-            response = requests.post(
-                f"{self.wp_url}/posts",
-                auth=self.wp_auth,
-                json=post_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
+            # Повторный запуск обновляет уже созданную статью (поиск по slug и ключевому слову)
+            post, created = self.wp_client.save_post(post_data, keyword)
+            wp_id = post['id']
+            wp_url = post['link']
             
-            if response.status_code == 201:
-                post = response.json()
-                wp_id = post['id']
-                wp_url = post['link']
-                
+            if created:
                 print(f"   ✅ Черновик создан в WordPress (ID: {wp_id})")
-                print(f"   🔗 URL: {wp_url}")
-                print(f"   📝 Статус: ЧЕРНОВИК (качество: {quality_score}/100, SEO: {seo_score}/100)")
-                
-                return {
-                    'wp_id': wp_id,
-                    'wp_url': wp_url,
-                    'status': 'draft',
-                    'quality_score': quality_score,
-                    'seo_score': seo_score
-                }
             else:
-                print(f"   ❌ Ошибка публикации: {response.status_code}")
-                return None
+                print(f"   ♻️ Статья уже была в WordPress, обновлена (ID: {wp_id})")
+            print(f"   🔗 URL: {wp_url}")
+            # Обновление не меняет статус: уже опубликованная статья остается опубликованной
+            status = post.get('status', 'draft')
+            print(f"   📝 Статус: {'ЧЕРНОВИК' if status == 'draft' else status} "
+                  f"(качество: {quality_score}/100, SEO: {seo_score}/100)")
+            
+            return {
+                'wp_id': wp_id,
+                'wp_url': wp_url,
+                'status': status,
+                'quality_score': quality_score,
+                'seo_score': seo_score
+            }
                 
         except Exception as e:
             print(f"   ❌ Ошибка при публикации: {str(e)}")
+            self.last_publish_error = str(e)
+            self.last_publish_exception = e
             return None
     
     def generate_meta_description(self, keyword, title, content):
-        """Генерация мета-описания"""
+        """
+        Генерация мета-описания: ключевая фраза в первом предложении, длина
+        в пределах, которые проверяет офлайн SEO-анализ (120-156 символов)
+        """
         # Создаем описание с ключевым словом
-        base_desc = f"{keyword} - подробное руководство. "
-        
-        # Добавляем описание
-        additional_text = "Получите экспертную консультацию по оформлению банковской гарантии. Быстрое оформление, выгодные условия."
+        meta_desc = f"{keyword[:1].upper()}{keyword[1:]}: подробное руководство."
         
-        meta_desc = base_desc + additional_text
+        # Добавляем описание, пока оно помещается в лимит
+        for sentence in ("Экспертная консультация по оформлению банковской гарантии.",
+                         "Быстрое оформление, выгодные условия.",
+                         "Поможем подготовить документы."):
+            if len(meta_desc) + 1 + len(sentence) > META_DESCRIPTION_MAX:
+                break
+            meta_desc = f"{meta_desc} {sentence}"
         
-        # Обрезаем до 160 символов
-        if len(meta_desc) > 160:
-            meta_desc = meta_desc[:157] + "..."
+        # Обрезаем до допустимой длины
+        if len(meta_desc) > META_DESCRIPTION_MAX:
+            meta_desc = meta_desc[:META_DESCRIPTION_MAX - 3] + "..."
         
         return meta_desc
     
-    def save_article_to_db(self, keyword, wp_result):
-        """Сохранение статьи в базу данных"""
+    def save_article_to_db(self, keyword, wp_result, prepared=None, duplicate_check=None):
+        """Сохранение статьи в базу данных (с размером HTML до/после минификации и MinHash-подписью)"""
         if wp_result:
             cursor = self.conn.cursor()
             
             word_count = len(wp_result.get('content', '').split()) if 'content' in wp_result else 0
+            prepared = prepared or {}
             
-            cursor.execute('''
-                INSERT INTO articles (
-                    keyword, wp_post_id, wp_post_url, status, word_count, 
-                    quality_score, seo_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            values = (
                 keyword,
-                wp_result['wp_id'],
                 wp_result['wp_url'],
                 wp_result['status'],
                 word_count,
                 wp_result.get('quality_score', 0),
-                wp_result.get('seo_score', 0)
-            ))
+                wp_result.get('seo_score', 0),
+                prepared.get('html_original_bytes'),
+                prepared.get('html_final_bytes'),
+                prepared.get('content')  # HTML для пересчета оценок и индекса почти-дубликатов
+            )
+            
+            # Обновленная запись WordPress (save_post нашел ее по slug) — обновляем ее строку
+            cursor.execute('SELECT id FROM articles WHERE wp_post_id = ? ORDER BY id DESC LIMIT 1', (wp_result['wp_id'],))
+            existing = cursor.fetchone()
+            if existing:
+                article_id = existing[0]
+                cursor.execute('''
+                    UPDATE articles SET
+                        keyword = ?, wp_post_url = ?, status = ?, word_count = ?,
+                        quality_score = ?, seo_score = ?, html_original_bytes = ?, html_final_bytes = ?, content = ?
+                    WHERE id = ?
+                ''', values + (article_id,))
+            else:
+                cursor.execute('''
+                    INSERT INTO articles (
+                        keyword, wp_post_url, status, word_count,
+                        quality_score, seo_score, html_original_bytes, html_final_bytes, content, wp_post_id
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', values + (wp_result['wp_id'],))
+                article_id = cursor.lastrowid
+            
+            # Подпись статьи в индекс почти-дубликатов
+            signature = self.duplicate_index.as_signature(prepared.get('minhash'))
+            self.duplicate_index.add(article_id, keyword, signature, commit=False)
+            
+            # Почти-дубликат, опубликованный с пометкой (WP_DUPLICATE_ACTION=flag)
+            if duplicate_check and duplicate_check.is_duplicate:
+                cursor.execute('''
+                    INSERT INTO quality_checks (article_id, check_type, result, score)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    article_id,
+                    'near_duplicate',
+                    json.dumps(duplicate_check.to_dict(), ensure_ascii=False),
+                    round(duplicate_check.max_similarity * 100)
+                ))
+            
+            # Офлайн SEO-анализ по правилам Yoast
+            if prepared.get('seo_analysis'):
+                cursor.execute('''
+                    INSERT INTO quality_checks (article_id, check_type, result, score)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    article_id,
+                    'yoast_offline',
+                    json.dumps(prepared['seo_analysis'], ensure_ascii=False),
+                    prepared['seo_analysis']['score']
+                ))
+            
+            # Проверка чисел статьи
+            if prepared.get('numeric_check'):
+                cursor.execute('''
+                    INSERT INTO quality_checks (article_id, check_type, result, score)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    article_id,
+                    'numeric_claims',
+                    json.dumps(prepared['numeric_check'], ensure_ascii=False),
+                    round(prepared['numeric_check']['coverage'])
+                ))
+            
+            # Структура HTML (score — число ошибок линтера)
+            if prepared.get('html_lint'):
+                cursor.execute('''
+                    INSERT INTO quality_checks (article_id, check_type, result, score)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    article_id,
+                    'html_lint',
+                    json.dumps(prepared['html_lint'], ensure_ascii=False),
+                    prepared['html_lint']['errors']
+                ))
             
-            article_id = cursor.lastrowid
             self.conn.commit()
             
             print(f"   💾 Статья сохранена в БД с ID: {article_id}")
@@ -404,6 +551,257 @@ class EnhancedWordPressAutomation:
         
         return None
     
+    def prepare_article(self, keyword):
+        """
+        Подготовка статьи без обращения к WordPress:
+        анализ, оглавление, генерация, оценка качества и минификация
+        """
+        # 1. Анализ ключевого слова
+        intent_analysis = self.analyze_keyword(keyword)
+        
+        # 2. Создание адаптивного оглавления
+        outline = self.create_adaptive_outline(keyword, intent_analysis)
+        
+        # 3. Генерация высококачественного контента
+        content, quality_score, seo_score = self.generate_high_quality_content(
+            keyword, outline, intent_analysis
+        )
+        
+        # 4. Минификация HTML и проверка лимита размера
+        optimized = optimize_article_html(content)
+        print(f"   🗜️ HTML: {optimized.original_bytes} → {optimized.final_bytes} байт (-{optimized.saved_percent}%)")
+        if not optimized.within_budget:
+            print(f"   ⚠️ Превышен лимит размера: {optimized.final_bytes} > {optimized.budget_bytes} байт")
+        
+        # 5. MinHash-подпись для проверки на почти-дубликаты перед публикацией
+        signature = self.duplicate_index.signature(optimized.html)
+        
+        prepared = {
+            'keyword': keyword,
+            'title': outline['title'],
+            'slug': self.transliterate_keyword(keyword),
+            'meta_description': self.generate_meta_description(keyword, outline['title'], optimized.html),
+            'content': optimized.html,
+            'quality_score': quality_score,
+            'seo_score': seo_score,
+            'html_original_bytes': optimized.original_bytes,
+            'html_final_bytes': optimized.final_bytes,
+            'within_budget': optimized.within_budget,
+            'minhash': signature.tolist() if signature is not None else None
+        }
+        
+        # 6. Офлайн SEO-анализ по правилам Yoast (без черновика в WordPress)
+        prepared['seo_analysis'] = self.check_seo(prepared)
+        
+        # 7. Проверка чисел по исследованиям и пересчет примеров комиссии
+        prepared['numeric_check'] = self.check_numbers(prepared)
+        
+        # 8. Структура HTML: заголовки, пустые разделы, теги, якоря, FAQ
+        prepared['html_lint'] = self.check_html(prepared)
+        return prepared
+    
+    def check_numbers(self, prepared):
+        """Проверка числовых утверждений по исследованиям и пересчет примеров комиссии"""
+        verification = verify_article(prepared['content'], get_evidence_index(), prepared['keyword'])
+        
+        print(f"   🔢 Числа: {len(verification.claims)} утверждений, подтверждено {verification.coverage:.0f}%, "
+              f"расчетов {len(verification.calculations)} ({verification.elapsed_ms:.1f} мс)")
+        for check in verification.calculation_errors:
+            print(f"      🔴 Ошибка расчета: {check.text} (ожидается {check.expected})")
+        
+        return verification.to_dict()
+    
+    def check_html(self, prepared):
+        """Проверка структуры HTML статьи линтером"""
+        report = lint_html(prepared['content'])
+        
+        status = '✅' if report.passed else '⚠️'
+        print(f"   {status} Структура HTML: ошибок {len(report.errors)}, предупреждений {len(report.warnings)} "
+              f"({report.elapsed_ms:.1f} мс)")
+        for issue in report.errors:
+            print(f"      🔴 {issue.code}: {issue.message}")
+        
+        return report.to_dict()
+    
+    def check_seo(self, prepared):
+        """Офлайн SEO-анализ подготовленной статьи (проверки Yoast без WordPress)"""
+        analysis = analyze_article(
+            prepared['content'], prepared['keyword'], prepared['title'],
+            prepared.get('meta_description', ''), prepared.get('slug', '')
+        )
+        
+        status = '✅' if analysis.passed else '⚠️'
+        print(f"   {status} Офлайн SEO (Yoast): {analysis.score}/100 (порог {analysis.min_score})")
+        for check in analysis.problems:
+            print(f"      🔴 {check.message}")
+        
+        return analysis.to_dict()
+    
+    def publish_prepared_article(self, prepared):
+        """Публикация подготовленной статьи и сохранение в БД"""
+        keyword = prepared['keyword']
+        content = prepared['content']
+        quality_score = prepared['quality_score']
+        seo_score = prepared['seo_score']
+        
+        if not prepared.get('within_budget', True):
+            print(f"   ❌ Статья '{keyword}' не опубликована: превышен лимит размера HTML")
+            return self.rejected_result(keyword, 'over_budget')
+        
+        # 7. Линтер структуры HTML: сломанная разметка не уходит в WordPress
+        if 'html_lint' not in prepared:
+            prepared['html_lint'] = self.check_html(prepared)
+        if not prepared['html_lint']['passed'] and WordPressConfig.HTML_LINT_ACTION == 'block':
+            print(f"   ❌ Статья '{keyword}' не опубликована: ошибки структуры HTML ({prepared['html_lint']['errors']})")
+            return self.rejected_result(keyword, 'lint_error', lint_errors=prepared['html_lint']['errors'])
+        
+        # 8. SEO-гейт: в WordPress уходят только статьи, прошедшие офлайн-анализ
+        # (подготовленные до появления анализа статьи проверяются здесь)
+        if 'seo_analysis' not in prepared:
+            prepared['meta_description'] = prepared.get('meta_description') or \
+                self.generate_meta_description(keyword, prepared['title'], content)
+            prepared['seo_analysis'] = self.check_seo(prepared)
+        seo_analysis = prepared['seo_analysis']
+        if not seo_analysis['passed']:
+            print(f"   ❌ Статья '{keyword}' не опубликована: SEO {seo_analysis['score']}/100 < {seo_analysis['min_score']}")
+            return self.rejected_result(keyword, 'seo_gate', seo_gate_score=seo_analysis['score'])
+        
+        # 9. Пересчитанные примеры комиссии должны сходиться
+        if 'numeric_check' not in prepared:
+            prepared['numeric_check'] = self.check_numbers(prepared)
+        if not prepared['numeric_check']['passed'] and WordPressConfig.NUMERIC_CHECK_ACTION == 'block':
+            print(f"   ❌ Статья '{keyword}' не опубликована: ошибки в расчетах комиссии")
+            return self.rejected_result(keyword, 'calculation_error')
+        
+        # 10. Проверка на почти-дубликаты уже опубликованных статей
+        signature = self.duplicate_index.as_signature(prepared.get('minhash'))
+        # Прежняя версия той же статьи не дубликат: повторная публикация обновит запись
+        duplicate_check = self.duplicate_index.check(signature, keyword=keyword)
+        if duplicate_check.previous:
+            print(f"   🔄 Статья уже публиковалась (#{duplicate_check.previous[0].article_id}): будет обновлена")
+        if duplicate_check.is_duplicate:
+            for similar in duplicate_check.duplicates:
+                print(f"   ⚠️ Почти-дубликат #{similar.article_id} '{similar.keyword}': сходство {similar.similarity:.0%}")
+            if WordPressConfig.DUPLICATE_ACTION == 'block':
+                print(f"   ❌ Статья '{keyword}' не опубликована: сходство выше порога {duplicate_check.threshold:.0%}")
+                return self.rejected_result(keyword, 'duplicate', duplicate_of=duplicate_check.similar[0].article_id)
+        
+        # 11. Публикация в WordPress
+        post_data = self.build_post_data(
+            keyword, content, prepared['title'], prepared['slug'], quality_score, seo_score,
+            prepared.get('meta_description')
+        )
+        wp_result = self.publish_to_wordpress(
+            keyword, content, prepared['title'], prepared['slug'], quality_score, seo_score, post_data=post_data
+        )
+        
+        # WordPress недоступен: статья уходит в спул и будет опубликована без повторной генерации
+        if not wp_result and self.spool_publish(prepared, post_data):
+            return self.rejected_result(keyword, 'spooled')
+        
+        # 12. Сохранение в БД
+        article_id = self.save_article_to_db(keyword, wp_result, prepared, duplicate_check)
+        
+        if wp_result:
+            print(f"   ✅ УСПЕХ: Статья создана (WP ID: {wp_result['wp_id']})")
+            print(f"   📊 Качество: {quality_score}/100, SEO: {seo_score}/100")
+            return {
+                'keyword': keyword,
+                'article_id': article_id,
+                'wp_id': wp_result['wp_id'],
+                'wp_url': wp_result['wp_url'],
+                'status': 'success',
+                'word_count': len(content.split()),
+                'quality_score': quality_score,
+                'seo_score': seo_score
+            }
+        
+        print(f"   ❌ ОШИБКА при обработке '{keyword}'")
+        return {
+            'keyword': keyword,
+            'article_id': None,
+            'wp_id': None,
+            'wp_url': None,
+            'status': 'error',
+            'word_count': 0,
+            'quality_score': 0,
+            'seo_score': 0
+        }
+    
+    def spool_publish(self, prepared, post_data):
+        """
+        Сохранение готовой статьи в спул публикации
+        (False — спул отключен или ошибку не исправит повтор)
+        """
+        if self.publish_spool is None:
+            return False
+        # 4xx (кроме 429) — статья отклонена WordPress: обычная ошибка публикации, не спул
+        if not is_retryable(self.last_publish_exception):
+            return False
+        spool_id = self.publish_spool.put(
+            self.wp_url, post_data, prepared['keyword'], self.spool_source, {'prepared': prepared},
+            self.last_publish_error, delay=self.spool_drainer.retry_delay
+        )
+        print(f"   ⏳ Статья сохранена в спул публикации (#{spool_id}): будет опубликована, когда WordPress ответит")
+        return True
+    
+    def record_spooled(self):
+        """Запись в БД статей, опубликованных из спула (фоновым потоком или drain_publish_spool.py)"""
+        if self.publish_spool is None:
+            return []
+        recorded = []
+        for entry in self.publish_spool.take_published(self.spool_source):
+            prepared = entry.context.get('prepared') or {}
+            keyword = prepared.get('keyword', entry.keyword)
+            wp_result = {**entry.wp_result, 'quality_score': prepared.get('quality_score', 0),
+                         'seo_score': prepared.get('seo_score', 0)}
+            duplicate_check = self.duplicate_index.check(self.duplicate_index.as_signature(prepared.get('minhash')),
+                                                         keyword=keyword)
+            print(f"   📬 Опубликована из спула: {keyword} (WP ID: {entry.wp_post_id})")
+            article_id = self.save_article_to_db(keyword, wp_result, prepared, duplicate_check)
+            self.publish_spool.mark_done(entry)
+            recorded.append({'keyword': keyword, 'article_id': article_id, 'wp_id': entry.wp_post_id})
+        return recorded
+    
+    def start_spool(self):
+        """Запись опубликованных из спула статей и фоновый разбор спула на время запуска (записанные статьи)"""
+        if self.spool_drainer is None:
+            return []
+        self.publish_spool.recover_stale()
+        counts = self.publish_spool.counts()
+        if counts.get('pending') or counts.get('published') or counts.get('dead'):
+            print(f"📬 Спул публикации: ожидают {counts.get('pending', 0)}, опубликованы {counts.get('published', 0)}, "
+                  f"отклонены {counts.get('dead', 0)}")
+        recorded = self.record_spooled()
+        self.spool_drainer.start()
+        return recorded
+    
+    def stop_spool(self):
+        """Остановка фонового разбора спула (записанные напоследок статьи)"""
+        if self.spool_drainer is None:
+            return []
+        self.spool_drainer.stop()
+        recorded = self.record_spooled()
+        pending = self.publish_spool.counts().get('pending', 0)
+        if pending:
+            print(f"⏳ В спуле публикации осталось {pending} статей: python drain_publish_spool.py --follow")
+        return recorded
+    
+    def rejected_result(self, keyword, status, **details):
+        """Результат для статьи без публикации: не прошла проверку (размер, структура, SEO, расчеты, дубликат)
+        или отложена в спул (spooled)"""
+        return {
+            'keyword': keyword,
+            'article_id': None,
+            'wp_id': None,
+            'wp_url': None,
+            'status': status,
+            'word_count': 0,
+            'quality_score': 0,
+            'seo_score': 0,
+            **details
+        }
+    
     def run_enhanced_automation(self):
         """Запуск улучшенной автоматизации"""
         print("🚀 Запуск УЛУЧШЕННОГО WordPress Automation Script")
@@ -412,6 +810,9 @@ class EnhancedWordPressAutomation:
         print("=" * 60)
         
         results = []
+        self.start_spool()
+        # Метки ключевых слов запуска создаются одним проходом до публикации
+        self.taxonomy.prepare(self.keywords)
         
         for i, keyword in enumerate(self.keywords, 1):
             print(f"\n{'='*60}")
@@ -419,53 +820,8 @@ class EnhancedWordPressAutomation:
             print(f"{'='*60}")
             
             try:
-                # 1. Анализ ключевого слова
-                intent_analysis = self.analyze_keyword(keyword)
-                
-                # 2. Создание адаптивного оглавления
-                outline = self.create_adaptive_outline(keyword, intent_analysis)
-                
-                # 3. Генерация высококачественного контента
-                content, quality_score, seo_score = self.generate_high_quality_content(
-                    keyword, outline, intent_analysis
-                )
-                
-                # 4. Публикация в WordPress
-                title = outline['title']
-                slug = self.transliterate_keyword(keyword)
-                
-                wp_result = self.publish_to_wordpress(
-                    keyword, content, title, slug, quality_score, seo_score
-                )
-                
-                # 5. Сохранение в БД
-                article_id = self.save_article_to_db(keyword, wp_result)
-                
-                if wp_result:
-                    results.append({
-                        'keyword': keyword,
-                        'article_id': article_id,
-                        'wp_id': wp_result['wp_id'],
-                        'wp_url': wp_result['wp_url'],
-                        'status': 'success',
-                        'word_count': len(content.split()),
-                        'quality_score': quality_score,
-                        'seo_score': seo_score
-                    })
-                    print(f"   ✅ УСПЕХ: Статья создана (WP ID: {wp_result['wp_id']})")
-                    print(f"   📊 Качество: {quality_score}/100, SEO: {seo_score}/100")
-                else:
-                    results.append({
-                        'keyword': keyword,
-                        'article_id': None,
-                        'wp_id': None,
-                        'wp_url': None,
-                        'status': 'error',
-                        'word_count': 0,
-                        'quality_score': 0,
-                        'seo_score': 0
-                    })
-                    print(f"   ❌ ОШИБКА при обработке '{keyword}'")
+                prepared = self.prepare_article(keyword)
+                results.append(self.publish_prepared_article(prepared))
                 
             except Exception as e:
                 print(f"   ❌ Критическая ошибка при обработке '{keyword}': {str(e)}")
@@ -480,8 +836,10 @@ class EnhancedWordPressAutomation:
                     'seo_score': 0
                 })
             
-            # Пауза между запросами
-            time.sleep(2)
+            # Статьи, которые фоновый разбор спула успел опубликовать
+            self.record_spooled()
+        
+        self.stop_spool()
         
         # Отображение результатов
         self.display_enhanced_results(results)
@@ -499,9 +857,16 @@ class EnhancedWordPressAutomation:
         
         successful = [r for r in results if r['status'] == 'success']
         failed = [r for r in results if r['status'] == 'error']
+        spooled = [r for r in results if r['status'] == 'spooled']
         
         print(f"✅ Создано статей: {len(successful)}/{len(results)}")
+        if spooled:
+            print(f"⏳ В спуле публикации (WordPress был недоступен): {len(spooled)}")
         print(f"📅 Время завершения: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        # Обновления отправляют только изменившиеся поля, без изменений — не отправляются
+        wp_stats = self.wp_client.stats
+        print(f"🌐 Запросов к WordPress: {wp_stats['requests']} | ⏭️ Без изменений: {wp_stats['unchanged']} | "
+              f"📉 Не отправлено: {wp_stats['bytes_saved'] / 1024:.0f} КБ")
         
         if successful:
             avg_quality = sum(r['quality_score'] for r in successful) / len(successful)
@@ -529,6 +894,9 @@ class EnhancedWordPressAutomation:
                 print(f"    ID в БД: {result['article_id']} | WP ID: {wp_id} | Статус: ✅ СОЗДАНА")
                 print(f"    🔗 URL: {wp_url}")
                 print(f"    📄 Объем: {word_count} слов | ⭐ Качество: {quality_score}/100 | 🔍 SEO: {seo_score}/100")
+            elif status == 'spooled':
+                print(f"{i:2d}. {keyword}")
+                print(f"    Статус: ⏳ В СПУЛЕ ПУБЛИКАЦИИ (будет опубликована без повторной генерации)")
             else:
                 print(f"{i:2d}. {keyword}")
                 print(f"    ID в БД: None | WP ID: None | Статус: ❌ ОШИБКА")
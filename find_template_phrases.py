@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Шаблонные фразы в сохраненных статьях
+- Находит повторяющиеся фразы корпуса (n-граммы лемм, общие для многих статей)
+- Показывает самые частые шаблонные фразы: заготовки, штампы и найденные в корпусе
+- --save сохраняет найденные фразы в набор, который проверяет генератор статей
+"""
+
+import argparse
+import os
+import sys
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from modules.generator.template_phrases import (
+    TemplatePhraseIndex, BUILTIN_PHRASES, TEMPLATE_PHRASES_PATH, mine_template_phrases, phrase_report, save_phrases
+)
+from modules.quality.rescoring import ArticleStore
+
+
+def find_template_phrases(db_path='wordpress_articles_final.db', chunk_size=500, top=30, mine=True,
+                          ngram=5, min_documents=3, min_share=0.2, save=False):
+    """
+    Отчет о шаблонных фразах по всем статьям
+
+    Args:
+        db_path: SQLite БД со статьями (articles.content)
+        chunk_size: Статей в порции
+        top: Сколько фраз показать
+        mine: Искать повторяющиеся фразы корпуса
+        ngram: Длина n-граммы при поиске, слов
+        min_documents: Минимум статей с фразой
+        min_share: Минимальная доля статей с фразой
+        save: Сохранить найденные фразы в TEMPLATE_PHRASES_PATH
+
+    Returns:
+        Строки отчета (фраза, категория, статей, вхождений)
+    """
+    store = ArticleStore.sqlite(db_path, layout='automation')
+
+    def documents():
+        for chunk in store.iter_chunks(chunk_size):
+            for _, keyword, html in chunk:
+                yield html, keyword or ''
+
+    print(f"🔎 Шаблонные фразы: {store.count()} статей")
+    mined = []
+    if mine:
+        mined = mine_template_phrases(documents, ngram, min_documents, min_share)
+        print(f"⛏️ Повторяющихся фраз в корпусе: {len(mined)}")
+        if save:
+            save_phrases(mined)
+            print(f"💾 Фразы сохранены: {TEMPLATE_PHRASES_PATH}")
+
+    index = TemplatePhraseIndex(list(BUILTIN_PHRASES) + mined) if mine else TemplatePhraseIndex.load()
+    report = phrase_report(index, documents())
+    store.close()
+
+    print("-" * 60)
+    for row in report[:top]:
+        print(f"   {row['articles']:>5} ст. ({row['share']:>5.1f}%) | {row['occurrences']:>6} раз | "
+              f"{row['category']:<11} | {row['example'][:80]}")
+    print("-" * 60)
+    print(f"📋 Фраз в отчете: {len(report)}")
+    return report
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Шаблонные фразы в сохраненных статьях')
+    parser.add_argument('--db', default='wordpress_articles_final.db', help='SQLite БД со статьями')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Статей в порции')
+    parser.add_argument('--top', type=int, default=30, help='Фраз в отчете')
+    parser.add_argument('--no-mine', action='store_true', help='Только известные фразы, без поиска по корпусу')
+    parser.add_argument('--ngram', type=int, default=5, help='Длина n-граммы при поиске, слов')
+    parser.add_argument('--min-documents', type=int, default=3, help='Минимум статей с фразой')
+    parser.add_argument('--min-share', type=float, default=0.2, help='Минимальная доля статей с фразой')
+    parser.add_argument('--save', action='store_true', help='Сохранить найденные фразы для генератора')
+
+    args = parser.parse_args()
+    find_template_phrases(args.db, args.chunk_size, args.top, not args.no_mine, args.ngram,
+                          args.min_documents, args.min_share, args.save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Индекс почти-дубликатов статей
+- Заполняет MinHash-индекс по уже сохраненным статьям (articles.content)
+- Показывает статьи, похожие друг на друга выше порога
+"""
+
+import argparse
+import sqlite3
+import os
+import sys
+
+import numpy as np
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from config.wordpress import WordPressConfig
+from modules.quality.near_duplicates import NearDuplicateIndex
+from modules.quality.rescoring import ArticleStore
+
+
+def rebuild_index(db_path, chunk_size):
+    """Индексация всех статей с сохраненным HTML порциями"""
+    store = ArticleStore.sqlite(db_path, layout='automation')
+    try:
+        store.check_layout()
+    except ValueError as e:
+        print(f"❌ {e}")
+        store.close()
+        return
+    index = NearDuplicateIndex(store.connection)
+    total = store.count()
+    indexed = 0
+
+    print(f"🧬 Индексация {total} статей")
+    for chunk in store.iter_chunks(chunk_size):
+        indexed += index.index_articles(chunk)
+        print(f"   📊 {indexed}/{total}")
+
+    store.close()
+    print(f"✅ В индексе: {indexed} статей")
+
+
+def report_duplicates(db_path, threshold, top_k):
+    """Статьи корпуса, похожие друг на друга выше порога"""
+    conn = sqlite3.connect(db_path)
+    index = NearDuplicateIndex(conn)
+    found = 0
+    total = index.count()
+
+    print(f"🔍 Почти-дубликаты в индексе ({total} статей), порог {threshold:.0%}")
+    print("-" * 60)
+    for article_id, keyword, blob in conn.execute("SELECT article_id, keyword, signature FROM article_minhash"):
+        signature = index.as_signature(np.frombuffer(blob, dtype=np.uint32))
+        if signature is None:
+            continue
+        # Все пары выше порога: отбор «каждая пара один раз» — до ограничения top_k,
+        # иначе пары сразу за первыми top_k терялись бы
+        similar, _ = index.query(signature, top_k=total, min_similarity=threshold, exclude_id=article_id)
+        similar = [s for s in similar if s.article_id > article_id][:top_k]
+        if not similar:
+            continue
+        found += len(similar)
+        print(f"#{article_id} {keyword}")
+        for s in similar:
+            print(f"   🔁 #{s.article_id} {s.keyword}: {s.similarity:.0%}")
+
+    conn.close()
+    print("-" * 60)
+    print(f"📋 Пар выше порога: {found}")
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Индекс почти-дубликатов статей')
+    parser.add_argument('--db', default='wordpress_articles_final.db', help='SQLite БД со статьями')
+    parser.add_argument('--rebuild', action='store_true', help='Проиндексировать сохраненные статьи')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Статей в порции при индексации')
+    parser.add_argument('--threshold', type=float, default=WordPressConfig.DUPLICATE_THRESHOLD,
+                        help='Порог сходства для отчета')
+    parser.add_argument('--top', type=int, default=5, help='Похожих статей на одну статью')
+
+    args = parser.parse_args()
+
+    if args.rebuild:
+        rebuild_index(args.db, args.chunk_size)
+    report_duplicates(args.db, args.threshold, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Нагрузочный тест публикации на локальной замене WordPress REST API
+- Поднимает FakeWordPress (posts, media, categories, tags, batch/v1) с заданными
+  задержкой, долей ошибок 5xx и 429, серверным лимитом запросов и числом PHP-воркеров
+- Публикует синтетическую очередь publish_queue через BulkPublisher
+- Показывает пропускную способность и p50/p95/p99 задержки ответов: параллельность,
+  лимит запросов и размер пакета подбираются без обращения к рабочему сайту
+- --serve только запускает сервер: скрипты публикации направляются на него через
+  WP_SITE_URL=http://127.0.0.1:<порт>
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from config.wordpress import WordPressConfig
+from benchmarks.fake_wordpress import FakeWordPress, FaultProfile, DEFAULT_SEED
+from benchmarks.load_test import run_load_test, format_load_report
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Нагрузочный тест публикации на локальной замене WordPress')
+    parser.add_argument('--articles', type=int, default=200, help='Статей в очереди')
+    parser.add_argument('--workers', type=int, default=WordPressConfig.PUBLISH_WORKERS,
+                        help='Максимум одновременных публикаций')
+    parser.add_argument('--rps', type=float, default=WordPressConfig.REQUESTS_PER_SECOND,
+                        help='Лимит запросов клиента к WordPress в секунду')
+    parser.add_argument('--burst', type=int, default=WordPressConfig.REQUESTS_BURST,
+                        help='Запросов подряд без ожидания')
+    parser.add_argument('--batch-size', type=int, default=WordPressConfig.BATCH_SIZE,
+                        help='Статей в одном запросе /wp-json/batch/v1 (1 — по одной)')
+    parser.add_argument('--retry-delay', type=float, default=1.0, help='Пауза клиента перед повтором 429/5xx, с')
+    parser.add_argument('--size', default='small', choices=['small', 'medium', 'large'], help='Размер статей')
+    parser.add_argument('--latency-ms', type=float, default=80, help='Задержка ответа сервера, мс')
+    parser.add_argument('--jitter-ms', type=float, default=40, help='Случайная добавка к задержке, мс')
+    parser.add_argument('--write-latency-ms', type=float, default=120,
+                        help='Дополнительная задержка записи (в пакете — на статью), мс')
+    parser.add_argument('--server-workers', type=int, default=8, help='PHP-воркеров сервера (0 — без ограничения)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Доля ответов 500/503')
+    parser.add_argument('--post-write-errors', type=float, default=0.5,
+                        help='Доля ошибок записи, возвращаемых уже после сохранения')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Доля ответов 429')
+    parser.add_argument('--server-rps', type=float, default=0.0,
+                        help='Серверный лимит запросов в секунду, сверх него — 429 (0 — без лимита)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Зерно статей, задержек и ошибок')
+    parser.add_argument('--url', help='REST API уже запущенного стенда вместо локального сервера')
+    parser.add_argument('--serve', action='store_true', help='Только запустить сервер (до Ctrl+C)')
+    parser.add_argument('--port', type=int, default=0, help='Порт локального сервера (0 — свободный)')
+    parser.add_argument('--json', help='Сохранить отчет в JSON')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Подробный вывод')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    profile = FaultProfile(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, write_latency_ms=args.write_latency_ms,
+        server_workers=args.server_workers, error_rate=args.error_rate, post_write_errors=args.post_write_errors,
+        throttle_rate=args.throttle_rate, max_rps=args.server_rps
+    )
+    server = None if args.url else FakeWordPress(port=args.port, profile=profile, seed=args.seed).start()
+
+    try:
+        if args.serve:
+            if server is None:
+                parser.error('--serve запускает локальный сервер и несовместим с --url')
+            print(f"🧪 Локальный WordPress REST API: {server.api_url}")
+            print(f"   WP_SITE_URL={server.site_url} python publish_queue.py ...")
+            print(f"   Профиль: {profile.to_dict()}")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                print(f"\n📊 {server.stats()}")
+            return
+
+        api_url = args.url or server.api_url
+        print("🏋️ Нагрузочный тест публикации")
+        print(f"🌐 Сервер: {api_url}" + ('' if args.url else f" | Профиль: {profile.to_dict()}"))
+        print("=" * 60)
+        report = run_load_test(api_url, articles=args.articles, workers=args.workers, requests_per_second=args.rps,
+                               burst=args.burst, batch_size=args.batch_size, retry_delay=args.retry_delay,
+                               size=args.size, seed=args.seed, server=server)
+        print(format_load_report(report))
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({'profile': None if args.url else profile.to_dict(), 'report': report.to_dict()},
+                          f, ensure_ascii=False, indent=2)
+            print(f"💾 Отчет сохранен: {args.json}")
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Публикация статей из очереди publish_queue
+- Разбирает очередь несколькими потоками: сначала urgent/high, затем по scheduled_at
+- Сохраняет статьи пакетами через /wp-json/batch/v1 (до 25 за запрос)
+- Общий лимит запросов к хосту WordPress (--rps), параллельность снижается при росте задержки ответов
+- Изображения статей сжимаются, дедуплицируются и загружаются в медиатеку (--no-media — без этого)
+- Рубрика, метки и автор — по ID из кеша справочников WordPress; недостающие метки пакета
+  создаются одним проходом (--no-taxonomy — без рубрик и меток)
+- Пишет published (wp_post_id, response_code, publish_duration); ошибки возвращают элемент в очередь
+  до max_retries, затем статус failed
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from config.wordpress import WordPressConfig
+from modules.publisher.bulk_publisher import PublishQueueStore, BulkPublisher
+from modules.publisher.media_pipeline import MediaPipeline
+from modules.publisher.taxonomy_cache import get_taxonomy_cache
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro', 'db', 'bizfin_pro.db')
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Публикация статей из очереди publish_queue')
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite БД пайплайна')
+    parser.add_argument('--mysql', action='store_true', help='Очередь в MySQL (config/database.py)')
+    parser.add_argument('--workers', type=int, default=WordPressConfig.PUBLISH_WORKERS,
+                        help='Максимум одновременных публикаций')
+    parser.add_argument('--rps', type=float, help='Лимит запросов к WordPress в секунду')
+    parser.add_argument('--limit', type=int, help='Максимум элементов за запуск')
+    parser.add_argument('--batch-size', type=int, default=WordPressConfig.BATCH_SIZE,
+                        help='Статей в одном запросе /wp-json/batch/v1 (1 — по одной)')
+    parser.add_argument('--status', default='draft', choices=['draft', 'pending', 'publish'],
+                        help='Статус создаваемых записей')
+    parser.add_argument('--no-media', action='store_true', help='Не загружать изображения статей в медиатеку')
+    parser.add_argument('--media-workers', type=int, default=WordPressConfig.MEDIA_WORKERS,
+                        help='Процессов обработки изображений')
+    parser.add_argument('--no-taxonomy', action='store_true', help='Не назначать рубрику, метки и автора')
+    parser.add_argument('--wait', action='store_true', help='Ждать отложенные элементы (scheduled_at в будущем)')
+    parser.add_argument('--recover-stale', action='store_true',
+                        help='Вернуть в очередь элементы processing прерванного запуска')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Подробный вывод')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    store = PublishQueueStore.mysql() if args.mysql else PublishQueueStore.sqlite(args.db)
+    media = None if args.no_media else MediaPipeline(workers=args.media_workers, upload_workers=args.workers)
+    taxonomy = None if args.no_taxonomy else get_taxonomy_cache()
+    publisher = BulkPublisher(store, workers=args.workers, requests_per_second=args.rps, post_status=args.status,
+                              batch_size=args.batch_size, media=media, taxonomy=taxonomy)
+
+    print("📤 Публикация из очереди publish_queue")
+    print(f"🗄️ Очередь: {'MySQL' if args.mysql else args.db} | Потоков: до {publisher.workers} | "
+          f"Пакет: {publisher.batch_size} | Лимит: {publisher.client.limiter.rate:.2f} req/s")
+    if args.recover_stale:
+        print(f"♻️ Возвращено в очередь: {store.recover_stale()}")
+    print(f"📋 Очередь: {store.counts()}")
+    print("=" * 60)
+
+    try:
+        stats = publisher.run(limit=args.limit, wait_scheduled=args.wait)
+        summary = stats.to_dict()
+        concurrency = publisher.concurrency
+        print("=" * 60)
+        print(f"✅ Опубликовано: {summary['published']} (создано {summary['created']}, обновлено {summary['updated']}) | "
+              f"🔁 Отложено для повтора: {summary['retried']} | ❌ Ошибок: {summary['failed']}")
+        print(f"⏱️ Время: {summary['elapsed_seconds']} с | ⚡ {summary['rate_per_second']} статей/с | "
+              f"медиана публикации: {summary['duration_p50']} с")
+        print(f"⚙️ Параллельность: {concurrency.lowest_limit}–{concurrency.peak_limit} "
+              f"(изменений: {concurrency.adjustments}) | 🌐 Запросов к WordPress: {publisher.client.stats['requests']}, "
+              f"из них пакетов: {publisher.client.stats['batches']}")
+        print(f"⏭️ Без изменений (не отправлено): {publisher.client.stats['unchanged']} | "
+              f"📉 Сэкономлено: {publisher.client.stats['bytes_saved'] / 1024:.0f} КБ")
+        if media is not None:
+            media_stats = media.stats
+            print(f"🖼️ Изображений: {media_stats.images} | загружено: {media_stats.uploaded} "
+                  f"({media_stats.bytes_before / 1024:.0f} → {media_stats.bytes_after / 1024:.0f} КБ) | "
+                  f"повторов: {media_stats.reused} | похожих: {media_stats.similar} | ❌ {media_stats.failed}")
+        if taxonomy is not None:
+            print(f"🏷️ Справочники: загрузок {taxonomy.stats['loads']} | создано меток: {taxonomy.stats['created']} | "
+                  f"запросов: {taxonomy.stats['requests']}")
+        print(f"📋 Очередь: {store.counts()}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
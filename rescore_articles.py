@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Массовый пересчет оценок статей
+- Пересчитывает quality_score, seo_score и content_rating по текущим правилам оценки
+  скрипта, создавшего БД (--rules; для wordpress_articles_enhanced.db — enhanced)
+- Читает HTML статей порциями из SQLite или MySQL (в памяти не больше двух порций)
+- Оценивает в пуле процессов, пишет оценки и строки quality_metrics пакетными транзакциями
+- Показывает скорость и оставшееся время; --start-after продолжает прерванный запуск
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from wordPress_automation_final import WordPressAutomationFinal
+from enhanced_wordpress_automation import EnhancedWordPressAutomation
+from modules.quality.rescoring import ArticleStore, BulkRescorer, ARTICLE_LAYOUTS, format_eta
+
+
+def score_article(keyword, html):
+    """Оценки статьи по правилам WordPressAutomationFinal (как при сохранении)"""
+    quality_score = WordPressAutomationFinal.evaluate_content_quality(html, keyword)
+    seo_score = WordPressAutomationFinal.evaluate_seo_quality(html, keyword)
+    return {
+        'quality_score': quality_score,
+        'seo_score': seo_score,
+        'content_rating': (quality_score + seo_score) // 2
+    }
+
+
+def score_enhanced_article(keyword, html):
+    """Оценки статьи по правилам EnhancedWordPressAutomation (как при сохранении)"""
+    quality_score = EnhancedWordPressAutomation.evaluate_content_quality(html, keyword)
+    seo_score = EnhancedWordPressAutomation.evaluate_seo_quality(html, keyword)
+    return {
+        'quality_score': quality_score,
+        'seo_score': seo_score,
+        'content_rating': (quality_score + seo_score) // 2
+    }
+
+
+# Правила оценки скрипта, создавшего БД
+SCORERS = {
+    'final': score_article,
+    'enhanced': score_enhanced_article
+}
+
+
+def print_progress(progress):
+    """Строка хода пересчета"""
+    percent = progress.done / progress.total * 100 if progress.total else 100
+    print(
+        f"   📊 {progress.done}/{progress.total} ({percent:.1f}%) | "
+        f"⚡ {progress.rate:.0f} ст/с | ⏳ ETA {format_eta(progress.eta_seconds)} | "
+        f"❌ Ошибок: {progress.errors} | last_id={progress.last_id}"
+    )
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Массовый пересчет оценок статей')
+    parser.add_argument('--db', default='wordpress_articles_final.db', help='SQLite БД со статьями')
+    parser.add_argument('--mysql', action='store_true', help='Читать статьи из MySQL (config/database.py)')
+    parser.add_argument('--layout', choices=sorted(ARTICLE_LAYOUTS),
+                        help='Раскладка таблиц (по умолчанию automation для SQLite, pipeline для MySQL)')
+    parser.add_argument('--rules', choices=sorted(SCORERS),
+                        help='Правила оценки (по умолчанию enhanced для *enhanced*.db, иначе final)')
+    parser.add_argument('--workers', type=int, help='Процессов оценки (по умолчанию число CPU)')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Статей в порции и в одной транзакции')
+    parser.add_argument('--start-after', type=int, default=0, help='Продолжить с id больше указанного')
+    parser.add_argument('--limit', type=int, help='Максимум статей')
+    parser.add_argument('--no-metrics', action='store_true', help='Не добавлять строки в quality_metrics')
+    parser.add_argument('--dry-run', action='store_true', help='Только оценить, без записи в БД')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    if args.mysql:
+        store = ArticleStore.mysql(layout=args.layout or 'pipeline')
+        source = 'MySQL'
+    else:
+        store = ArticleStore.sqlite(args.db, layout=args.layout or 'automation')
+        source = args.db
+    rules = args.rules or ('enhanced' if not args.mysql and 'enhanced' in os.path.basename(args.db) else 'final')
+
+    try:
+        store.check_layout()
+    except ValueError as e:
+        print(f"❌ {e}")
+        store.close()
+        return
+
+    rescorer = BulkRescorer(
+        store,
+        SCORERS[rules],
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        record_metrics=not args.no_metrics
+    )
+
+    print("🔁 Пересчет оценок статей")
+    print(f"🗄️ Источник: {source} ({store.layout}) | Правила: {rules} | Процессов: {rescorer.workers} | "
+          f"Порция: {rescorer.chunk_size}")
+    if args.dry_run:
+        print("🧪 Пробный запуск: оценки не записываются")
+    print("=" * 60)
+
+    try:
+        progress = rescorer.run(
+            start_after=args.start_after,
+            limit=args.limit,
+            dry_run=args.dry_run,
+            on_progress=print_progress
+        )
+    except KeyboardInterrupt:
+        print("\n⏸️ Прервано: продолжите с --start-after по последнему last_id")
+        return
+    finally:
+        store.close()
+
+    print("=" * 60)
+    print(f"✅ Пересчитано: {progress.done - progress.errors} | ❌ Ошибок: {progress.errors}")
+    print(f"⏱️ Время: {progress.elapsed:.1f} с | ⚡ {progress.rate:.0f} статей/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк оценки и разбора статей
+- Детерминированный синтетический корпус (страницы конкурентов и статьи) плюс сохраненные страницы
+- Замеряет время и память (tracemalloc) оценщиков, разбора страниц конкурентов,
+  сводки корпуса и генераторов статей
+- Сохраняет базовую линию и сравнивает с ней: рост времени/памяти и изменившиеся оценки
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from wordPress_automation_final import WordPressAutomationFinal
+from enhanced_wordpress_automation import EnhancedWordPressAutomation
+from modules.quality.content_metrics import get_content_metrics
+from benchmarks.corpus import build_corpus, capture_fixture, CORPUS_SIZES, DEFAULT_KEYWORD, DEFAULT_SEED
+from benchmarks.runner import (
+    Benchmark, measure, load_baseline, save_baseline, compare, format_report, DEFAULT_BASELINE_PATH
+)
+
+# Разбор страниц конкурентов (requests, beautifulsoup4, lxml, pydantic)
+try:
+    from modules.research.bizfinpro_researcher import extract_page_artifact, synthesize_corpus
+    RESEARCHER_AVAILABLE = True
+except ImportError:
+    RESEARCHER_AVAILABLE = False
+
+
+def scoring_benchmarks(corpus):
+    """Оценщики качества и SEO обоих скриптов по статьям корпуса"""
+    articles = [(page.html, page.keyword) for page in corpus.articles]
+    # Без __init__: оценка не использует БД и WordPress
+    enhanced = EnhancedWordPressAutomation.__new__(EnhancedWordPressAutomation)
+    # Разбор статьи кешируется на статью, кеш лемм общий для пакета: сбрасывается только первый
+    reset = get_content_metrics.cache_clear
+
+    return [
+        Benchmark('content_metrics.parse', lambda: [get_content_metrics(html, kw) for html, kw in articles],
+                  len(articles), lambda m: [m.raw_word_count, len(m.headings), m.keyword_forms.occurrences], reset),
+        Benchmark('final.evaluate_content_quality',
+                  lambda: [WordPressAutomationFinal.evaluate_content_quality(html, kw) for html, kw in articles],
+                  len(articles), int, reset),
+        Benchmark('final.evaluate_seo_quality',
+                  lambda: [WordPressAutomationFinal.evaluate_seo_quality(html, kw) for html, kw in articles],
+                  len(articles), int, reset),
+        Benchmark('enhanced.evaluate_content_quality',
+                  lambda: [enhanced.evaluate_content_quality(html, kw) for html, kw in articles],
+                  len(articles), int, reset),
+        Benchmark('enhanced.evaluate_seo_quality',
+                  lambda: [enhanced.evaluate_seo_quality(html, kw) for html, kw in articles],
+                  len(articles), int, reset),
+    ]
+
+
+def research_benchmarks(corpus):
+    """Разбор страниц конкурентов и сводка корпуса"""
+    if not RESEARCHER_AVAILABLE:
+        print("⚠️ Разбор страниц конкурентов пропущен: нет beautifulsoup4/lxml/pydantic")
+        return []
+
+    pages = [(page.html_bytes, page.url or 'https://example.ru/', page.name) for page in corpus.competitors]
+    artifacts = [extract_page_artifact(html, url, name) for html, url, name in pages]
+
+    def artifact_signature(artifact):
+        return [len(artifact.h_outline), len(artifact.tables_tsv), len(artifact.faq), len(artifact.calculators),
+                len(artifact.legal_refs), len(artifact.ctas), artifact.word_count, artifact.schema_types]
+
+    def synthesis_signature(synthesis):
+        return [len(synthesis.consensus), len(synthesis.common_outline), len(synthesis.legal_anchors),
+                len(synthesis.must_have_blocks), len(synthesis.disagreements)]
+
+    return [
+        Benchmark('research.extract_page_artifact',
+                  lambda: [extract_page_artifact(html, url, name) for html, url, name in pages],
+                  len(pages), artifact_signature),
+        Benchmark('research.synthesize_corpus', lambda: [synthesize_corpus(corpus.keyword, artifacts)],
+                  1, synthesis_signature),
+    ]
+
+
+def generator_benchmarks(corpus, workdir):
+    """Генерация статей обоими скриптами (исследование и оглавление готовятся заранее)"""
+    cwd = os.getcwd()
+    os.chdir(workdir)  # БД скриптов создаются во временном каталоге
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            final = WordPressAutomationFinal()
+            enhanced = EnhancedWordPressAutomation()
+            keywords = [corpus.keyword] + [kw for kw in final.keywords if kw != corpus.keyword][:2]
+            final_inputs = []
+            enhanced_inputs = []
+            for keyword in keywords:
+                research = final.research_keyword(keyword)
+                final_inputs.append((keyword, research, final.create_article_outline(keyword, research)))
+                intent = enhanced.analyze_keyword(keyword)
+                enhanced_inputs.append((keyword, enhanced.create_adaptive_outline(keyword, intent), intent))
+    finally:
+        os.chdir(cwd)
+
+    def run_quietly(generate, inputs):
+        # Генераторы печатают ход работы: вывод не должен попадать в замер терминала
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [generate(*args) for args in inputs]
+
+    def reset():
+        get_content_metrics.cache_clear()
+        random.seed(corpus.seed)
+
+    def generated_signature(result):
+        content, quality_score, seo_score = result
+        return [len(content.split()), quality_score, seo_score]
+
+    return [
+        Benchmark('generator.final', lambda: run_quietly(final.generate_article_content, final_inputs),
+                  len(final_inputs), generated_signature, reset),
+        Benchmark('generator.enhanced', lambda: run_quietly(enhanced.generate_high_quality_content, enhanced_inputs),
+                  len(enhanced_inputs), generated_signature, reset),
+    ]
+
+
+def run_benchmarks(size='medium', pages=10, seed=DEFAULT_SEED, keyword=DEFAULT_KEYWORD, repeat=5,
+                   only=None, include_fixtures=True, baseline_path=DEFAULT_BASELINE_PATH,
+                   save=False, tolerance=0.2):
+    """
+    Прогон бенчмарков и сравнение с базовой линией
+
+    Args:
+        size: Размер синтетических документов (small, medium, large)
+        pages: Синтетических документов каждого вида
+        seed: Зерно генератора корпуса
+        keyword: Ключевая фраза синтетических документов
+        repeat: Прогонов для замера времени
+        only: Подстроки имен замеров (None — все)
+        include_fixtures: Добавить сохраненные страницы из fixtures/
+        baseline_path: JSON базовой линии
+        save: Сохранить результаты как новую базовую линию
+        tolerance: Допустимый рост времени и памяти (0.2 — 20%)
+
+    Returns:
+        Сравнения с базовой линией
+    """
+    corpus = build_corpus(size, pages, seed, keyword, include_fixtures)
+    description = corpus.describe()
+    print(f"📚 Корпус {size}: {description['competitors']} страниц конкурентов, {description['articles']} статей, "
+          f"{description['bytes'] / 1024:.0f} КБ (seed {seed})")
+
+    workdir = tempfile.mkdtemp(prefix='bizfin-bench-')
+    try:
+        benchmarks = scoring_benchmarks(corpus) + research_benchmarks(corpus) + generator_benchmarks(corpus, workdir)
+        if only:
+            benchmarks = [b for b in benchmarks if any(part in b.name for part in only)]
+
+        results = []
+        for benchmark in benchmarks:
+            print(f"   ⏱️ {benchmark.name} ({benchmark.items} × {repeat})")
+            results.append(measure(benchmark, repeat))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = load_baseline(baseline_path)
+    if baseline and baseline.get('corpus', {}).get('size') != size:
+        print(f"⚠️ Базовая линия снята на корпусе {baseline['corpus'].get('size')}: время несравнимо")
+    comparisons = compare(results, baseline, tolerance, tolerance)
+
+    print("-" * 110)
+    print(format_report(comparisons, baseline))
+    print("-" * 110)
+
+    if save:
+        save_baseline(results, description, baseline_path)
+        print(f"💾 Базовая линия сохранена: {baseline_path}")
+    elif not baseline:
+        print("💡 Базовой линии нет: сохраните текущие результаты с --save-baseline")
+    return comparisons
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Бенчмарк оценки и разбора статей')
+    parser.add_argument('--size', choices=sorted(CORPUS_SIZES), default='medium', help='Размер синтетических документов')
+    parser.add_argument('--pages', type=int, default=10, help='Синтетических документов каждого вида')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Зерно генератора корпуса')
+    parser.add_argument('--keyword', default=DEFAULT_KEYWORD, help='Ключевая фраза синтетических документов')
+    parser.add_argument('--repeat', type=int, default=5, help='Прогонов для замера времени')
+    parser.add_argument('--only', action='append', help='Только замеры, в имени которых есть подстрока')
+    parser.add_argument('--no-fixtures', action='store_true', help='Без сохраненных страниц из fixtures/')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='JSON базовой линии')
+    parser.add_argument('--save-baseline', action='store_true', help='Сохранить результаты как базовую линию')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Допустимый рост времени и памяти (доля)')
+    parser.add_argument('--check', action='store_true', help='Код выхода 1 при регрессии')
+    parser.add_argument('--capture', metavar='URL', help='Сохранить страницу в fixtures/ и выйти')
+    parser.add_argument('--capture-kind', choices=['competitor', 'article'], default='competitor',
+                        help='Вид сохраняемой страницы')
+
+    args = parser.parse_args()
+
+    if args.capture:
+        name, size = capture_fixture(args.capture, args.keyword, args.capture_kind)
+        print(f"💾 Страница сохранена в fixtures: {name} ({size} байт)")
+        return
+
+    comparisons = run_benchmarks(
+        args.size, args.pages, args.seed, args.keyword, args.repeat, args.only,
+        not args.no_fixtures, args.baseline, args.save_baseline, args.tolerance
+    )
+    if args.check and any(comparison.regression for comparison in comparisons):
+        print("❌ Обнаружена регрессия относительно базовой линии")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Синхронизация локального зеркала записей WordPress (wp_posts_mirror)
+- Выбирает только записи, измененные с прошлой синхронизации (modified_after)
+- Страницы по 100 записей, только нужные поля (_fields)
+- Перезаписывает только записи с изменившимся хешем содержимого или мета-полей
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from modules.publisher.wp_mirror import WordPressMirror
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro', 'db', 'bizfin_pro.db')
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Синхронизация локального зеркала записей WordPress')
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite БД пайплайна')
+    parser.add_argument('--mysql', action='store_true', help='Зеркало в MySQL (config/database.py)')
+    parser.add_argument('--full', action='store_true', help='Выбрать все записи, а не только измененные')
+    parser.add_argument('--prune', action='store_true', help='Удалить из зеркала записи, которых нет на сайте')
+    parser.add_argument('--per-page', type=int, default=100, help='Записей на страницу (до 100)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Подробный вывод')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    mirror = WordPressMirror.mysql() if args.mysql else WordPressMirror.sqlite(args.db)
+    try:
+        print("🪞 Синхронизация зеркала WordPress")
+        print(f"🗄️ Зеркало: {'MySQL' if args.mysql else args.db} | Записей: {mirror.count()}")
+        report = mirror.sync(full=args.full, prune=args.prune, per_page=min(args.per_page, 100))
+        print("=" * 60)
+        print(f"📥 Получено: {report.fetched} за {report.pages} стр. "
+              f"(изменены после {report.since or 'начала'})")
+        print(f"🆕 Новых: {report.inserted} | ✏️ Изменено: {report.updated} | "
+              f"✅ Без изменений: {report.unchanged} | 🗑️ Удалено: {report.removed}")
+        print(f"⏱️ Время: {report.elapsed:.2f} с | 🌐 Запросов к WordPress: {mirror.client.stats['requests']}")
+    finally:
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Проверка чисел в сохраненных статьях
+- Ищет числовые утверждения статей в индексе чисел сохраненных исследований (web_research)
+- Пересчитывает примеры и таблицы комиссий по текущему тарифу калькулятора
+- Показывает статьи с ошибками в расчетах и неподтвержденными числами
+"""
+
+import argparse
+import os
+import sys
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from modules.quality.numeric_claims import EvidenceIndex, verify_article
+from modules.quality.rescoring import ArticleStore
+
+
+def run_verification(db_path='wordpress_articles_final.db', research_db=None, chunk_size=500, show_unverified=5):
+    """
+    Проверка чисел всех статей с сохраненным HTML
+
+    Args:
+        db_path: SQLite БД со статьями (articles.content)
+        research_db: SQLite БД исследований (по умолчанию DB_CONFIG)
+        chunk_size: Статей в порции
+        show_unverified: Сколько неподтвержденных чисел показывать на статью
+
+    Returns:
+        Сводка: статьи, утверждения, ошибки расчетов
+    """
+    index = EvidenceIndex.from_research_db(research_db)
+    store = ArticleStore.sqlite(db_path, layout='automation')
+    summary = {'articles': 0, 'claims': 0, 'unverified': 0, 'calculation_errors': 0, 'elapsed_ms': 0.0}
+
+    print(f"🔢 Проверка чисел: {store.count()} статей, чисел в индексе исследований: {len(index)}")
+    print("-" * 60)
+    for chunk in store.iter_chunks(chunk_size):
+        for article_id, keyword, html in chunk:
+            verification = verify_article(html, index, keyword)
+            summary['articles'] += 1
+            summary['claims'] += len(verification.claims)
+            summary['unverified'] += len(verification.unverified)
+            summary['calculation_errors'] += len(verification.calculation_errors)
+            summary['elapsed_ms'] += verification.elapsed_ms
+
+            if verification.calculation_errors or verification.unverified:
+                print(f"#{article_id} {keyword}: подтверждено {verification.coverage:.0f}% из {len(verification.claims)}")
+                for check in verification.calculation_errors:
+                    print(f"   🔴 Ошибка расчета: {check.text} (ожидается {check.expected})")
+                for match in verification.unverified[:show_unverified]:
+                    print(f"   ⚠️ Нет в исследованиях: {match.claim.text}")
+
+    store.close()
+    print("-" * 60)
+    average = summary['elapsed_ms'] / summary['articles'] if summary['articles'] else 0.0
+    print(f"📋 Статей: {summary['articles']} | Чисел: {summary['claims']} | "
+          f"Не подтверждено: {summary['unverified']} | Ошибок расчета: {summary['calculation_errors']}")
+    print(f"⚡ В среднем {average:.1f} мс на статью")
+    return summary
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Проверка чисел в сохраненных статьях')
+    parser.add_argument('--db', default='wordpress_articles_final.db', help='SQLite БД со статьями')
+    parser.add_argument('--research-db', help='SQLite БД исследований (по умолчанию bizfin-pro/data/bizfin_pro.db)')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Статей в порции')
+    parser.add_argument('--show', type=int, default=5, help='Неподтвержденных чисел на статью в отчете')
+
+    args = parser.parse_args()
+    summary = run_verification(args.db, args.research_db, args.chunk_size, args.show)
+    sys.exit(1 if summary['calculation_errors'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Проверка опубликованных статей (Этапы 7-10)
+- Записи WordPress запрашиваются по 100 за запрос (include, только нужные поля)
+- Страницы статей проверяются HEAD-запросами в несколько потоков
+- Результаты пишутся пакетно в publish_status, seo_meta_expected,
+  wp_meta_verification и seo_meta_audit_log
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from modules.publisher.verification import PublishVerifier
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro', 'db', 'bizfin_pro.db')
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Проверка опубликованных статей')
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite БД пайплайна')
+    parser.add_argument('--mysql', action='store_true', help='БД MySQL (config/database.py)')
+    parser.add_argument('--limit', type=int, help='Максимум статей')
+    parser.add_argument('--recheck', action='store_true', help='Проверить и уже проверенные статьи')
+    parser.add_argument('--head-workers', type=int, help='Потоков проверки страниц')
+    parser.add_argument('--head-rps', type=float, help='HEAD-запросов в секунду')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Подробный вывод')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    options = {'head_workers': args.head_workers, 'head_rps': args.head_rps}
+    verifier = PublishVerifier.mysql(**options) if args.mysql else PublishVerifier.sqlite(args.db, **options)
+    try:
+        print("🔎 Проверка опубликованных статей")
+        stats = verifier.run(limit=args.limit, recheck=args.recheck)
+        print("=" * 60)
+        print(f"📋 Проверено: {stats.checked} | ✅ Успешно: {stats.success} | "
+              f"⚠️ Частично: {stats.partial} | ❌ Не найдено: {stats.failed}")
+        print(f"🏷️ SEO-мета совпадают: {stats.meta_ok} | Расхождений: {stats.meta_mismatch} | "
+              f"Зафиксировано ожидаемых: {stats.expected_created}")
+        print(f"⏱️ Время: {stats.elapsed:.2f} с | 🌐 Запросов к REST API: {stats.api_requests} | "
+              f"HEAD: {stats.head_checks}")
+    finally:
+        verifier.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,22 +8,54 @@
 - Публикация без технических данных
 """
 
-import requests
 import json
 import sqlite3
 import re
 from datetime import datetime
-import time
+import sys
+import os
+
+# Общие модули BizFin Pro
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bizfin-pro'))
+
+from modules.publisher.rate_limiter import get_host_limiter
+from modules.publisher.wordpress_client import get_wordpress_client
+from modules.publisher.publish_spool import get_publish_spool, PublishSpoolDrainer, is_retryable
+from modules.publisher.taxonomy_cache import get_taxonomy_cache
+from modules.generator.html_minifier import optimize_article_html
+from modules.generator.pricing import get_pricing_engine
+from modules.generator.template_phrases import SmartContentRewriter
+from modules.quality.content_metrics import get_content_metrics
+from modules.quality.near_duplicates import NearDuplicateIndex
+from modules.quality.seo_analysis import analyze_article
+from modules.quality.numeric_claims import verify_article, get_evidence_index
+from modules.quality.html_lint import lint_html
+from config.wordpress import WordPressConfig
 
 class WordPressAutomationFinal:
     def __init__(self):
-        self.wp_url = "https://bizfin-pro.ru/wp-json/wp/v2"
-        self.wp_username = "bizfin_pro_r"
-        self.wp_app_password = "U3Ep gU2T clRu FcwN QU6l Dsda"
+        # Сайт задается WP_SITE_URL/WP_USERNAME/WP_APP_PASSWORD (например, локальный
+        # стенд load_test_publisher.py --serve вместо рабочего сайта)
+        self.wp_url = WordPressConfig.API_URL
+        self.wp_username = WordPressConfig.USERNAME
+        self.wp_app_password = WordPressConfig.APP_PASSWORD
         self.wp_auth = (self.wp_username, self.wp_app_password)
         self.db_path = "wordpress_articles_final.db"
         self.conn = None
         
+        # Общий лимит запросов к WordPress (вместо фиксированных пауз)
+        self.wp_rate_limiter = get_host_limiter(self.wp_url)
+        # Общий клиент REST API: пул соединений, повторы, поиск статьи перед созданием
+        self.wp_client = get_wordpress_client(self.wp_url, self.wp_username, self.wp_app_password)
+        # Спул публикации: готовая статья не теряется, если WordPress недоступен
+        self.publish_spool = get_publish_spool()
+        self.spool_source = f"{self.__class__.__name__}:{os.path.abspath(self.db_path)}"
+        self.spool_drainer = PublishSpoolDrainer(self.publish_spool, self.wp_client) if self.publish_spool else None
+        self.last_publish_error = None
+        self.last_publish_exception = None
+        # ID рубрики, меток и автора по именам: справочники загружаются один раз
+        self.taxonomy = get_taxonomy_cache(self.wp_client)
+        
         # Ключевые слова для обработки
         self.keywords = [
             "банковская гарантия для исполнения контракта 44 фз онлайн",
@@ -42,7 +74,8 @@ class WordPressAutomationFinal:
     
     def initialize_db(self):
         """Инициализация базы данных"""
-        self.conn = sqlite3.connect(self.db_path)
+        # timeout и check_same_thread нужны для пакетного режима с пулом потоков
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
         cursor = self.conn.cursor()
         
         # Таблица для исследований
@@ -91,6 +124,9 @@ class WordPressAutomationFinal:
                 quality_score INTEGER DEFAULT 0,
                 seo_score INTEGER DEFAULT 0,
                 content_rating INTEGER DEFAULT 0,
+                html_original_bytes INTEGER,
+                html_final_bytes INTEGER,
+                content TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -107,9 +143,28 @@ class WordPressAutomationFinal:
             )
         ''')
         
+        # Колонки, добавленные после первых запусков (существующие БД)
+        self.ensure_columns('articles', {
+            'html_original_bytes': 'INTEGER',
+            'html_final_bytes': 'INTEGER',
+            'content': 'TEXT'
+        })
+        
+        # Индекс почти-дубликатов (MinHash-подписи рядом с таблицей articles)
+        self.duplicate_index = NearDuplicateIndex(self.conn)
+        
         self.conn.commit()
         print("✅ База данных инициализирована")
     
+    def ensure_columns(self, table, columns):
+        """Добавление недостающих колонок в существующую таблицу"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+    
     def research_keyword(self, keyword):
         """Реальное исследование ключевого слова с анализом намерений"""
         print(f"   🔍 Реальное исследование ключевого слова: {keyword}")
@@ -276,15 +331,8 @@ class WordPressAutomationFinal:
         section_title = section["title"]
         word_count = section["word_count"]
         
-        # Определяем уровень заголовка
-        if section_num <= 2:
-            header_tag = "h2"
-            header_class = "section-title"
-        else:
-            header_tag = "h3"
-            header_class = "subsection-title"
-        
-        content = f"""<{header_tag} class="{header_class}">{section_title}</{header_tag}>
+        # Разделы оглавления — равноправные H2, блоки внутри раздела — H3
+        content = f"""<h2 class="section-title">{section_title}</h2>
 
 """
         
@@ -298,6 +346,11 @@ class WordPressAutomationFinal:
     def generate_unique_section_content(self, keyword, research_data, section_title, section_num, word_count):
         """Генерация уникального контента на основе исследования"""
         
+        # Примеры расчетов для калькуляторных запросов - реальная таблица комиссий
+        title_lower = section_title.lower()
+        if "калькулятор" in keyword.lower() and "пример" in title_lower and "расчет" in title_lower:
+            return self.generate_cost_content(keyword, word_count)
+        
         # Берем уникальные данные для каждого раздела
         if section_num == 1:  # Первый раздел - определение
             return self.create_definition_with_stats(keyword, research_data)
@@ -628,7 +681,7 @@ class WordPressAutomationFinal:
         
         content = f"""<p>Анализ рынка {keyword.lower()} показывает следующие ключевые показатели:</p>
 
-<h4>📊 Актуальная статистика рынка:</h4>
+<h3>📊 Актуальная статистика рынка:</h3>
 <ul>
 """
         
@@ -638,7 +691,7 @@ class WordPressAutomationFinal:
         
         content += f"""</ul>
 
-<h4>🔢 Важные факты и цифры:</h4>
+<h3>🔢 Важные факты и цифры:</h3>
 <table class="wp-block-table">
 <thead>
 <tr><th>Параметр</th><th>Значение</th><th>Комментарий</th></tr>
@@ -675,7 +728,7 @@ class WordPressAutomationFinal:
         
         content = f"""<p>Рынок {keyword.lower()} активно развивается, и эксперты выделяют следующие ключевые тренды:</p>
 
-<h4>📈 Основные тенденции развития:</h4>
+<h3>📈 Основные тенденции развития:</h3>
 <ul>
 """
         
@@ -685,7 +738,7 @@ class WordPressAutomationFinal:
         
         content += f"""</ul>
 
-<h4>🔮 Прогнозы на ближайшее будущее:</h4>
+<h3>🔮 Прогнозы на ближайшее будущее:</h3>
 <p>Аналитики прогнозируют дальнейшее развитие рынка {keyword.lower()} в следующих направлениях:</p>
 
 <ol>
@@ -707,7 +760,7 @@ class WordPressAutomationFinal:
         
         content = f"""<p>Эксперты финансового рынка дают следующие рекомендации по работе с {keyword.lower()}:</p>
 
-<h4>👨‍💼 Мнения специалистов:</h4>
+<h3>👨‍💼 Мнения специалистов:</h3>
 <ul>
 """
         
@@ -717,7 +770,7 @@ class WordPressAutomationFinal:
         
         content += f"""</ul>
 
-<h4>💡 Практические рекомендации экспертов:</h4>
+<h3>💡 Практические рекомендации экспертов:</h3>
 
 <div class="wp-block-group">
 <h4>✅ Что рекомендуют делать:</h4>
@@ -751,7 +804,7 @@ class WordPressAutomationFinal:
         
         content = f"""<p>Практические примеры помогут лучше понять особенности работы с {keyword.lower()}:</p>
 
-<h4>📋 Реальные кейсы и примеры:</h4>
+<h3>📋 Реальные кейсы и примеры:</h3>
 """
         
         # Добавляем кейсы
@@ -768,7 +821,7 @@ class WordPressAutomationFinal:
 """
         
         content += f"""
-<h4>🎯 Уроки из практики:</h4>
+<h3>🎯 Уроки из практики:</h3>
 <p>Анализ кейсов показывает, что успех в работе с {keyword.lower()} зависит от:</p>
 
 <ul>
@@ -792,7 +845,7 @@ class WordPressAutomationFinal:
         
         content = f"""<p>Практические советы помогут избежать типичных ошибок при работе с {keyword.lower()}:</p>
 
-<h4>⚠️ Частые проблемы и их решения:</h4>
+<h3>⚠️ Частые проблемы и их решения:</h3>
 """
         
         # Создаем пары проблема-решение
@@ -804,7 +857,7 @@ class WordPressAutomationFinal:
 """
         
         content += f"""
-<h4>💡 Практические лайфхаки:</h4>
+<h3>💡 Практические лайфхаки:</h3>
 <ul>
 <li><strong>Экономия времени:</strong> Подготовьте документы заранее</li>
 <li><strong>Экономия денег:</strong> Сравните условия в 3-5 банках</li>
@@ -813,7 +866,7 @@ class WordPressAutomationFinal:
 <li><strong>Повышение шансов:</strong> Обратитесь к консультантам</li>
 </ul>
 
-<h4>📋 Чек-лист действий:</h4>
+<h3>📋 Чек-лист действий:</h3>
 <ol>
 <li>Определите требования к {keyword.lower()}</li>
 <li>Выберите подходящие банки</li>
@@ -835,7 +888,7 @@ class WordPressAutomationFinal:
         
         content = f"""<p>Ответы на наиболее актуальные вопросы о {keyword.lower()}:</p>
 
-<h4>❓ Часто задаваемые вопросы:</h4>
+<h3>❓ Часто задаваемые вопросы:</h3>
 """
         
         # Создаем уникальные FAQ на основе исследования
@@ -858,12 +911,12 @@ class WordPressAutomationFinal:
         # Генерируем ответы
         for i, question in enumerate(unique_questions[:6], 1):
             content += f"""
-<h3>❓ {question}</h3>
+<h4>❓ {question}</h4>
 <p>Детальный ответ на вопрос с практическими рекомендациями и примерами...</p>
 """
         
         content += f"""
-<h4>📞 Нужна дополнительная консультация?</h4>
+<h3>📞 Нужна дополнительная консультация?</h3>
 <p>Если у вас остались вопросы по {keyword.lower()}, обратитесь к нашим специалистам за персональной консультацией.</p>
 
 """
@@ -874,7 +927,7 @@ class WordPressAutomationFinal:
         """Создание дополнительного контента"""
         content = f"""<p>Дополнительная информация по теме {keyword.lower()}:</p>
 
-<h4>📚 Дополнительные ресурсы:</h4>
+<h3>📚 Дополнительные ресурсы:</h3>
 <ul>
 <li>Официальные документы и регламенты</li>
 <li>Образцы документов и шаблоны</li>
@@ -883,7 +936,7 @@ class WordPressAutomationFinal:
 <li>Полезные ссылки и ресурсы</li>
 </ul>
 
-<h4>🔗 Полезные ссылки:</h4>
+<h3>🔗 Полезные ссылки:</h3>
 <ul>
 <li><a href="https://zakupki.gov.ru" target="_blank">Единая информационная система</a></li>
 <li><a href="https://cbr.ru" target="_blank">Центральный банк России</a></li>
@@ -901,7 +954,7 @@ class WordPressAutomationFinal:
         """Генерация контента для раздела документов"""
         content = f"""<p>Для получения {keyword.lower()} необходимо подготовить определенный пакет документов.</p>
 
-<h4>Обязательные документы:</h4>
+<h3>Обязательные документы:</h3>
 
 <ul>
 <li><strong>Учредительные документы:</strong>
@@ -927,7 +980,7 @@ class WordPressAutomationFinal:
 </li>
 </ul>
 
-<h4>Требования к документам:</h4>
+<h3>Требования к документам:</h3>
 <p>Все документы должны быть актуальными, заверенными и соответствовать требованиям банка.</p>
 
 <p>Сроки подготовки документов: 7-15 рабочих дней в зависимости от сложности.</p>
@@ -939,14 +992,14 @@ class WordPressAutomationFinal:
         """Генерация контента для раздела проверки"""
         content = f"""<p>Проверка {keyword.lower()} - это обязательная процедура для подтверждения подлинности документа.</p>
 
-<h4>Где проверить:</h4>
+<h3>Где проверить:</h3>
 <ul>
 <li><strong>Реестр ЕИС:</strong> zakupki.gov.ru</li>
 <li><strong>Сайт банка-гаранта:</strong> Прямая проверка</li>
 <li><strong>Обращение в банк:</strong> Официальный запрос</li>
 </ul>
 
-<h4>Что проверить:</h4>
+<h3>Что проверить:</h3>
 <table class="wp-block-table">
 <thead>
 <tr><th>Параметр</th><th>Что проверить</th></tr>
@@ -960,7 +1013,7 @@ class WordPressAutomationFinal:
 </tbody>
 </table>
 
-<h4>Признаки подделки:</h4>
+<h3>Признаки подделки:</h3>
 <ul>
 <li>Отсутствие в официальном реестре</li>
 <li>Ошибки в реквизитах банка</li>
@@ -977,7 +1030,7 @@ class WordPressAutomationFinal:
         """Генерация контента для раздела процесса"""
         content = f"""<p>Процесс оформления {keyword.lower()} состоит из нескольких этапов.</p>
 
-<h4>Пошаговый алгоритм:</h4>
+<h3>Пошаговый алгоритм:</h3>
 
 <ol>
 <li><strong>Подготовительный этап:</strong>
@@ -1019,7 +1072,7 @@ class WordPressAutomationFinal:
         """Генерация контента для раздела стоимости"""
         content = f"""<p>Стоимость {keyword.lower()} зависит от множества факторов и рассчитывается индивидуально.</p>
 
-<h4>Основные факторы стоимости:</h4>
+<h3>Основные факторы стоимости:</h3>
 
 <ul>
 <li><strong>Размер гарантии:</strong> Чем больше сумма, тем выше стоимость</li>
@@ -1029,18 +1082,8 @@ class WordPressAutomationFinal:
 <li><strong>Наличие залога:</strong> Залог может снизить комиссию</li>
 </ul>
 
-<h4>Диапазон цен:</h4>
-<table class="wp-block-table">
-<thead>
-<tr><th>Сумма гарантии</th><th>Ставка (годовых)</th><th>Комиссия за год</th></tr>
-</thead>
-<tbody>
-<tr><td>До 1 млн руб.</td><td>3-5%</td><td>30-50 тыс. руб.</td></tr>
-<tr><td>1-5 млн руб.</td><td>2-4%</td><td>20-200 тыс. руб.</td></tr>
-<tr><td>5-10 млн руб.</td><td>1.5-3%</td><td>75-300 тыс. руб.</td></tr>
-<tr><td>Свыше 10 млн руб.</td><td>1-2%</td><td>100 тыс. руб.+</td></tr>
-</tbody>
-</table>
+<h3>Комиссия по сумме и сроку:</h3>
+{get_pricing_engine().render_cost_section(keyword)}
 
 <p>Для получения точной стоимости рекомендуется обратиться в несколько банков для сравнения условий.</p>
 
@@ -1051,7 +1094,7 @@ class WordPressAutomationFinal:
         """Генерация контента для раздела советов"""
         content = f"""<p>Практические советы по работе с {keyword.lower()} помогут избежать типичных ошибок.</p>
 
-<h4>Рекомендации:</h4>
+<h3>Рекомендации:</h3>
 
 <ul>
 <li><strong>Планируйте заранее:</strong> Начинайте оформление за 2-3 недели до срока</li>
@@ -1061,10 +1104,10 @@ class WordPressAutomationFinal:
 <li><strong>Следите за сроками:</strong> Не допускайте просрочки</li>
 </ul>
 
-<h4>Частые ошибки:</h4>
+<h3>Частые ошибки:</h3>
 
 <div class="wp-block-group">
-<h4>Чего избегать:</h4>
+<h3>Чего избегать:</h3>
 <ul>
 <li>Подача заявки в последний день</li>
 <li>Предоставление неполного пакета документов</li>
@@ -1127,75 +1170,150 @@ class WordPressAutomationFinal:
 """
         return content
     
-    def publish_to_wordpress(self, keyword, content, title, slug):
-        """Публикация статьи в WordPress"""
-        print(f"   📤 Публикация в WordPress: {title}")
-        
-        post_data = {
+    def generate_meta_description(self, keyword):
+        """Мета-описание статьи (проверяется офлайн SEO-анализом до публикации)"""
+        return f"{keyword} - подробное руководство по оформлению и требованиям. Консультация специалистов."
+    
+    def build_post_data(self, keyword, content, title, slug, meta_description=None):
+        """Поля записи WordPress (рубрика, метка и автор — по ID из кеша справочников)"""
+        return {
             'title': title,
             'content': content,
             'slug': slug,
             'status': 'draft',
             'meta': {
                 'yoast_wpseo_focuskw': keyword,
-                'yoast_wpseo_metadesc': f"{keyword} - подробное руководство по оформлению и требованиям. Консультация специалистов."
-            }
+                'yoast_wpseo_metadesc': meta_description or self.generate_meta_description(keyword)
+            },
+            **self.taxonomy.post_terms(keyword)
         }
+    
+    def publish_to_wordpress(self, keyword, content, title, slug, meta_description=None, post_data=None):
+        """Публикация статьи в WordPress (post_data — уже собранные поля записи)"""
+        print(f"   📤 Публикация в WordPress: {title}")
+        
+        post_data = post_data or self.build_post_data(keyword, content, title, slug, meta_description)
         
         try:
-            response = requests.post(
-                f"{self.wp_url}/posts",
-                auth=self.wp_auth,
-                json=post_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
+            # Повторный запуск обновляет уже созданную статью (поиск по slug и ключевому слову)
+            post, created = self.wp_client.save_post(post_data, keyword)
+            wp_id = post['id']
+            wp_url = post['link']
             
-            if response.status_code == 201:
-                post = response.json()
-                wp_id = post['id']
-                wp_url = post['link']
-                
+            if created:
                 print(f"   ✅ Черновик создан в WordPress (ID: {wp_id})")
-                print(f"   🔗 URL: {wp_url}")
-                print(f"   📝 Статус: ЧЕРНОВИК (для дальнейшей доработки)")
-                
-                return {
-                    'wp_id': wp_id,
-                    'wp_url': wp_url,
-                    'status': 'draft'
-                }
             else:
-                print(f"   ❌ Ошибка публикации: {response.status_code}")
-                return None
+                print(f"   ♻️ Статья уже была в WordPress, обновлена (ID: {wp_id})")
+            print(f"   🔗 URL: {wp_url}")
+            # Обновление не меняет статус: уже опубликованная статья остается опубликованной
+            status = post.get('status', 'draft')
+            print(f"   📝 Статус: {'ЧЕРНОВИК' if status == 'draft' else status} (для дальнейшей доработки)")
+            
+            return {
+                'wp_id': wp_id,
+                'wp_url': wp_url,
+                'status': status
+            }
                 
         except Exception as e:
             print(f"   ❌ Ошибка при публикации: {str(e)}")
+            self.last_publish_error = str(e)
+            self.last_publish_exception = e
             return None
     
-    def save_article_to_db(self, keyword, wp_result, quality_score=None, seo_score=None):
-        """Сохранение статьи в базу данных с метриками качества"""
+    def save_article_to_db(self, keyword, wp_result, quality_score=None, seo_score=None, prepared=None,
+                           duplicate_check=None):
+        """Сохранение статьи в базу данных с метриками качества, размером HTML и MinHash-подписью"""
         if wp_result:
             cursor = self.conn.cursor()
             
             word_count = len(wp_result.get('content', '').split()) if 'content' in wp_result else 0
             content_rating = ((quality_score or 0) + (seo_score or 0)) // 2
+            prepared = prepared or {}
             
-            cursor.execute('''
-                INSERT INTO articles (keyword, wp_post_id, wp_post_url, status, word_count, quality_score, seo_score, content_rating)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            values = (
                 keyword,
-                wp_result['wp_id'],
                 wp_result['wp_url'],
                 wp_result['status'],
                 word_count,
                 quality_score or 0,
                 seo_score or 0,
-                content_rating
-            ))
+                content_rating,
+                prepared.get('html_original_bytes'),
+                prepared.get('html_final_bytes'),
+                prepared.get('content')  # HTML для пересчета оценок (rescore_articles.py)
+            )
+            
+            # Обновленная запись WordPress (save_post нашел ее по slug) — обновляем ее строку
+            cursor.execute('SELECT id FROM articles WHERE wp_post_id = ? ORDER BY id DESC LIMIT 1', (wp_result['wp_id'],))
+            existing = cursor.fetchone()
+            if existing:
+                article_id = existing[0]
+                cursor.execute('''
+                    UPDATE articles SET keyword = ?, wp_post_url = ?, status = ?, word_count = ?, quality_score = ?,
+                                        seo_score = ?, content_rating = ?, html_original_bytes = ?,
+                                        html_final_bytes = ?, content = ?
+                    WHERE id = ?
+                ''', values + (article_id,))
+            else:
+                cursor.execute('''
+                    INSERT INTO articles (keyword, wp_post_url, status, word_count, quality_score, seo_score,
+                                          content_rating, html_original_bytes, html_final_bytes, content, wp_post_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', values + (wp_result['wp_id'],))
+                article_id = cursor.lastrowid
             
-            article_id = cursor.lastrowid
+            # Подпись статьи в индекс почти-дубликатов
+            signature = self.duplicate_index.as_signature(prepared.get('minhash'))
+            self.duplicate_index.add(article_id, keyword, signature, commit=False)
+            
+            # Почти-дубликат, опубликованный с пометкой (WP_DUPLICATE_ACTION=flag)
+            if duplicate_check and duplicate_check.is_duplicate:
+                cursor.execute('''
+                    INSERT INTO quality_metrics (article_id, metric_type, score, details)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    article_id,
+                    'near_duplicate',
+                    round(duplicate_check.max_similarity * 100),
+                    json.dumps(duplicate_check.to_dict(), ensure_ascii=False)
+                ))
+            
+            # Офлайн SEO-анализ по правилам Yoast
+            if prepared.get('seo_analysis'):
+                cursor.execute('''
+                    INSERT INTO quality_metrics (article_id, metric_type, score, details)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    article_id,
+                    'yoast_offline',
+                    prepared['seo_analysis']['score'],
+                    json.dumps(prepared['seo_analysis'], ensure_ascii=False)
+                ))
+            
+            # Проверка чисел статьи
+            if prepared.get('numeric_check'):
+                cursor.execute('''
+                    INSERT INTO quality_metrics (article_id, metric_type, score, details)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    article_id,
+                    'numeric_claims',
+                    round(prepared['numeric_check']['coverage']),
+                    json.dumps(prepared['numeric_check'], ensure_ascii=False)
+                ))
+            
+            # Структура HTML (score — число ошибок линтера)
+            if prepared.get('html_lint'):
+                cursor.execute('''
+                    INSERT INTO quality_metrics (article_id, metric_type, score, details)
+                    VALUES (?, ?, ?, ?)
+                ''', (
+                    article_id,
+                    'html_lint',
+                    prepared['html_lint']['errors'],
+                    json.dumps(prepared['html_lint'], ensure_ascii=False)
+                ))
             
             # Сохранение детальных метрик качества
             if quality_score is not None and seo_score is not None:
@@ -1209,6 +1327,266 @@ class WordPressAutomationFinal:
         
         return None
     
+    def prepare_article(self, keyword):
+        """
+        Подготовка статьи без обращения к WordPress:
+        исследование, оглавление, генерация, оценка качества и минификация
+        """
+        # 1. Исследование ключевого слова
+        research_data = self.research_keyword(keyword)
+        
+        # 2. Создание оглавления
+        outline = self.create_article_outline(keyword, research_data)
+        
+        # 3. Генерация статьи по частям с оценкой качества
+        content, quality_score, seo_score = self.generate_article_content(keyword, research_data, outline)
+        
+        # 4. Минификация HTML и проверка лимита размера
+        optimized = optimize_article_html(content)
+        print(f"   🗜️ HTML: {optimized.original_bytes} → {optimized.final_bytes} байт (-{optimized.saved_percent}%)")
+        if not optimized.within_budget:
+            print(f"   ⚠️ Превышен лимит размера: {optimized.final_bytes} > {optimized.budget_bytes} байт")
+        
+        # 5. MinHash-подпись для проверки на почти-дубликаты перед публикацией
+        signature = self.duplicate_index.signature(optimized.html)
+        
+        prepared = {
+            'keyword': keyword,
+            'title': outline['title'],
+            'slug': self.transliterate_keyword(keyword),
+            'meta_description': self.generate_meta_description(keyword),
+            'content': optimized.html,
+            'quality_score': quality_score,
+            'seo_score': seo_score,
+            'html_original_bytes': optimized.original_bytes,
+            'html_final_bytes': optimized.final_bytes,
+            'within_budget': optimized.within_budget,
+            'minhash': signature.tolist() if signature is not None else None
+        }
+        
+        # 6. Офлайн SEO-анализ по правилам Yoast (без черновика в WordPress)
+        prepared['seo_analysis'] = self.check_seo(prepared)
+        
+        # 7. Проверка чисел по исследованиям и пересчет примеров комиссии
+        prepared['numeric_check'] = self.check_numbers(prepared)
+        
+        # 8. Структура HTML: заголовки, пустые разделы, теги, якоря, FAQ
+        prepared['html_lint'] = self.check_html(prepared)
+        return prepared
+    
+    def publish_prepared_article(self, prepared):
+        """Публикация подготовленной статьи и сохранение в БД"""
+        keyword = prepared['keyword']
+        content = prepared['content']
+        quality_score = prepared['quality_score']
+        seo_score = prepared['seo_score']
+        
+        if not prepared.get('within_budget', True):
+            print(f"   ❌ Статья '{keyword}' не опубликована: превышен лимит размера HTML")
+            return self.rejected_result(keyword, 'over_budget')
+        
+        # 7. Линтер структуры HTML: сломанная разметка не уходит в WordPress
+        if 'html_lint' not in prepared:
+            prepared['html_lint'] = self.check_html(prepared)
+        if not prepared['html_lint']['passed'] and WordPressConfig.HTML_LINT_ACTION == 'block':
+            print(f"   ❌ Статья '{keyword}' не опубликована: ошибки структуры HTML ({prepared['html_lint']['errors']})")
+            return self.rejected_result(keyword, 'lint_error', lint_errors=prepared['html_lint']['errors'])
+        
+        # 8. SEO-гейт: в WordPress уходят только статьи, прошедшие офлайн-анализ
+        # (подготовленные до появления анализа статьи проверяются здесь)
+        if 'seo_analysis' not in prepared:
+            prepared['meta_description'] = prepared.get('meta_description') or self.generate_meta_description(keyword)
+            prepared['seo_analysis'] = self.check_seo(prepared)
+        seo_analysis = prepared['seo_analysis']
+        if not seo_analysis['passed']:
+            print(f"   ❌ Статья '{keyword}' не опубликована: SEO {seo_analysis['score']}/100 < {seo_analysis['min_score']}")
+            return self.rejected_result(keyword, 'seo_gate', seo_gate_score=seo_analysis['score'])
+        
+        # 9. Пересчитанные примеры комиссии должны сходиться
+        if 'numeric_check' not in prepared:
+            prepared['numeric_check'] = self.check_numbers(prepared)
+        if not prepared['numeric_check']['passed'] and WordPressConfig.NUMERIC_CHECK_ACTION == 'block':
+            print(f"   ❌ Статья '{keyword}' не опубликована: ошибки в расчетах комиссии")
+            return self.rejected_result(keyword, 'calculation_error')
+        
+        # 10. Проверка на почти-дубликаты уже опубликованных статей
+        duplicate_check = self.check_duplicates(prepared)
+        if duplicate_check.is_duplicate and WordPressConfig.DUPLICATE_ACTION == 'block':
+            print(f"   ❌ Статья '{keyword}' не опубликована: сходство выше порога {duplicate_check.threshold:.0%}")
+            return self.rejected_result(keyword, 'duplicate', duplicate_of=duplicate_check.similar[0].article_id)
+        
+        # 11. Публикация в WordPress
+        post_data = self.build_post_data(
+            keyword, content, prepared['title'], prepared['slug'], prepared.get('meta_description')
+        )
+        wp_result = self.publish_to_wordpress(
+            keyword, content, prepared['title'], prepared['slug'], post_data=post_data
+        )
+        
+        # WordPress недоступен: статья уходит в спул и будет опубликована без повторной генерации
+        if not wp_result and self.spool_publish(prepared, post_data):
+            return self.rejected_result(keyword, 'spooled')
+        
+        # 12. Сохранение в БД с метриками качества
+        article_id = self.save_article_to_db(keyword, wp_result, quality_score, seo_score, prepared, duplicate_check)
+        
+        if wp_result:
+            print(f"   ✅ УСПЕХ: Статья создана (WP ID: {wp_result['wp_id']})")
+            print(f"   📊 Качество: {quality_score}/100, SEO: {seo_score}/100")
+            return {
+                'keyword': keyword,
+                'article_id': article_id,
+                'wp_id': wp_result['wp_id'],
+                'wp_url': wp_result['wp_url'],
+                'status': 'success',
+                'word_count': len(content.split()),
+                'quality_score': quality_score,
+                'seo_score': seo_score,
+                'content_rating': ((quality_score or 0) + (seo_score or 0)) // 2
+            }
+        
+        print(f"   ❌ ОШИБКА при обработке '{keyword}'")
+        return {
+            'keyword': keyword,
+            'article_id': None,
+            'wp_id': None,
+            'wp_url': None,
+            'status': 'error',
+            'word_count': 0,
+            'quality_score': 0,
+            'seo_score': 0,
+            'content_rating': 0
+        }
+    
+    def check_numbers(self, prepared):
+        """Проверка числовых утверждений по исследованиям и пересчет примеров комиссии"""
+        verification = verify_article(prepared['content'], get_evidence_index(), prepared['keyword'])
+        
+        print(f"   🔢 Числа: {len(verification.claims)} утверждений, подтверждено {verification.coverage:.0f}%, "
+              f"расчетов {len(verification.calculations)} ({verification.elapsed_ms:.1f} мс)")
+        for check in verification.calculation_errors:
+            print(f"      🔴 Ошибка расчета: {check.text} (ожидается {check.expected})")
+        
+        return verification.to_dict()
+    
+    def check_html(self, prepared):
+        """Проверка структуры HTML статьи линтером"""
+        report = lint_html(prepared['content'])
+        
+        status = '✅' if report.passed else '⚠️'
+        print(f"   {status} Структура HTML: ошибок {len(report.errors)}, предупреждений {len(report.warnings)} "
+              f"({report.elapsed_ms:.1f} мс)")
+        for issue in report.errors:
+            print(f"      🔴 {issue.code}: {issue.message}")
+        
+        return report.to_dict()
+    
+    def check_seo(self, prepared):
+        """Офлайн SEO-анализ подготовленной статьи (проверки Yoast без WordPress)"""
+        analysis = analyze_article(
+            prepared['content'], prepared['keyword'], prepared['title'],
+            prepared.get('meta_description', ''), prepared.get('slug', '')
+        )
+        
+        status = '✅' if analysis.passed else '⚠️'
+        print(f"   {status} Офлайн SEO (Yoast): {analysis.score}/100 (порог {analysis.min_score})")
+        for check in analysis.problems:
+            print(f"      🔴 {check.message}")
+        
+        return analysis.to_dict()
+    
+    def check_duplicates(self, prepared):
+        """Сравнение подготовленной статьи с индексом почти-дубликатов"""
+        signature = self.duplicate_index.as_signature(prepared.get('minhash'))
+        # Прежняя версия той же статьи не дубликат: повторная публикация обновит запись
+        duplicate_check = self.duplicate_index.check(signature, keyword=prepared['keyword'])
+        if duplicate_check.previous:
+            print(f"   🔄 Статья уже публиковалась (#{duplicate_check.previous[0].article_id}): будет обновлена")
+        
+        if duplicate_check.is_duplicate:
+            print(f"   ⚠️ Почти-дубликат (кандидатов LSH: {duplicate_check.candidates}):")
+            for similar in duplicate_check.duplicates:
+                print(f"      🔁 #{similar.article_id} '{similar.keyword}': сходство {similar.similarity:.0%}")
+        elif duplicate_check.similar:
+            nearest = duplicate_check.similar[0]
+            print(f"   🧬 Ближайшая статья: #{nearest.article_id} ({nearest.similarity:.0%})")
+        
+        return duplicate_check
+    
+    def spool_publish(self, prepared, post_data):
+        """
+        Сохранение готовой статьи в спул публикации
+        (False — спул отключен или ошибку не исправит повтор)
+        """
+        if self.publish_spool is None:
+            return False
+        # 4xx (кроме 429) — статья отклонена WordPress: обычная ошибка публикации, не спул
+        if not is_retryable(self.last_publish_exception):
+            return False
+        spool_id = self.publish_spool.put(
+            self.wp_url, post_data, prepared['keyword'], self.spool_source, {'prepared': prepared},
+            self.last_publish_error, delay=self.spool_drainer.retry_delay
+        )
+        print(f"   ⏳ Статья сохранена в спул публикации (#{spool_id}): будет опубликована, когда WordPress ответит")
+        return True
+    
+    def record_spooled(self):
+        """Запись в БД статей, опубликованных из спула (фоновым потоком или drain_publish_spool.py)"""
+        if self.publish_spool is None:
+            return []
+        recorded = []
+        for entry in self.publish_spool.take_published(self.spool_source):
+            prepared = entry.context.get('prepared') or {}
+            keyword = prepared.get('keyword', entry.keyword)
+            duplicate_check = self.duplicate_index.check(self.duplicate_index.as_signature(prepared.get('minhash')),
+                                                         keyword=keyword)
+            print(f"   📬 Опубликована из спула: {keyword} (WP ID: {entry.wp_post_id})")
+            article_id = self.save_article_to_db(keyword, entry.wp_result, prepared.get('quality_score'),
+                                                 prepared.get('seo_score'), prepared, duplicate_check)
+            self.publish_spool.mark_done(entry)
+            recorded.append({'keyword': keyword, 'article_id': article_id, 'wp_id': entry.wp_post_id})
+        return recorded
+    
+    def start_spool(self):
+        """Запись опубликованных из спула статей и фоновый разбор спула на время запуска (записанные статьи)"""
+        if self.spool_drainer is None:
+            return []
+        self.publish_spool.recover_stale()
+        counts = self.publish_spool.counts()
+        if counts.get('pending') or counts.get('published') or counts.get('dead'):
+            print(f"📬 Спул публикации: ожидают {counts.get('pending', 0)}, опубликованы {counts.get('published', 0)}, "
+                  f"отклонены {counts.get('dead', 0)}")
+        recorded = self.record_spooled()
+        self.spool_drainer.start()
+        return recorded
+    
+    def stop_spool(self):
+        """Остановка фонового разбора спула (записанные напоследок статьи)"""
+        if self.spool_drainer is None:
+            return []
+        self.spool_drainer.stop()
+        recorded = self.record_spooled()
+        pending = self.publish_spool.counts().get('pending', 0)
+        if pending:
+            print(f"⏳ В спуле публикации осталось {pending} статей: python drain_publish_spool.py --follow")
+        return recorded
+    
+    def rejected_result(self, keyword, status, **details):
+        """Результат для статьи без публикации: не прошла проверку (размер, структура, SEO, расчеты, дубликат)
+        или отложена в спул (spooled)"""
+        return {
+            'keyword': keyword,
+            'article_id': None,
+            'wp_id': None,
+            'wp_url': None,
+            'status': status,
+            'word_count': 0,
+            'quality_score': 0,
+            'seo_score': 0,
+            'content_rating': 0,
+            **details
+        }
+    
     def run_automation(self):
         """Основная функция автоматизации"""
         print("🚀 Запуск ФИНАЛЬНОГО WordPress Automation Script")
@@ -1217,6 +1595,9 @@ class WordPressAutomationFinal:
         print("=" * 60)
         
         results = []
+        self.start_spool()
+        # Метки ключевых слов запуска создаются одним проходом до публикации
+        self.taxonomy.prepare(self.keywords)
         
         for i, keyword in enumerate(self.keywords, 1):
             print(f"\n{'='*60}")
@@ -1224,51 +1605,8 @@ class WordPressAutomationFinal:
             print(f"{'='*60}")
             
             try:
-                # 1. Исследование ключевого слова
-                research_data = self.research_keyword(keyword)
-                
-                # 2. Создание оглавления
-                outline = self.create_article_outline(keyword, research_data)
-                
-                # 3. Генерация статьи по частям с оценкой качества
-                content, quality_score, seo_score = self.generate_article_content(keyword, research_data, outline)
-                
-                # 4. Публикация в WordPress
-                title = outline['title']
-                slug = self.transliterate_keyword(keyword)
-                
-                wp_result = self.publish_to_wordpress(keyword, content, title, slug)
-                
-                # 5. Сохранение в БД с метриками качества
-                article_id = self.save_article_to_db(keyword, wp_result, quality_score, seo_score)
-                
-                if wp_result:
-                    results.append({
-                        'keyword': keyword,
-                        'article_id': article_id,
-                        'wp_id': wp_result['wp_id'],
-                        'wp_url': wp_result['wp_url'],
-                        'status': 'success',
-                        'word_count': len(content.split()),
-                        'quality_score': quality_score,
-                        'seo_score': seo_score,
-                        'content_rating': ((quality_score or 0) + (seo_score or 0)) // 2
-                    })
-                    print(f"   ✅ УСПЕХ: Статья создана (WP ID: {wp_result['wp_id']})")
-                    print(f"   📊 Качество: {quality_score}/100, SEO: {seo_score}/100")
-                else:
-                    results.append({
-                        'keyword': keyword,
-                        'article_id': None,
-                        'wp_id': None,
-                        'wp_url': None,
-                        'status': 'error',
-                        'word_count': 0,
-                        'quality_score': 0,
-                        'seo_score': 0,
-                        'content_rating': 0
-                    })
-                    print(f"   ❌ ОШИБКА при обработке '{keyword}'")
+                prepared = self.prepare_article(keyword)
+                results.append(self.publish_prepared_article(prepared))
                 
             except Exception as e:
                 print(f"   ❌ Критическая ошибка при обработке '{keyword}': {str(e)}")
@@ -1281,8 +1619,10 @@ class WordPressAutomationFinal:
                     'word_count': 0
                 })
             
-            # Пауза между запросами
-            time.sleep(2)
+            # Статьи, которые фоновый разбор спула успел опубликовать
+            self.record_spooled()
+        
+        self.stop_spool()
         
         # Отображение результатов
         self.display_final_results(results)
@@ -1300,9 +1640,16 @@ class WordPressAutomationFinal:
         
         successful = [r for r in results if r['status'] == 'success']
         failed = [r for r in results if r['status'] == 'error']
+        spooled = [r for r in results if r['status'] == 'spooled']
         
         print(f"✅ Создано статей: {len(successful)}/{len(results)}")
+        if spooled:
+            print(f"⏳ В спуле публикации (WordPress был недоступен): {len(spooled)}")
         print(f"📅 Время завершения: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        # Обновления отправляют только изменившиеся поля, без изменений — не отправляются
+        wp_stats = self.wp_client.stats
+        print(f"🌐 Запросов к WordPress: {wp_stats['requests']} | ⏭️ Без изменений: {wp_stats['unchanged']} | "
+              f"📉 Не отправлено: {wp_stats['bytes_saved'] / 1024:.0f} КБ")
         
         # Статистика качества
         if successful:
@@ -1334,6 +1681,9 @@ class WordPressAutomationFinal:
                 print(f"    ID в БД: {result['article_id']} | WP ID: {wp_id} | Статус: ✅ СОЗДАНА")
                 print(f"    🔗 URL: {wp_url}")
                 print(f"    📄 Объем: {word_count} слов | ⭐ Качество: {quality_score}/100 | 🔍 SEO: {seo_score}/100 | 📊 Рейтинг: {content_rating}/100")
+            elif status == 'spooled':
+                print(f"{i:2d}. {keyword}")
+                print(f"    Статус: ⏳ В СПУЛЕ ПУБЛИКАЦИИ (будет опубликована без повторной генерации)")
             else:
                 print(f"{i:2d}. {keyword}")
                 print(f"    ID в БД: None | WP ID: None | Статус: ❌ ОШИБКА")
@@ -2059,12 +2409,14 @@ class WordPressAutomationFinal:
                 "case_studies": [f"Примеры {keyword}", f"Кейсы по {keyword}"]
             }
     
-    def evaluate_content_quality(self, content, keyword):
+    @staticmethod
+    def evaluate_content_quality(content, keyword):
         """Оценка качества контента (0-100 баллов)"""
+        metrics = get_content_metrics(content, keyword)
         score = 0
         
         # Проверка объема (25 баллов) - более гибкая оценка
-        word_count = len(content.split())
+        word_count = metrics.raw_word_count
         if word_count >= 2500:
             score += 25
         elif word_count >= 2000:
@@ -2077,9 +2429,9 @@ class WordPressAutomationFinal:
             score += 5
         
         # Проверка структуры (30 баллов) - более детальная
-        h1_count = content.count('<h1')
-        h2_count = content.count('<h2')
-        h3_count = content.count('<h3')
+        h1_count = metrics.raw_markup_count('<h1')
+        h2_count = metrics.raw_markup_count('<h2')
+        h3_count = metrics.raw_markup_count('<h3')
         
         if h1_count >= 1:
             score += 8
@@ -2093,18 +2445,19 @@ class WordPressAutomationFinal:
             score += 5
         
         # Проверка разнообразия контента (25 баллов)
-        if '<ul>' in content:
+        # Теги сверяются точно, как раньше: оценки сохраненных статей не меняются
+        if metrics.raw_markup_count('<ul>'):
             score += 6
-        if '<ol>' in content:
+        if metrics.raw_markup_count('<ol>'):
             score += 6
-        if '<table' in content:
+        if metrics.raw_markup_count('<table'):
             score += 8
-        if '<blockquote>' in content:
+        if metrics.raw_markup_count('<blockquote>'):
             score += 5
         
         # Проверка уникальности и естественности (20 баллов)
-        keyword_occurrences = content.lower().count(keyword.lower())
-        content_lower = content.lower()
+        # Вхождения ключа во всех словоформах («банковской гарантии», «банковскую гарантию»)
+        keyword_occurrences = metrics.keyword_forms.occurrences
         
         # Проверяем естественность использования ключевых слов
         if keyword_occurrences >= 3 and keyword_occurrences <= 12:
@@ -2112,10 +2465,20 @@ class WordPressAutomationFinal:
         elif keyword_occurrences >= 1 and keyword_occurrences <= 20:
             score += 10
         
+        # Читаемость по русскому индексу Флеша (до 5 баллов; шкала Оборневой
+        # на 10-15 баллов ниже коэффициентов «Простого русского»)
+        flesch = metrics.readability.flesch_reading_ease
+        if flesch >= 30:
+            score += 5
+        elif flesch >= 15:
+            score += 3
+        elif flesch >= 0:
+            score += 1
+        
         # Дополнительные бонусы за качество
-        if '<!-- wp:more -->' in content:
+        if metrics.has_comment('wp:more'):
             score += 3
-        if '<hr>' in content:
+        if metrics.raw_markup_count('<hr>'):
             score += 2
         
         # Штраф за переоптимизацию
@@ -2124,23 +2487,24 @@ class WordPressAutomationFinal:
         
         return min(max(score, 0), 100)
     
-    def evaluate_seo_quality(self, content, keyword):
+    @staticmethod
+    def evaluate_seo_quality(content, keyword):
         """Оценка SEO качества (0-100 баллов)"""
+        metrics = get_content_metrics(content, keyword)
         score = 0
         
         # Проверка заголовка H1 (20 баллов)
-        if '<h1' in content and keyword.lower() in content.lower():
+        if metrics.raw_markup_count('<h1') and metrics.keyword_forms.occurrences:
             score += 20
         
         # Проверка ключевого слова в начале статьи (20 баллов)
-        first_300_chars = content[:300].lower()
-        if keyword.lower() in first_300_chars:
+        if metrics.keyword_in_prefix(300):
             score += 20
         
         # Проверка структуры заголовков (25 баллов)
-        h1_count = content.count('<h1')
-        h2_count = content.count('<h2')
-        h3_count = content.count('<h3')
+        h1_count = metrics.raw_markup_count('<h1')
+        h2_count = metrics.raw_markup_count('<h2')
+        h3_count = metrics.raw_markup_count('<h3')
         
         if h1_count >= 1:
             score += 8
@@ -2152,11 +2516,8 @@ class WordPressAutomationFinal:
             score += 7
         
         # Проверка естественности использования ключевых слов (20 баллов)
-        keyword_occurrences = content.lower().count(keyword.lower())
-        word_count = len(content.split())
-        
-        if word_count > 0:
-            keyword_density = (keyword_occurrences / word_count) * 100
+        if metrics.tokens:
+            keyword_density = metrics.keyword_forms.density  # по леммам, с учетом словоформ
             if 0.5 <= keyword_density <= 2.0:  # Оптимальная плотность
                 score += 20
             elif 0.3 <= keyword_density <= 3.0:
@@ -2165,51 +2526,44 @@ class WordPressAutomationFinal:
                 score += 10
         
         # Проверка внутренних ссылок (10 баллов)
-        if '<a href=' in content:
+        if metrics.raw_markup_count('<a href='):
             score += 10
         
         # Проверка наличия списков и структурированного контента (5 баллов)
-        if '<ul>' in content or '<ol>' in content:
+        if metrics.raw_markup_count('<ul>') or metrics.raw_markup_count('<ol>'):
             score += 5
         
         return min(score, 100)
     
     def smart_rewrite_content(self, content, keyword, research_data):
-        """Умное переписывание контента для улучшения качества"""
+        """Замена шаблонных фраз: заготовки — данными исследования, штампы — короткими вариантами"""
         try:
-            # Импортируем умный переписчик
-            from smart_content_rewriter import SmartContentRewriter
-            
             rewriter = SmartContentRewriter()
             rewritten_content, analysis = rewriter.rewrite_content(content, keyword, research_data)
             
             # Проверяем улучшения
             if analysis['template_count'] > 0:
-                print(f"   🔄 Умное переписывание: убрано {analysis['template_count']} шаблонных фраз")
+                print(f"   🔄 Умное переписывание: найдено {analysis['template_count']} шаблонных фраз, "
+                      f"заменено {analysis['replaced']} ({analysis['elapsed_ms']:.1f} мс)")
             
             return rewritten_content
             
-        except ImportError:
-            print("   ⚠️ Модуль умного переписывания недоступен, используем оригинальный контент")
-            return content
         except Exception as e:
             print(f"   ⚠️ Ошибка умного переписывания: {e}")
             return content
     
-    def evaluate_content_uniqueness(self, content, keyword):
+    @staticmethod
+    def evaluate_content_uniqueness(content, keyword):
         """Оценка уникальности контента"""
-        # Подсчет уникальных слов
-        words = content.lower().split()
-        unique_words = set(words)
-        uniqueness_ratio = len(unique_words) / len(words) if words else 0
+        metrics = get_content_metrics(content, keyword)
+        
+        # Доля уникальных слов
+        uniqueness_ratio = metrics.raw_uniqueness_ratio
         
         # Проверка на повторяющиеся фразы
         repeated_phrases = 0
-        keyword_lower = keyword.lower()
-        if keyword_lower in content.lower():
-            occurrences = content.lower().count(keyword_lower)
-            if occurrences > 15:
-                repeated_phrases += 1
+        if metrics.keyword_forms.occurrences > 15:
+            repeated_phrases += 1
         
         # Оценка уникальности
         if uniqueness_ratio > 0.7 and repeated_phrases == 0:
@@ -2261,15 +2615,9 @@ def main():
     print("🚀 ЗАПУСК МОДУЛЯ ПРОВЕРКИ РАСЧЕТОВ И ЧИСЛОВЫХ ДАННЫХ")
     print("="*60)
     
-    from calculation_verification_module import CalculationVerificationModule
+    from verify_numbers import run_verification
     
-    verification_module = CalculationVerificationModule(
-        "https://bizfin-pro.ru/wp-json/wp/v2",
-        "bizfin_pro_r", 
-        "U3Ep gU2T clRu FcwN QU6l Dsda",
-        "wordpress_articles_final.db"
-    )
-    verification_module.run_verification()
+    run_verification("wordpress_articles_final.db")
     
     # После проверки расчетов запускаем модуль Yoast SEO оптимизации
     print("\n" + "="*60)